@@ -6,6 +6,8 @@ Runway AI Task 상태 확인 스크립트
 import os
 import requests
 
+from src.utils.download import download_file
+
 # API 설정
 RUNWAY_API_KEY = os.getenv("RUNWAY_API_KEY")
 if not RUNWAY_API_KEY:
@@ -66,12 +68,8 @@ def download_video(video_url: str, output_path: str):
     try:
         print(f"📥 영상 다운로드 중: {video_url}")
         
-        response = requests.get(video_url, timeout=120)
-        response.raise_for_status()
+        download_file(video_url, output_path)
         
-        with open(output_path, 'wb') as f:
-            f.write(response.content)
-            
         print(f"✅ 다운로드 완료: {output_path}")
         return True
         
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+후보 이미지 지각 해시/중복 제거 벤치마크
+
+상품 헤더처럼 같은 사진의 크롭/축소/재압축본이 섞인 합성 JPEG 후보를 만들고
+- 해시 계산: 이미지마다 전체 디코딩 후 하나씩 해시 (``loop``) vs JPEG 축소 디코딩 + NumPy 일괄 (``vectorized``)
+- 중복 제거: 예전처럼 앞 8장을 자르면 남는 서로 다른 사진 수 vs 중복을 걷어낸 뒤 8장을 자르면 남는 수
+를 비교한다.
+
+예)
+  python scripts/bench_dedupe.py
+  python scripts/bench_dedupe.py --photos 12 --copies 3 --size 2400x1600 --json dedupe.json
+"""
+
+import argparse
+import io
+import json
+import sys
+import time
+from pathlib import Path
+
+CUR = Path(__file__).resolve().parent
+ROOT = CUR.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from src.utils.perceptual import PHASH_SIZE, collapse, gray_thumbnail, hash_images, hash_thumbnails
+
+MAX_CANDIDATES = 8
+
+
+def synthetic_photo(seed: int, width: int, height: int) -> Image.Image:
+    rng = np.random.default_rng(seed)
+    base = cv2.resize(rng.integers(0, 256, (6, 9, 3)).astype(np.uint8), (width, height), interpolation=cv2.INTER_CUBIC)
+    texture = cv2.GaussianBlur(rng.normal(0, 25, (height, width, 3)).astype(np.float32), (0, 0), 3)
+    return Image.fromarray(np.clip(base + texture, 0, 255).astype(np.uint8))
+
+
+def variant(image: Image.Image, k: int) -> Image.Image:
+    """k 번째 복제본: 축소 / 가장자리 크롭 / 그대로 (재압축은 저장할 때)."""
+    w, h = image.size
+    if k % 3 == 1:
+        return image.resize((w // 2, h // 2))
+    if k % 3 == 2:
+        return image.crop((int(w * 0.04), int(h * 0.04), int(w * 0.96), int(h * 0.96)))
+    return image
+
+
+def jpeg(image: Image.Image, quality: int) -> bytes:
+    buf = io.BytesIO()
+    image.save(buf, "JPEG", quality=quality)
+    return buf.getvalue()
+
+
+def loop_hashes(blobs) -> np.ndarray:
+    """이미지마다 전체 디코딩 → 썸네일 → 해시."""
+    rows = []
+    for data in blobs:
+        image = Image.open(io.BytesIO(data)).convert("RGB")
+        thumb = gray_thumbnail(image, PHASH_SIZE)
+        rows.append(hash_thumbnails(thumb[None])[0])
+    return np.stack(rows)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Benchmark perceptual-hash dedupe of candidate images")
+    ap.add_argument("--photos", type=int, default=8, help="서로 다른 사진 수")
+    ap.add_argument("--copies", type=int, default=3, help="사진마다 후보에 섞인 수 (원본 포함)")
+    ap.add_argument("--size", default="1600x1067", help="원본 WxH")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--json", type=str, default="", help="결과 JSON 저장 경로")
+    args = ap.parse_args()
+
+    width, height = (int(v) for v in args.size.lower().split("x"))
+    photos = [synthetic_photo(i, width, height) for i in range(args.photos)]
+    # 헤더처럼 복제본이 원본 가까이에 섞인 순서
+    items, blobs = [], []
+    for k in range(args.copies):
+        for i, photo in enumerate(photos):
+            blobs.append(jpeg(variant(photo, k), 90 - 15 * k))
+            items.append({"filename": f"p{i}_v{k}.jpg", "photo": i, "score": float(len(blobs[-1]))})
+    order = sorted(range(len(items)), key=lambda j: (items[j]["photo"] // 3, j))
+    items, blobs = [items[j] for j in order], [blobs[j] for j in order]
+
+    timings = {}
+    for name, fn in (("loop", loop_hashes), ("vectorized", hash_images)):
+        best = float("inf")
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            hashes = fn(blobs)
+            best = min(best, time.perf_counter() - t0)
+        timings[name] = round(best * 1000, 1)
+
+    hashes = hash_images(blobs)
+    survivors = collapse(items, hashes, score=lambda it: it["score"])
+    before = len({it["photo"] for it in items[:MAX_CANDIDATES]})
+    after = len({it["photo"] for it in survivors[:MAX_CANDIDATES]})
+    merged_wrong = sum(len({items[j]["photo"] for j, it in enumerate(items) if it["filename"] in s["duplicates"]} - {s["photo"]}) for s in survivors)
+
+    print(f"후보 {len(items)}장 (사진 {args.photos}장 x {args.copies}), 원본 {args.size}")
+    print(f"해시 계산: loop {timings['loop']:.0f}ms / vectorized {timings['vectorized']:.0f}ms")
+    print(f"중복 제거: {len(items)} → {len(survivors)} (다른 사진을 잘못 합친 수 {merged_wrong})")
+    print(f"📉 상위 {MAX_CANDIDATES}장 중 서로 다른 사진: {before} → {after}, 해시 {timings['loop'] / timings['vectorized']:.1f}배")
+
+    if args.json:
+        out = {
+            "candidates": len(items), "photos": args.photos, "copies": args.copies, "size": args.size,
+            "hash_ms": timings, "survivors": len(survivors), "wrong_merges": merged_wrong,
+            "distinct_in_top": {"before": before, "after": after},
+        }
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(out, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
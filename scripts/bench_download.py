@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+다운로드 매니저 벤치마크
+
+로컬 스탠드인 서버(Range 지원 + 연결 끊김 주입)를 띄우고
+기존 방식(response.content / 8KB 스트리밍)과 DownloadManager 를 비교한다.
+
+예) python scripts/bench_download.py --size-mb 64 --drop-every-mb 16
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+CUR = Path(__file__).resolve().parent
+ROOT = CUR.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.utils.download import DownloadManager
+
+
+def make_handler(payload: bytes, drop_every: int):
+    """drop_every 바이트를 보낼 때마다 연결을 끊는 핸들러."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):  # 조용히
+            pass
+
+        def _range(self):
+            hdr = self.headers.get("Range")
+            if not hdr or not hdr.startswith("bytes="):
+                return 0, len(payload) - 1, False
+            start_s, _, end_s = hdr[6:].partition("-")
+            start = int(start_s)
+            end = int(end_s) if end_s else len(payload) - 1
+            return start, min(end, len(payload) - 1), True
+
+        def do_HEAD(self):
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(payload)))
+            self.send_header("Accept-Ranges", "bytes")
+            self.end_headers()
+
+        def do_GET(self):
+            start, end, partial = self._range()
+            if start >= len(payload):
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{len(payload)}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(206 if partial else 200)
+            self.send_header("Content-Length", str(end - start + 1))
+            self.send_header("Accept-Ranges", "bytes")
+            if partial:
+                self.send_header("Content-Range", f"bytes {start}-{end}/{len(payload)}")
+            self.end_headers()
+            # 요청마다 drop_every 바이트만 보내고 끊는다 (0 이면 끊지 않음)
+            limit = end + 1 if not drop_every else min(end + 1, start + drop_every)
+            pos = start
+            try:
+                while pos < limit:
+                    n = min(256 * 1024, limit - pos)
+                    self.wfile.write(payload[pos:pos + n])
+                    pos += n
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            if pos <= end:
+                self.close_connection = True
+
+    return Handler
+
+
+def start_server(payload: bytes, drop_every: int) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(payload, drop_every))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def bench(name, fn):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    try:
+        extra = fn() or {}
+        ok = True
+        error = None
+    except Exception as e:
+        extra, ok, error = {}, False, str(e)[:120]
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    row = {"method": name, "ok": ok, "elapsed_s": round(elapsed, 3), "peak_py_mem_mb": round(peak / 1e6, 1), **extra}
+    if error:
+        row["error"] = error
+    return row
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="DownloadManager benchmark with injected connection drops")
+    ap.add_argument("--size-mb", type=int, default=64)
+    ap.add_argument("--drop-every-mb", type=int, default=16, help="요청당 전송 후 끊을 크기 (0=끊지 않음)")
+    ap.add_argument("--segments", type=int, default=4)
+    ap.add_argument("--json", type=str, default="", help="결과 JSON 저장 경로")
+    args = ap.parse_args()
+
+    payload = os.urandom(args.size_mb * 1024 * 1024)
+    server = start_server(payload, args.drop_every_mb * 1024 * 1024)
+    url = f"http://127.0.0.1:{server.server_address[1]}/video.mp4"
+    rows = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        def legacy_content():
+            r = requests.get(url, timeout=120)
+            r.raise_for_status()
+            if len(r.content) != len(payload):
+                raise RuntimeError(f"truncated {len(r.content)}/{len(payload)}")
+            with open(os.path.join(tmp, "legacy.mp4"), "wb") as f:
+                f.write(r.content)
+
+        def legacy_stream():
+            with requests.get(url, stream=True, timeout=120) as r:
+                r.raise_for_status()
+                with open(os.path.join(tmp, "legacy_stream.mp4"), "wb") as f:
+                    for chunk in r.iter_content(chunk_size=8192):
+                        f.write(chunk)
+
+        def manager(parallel: bool):
+            def _run():
+                mgr = DownloadManager(backoff_s=0.01, max_retries=50, max_segments=args.segments)
+                res = mgr.download(url, os.path.join(tmp, f"mgr_{parallel}.mp4"), parallel=parallel)
+                return {"resumes": res.resumes, "segments": res.segments, "size": res.size}
+            return _run
+
+        rows.append(bench("requests.content", legacy_content))
+        rows.append(bench("stream_8k_no_resume", legacy_stream))
+        rows.append(bench("manager_sequential", manager(False)))
+        rows.append(bench("manager_parallel", manager(True)))
+
+    server.shutdown()
+    for row in rows:
+        print(json.dumps(row, ensure_ascii=False))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
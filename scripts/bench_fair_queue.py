@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+대기열 정책 벤치마크 (배치 부하 중 interactive 미리보기 p95 지연)
+
+같은 작업 흐름을 FIFO(기존 세마포어 순서), 우선순위+공정 분배, 여기에
+interactive 예약 슬롯까지 둔 FairQueue 로 각각 돌려 interactive / batch 지연을
+비교한다. 시간은 ``--service-s`` 로 축소한다.
+
+예)
+  python scripts/bench_fair_queue.py
+  python scripts/bench_fair_queue.py --batch-jobs 500 --capacity 3 --service-s 0.02 --json bench.json
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+CUR = Path(__file__).resolve().parent
+ROOT = CUR.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.sim.fairness import POLICIES, run_fairness
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Benchmark queue policies under concurrent batch load")
+    ap.add_argument("--policy", action="append", choices=POLICIES, help="반복 지정 가능 (기본 전체)")
+    ap.add_argument("--capacity", type=int, default=3, help="슬롯 수 (예: RUNWAY_MAX_INFLIGHT)")
+    ap.add_argument("--batch-jobs", type=int, default=200)
+    ap.add_argument("--batch-users", type=int, default=2)
+    ap.add_argument("--interactive-jobs", type=int, default=20)
+    ap.add_argument("--interactive-users", type=int, default=3)
+    ap.add_argument("--service-s", type=float, default=0.05, help="작업 1건 실행 시간 (축소)")
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--json", type=str, default="", help="결과 JSON 저장 경로")
+    args = ap.parse_args()
+
+    reports = []
+    for policy in args.policy or POLICIES:
+        report = run_fairness(
+            policy,
+            capacity=args.capacity,
+            batch_jobs=args.batch_jobs,
+            batch_users=args.batch_users,
+            interactive_jobs=args.interactive_jobs,
+            interactive_users=args.interactive_users,
+            service_s=args.service_s,
+            seed=args.seed,
+        )
+        print(report.summary())
+        reports.append(report)
+    base = reports[0]
+    for r in reports[1:]:
+        if base.policy == "fifo" and r.interactive_p95_s:
+            print(
+                f"📉 {r.policy}: interactive p95 {base.interactive_p95_s:.2f}s → {r.interactive_p95_s:.2f}s "
+                f"({base.interactive_p95_s / r.interactive_p95_s:.1f}배 단축), "
+                f"배치 완료 {base.batch_makespan_s:.2f}s → {r.batch_makespan_s:.2f}s"
+            )
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump([r.as_dict() for r in reports], f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
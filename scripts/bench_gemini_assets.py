@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Gemini 입력 이미지 업로드 벤치마크 (로컬 시뮬레이터, 크레딧 소모 없음)
+
+같은 상품 이미지 몇 장으로 마케팅 영상 여러 편을 만들며, 예전 흐름(분석/생성마다
+다운로드→업로드→삭제)과 업로드 핸들 재사용(``GeminiAssets``)의 업로드 수와
+편당 소요 시간을 비교한다. 지연은 ``--upload-s`` 등으로 흉내 낸다.
+
+예)
+  python scripts/bench_gemini_assets.py
+  python scripts/bench_gemini_assets.py --videos 20 --images 4 --upload-s 1.5 --json bench.json
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+CUR = Path(__file__).resolve().parent
+ROOT = CUR.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.sim import SimConfig, serve
+from src.sim.assets import MODES, run_assets
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Benchmark Gemini input uploads per marketing video")
+    ap.add_argument("--mode", action="append", choices=MODES, help="반복 지정 가능 (기본 전체)")
+    ap.add_argument("--videos", type=int, default=6)
+    ap.add_argument("--images", type=int, default=2, help="서로 다른 상품 이미지 수")
+    ap.add_argument("--image-s", type=float, default=0.2, help="이미지 다운로드 지연")
+    ap.add_argument("--upload-s", type=float, default=0.5, help="Files API 업로드 지연")
+    ap.add_argument("--processing-s", type=float, default=0.5, help="업로드 후 ACTIVE 까지")
+    ap.add_argument("--analyze-s", type=float, default=0.3)
+    ap.add_argument("--queue-s", type=float, default=0.2)
+    ap.add_argument("--run-s", type=float, default=1.0)
+    ap.add_argument("--poll-interval", type=float, default=0.2)
+    ap.add_argument("--json", type=str, default="", help="결과 JSON 저장 경로")
+    args = ap.parse_args()
+
+    sim = serve(SimConfig(
+        queue_s=args.queue_s,
+        run_s=args.run_s,
+        image_s=args.image_s,
+        upload_s=args.upload_s,
+        file_processing_s=args.processing_s,
+        analyze_s=args.analyze_s,
+        video_bytes=64 * 1024,
+    ))
+    reports = []
+    try:
+        for mode in args.mode or MODES:
+            report = run_assets(sim, mode, args.videos, args.images, poll_interval_s=args.poll_interval)
+            print(report.summary())
+            reports.append(report)
+    finally:
+        sim.stop()
+    if len(reports) == 2 and reports[1].per_video_mean_s:
+        before, after = reports
+        print(
+            f"📉 업로드 {before.uploads} → {after.uploads}건, "
+            f"편당 평균 {before.per_video_mean_s:.2f}s → {after.per_video_mean_s:.2f}s "
+            f"({before.per_video_mean_s / after.per_video_mean_s:.1f}배 단축)"
+        )
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump([r.as_dict() for r in reports], f, ensure_ascii=False, indent=2)
+    return 0 if all(r.succeeded == r.videos for r in reports) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
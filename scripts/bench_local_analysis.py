@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+로컬 사진 분석기 벤치마크 (지연 ms/장, 원격 분석과의 일치율)
+
+라벨 세트(JSONL, ``{"image": 경로|URL, "analysis": {...}}``)를 주면 그 결과와 비교하고,
+없으면 합성 이미지 세트로 돈다. ``--label-remote`` 는 이미지 목록을 Gemini 로 분석해
+라벨 세트를 만든다 (API 키 필요, ``PHOTO_ANALYSIS_BATCH`` 장당 요청 1번).
+
+예)
+  python scripts/bench_local_analysis.py
+  python scripts/bench_local_analysis.py --label-remote images.txt --labels labels.jsonl
+  python scripts/bench_local_analysis.py --labels labels.jsonl --json bench.json
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+CUR = Path(__file__).resolve().parent
+ROOT = CUR.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.sim.analysis import label_remote, load_labels, run_agreement, synthetic_samples
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Benchmark the local photo analyzer against remote labels")
+    ap.add_argument("--labels", type=str, default="", help="라벨 세트 JSONL (없으면 합성 세트)")
+    ap.add_argument("--label-remote", type=str, default="", help="이미지 경로/URL 목록 파일 → --labels 에 원격 분석 저장")
+    ap.add_argument("--synthetic", type=int, default=5, help="합성 세트 종류별 장수")
+    ap.add_argument("--json", type=str, default="", help="결과 JSON 저장 경로")
+    args = ap.parse_args()
+
+    if args.label_remote:
+        if not args.labels:
+            ap.error("--label-remote 에는 --labels 저장 경로가 필요합니다")
+        images = [line.strip() for line in Path(args.label_remote).read_text(encoding="utf-8").splitlines() if line.strip()]
+        print(f"🏷️ 원격 분석으로 라벨 {label_remote(images, args.labels)}장 저장: {args.labels}")
+
+    samples = load_labels(args.labels) if args.labels else synthetic_samples(args.synthetic)
+    report = run_agreement(samples)
+    print(report.summary())
+    for m in report.mismatches:
+        print(f"  ✗ {m['image']}: 원격 {m['expected']} / 로컬 {m['local']} ({m['scene']})")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report.as_dict(), f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+영상 서빙 방식 비교: st.video(bytes) vs 사이드카 Range 서빙
+
+- legacy: open().read() 로 전체 바이트를 메모리에 올려 st.video + download_button 에 전달
+- sidecar: /media/... 를 Range 요청으로 스트리밍 (첫 프레임에 필요한 앞부분만)
+
+첫 프레임까지 시간(TTFF)은 브라우저가 moov + 첫 샘플을 받는 시점으로 근사한다
+(faststart 파일 기준 앞 --head-kb 바이트).
+
+예) python scripts/bench_media_serving.py --size-mb 10
+"""
+
+import argparse
+import json
+import os
+import struct
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import requests
+
+CUR = Path(__file__).resolve().parent
+ROOT = CUR.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.server.runner import start_background_server
+from src.utils.faststart import is_faststart
+
+
+def make_faststart_mp4(path: str, size_mb: int) -> None:
+    """ftyp + moov + mdat 구조의 합성 파일 (내용은 난수)."""
+    ftyp = b"isom" + struct.pack(">I", 512) + b"isomiso2avc1mp41"
+    moov_body = os.urandom(64 * 1024)
+    mdat_body = os.urandom(size_mb * 1024 * 1024)
+    with open(path, "wb") as f:
+        for name, body in ((b"ftyp", ftyp), (b"moov", moov_body), (b"mdat", mdat_body)):
+            f.write(struct.pack(">I", len(body) + 8) + name)
+            f.write(body)
+
+
+def bench_legacy(path: str, url: str) -> dict:
+    session = requests.Session()
+    session.get(url, headers={"Range": "bytes=0-0"}, timeout=10)  # 커넥션 워밍업
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    # main() 의 기존 흐름: 파일 전체를 두 번 메모리에 올린다 (st.video, st.download_button)
+    with open(path, "rb") as f:
+        video_bytes = f.read()
+    download_bytes = bytes(bytearray(video_bytes))
+    # 브라우저는 전체 블롭을 받은 뒤에야 재생 가능 → 전체 전송 시간을 포함
+    session.get(url, timeout=30).content
+    ttff = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del video_bytes, download_bytes
+    return {"method": "st.video(bytes)", "ttff_ms": round(ttff * 1000, 2), "server_peak_mem_mb": round(peak / 1e6, 2)}
+
+
+def bench_sidecar(url: str, head_bytes: int) -> dict:
+    session = requests.Session()
+    session.get(url, headers={"Range": "bytes=0-0"}, timeout=10)  # 커넥션 워밍업
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    r = session.get(url, headers={"Range": f"bytes=0-{head_bytes - 1}"}, timeout=10)
+    ttff = time.perf_counter() - t0
+    assert r.status_code == 206, r.status_code
+    # 탐색(seek): 중간 지점 Range
+    t1 = time.perf_counter()
+    r2 = session.get(url, headers={"Range": "bytes=5000000-5524287"}, timeout=10)
+    seek = time.perf_counter() - t1
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "method": "sidecar range",
+        "ttff_ms": round(ttff * 1000, 2),
+        "seek_ms": round(seek * 1000, 2),
+        "seek_status": r2.status_code,
+        "server_peak_mem_mb": round(peak / 1e6, 2),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Measure time-to-first-frame and server memory for video serving")
+    ap.add_argument("--size-mb", type=int, default=10)
+    ap.add_argument("--head-kb", type=int, default=512, help="첫 프레임에 필요한 앞부분 크기(KB)")
+    ap.add_argument("--port", type=int, default=38901)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, "bench", "video.mp4")
+        os.makedirs(os.path.dirname(path))
+        make_faststart_mp4(path, args.size_mb)
+        assert is_faststart(path)
+        start_background_server(host="127.0.0.1", port=args.port, media_root=root)
+        url = f"http://127.0.0.1:{args.port}/media/bench/video.mp4"
+        head = args.head_kb * 1024
+        rows = [bench_legacy(path, url), bench_sidecar(url, head)]
+    for row in rows:
+        print(json.dumps(row, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+텍스트 오버레이 미리보기 지연 벤치마크 (폰트 레지스트리 LRU 유무)
+
+- ``uncached``: 미리보기마다 폰트 파일을 다시 연다 (예전 ``ImageFont.truetype`` 매번 호출과 같음)
+- ``cached``: 레지스트리의 (페이스, 크기) LRU 에서 꺼낸다
+
+UI 에서 글자 크기 슬라이더를 움직이는 것처럼 몇 가지 크기를 돌려 가며 ``preview_text_overlay`` 를 부른다.
+폰트 폴더 스캔(시작할 때 한 번)은 따로 잰다.
+
+예)
+  python scripts/bench_preview_fonts.py
+  python scripts/bench_preview_fonts.py --renders 100 --size 1080x1920 --json preview.json
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+CUR = Path(__file__).resolve().parent
+ROOT = CUR.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from PIL import Image
+
+from src.utils import fonts
+from src.utils.text_overlay import preview_text_overlay
+
+COPY = "서울 야경 투어\n지금 예약 · 39,000원"
+SIZES = (56, 60, 64, 68, 72)
+
+
+def measure(image: Image.Image, renders: int) -> dict:
+    latencies = []
+    for i in range(renders):
+        settings = {"copy": COPY, "font_size": SIZES[i % len(SIZES)], "position": "bottom"}
+        t0 = time.perf_counter()
+        preview_text_overlay(image, settings)
+        latencies.append((time.perf_counter() - t0) * 1000)
+    latencies.sort()
+    return {
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 2),
+        "mean_ms": round(statistics.fmean(latencies), 2),
+    }
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Benchmark text overlay preview latency with the font registry")
+    ap.add_argument("--renders", type=int, default=50)
+    ap.add_argument("--size", default="1080x1920", help="미리보기 이미지 WxH")
+    ap.add_argument("--json", type=str, default="", help="결과 JSON 저장 경로")
+    args = ap.parse_args()
+
+    width, height = (int(v) for v in args.size.lower().split("x"))
+    image = Image.new("RGB", (width, height), (40, 90, 140))
+
+    t0 = time.perf_counter()
+    registry = fonts.FontRegistry()
+    scan_ms = (time.perf_counter() - t0) * 1000
+    face = registry.find(COPY)
+    print(f"🔤 스캔 {scan_ms:.0f}ms: 페이스 {len(registry.faces)}개, 선택 {face.family + ' ' + face.style if face else '(PIL 기본)'}")
+
+    results = {"scan_ms": round(scan_ms, 1), "faces": len(registry.faces), "face": face.path if face else None}
+    for mode, cache_size in (("uncached", 0), ("cached", registry.cache_size)):
+        registry.cache_size = cache_size
+        registry._fonts.clear()
+        fonts._registry = registry
+        preview_text_overlay(image, {"copy": COPY})  # 첫 렌더 (numpy/PIL 워밍업)
+        results[mode] = measure(image, args.renders)
+        r = results[mode]
+        print(f"{mode:<9} p50 {r['p50_ms']:7.2f}ms  p95 {r['p95_ms']:7.2f}ms  평균 {r['mean_ms']:7.2f}ms")
+    before, after = results["uncached"]["p50_ms"], results["cached"]["p50_ms"]
+    print(f"📉 미리보기 p50: {before:.2f}ms → {after:.2f}ms ({before / after:.2f}배)")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+로컬 렌더 엔진 벤치마크 모음 (+ 기준선 대비 회귀 비교)
+
+엔진마다 결정적인 합성 입력(시드 고정 사진)을 해상도/길이 조합으로 만들어 돌리고
+벽시계 시간, 초당 프레임, 최대 RSS, 스크래치(임시) 디스크 최대 사용량, 결과 크기를 JSON 으로 남긴다.
+
+- ``simulation``: ``render_simulation`` (``generate_local_simulation_video``)
+- ``ai_motion``: ``ai_motion.render_parallax`` (전경/배경 레이어는 합성, rembg 분리는 재지 않음)
+- ``depth``: ``ai_motion_depth.render_depth_parallax`` (MiDaS 모델이 캐시에 있을 때만, ``--allow-download``)
+- ``grabcut``: ``ai_motion_grabcut.render_parallax``
+- ``slideshow``: ``ImageSlideshowRenderer.render`` (로컬 이미지 4장)
+- ``text_overlay``: ``overlay_text`` (``apply_text_overlay`` 의 본체. 입력 영상은 미리 만들어 두고 재지 않음)
+
+ffmpeg 가 필요한 엔진은 ffmpeg 가 없으면 ``skipped`` 로 남긴다. 경우마다 새 프로세스에서 돌려
+최대 RSS 가 경우별 값이 되게 한다 (ffmpeg 자식 프로세스는 ``child_peak_rss_mb``). 스크래치 사용량은
+바깥 작업 공간 아래(렌더러의 작업 공간이 그 안에 생긴다)를 주기적으로 재서 최대값을 남긴다.
+
+``--compare 기준선.json`` 은 같은 (엔진, 크기, 길이) 의 시간/RSS/스크래치가 ``--threshold`` 보다 늘면
+회귀로 표시하고 종료 코드 1. ``--results`` 로 이미 잰 결과를 비교만 할 수도 있다.
+
+예)
+  python scripts/bench_render_engines.py --json bench/render_baseline.json
+  python scripts/bench_render_engines.py --engines simulation,text_overlay --sizes 540x960 --durations 2
+  python scripts/bench_render_engines.py --compare bench/render_baseline.json --threshold 0.15
+  python scripts/bench_render_engines.py --results new.json --compare bench/render_baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+CUR = Path(__file__).resolve().parent
+ROOT = CUR.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+ENGINES = ("simulation", "ai_motion", "depth", "grabcut", "slideshow", "text_overlay")
+NEEDS_FFMPEG = ("ai_motion", "depth", "grabcut", "slideshow")
+PRESET = {"ai_motion": "ai_motion", "depth": "ai_motion_depth", "grabcut": "ai_motion_grabcut"}
+# 회귀로 볼 지표와 잡음으로 무시할 최소 증가량
+COMPARED = {"wall_s": 0.05, "peak_rss_mb": 16.0, "scratch_peak_bytes": 1024 * 1024}
+FPS = 30
+COPY = "서울 야경 투어\n지금 예약 · 39,000원"
+
+
+def synthetic_photo(width: int, height: int, seed: int):
+    """그라디언트 + 원 몇 개 + 잡음 (시드 고정)."""
+    import cv2
+    import numpy as np
+    from PIL import Image
+
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    img = np.stack([x / width * 200 + 30, y / height * 180 + 40, (x + y) / (width + height) * 160 + 60], axis=2)
+    for _ in range(6):
+        cx, cy = int(rng.integers(0, width)), int(rng.integers(0, height))
+        r = int(rng.integers(min(width, height) // 12, min(width, height) // 4))
+        color = tuple(float(c) for c in rng.integers(0, 256, 3))
+        cv2.circle(img, (cx, cy), r, color, -1)
+    img += rng.normal(0, 8, img.shape)
+    return Image.fromarray(np.clip(img, 0, 255).astype(np.uint8))
+
+
+def _dir_bytes(root: str) -> int:
+    total = 0
+    for dirpath, _, names in os.walk(root):
+        for n in names:
+            try:
+                total += os.path.getsize(os.path.join(dirpath, n))
+            except OSError:
+                pass
+    return total
+
+
+class ScratchSampler:
+    """작업 공간 디렉터리 크기를 주기적으로 재서 최대값을 남긴다."""
+
+    def __init__(self, root: str, interval_s: float = 0.05) -> None:
+        self.root, self.interval_s = root, interval_s
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            self.peak = max(self.peak, _dir_bytes(self.root))
+            self._stop.wait(self.interval_s)
+
+    def __enter__(self) -> "ScratchSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, _dir_bytes(self.root))
+
+
+def skip_reason(engine: str, allow_download: bool = False) -> Optional[str]:
+    if engine in NEEDS_FFMPEG and not shutil.which("ffmpeg"):
+        return "ffmpeg 없음"
+    if engine == "depth" and not allow_download:
+        from src.utils.ai_motion_depth import MidasPath
+
+        if not os.path.exists(MidasPath):
+            return "MiDaS 모델 없음 (--allow-download)"
+    return None
+
+
+def run_case(engine: str, width: int, height: int, duration: float, out_dir: str) -> Dict[str, Any]:
+    """한 경우를 현재 프로세스에서 실행. 입력 준비는 재지 않는다."""
+    from src.utils.metrics import SCRATCH_BYTES
+    from src.utils.motion import motion_spec
+    from src.utils.workspace import workspace
+
+    out = os.path.join(out_dir, f"{engine}_{width}x{height}_{duration:g}s.mp4")
+    frames = max(1, int(duration * FPS))
+    with workspace(f"bench-{engine}") as ws:
+        photo = synthetic_photo(1600, 1200, seed=7)
+        spec = motion_spec(PRESET.get(engine, ""), width=width, height=height, duration=duration, fps=FPS)
+        if engine == "simulation":
+            from src.utils.simulation import render_simulation
+
+            def run():
+                render_simulation(photo, out, duration=duration, fps=FPS, width=width, height=height)
+        elif engine == "ai_motion":
+            from PIL import Image
+
+            from src.utils.ai_motion import composite_layers, render_parallax
+
+            fg = Image.new("RGBA", photo.size, (0, 0, 0, 0))
+            fg.paste(photo.crop((400, 300, 1200, 900)), (400, 300))
+            fg_path, bg_path = composite_layers(fg, photo, spec, ws)
+
+            def run():
+                render_parallax(fg_path, bg_path, out, spec)
+        elif engine == "depth":
+            from src.utils.ai_motion_depth import ensure_midas_model, render_depth_parallax
+
+            ensure_midas_model()
+
+            def run():
+                render_depth_parallax(photo, out, spec)
+        elif engine == "grabcut":
+            from src.utils.ai_motion_grabcut import render_parallax as grabcut_parallax
+
+            def run():
+                grabcut_parallax(photo, out, spec)
+        elif engine == "slideshow":
+            from src.utils.image_slideshow import CanvasSpec, ClipSpec, ImageSlideshowRenderer
+
+            paths = []
+            for i in range(4):
+                paths.append(ws.path(f"input_{i}.jpg"))
+                synthetic_photo(1600, 1200, seed=10 + i).save(paths[-1], quality=90)
+            clips = [ClipSpec(url=p, duration=duration / 4) for p in paths]
+            renderer = ImageSlideshowRenderer(CanvasSpec(width=width, height=height, duration=duration, fps=FPS))
+
+            def run():
+                renderer.render(clips, out)
+        elif engine == "text_overlay":
+            from src.utils.simulation import render_simulation
+            from src.utils.text_overlay import overlay_text
+
+            source = render_simulation(photo, ws.path("source.mp4"), duration=duration, fps=FPS, width=width, height=height)
+
+            def run():
+                overlay_text(source, {"copy": COPY, "position": "bottom", "font_size": 64}, out)
+        else:
+            raise ValueError(f"알 수 없는 엔진: {engine} (가능: {', '.join(ENGINES)})")
+
+        inputs = _dir_bytes(ws.root)  # 미리 만든 입력은 빼고 잰다
+        written0 = sum(SCRATCH_BYTES.snapshot().values())
+        with ScratchSampler(ws.root) as sampler:
+            t0 = time.perf_counter()
+            run()
+            wall = time.perf_counter() - t0
+        written = sum(SCRATCH_BYTES.snapshot().values()) - written0
+    self_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    child_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024  # macOS 는 바이트, 리눅스는 KiB
+    return {
+        "status": "ok",
+        "wall_s": round(wall, 3),
+        "frames": frames,
+        "fps": round(frames / wall, 2) if wall > 0 else None,
+        "peak_rss_mb": round(self_rss / scale, 1),
+        "child_peak_rss_mb": round(child_rss / scale, 1),
+        "scratch_peak_bytes": max(0, sampler.peak - inputs),
+        "scratch_written_bytes": int(written),
+        "output_bytes": os.path.getsize(out) if os.path.exists(out) else 0,
+    }
+
+
+def run_isolated(case: Dict[str, Any], out_dir: str, allow_download: bool) -> Dict[str, Any]:
+    """새 프로세스에서 한 경우를 실행 (최대 RSS 를 경우별로)."""
+    cmd = [sys.executable, str(Path(__file__).resolve()), "--worker", json.dumps(case), "--out-dir", out_dir]
+    if allow_download:
+        cmd.append("--allow-download")
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    lines = [ln for ln in proc.stdout.splitlines() if ln.startswith("{")]
+    if proc.returncode != 0 or not lines:
+        return {"status": "failed", "error": (proc.stderr.strip().splitlines() or ["?"])[-1][:300]}
+    return json.loads(lines[-1])
+
+
+def case_key(row: Dict[str, Any]) -> str:
+    return f"{row['engine']}@{row['size']}/{row['duration']:g}s"
+
+
+def run_suite(engines: List[str], sizes: List[str], durations: List[float], repeat: int, out_dir: str,
+              allow_download: bool = False) -> List[Dict[str, Any]]:
+    rows = []
+    for engine in engines:
+        reason = skip_reason(engine, allow_download)
+        for size in sizes:
+            for duration in durations:
+                row: Dict[str, Any] = {"engine": engine, "size": size, "duration": duration}
+                if reason:
+                    rows.append({**row, "status": "skipped", "reason": reason})
+                    print(f"⏭️ {case_key(row):<32} {reason}", flush=True)
+                    continue
+                runs = [run_isolated(row, out_dir, allow_download) for _ in range(max(1, repeat))]
+                ok = [r for r in runs if r["status"] == "ok"]
+                if not ok:
+                    rows.append({**row, **runs[-1]})
+                    print(f"❌ {case_key(row):<32} {runs[-1].get('error')}", flush=True)
+                    continue
+                result = dict(ok[-1])
+                result["wall_s"] = round(statistics.median(r["wall_s"] for r in ok), 3)
+                result["fps"] = round(result["frames"] / result["wall_s"], 2) if result["wall_s"] > 0 else None
+                for k in ("peak_rss_mb", "child_peak_rss_mb", "scratch_peak_bytes"):
+                    result[k] = max(r[k] for r in ok)
+                rows.append({**row, **result, "runs": len(ok)})
+                print(
+                    f"✅ {case_key(row):<32} {result['wall_s']:7.2f}s {result['fps'] or 0:7.1f}fps "
+                    f"RSS {result['peak_rss_mb']:6.0f}MB  scratch {result['scratch_peak_bytes'] / 1e6:7.1f}MB  "
+                    f"out {result['output_bytes'] / 1e6:6.2f}MB",
+                    flush=True,
+                )
+    return rows
+
+
+def compare(baseline: List[Dict[str, Any]], current: List[Dict[str, Any]], threshold: float) -> List[Dict[str, Any]]:
+    """같은 경우끼리 ``COMPARED`` 지표 비교. 늘어난 비율이 ``threshold`` 를 넘고 잡음 하한보다 크면 회귀."""
+    base = {case_key(r): r for r in baseline if r.get("status") == "ok"}
+    out = []
+    for row in current:
+        if row.get("status") != "ok" or case_key(row) not in base:
+            continue
+        b = base[case_key(row)]
+        for metric, floor in COMPARED.items():
+            old, new = b.get(metric), row.get(metric)
+            if old in (None, 0) or new is None:
+                continue
+            change = (new - old) / old
+            out.append({
+                "case": case_key(row), "metric": metric, "baseline": old, "current": new,
+                "change": round(change, 4), "regression": change > threshold and new - old > floor,
+            })
+    return out
+
+
+def _meta() -> Dict[str, Any]:
+    commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": commit or None,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "ffmpeg": bool(shutil.which("ffmpeg")),
+        "fps": FPS,
+    }
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Benchmark local render engines and compare against a baseline")
+    ap.add_argument("--engines", default=",".join(ENGINES), help="쉼표 구분 (기본: 전체)")
+    ap.add_argument("--sizes", default="540x960,1080x1920", help="쉼표 구분 WxH")
+    ap.add_argument("--durations", default="2,5", help="쉼표 구분 초")
+    ap.add_argument("--repeat", type=int, default=1, help="경우마다 실행 횟수 (시간은 중앙값)")
+    ap.add_argument("--out-dir", default="", help="결과 영상 위치 (기본: 임시 디렉터리, 끝나면 삭제)")
+    ap.add_argument("--allow-download", action="store_true", help="MiDaS 모델이 없으면 내려받는다")
+    ap.add_argument("--json", type=str, default="", help="결과 JSON 저장 경로 (기준선으로 쓴다)")
+    ap.add_argument("--results", type=str, default="", help="새로 재지 않고 이 결과 JSON 을 비교")
+    ap.add_argument("--compare", type=str, default="", help="기준선 JSON")
+    ap.add_argument("--threshold", type=float, default=0.2, help="회귀로 볼 증가 비율 (0.2 = 20%%)")
+    ap.add_argument("--worker", type=str, default="", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.worker:
+        case = json.loads(args.worker)
+        width, height = (int(v) for v in case["size"].lower().split("x"))
+        print(json.dumps(run_case(case["engine"], width, height, float(case["duration"]), args.out_dir)))
+        return 0
+
+    if args.results:
+        with open(args.results, encoding="utf-8") as f:
+            report = json.load(f)
+    else:
+        engines = [e.strip() for e in args.engines.split(",") if e.strip()]
+        unknown = set(engines) - set(ENGINES)
+        if unknown:
+            ap.error(f"알 수 없는 엔진: {', '.join(sorted(unknown))} (가능: {', '.join(ENGINES)})")
+        sizes = [s.strip() for s in args.sizes.split(",") if s.strip()]
+        durations = [float(d) for d in args.durations.split(",") if d.strip()]
+        import tempfile
+
+        out_dir = args.out_dir or tempfile.mkdtemp(prefix="bench-render-")
+        os.makedirs(out_dir, exist_ok=True)
+        try:
+            rows = run_suite(engines, sizes, durations, args.repeat, out_dir, args.allow_download)
+        finally:
+            if not args.out_dir:
+                shutil.rmtree(out_dir, ignore_errors=True)
+        report = {"meta": _meta(), "results": rows}
+        if args.json:
+            os.makedirs(os.path.dirname(args.json) or ".", exist_ok=True)
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if not args.compare:
+        return 0
+    with open(args.compare, encoding="utf-8") as f:
+        baseline = json.load(f)
+    diffs = compare(baseline["results"], report["results"], args.threshold)
+    regressions = [d for d in diffs if d["regression"]]
+    print(f"\n{'경우':<32} {'지표':<20} {'기준선':>12} {'현재':>12} {'변화':>8}")
+    for d in diffs:
+        mark = "🔺" if d["regression"] else "  "
+        print(f"{d['case']:<32} {d['metric']:<20} {d['baseline']:>12} {d['current']:>12} {d['change']:+8.1%} {mark}")
+    if not diffs:
+        print("비교할 경우가 없습니다 (엔진/크기/길이가 겹치지 않음)")
+    print(f"📉 회귀 {len(regressions)}건 / 비교 {len(diffs)}건 (기준 +{args.threshold:.0%}, 기준선 {baseline.get('meta', {}).get('commit')})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
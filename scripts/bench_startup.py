@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+기동 시간 벤치마크
+
+1) ``python -X importtime -c "import app"`` 로 앱 모듈 import 비용을 측정하고
+   누적 시간이 큰 패키지와 '기동 시 로드되면 안 되는' 무거운 SDK 로드 여부를 보고한다.
+2) ``--boot`` 를 주면 컨테이너와 같은 명령으로 Streamlit 을 띄워
+   ``/_stcore/health`` 가 200 을 줄 때까지의 시간(boot-to-healthy)을 잰다.
+
+결과는 JSON 한 줄로 출력하고, ``--record`` 로 JSONL 에 누적해 추이를 본다.
+``--max-import-ms`` 를 넘으면 종료 코드 1 (CI 게이트용).
+
+예)
+  python scripts/bench_startup.py
+  python scripts/bench_startup.py --boot --record logs/startup_bench.jsonl
+"""
+
+import argparse
+import json
+import os
+import re
+import socket
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import requests
+
+CUR = Path(__file__).resolve().parent
+ROOT = CUR.parent
+
+# 엔진이 선택되기 전에는 로드되면 안 되는 모듈
+HEAVY_MODULES = (
+    "google.genai",
+    "google.cloud.aiplatform",
+    "cv2",
+    "numpy",
+    "rembg",
+    "onnxruntime",
+    "PIL.Image",
+)
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+def parse_importtime(stderr: str) -> Tuple[int, List[Tuple[str, int, int, int]]]:
+    """(app 누적 µs, [(모듈, self µs, 누적 µs, 깊이)])"""
+    rows = []
+    total = 0
+    for line in stderr.splitlines():
+        m = _LINE.match(line)
+        if not m:
+            continue
+        self_us, cum_us, indent, name = int(m.group(1)), int(m.group(2)), len(m.group(3)), m.group(4)
+        rows.append((name, self_us, cum_us, indent // 2))
+        if name == "app":
+            total = cum_us
+    return total, rows
+
+
+def run_importtime(module: str = "app") -> Tuple[int, List[Tuple[str, int, int, int]]]:
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="0", TRACE_SAMPLE_RATE="0", METRICS_SNAPSHOT_INTERVAL="0")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=str(ROOT),
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        tail = "\n".join(proc.stderr.splitlines()[-5:])
+        raise RuntimeError(f"import {module} 실패:\n{tail}")
+    return parse_importtime(proc.stderr)
+
+
+def top_packages(rows: List[Tuple[str, int, int, int]], n: int) -> List[Dict[str, object]]:
+    """최상위 패키지별 self 시간 합계 상위 n 개."""
+    by_pkg: Dict[str, int] = defaultdict(int)
+    for name, self_us, _, _ in rows:
+        by_pkg[name.split(".")[0]] += self_us
+    ranked = sorted(by_pkg.items(), key=lambda kv: kv[1], reverse=True)[:n]
+    return [{"package": k, "ms": round(v / 1000, 1)} for k, v in ranked]
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def measure_boot(timeout_s: float = 60.0) -> float:
+    """Dockerfile CMD 와 같은 옵션으로 Streamlit 을 띄우고 health 까지 걸린 ms."""
+    port = _free_port()
+    cmd = [
+        sys.executable, "-m", "streamlit", "run", "app.py",
+        f"--server.port={port}", "--server.address=127.0.0.1",
+        "--server.headless=true", "--browser.gatherUsageStats=false",
+    ]
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(cmd, cwd=str(ROOT), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        url = f"http://127.0.0.1:{port}/_stcore/health"
+        while time.perf_counter() - t0 < timeout_s:
+            if proc.poll() is not None:
+                raise RuntimeError(f"streamlit 이 종료됨 (code={proc.returncode})")
+            try:
+                if requests.get(url, timeout=1).status_code == 200:
+                    return (time.perf_counter() - t0) * 1000
+            except requests.RequestException:
+                pass
+            time.sleep(0.05)
+        raise TimeoutError(f"{timeout_s}s 안에 healthy 상태가 되지 않았습니다")
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Startup benchmark (-X importtime + boot-to-healthy)")
+    ap.add_argument("--module", default="app")
+    ap.add_argument("--runs", type=int, default=3, help="import 측정 반복 (최솟값 사용)")
+    ap.add_argument("--top", type=int, default=10)
+    ap.add_argument("--boot", action="store_true", help="Streamlit boot-to-healthy 도 측정")
+    ap.add_argument("--record", help="결과를 덧붙일 JSONL 경로")
+    ap.add_argument("--max-import-ms", type=float, default=0.0, help="초과 시 exit 1")
+    args = ap.parse_args()
+
+    # 첫 실행은 .pyc 생성 비용이 섞이므로 버린다
+    run_importtime(args.module)
+    best_total, best_rows = None, []
+    for _ in range(max(1, args.runs)):
+        total, rows = run_importtime(args.module)
+        if best_total is None or total < best_total:
+            best_total, best_rows = total, rows
+
+    loaded = {name for name, _, _, _ in best_rows}
+    result: Dict[str, object] = {
+        "ts": round(time.time(), 3),
+        "module": args.module,
+        "import_ms": round(best_total / 1000, 1),
+        "modules_loaded": len(best_rows),
+        "heavy_loaded": [m for m in HEAVY_MODULES if m in loaded],
+        "top_packages": top_packages(best_rows, args.top),
+    }
+    if args.boot:
+        result["boot_to_healthy_ms"] = round(measure_boot(), 1)
+
+    print(json.dumps(result, ensure_ascii=False))
+    if args.record:
+        os.makedirs(os.path.dirname(args.record) or ".", exist_ok=True)
+        with open(args.record, "a", encoding="utf-8") as f:
+            f.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+    if result["heavy_loaded"]:
+        print(f"⚠️ 기동 시 무거운 모듈 로드: {', '.join(result['heavy_loaded'])}", file=sys.stderr)
+    if args.max_import_ms and result["import_ms"] > args.max_import_ms:
+        print(f"❌ import {result['import_ms']}ms > 기준 {args.max_import_ms}ms", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+정적 텍스트 오버레이 벤치마크 (8초 / 15초 영상)
+
+- ``subtitles``: 예전 방식 — ASS 자막을 ``ffmpeg -vf subtitles`` 로 (libass 가 프레임마다 래스터화)
+- ``overlay``: 한 번 래스터화한 레이어 PNG + ffmpeg ``overlay`` 필터
+- ``blend``: 같은 레이어를 프로세스 안에서 합성 (OpenCV 디코딩/인코딩)
+- ``blend_per_frame``: 프로세스 안에서 프레임마다 다시 래스터화 (ffmpeg 가 없을 때 예전 방식의 대역)
+
+ffmpeg 가 없으면 ``subtitles`` / ``overlay`` 는 건너뛴다.
+
+예)
+  python scripts/bench_text_overlay.py
+  python scripts/bench_text_overlay.py --durations 8 15 --size 1080x1920 --json bench.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+CUR = Path(__file__).resolve().parent
+ROOT = CUR.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import cv2
+import numpy as np
+
+from src.utils.text_overlay import OverlayStyle, burn_subtitles, overlay_text, rasterize
+
+MODES = ("subtitles", "overlay", "blend", "blend_per_frame")
+COPY = "서울 야경 투어\n지금 예약 · 39,000원"
+
+
+def synthetic_video(path: str, width: int, height: int, seconds: float, fps: int) -> str:
+    """움직이는 그라데이션 (인코더가 정지 화면으로 건너뛰지 않도록)."""
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), float(fps), (width, height))
+    base = np.linspace(0, 255, width, dtype=np.float32)[None, :, None].repeat(height, 0).repeat(3, 2)
+    for i in range(int(seconds * fps)):
+        writer.write(((base + i * 3) % 256).astype(np.uint8))
+    writer.release()
+    return path
+
+
+def per_frame(video_path: str, output_path: str, settings: dict) -> int:
+    style = OverlayStyle.from_settings(settings)
+    cap = cv2.VideoCapture(video_path)
+    width, height = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    writer = cv2.VideoWriter(output_path, cv2.VideoWriter_fourcc(*'mp4v'), cap.get(cv2.CAP_PROP_FPS), (width, height))
+    frames = 0
+    while True:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        writer.write(rasterize((width, height), settings["copy"], style.for_height(height)).bgr().composite(frame))
+        frames += 1
+    cap.release()
+    writer.release()
+    return frames
+
+
+def run(mode: str, video_path: str, out_path: str, settings: dict) -> float:
+    t0 = time.perf_counter()
+    if mode == "subtitles":
+        burn_subtitles(video_path, settings["copy"], OverlayStyle.from_settings(settings), out_path, {}, shutil.which("ffmpeg"))
+    elif mode == "overlay":
+        overlay_text(video_path, settings, out_path, mode="ffmpeg")
+    elif mode == "blend":
+        overlay_text(video_path, settings, out_path, mode="blend")
+    else:
+        per_frame(video_path, out_path, settings)
+    return time.perf_counter() - t0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Benchmark static text overlay")
+    ap.add_argument("--mode", action="append", choices=MODES, help="반복 지정 가능 (기본 전체)")
+    ap.add_argument("--durations", type=float, nargs="+", default=[8, 15])
+    ap.add_argument("--size", default="720x1280", help="WxH (Veo 720p 세로)")
+    ap.add_argument("--fps", type=int, default=24)
+    ap.add_argument("--json", type=str, default="", help="결과 JSON 저장 경로")
+    args = ap.parse_args()
+
+    width, height = (int(v) for v in args.size.lower().split("x"))
+    settings = {"copy": COPY, "position": "top", "font_size": 56}
+    has_ffmpeg = bool(shutil.which("ffmpeg"))
+    rows = []
+    with tempfile.TemporaryDirectory(prefix="bench_overlay_") as tmp:
+        for seconds in args.durations:
+            src = synthetic_video(os.path.join(tmp, f"in_{seconds:g}.mp4"), width, height, seconds, args.fps)
+            frames = int(seconds * args.fps)
+            results = {}
+            for mode in args.mode or MODES:
+                if mode in ("subtitles", "overlay") and not has_ffmpeg:
+                    print(f"{seconds:>4g}s {mode:<16} 건너뜀 (ffmpeg 없음)")
+                    continue
+                elapsed = run(mode, src, os.path.join(tmp, f"out_{mode}_{seconds:g}.mp4"), settings)
+                results[mode] = elapsed
+                rows.append({"mode": mode, "seconds": seconds, "frames": frames, "size": args.size,
+                             "elapsed_s": round(elapsed, 3), "fps": round(frames / elapsed, 1)})
+                print(f"{seconds:>4g}s {mode:<16} {elapsed:6.2f}s ({frames / elapsed:6.1f} fps)")
+            base = results.get("subtitles") or results.get("blend_per_frame")
+            best = min((results[m] for m in ("overlay", "blend") if m in results), default=None)
+            if base and best:
+                print(f"📉 {seconds:g}s 영상: {base:.2f}s → {best:.2f}s ({base / best:.1f}배 단축)")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
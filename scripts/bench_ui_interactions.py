@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Streamlit UI 상호작용 지연 벤치마크 (앱 전체 재실행 vs 프래그먼트 재실행 + 미리보기 메모)
+
+``streamlit.testing`` 의 AppTest 로 같은 상호작용 시나리오(스타일 선택, 슬라이더, 텍스트 설정, 이미지 선택)를
+두 방식으로 재생하고 상호작용당 스크립트 실행 시간을 잰다.
+
+- ``full``: 예전 동작 — 위젯이 바뀔 때마다 ``app.py`` 전체를 다시 실행하고, 미리보기/카피도 매번 다시 만든다
+  (미리보기 메모와 세션 카피 캐시를 매번 비운다)
+- ``fragment``: 위젯이 속한 프래그먼트 함수만 다시 실행한다 (이미지 선택은 앱 전체). 메모는 유지
+
+AppTest 는 프래그먼트 단위 재실행을 흉내 내지 않아, ``fragment`` 모드는 해당 프래그먼트 함수만 부르는
+작은 스크립트를 같은 세션 상태로 돌린다. 상품 API 는 고정 응답(``--catalog-ms`` 지연)으로 바꾸고
+미디어 사이드카는 띄우지 않는다. 후보 이미지는 ``--photo`` 크기의 합성 사진 8장.
+
+예)
+  python scripts/bench_ui_interactions.py
+  python scripts/bench_ui_interactions.py --photo 4000x3000 --catalog-ms 300 --json ui.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+CUR = Path(__file__).resolve().parent
+ROOT = CUR.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+os.environ.setdefault("TEXT_SETTINGS_UI", "1")
+
+import numpy as np
+from PIL import Image
+from streamlit.testing.v1 import AppTest
+
+from src.server import runner
+from src.utils import catalog
+from src.utils.previews import get_cache, image_digest
+
+APP = str(ROOT / "app.py")
+PRODUCT_ID = "4454757"
+
+# (설명, 위젯 종류, 라벨 또는 키, 값, 위젯이 속한 프래그먼트 — None 이면 앱 전체 재실행)
+SCENARIO = (
+    ("카메라 속도", "selectbox", "카메라 속도", "fast", "video_settings_panel"),
+    ("조명 분위기", "selectbox", "조명 분위기", "golden_hour", "video_settings_panel"),
+    ("필름 그레인", "slider", "필름 그레인", 0.3, "video_settings_panel"),
+    ("글자 크기", "slider", "글자 크기", 72, "text_settings_panel"),
+    ("글자 크기", "slider", "글자 크기", 80, "text_settings_panel"),
+    ("문구 위치", "selectbox", "위치", "bottom", "text_settings_panel"),
+    ("배경 불투명도", "slider", "배경 불투명도", 0.6, "text_settings_panel"),
+    ("이미지 선택", "button", "select_2", None, None),
+)
+
+
+def synthetic_photo(width: int, height: int, seed: int) -> Image.Image:
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    base = np.stack([x / width * 255, y / height * 255, (x + y) / (width + height) * 255], axis=2)
+    noise = rng.normal(0, 12, (height, width, 3))
+    return Image.fromarray(np.clip(base + noise, 0, 255).astype(np.uint8))
+
+
+def analyzed_items(width: int, height: int):
+    items = []
+    for i in range(8):
+        img = synthetic_photo(width, height, i)
+        items.append({
+            "filename": f"photo_{i}.jpg", "url": f"https://example.invalid/photo_{i}.jpg", "type": "NON_REVIEW",
+            "image": img, "width": width, "height": height, "aspect_ratio": height / width,
+            "is_portrait": height / width >= 1.2, "is_landscape": height / width <= 0.8,
+            "pixels": width * height, "score": float(8 - i), "digest": image_digest(img),
+        })
+    return items
+
+
+def seed_session(at: AppTest, items) -> None:
+    at.session_state["product_id"] = PRODUCT_ID
+    at.session_state["product_id_current"] = PRODUCT_ID
+    at.session_state["analyzed_images"] = items
+    at.session_state["selected_image"] = items[0]
+
+
+def fragment_script(name: str) -> None:
+    """``app`` 의 프래그먼트 하나만 실행 (프래그먼트 재실행과 같은 범위). AppTest 가 소스만 옮겨 가므로 자체 완결."""
+    import streamlit as st
+
+    import app
+
+    if name == "text_settings_panel":
+        app.text_settings_panel(st.session_state.selected_image, app.get_marketing_copy(st.session_state.product_id, "travel"))
+    else:
+        getattr(app, name)()
+
+
+def widget(at: AppTest, kind: str, label: str):
+    if kind == "button":
+        return at.button(key=label)
+    matches = [w for w in getattr(at, kind) if w.label == label]
+    if not matches:
+        raise RuntimeError(f"위젯을 찾을 수 없습니다: {kind} {label!r}")
+    return matches[0]
+
+
+def timed_run(at: AppTest) -> float:
+    t0 = time.perf_counter()
+    at.run()
+    elapsed = time.perf_counter() - t0
+    if at.exception:
+        raise RuntimeError(f"스크립트 오류: {at.exception[0].message}")
+    return elapsed
+
+
+def run_full(items) -> list:
+    at = AppTest.from_file(APP, default_timeout=120)
+    seed_session(at, items)
+    timed_run(at)
+    rows = []
+    for desc, kind, label, value, _ in SCENARIO:
+        get_cache().clear()
+        at.session_state["marketing_copy"] = None
+        w = widget(at, kind, label)
+        w.click() if kind == "button" else w.set_value(value)
+        rows.append((desc, timed_run(at)))
+    return rows
+
+
+def run_fragments(items) -> list:
+    full = AppTest.from_file(APP, default_timeout=120)
+    seed_session(full, items)
+    timed_run(full)
+    fragments = {}
+    rows = []
+    for desc, kind, label, value, name in SCENARIO:
+        if name is None:
+            widget(full, kind, label).click()
+            rows.append((desc, timed_run(full)))
+            continue
+        at = fragments.get(name)
+        if at is None:
+            at = AppTest.from_function(fragment_script, args=(name,), default_timeout=120)
+            for key in full.session_state.filtered_state:
+                at.session_state[key] = full.session_state[key]
+            timed_run(at)
+            fragments[name] = at
+        widget(at, kind, label).set_value(value)
+        rows.append((desc, timed_run(at)))
+    return rows
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Benchmark Streamlit per-interaction latency")
+    ap.add_argument("--photo", default="3000x2000", help="후보 이미지 WxH")
+    ap.add_argument("--catalog-ms", type=float, default=0.0, help="상품 API 응답 지연 가정 (ms)")
+    ap.add_argument("--json", type=str, default="", help="결과 JSON 저장 경로")
+    args = ap.parse_args()
+
+    payload = {"data": {"title": "상하이 디즈니랜드 입장권", "ctaButton": {"price": {"salePrice": "89,000원"}}}}
+
+    def fake_get_json(url, timeout=None):
+        time.sleep(args.catalog_ms / 1000)
+        return payload
+
+    catalog.get_json = fake_get_json
+    runner.start_background_server = lambda *a, **k: None
+
+    width, height = (int(v) for v in args.photo.lower().split("x"))
+    items = analyzed_items(width, height)
+    results = {"full": run_full(items), "fragment": run_fragments(items)}
+
+    print(f"{'상호작용':<12} {'전체 재실행':>12} {'프래그먼트':>12}")
+    for (desc, full_s), (_, frag_s) in zip(results["full"], results["fragment"]):
+        print(f"{desc:<12} {full_s * 1000:10.0f}ms {frag_s * 1000:10.0f}ms")
+    summary = {mode: round(statistics.median(s for _, s in rows) * 1000, 1) for mode, rows in results.items()}
+    print(f"📉 상호작용 중앙값: {summary['full']:.0f}ms → {summary['fragment']:.0f}ms ({summary['full'] / summary['fragment']:.1f}배)")
+
+    if args.json:
+        out = {
+            "photo": args.photo,
+            "catalog_ms": args.catalog_ms,
+            "median_ms": summary,
+            "interactions": [
+                {"interaction": desc, "full_ms": round(f * 1000, 1), "fragment_ms": round(g * 1000, 1)}
+                for (desc, f), (_, g) in zip(results["full"], results["fragment"])
+            ],
+        }
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(out, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Veo 변형(A/B) 생성 벤치마크 (로컬 시뮬레이터, 크레딧 소모 없음)
+
+변형 n 편을 변형마다 작업을 하나씩 차례로 돌리는 예전 방식과, 변형 모드(작업 n 개를
+같이 기다리기 / 작업 하나에 n 편)로 만들 때의 변형당 벽시계 시간을 비교한다.
+
+예)
+  python scripts/bench_veo_variants.py
+  python scripts/bench_veo_variants.py --variants 4 --run-s 3 --download-s 0.5 --json bench.json
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+CUR = Path(__file__).resolve().parent
+ROOT = CUR.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.sim import SimConfig, serve
+from src.sim.variants import MODES, run_variants
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Benchmark Veo multi-variant generation")
+    ap.add_argument("--mode", action="append", choices=MODES, help="반복 지정 가능 (기본 전체)")
+    ap.add_argument("--variants", type=int, default=3)
+    ap.add_argument("--queue-s", type=float, default=0.3)
+    ap.add_argument("--run-s", type=float, default=1.5)
+    ap.add_argument("--download-s", type=float, default=0.3, help="결과 영상 다운로드 지연")
+    ap.add_argument("--poll-interval", type=float, default=0.2)
+    ap.add_argument("--json", type=str, default="", help="결과 JSON 저장 경로")
+    args = ap.parse_args()
+
+    sim = serve(SimConfig(
+        queue_s=args.queue_s,
+        run_s=args.run_s,
+        jitter=0.0,
+        download_s=args.download_s,
+        veo_max_samples=max(4, args.variants),
+        video_bytes=64 * 1024,
+    ))
+    reports = []
+    try:
+        run_variants(sim, "concurrent", 1, poll_interval_s=args.poll_interval)  # 클라이언트 준비는 재지 않는다
+        for mode in args.mode or MODES:
+            report = run_variants(sim, mode, args.variants, poll_interval_s=args.poll_interval)
+            print(report.summary())
+            reports.append(report)
+    finally:
+        sim.stop()
+    base = next((r for r in reports if r.mode == "sequential"), None)
+    for r in reports:
+        if base is not None and r is not base and r.per_variant_s:
+            print(
+                f"📉 {r.mode}: 변형당 {base.per_variant_s:.2f}s → {r.per_variant_s:.2f}s "
+                f"({base.per_variant_s / r.per_variant_s:.1f}배 단축)"
+            )
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump([r.as_dict() for r in reports], f, ensure_ascii=False, indent=2)
+    return 0 if all(r.produced == r.variants for r in reports) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
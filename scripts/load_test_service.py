@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+생성 서비스 부하 테스트 (POST /jobs 동시 제출 → 완료까지)
+
+생성 서비스(`/jobs`)를 프로세스 안에 띄우고 벤더 시뮬레이터를 붙인 뒤
+N 건을 동시에 HTTP 로 제출한다. 제출 응답 지연(p50/p99)과 완료 처리량을 출력한다.
+``--url`` 을 주면 이미 떠 있는 서비스(``python -m src.server``)를 대상으로 한다.
+
+예)
+  python scripts/load_test_service.py --jobs 50 --workers 8
+  python scripts/load_test_service.py --url http://localhost:3001 --engine runway --jobs 50
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+CUR = Path(__file__).resolve().parent
+ROOT = CUR.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.engines.stats import quantile
+from src.server.client import GenerationClient
+
+# 시뮬레이터는 키를 검사하지 않는다
+_ENGINE_OPTIONS = {
+    "runway": {"api_key": "sim", "force_live": True},
+    "higgs": {"api_key": "sim", "api_secret": "sim"},
+    "veo": {"api_key": "sim"},
+}
+
+
+def _start_service(workers: int, out_dir: str) -> str:
+    import uvicorn
+    from starlette.applications import Starlette
+
+    from src.server.generation import GenerationService
+    from src.server.jobs_api import job_routes
+
+    app = Starlette(routes=job_routes(GenerationService(workers=workers, out_dir=out_dir)))
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning"))
+    server.install_signal_handlers = lambda: None
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return f"http://127.0.0.1:{server.servers[0].sockets[0].getsockname()[1]}"
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Load test the headless generation service")
+    ap.add_argument("--url", default="", help="외부 생성 서비스 주소 (없으면 프로세스 안에 띄움)")
+    ap.add_argument("--engine", default="runway", choices=["runway", "higgs", "veo"])
+    ap.add_argument("--jobs", type=int, default=50)
+    ap.add_argument("--workers", type=int, default=8, help="프로세스 내 서비스 워커 수")
+    ap.add_argument("--queue-s", type=float, default=0.5)
+    ap.add_argument("--run-s", type=float, default=2.0)
+    ap.add_argument("--timeout", type=float, default=600.0)
+    ap.add_argument("--json", type=str, default="", help="결과 JSON 저장 경로")
+    args = ap.parse_args()
+
+    sim = None
+    if not args.url:
+        from src.sim import SimConfig, serve
+
+        sim = serve(SimConfig(queue_s=args.queue_s, run_s=args.run_s))
+        os.environ.update(sim.env())
+        os.environ.setdefault("RUNWAY_LIVE", "1")
+        # 시뮬레이터엔 벤더 한도가 없으니 스케줄러 기본 한도(분당 10건 등)를 워커 수에 맞춰 푼다
+        prefix = args.engine.upper()
+        os.environ.setdefault(f"{prefix}_RATE_PER_MIN", "6000")
+        os.environ.setdefault(f"{prefix}_BURST", str(args.jobs))
+        os.environ.setdefault(f"{prefix}_MAX_INFLIGHT", str(args.workers))
+        base_url = _start_service(args.workers, tempfile.mkdtemp(prefix="service_load_"))
+        image_url = f"{sim.base_url}/files/input.jpg"
+    else:
+        base_url = args.url.rstrip("/")
+        image_url = os.getenv("LOAD_TEST_IMAGE_URL", "https://example.com/input.jpg")
+    client = GenerationClient(base_url)
+    settings = {
+        "image_url": image_url,
+        "prompt": "service load test",
+        "duration": 5,
+        "engine_options": _ENGINE_OPTIONS[args.engine],
+    }
+
+    # UI 와 같이 입력 이미지를 바이트로 함께 보낸다 (Runway 는 로컬 파일이 필요)
+    from PIL import Image
+
+    buf = io.BytesIO()
+    Image.new("RGB", (720, 1280), (40, 60, 90)).save(buf, format="JPEG")
+    image_bytes = buf.getvalue()
+
+    def submit(i: int):
+        t0 = time.monotonic()
+        # 시드를 달리해 서로 다른 작업으로 만든다 (같은 설정은 진행 중인 작업에 합쳐진다)
+        job = client.submit(args.engine, {**settings, "seed": i}, product_id=f"load{i % 10}", image_bytes=image_bytes)
+        return job["id"], time.monotonic() - t0
+
+    print(f"🚀 {args.jobs}건 동시 제출 → {base_url}")
+    t0 = time.monotonic()
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        submitted = list(pool.map(submit, range(args.jobs)))
+    submit_wall = time.monotonic() - t0
+    submit_lat = [lat for _, lat in submitted]
+
+    pending = {job_id for job_id, _ in submitted}
+    finished = {}
+    deadline = time.monotonic() + args.timeout
+    while pending and time.monotonic() < deadline:
+        for job_id in list(pending):
+            job = client.get(job_id)
+            if job["state"] in ("succeeded", "failed", "cancelled"):
+                finished[job_id] = job
+                pending.discard(job_id)
+        time.sleep(0.2)
+    wall = time.monotonic() - t0
+
+    states = Counter(j["state"] for j in finished.values())
+    states["unfinished"] = len(pending)
+    run_lat = [j["finished_at"] - j["created_at"] for j in finished.values() if j["state"] == "succeeded"]
+    report = {
+        "engine": args.engine,
+        "jobs": args.jobs,
+        "submit_wall_s": round(submit_wall, 3),
+        "submit_p50_ms": round(quantile(submit_lat, 0.5) * 1000, 1),
+        "submit_p99_ms": round(quantile(submit_lat, 0.99) * 1000, 1),
+        "wall_s": round(wall, 3),
+        "throughput_per_min": round(len(run_lat) / wall * 60, 2) if wall else 0.0,
+        "job_p50_s": round(quantile(run_lat, 0.5), 3) if run_lat else None,
+        "job_p99_s": round(quantile(run_lat, 0.99), 3) if run_lat else None,
+        "states": {k: v for k, v in states.items() if v},
+    }
+    print(
+        f"✅ 제출 p50 {report['submit_p50_ms']}ms / p99 {report['submit_p99_ms']}ms, "
+        f"완료 {states['succeeded']}/{args.jobs} ({report['wall_s']}s, {report['throughput_per_min']} jobs/min)"
+    )
+    print(json.dumps(report, ensure_ascii=False))
+    if sim is not None:
+        sim.stop()
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 0 if states["succeeded"] == args.jobs else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
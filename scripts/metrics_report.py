@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+주간 운영 리포트 (PRD §8 관측: 처리시간, 실패율)
+
+사이드카/배치 프로세스가 남긴 누적 스냅샷(logs/metrics.jsonl, 돌려 둔 ``.1`` … 포함)에서
+기간 내 증가분을 프로세스별로 구해 합산한 뒤 마크다운 표로 출력한다.
+
+예)
+  python scripts/metrics_report.py                    # 최근 7일
+  python scripts/metrics_report.py --days 1 --out reports/daily.md
+  python scripts/metrics_report.py --csv reports/weekly.csv
+"""
+
+import argparse
+import csv
+import json
+import math
+import os
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+CUR = Path(__file__).resolve().parent
+ROOT = CUR.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.utils.metrics import METRICS_FILE, NAMESPACE, snapshot_files
+
+
+def load_snapshots(path: str) -> List[dict]:
+    out = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                out.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return out
+
+
+def _sub_counter(cur: Dict[str, float], base: Dict[str, float]) -> Dict[str, float]:
+    return {k: v - base.get(k, 0.0) for k, v in cur.items()}
+
+
+def _sub_hist(cur: Dict[str, dict], base: Dict[str, dict]) -> Dict[str, dict]:
+    out = {}
+    for k, v in cur.items():
+        b = base.get(k) or {"counts": [0] * len(v["counts"]), "sum": 0.0}
+        out[k] = {"counts": [x - y for x, y in zip(v["counts"], b["counts"])], "sum": v["sum"] - b["sum"]}
+    return out
+
+
+def window_deltas(snapshots: List[dict], start_ts: float, end_ts: float) -> Dict[str, dict]:
+    """프로세스(pid)별 [기간 시작 직전, 기간 내 마지막] 스냅샷 차이를 합산."""
+    by_pid: Dict[int, List[dict]] = defaultdict(list)
+    for snap in snapshots:
+        if snap.get("ts", 0) <= end_ts:
+            by_pid[snap.get("pid", 0)].append(snap)
+
+    merged: Dict[str, dict] = {}
+    for snaps in by_pid.values():
+        snaps.sort(key=lambda s: s["ts"])
+        inside = [s for s in snaps if s["ts"] >= start_ts]
+        if not inside:
+            continue
+        before = [s for s in snaps if s["ts"] < start_ts]
+        cur = inside[-1]["metrics"]
+        base = before[-1]["metrics"] if before else {}
+        for name, entry in cur.items():
+            kind = entry["type"]
+            if kind == "gauge":
+                continue
+            base_values = (base.get(name) or {}).get("values", {})
+            if kind == "counter":
+                delta = _sub_counter(entry["values"], base_values)
+                tgt = merged.setdefault(name, {"type": kind, "labels": entry["labels"], "values": {}})
+                for k, v in delta.items():
+                    tgt["values"][k] = tgt["values"].get(k, 0.0) + v
+            elif kind == "histogram":
+                delta = _sub_hist(entry["values"], base_values)
+                tgt = merged.setdefault(
+                    name, {"type": kind, "labels": entry["labels"], "buckets": entry["buckets"], "values": {}}
+                )
+                for k, v in delta.items():
+                    acc = tgt["values"].setdefault(k, {"counts": [0] * len(v["counts"]), "sum": 0.0})
+                    acc["counts"] = [x + y for x, y in zip(acc["counts"], v["counts"])]
+                    acc["sum"] += v["sum"]
+    return merged
+
+
+def hist_quantile(q: float, buckets: List[float], counts: List[int]) -> Optional[float]:
+    """버킷 내 선형 보간 (Prometheus histogram_quantile 과 같은 방식)."""
+    total = sum(counts)
+    if total <= 0:
+        return None
+    rank = q * total
+    cumulative = 0
+    bounds = list(buckets) + [math.inf]
+    for i, c in enumerate(counts):
+        if cumulative + c >= rank and c > 0:
+            lower = bounds[i - 1] if i > 0 else 0.0
+            upper = bounds[i]
+            if math.isinf(upper):
+                return lower
+            return lower + (upper - lower) * (rank - cumulative) / c
+        cumulative += c
+    return bounds[-2]
+
+
+def _metric(merged: Dict[str, dict], name: str) -> dict:
+    return merged.get(f"{NAMESPACE}_{name}") or {"values": {}, "buckets": []}
+
+
+def _fmt_s(value: Optional[float]) -> str:
+    if value is None:
+        return "-"
+    return f"{value:.2f}s" if value < 60 else f"{value / 60:.1f}m"
+
+
+def build_rows(merged: Dict[str, dict]) -> Dict[str, List[Tuple]]:
+    sections: Dict[str, List[Tuple]] = {}
+
+    # 1) 벤더 작업 결과 / 실패율
+    jobs: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+    for key, v in _metric(merged, "vendor_jobs")["values"].items():
+        engine, status = key.split("|")
+        jobs[engine][status] += v
+    rows = []
+    for engine, by_status in sorted(jobs.items()):
+        total = sum(by_status.values())
+        failed = total - by_status.get("succeeded", 0.0)
+        rows.append((engine, int(total), int(by_status.get("succeeded", 0)), int(failed), f"{failed / total * 100:.1f}%" if total else "-"))
+    sections["vendor_jobs"] = rows
+
+    # 2) 벤더 단계별 시간
+    m = _metric(merged, "vendor_phase_seconds")
+    rows = []
+    for key, v in sorted(m["values"].items()):
+        engine, phase = key.split("|")
+        n = sum(v["counts"])
+        if not n:
+            continue
+        rows.append((
+            engine, phase, n, _fmt_s(v["sum"] / n),
+            _fmt_s(hist_quantile(0.5, m["buckets"], v["counts"])),
+            _fmt_s(hist_quantile(0.95, m["buckets"], v["counts"])),
+        ))
+    sections["vendor_phases"] = rows
+
+    # 3) 단계(스팬) 지연 - 누적 시간 순
+    m = _metric(merged, "span_seconds")
+    per_span: Dict[str, dict] = {}
+    for key, v in m["values"].items():
+        span_name, status = key.split("|")
+        acc = per_span.setdefault(span_name, {"counts": [0] * len(v["counts"]), "sum": 0.0, "errors": 0})
+        acc["counts"] = [x + y for x, y in zip(acc["counts"], v["counts"])]
+        acc["sum"] += v["sum"]
+        if status == "error":
+            acc["errors"] += sum(v["counts"])
+    rows = []
+    for span_name, v in sorted(per_span.items(), key=lambda kv: kv[1]["sum"], reverse=True):
+        n = sum(v["counts"])
+        if not n:
+            continue
+        rows.append((
+            span_name, n, v["errors"],
+            _fmt_s(hist_quantile(0.5, m["buckets"], v["counts"])),
+            _fmt_s(hist_quantile(0.95, m["buckets"], v["counts"])),
+            _fmt_s(v["sum"]),
+        ))
+    sections["stages"] = rows
+
+    # 4) 캐시 적중률
+    caches: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+    for key, v in _metric(merged, "cache_requests")["values"].items():
+        cache, result = key.split("|")
+        caches[cache][result] += v
+    rows = []
+    for cache, by_result in sorted(caches.items()):
+        total = by_result.get("hit", 0.0) + by_result.get("miss", 0.0)
+        rows.append((cache, int(total), f"{by_result.get('hit', 0.0) / total * 100:.1f}%" if total else "-"))
+    sections["caches"] = rows
+
+    # 5) 다운로드 바이트
+    rows = [
+        (source, f"{v / 1e6:.1f} MB")
+        for source, v in sorted(_metric(merged, "downloaded_bytes")["values"].items())
+        if v
+    ]
+    sections["downloads"] = rows
+
+    # 6) 로컬 렌더 처리량
+    m = _metric(merged, "render_fps")
+    secs = _metric(merged, "render_seconds")["values"]
+    rows = []
+    for renderer, v in sorted(m["values"].items()):
+        n = sum(v["counts"])
+        if not n:
+            continue
+        wall = secs.get(renderer, {"sum": 0.0})["sum"]
+        p50 = hist_quantile(0.5, m["buckets"], v["counts"])
+        rows.append((renderer, n, f"{v['sum'] / n:.1f}", f"{p50:.1f}" if p50 is not None else "-", _fmt_s(wall)))
+    sections["renders"] = rows
+    return sections
+
+
+HEADERS = {
+    "vendor_jobs": ("엔진", "작업 수", "성공", "실패", "실패율"),
+    "vendor_phases": ("엔진", "구간", "건수", "평균", "p50", "p95"),
+    "stages": ("단계", "호출 수", "오류", "p50", "p95", "누적"),
+    "caches": ("캐시", "조회 수", "적중률"),
+    "downloads": ("소스", "다운로드"),
+    "renders": ("렌더러", "건수", "평균 fps", "p50 fps", "누적 시간"),
+}
+TITLES = {
+    "vendor_jobs": "벤더 작업 / 실패율",
+    "vendor_phases": "벤더 대기·실행·다운로드 시간",
+    "stages": "단계별 처리 시간",
+    "caches": "캐시 적중률",
+    "downloads": "다운로드 바이트",
+    "renders": "로컬 렌더 처리량",
+}
+
+
+def render_markdown(sections: Dict[str, List[Tuple]], start_ts: float, end_ts: float) -> str:
+    fmt = "%Y-%m-%d %H:%M"
+    lines = [
+        "# 주간 운영 리포트",
+        "",
+        f"- 기간: {datetime.fromtimestamp(start_ts).strftime(fmt)} ~ {datetime.fromtimestamp(end_ts).strftime(fmt)}",
+        "",
+    ]
+    for key, title in TITLES.items():
+        lines.append(f"## {title}")
+        lines.append("")
+        rows = sections.get(key) or []
+        if not rows:
+            lines.append("_데이터 없음_")
+            lines.append("")
+            continue
+        header = HEADERS[key]
+        lines.append("| " + " | ".join(header) + " |")
+        lines.append("|" + "|".join(["---"] * len(header)) + "|")
+        for row in rows:
+            lines.append("| " + " | ".join(str(c) for c in row) + " |")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def write_csv(path: str, sections: Dict[str, List[Tuple]]) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        for key, rows in sections.items():
+            writer.writerow([TITLES[key]])
+            writer.writerow(HEADERS[key])
+            writer.writerows(rows)
+            writer.writerow([])
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Weekly metrics report from metrics snapshots")
+    ap.add_argument("path", nargs="?", default=METRICS_FILE)
+    ap.add_argument("--days", type=float, default=7.0)
+    ap.add_argument("--out", help="마크다운 저장 경로 (기본: 표준출력)")
+    ap.add_argument("--csv", help="스프레드시트용 CSV 저장 경로")
+    args = ap.parse_args()
+
+    files = snapshot_files(args.path)
+    if not files:
+        print(f"❌ 메트릭 스냅샷 파일이 없습니다: {args.path}")
+        return 1
+
+    end_ts = time.time()
+    start_ts = end_ts - args.days * 86400
+    merged = window_deltas([s for p in files for s in load_snapshots(p)], start_ts, end_ts)
+    sections = build_rows(merged)
+    report = render_markdown(sections, start_ts, end_ts)
+
+    if args.out:
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(report + "\n")
+        print(f"✅ 리포트 저장: {args.out}")
+    else:
+        print(report)
+    if args.csv:
+        write_csv(args.csv, sections)
+        print(f"✅ CSV 저장: {args.csv}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+대기열 상태 조회 (생성 서비스 워커 / 벤더 in-flight 슬롯 / 로컬 CPU 슬롯)
+
+생성 서비스(사이드카 또는 ``python -m src.server``)의 ``GET /queues`` 를 읽어
+대기열별로 실행 중 / 대기 중 작업을 내줄 순서대로 보여준다.
+
+예)
+  python scripts/queue_status.py
+  python scripts/queue_status.py --url http://localhost:3001 --watch 2
+  python scripts/queue_status.py --json
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+CUR = Path(__file__).resolve().parent
+ROOT = CUR.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.server.client import GenerationClient
+
+
+def _who(item: Dict[str, Any]) -> str:
+    label = item.get("label") or "/".join(str(item[k]) for k in ("product_id", "id") if item.get(k))
+    return f"{item['priority']:<11} {item['user']:<12} {label}"
+
+
+def render(queues: Dict[str, Dict[str, Any]], limit: int = 10) -> str:
+    lines = []
+    for name, q in queues.items():
+        running, waiting = q.get("running", []), q.get("waiting", [])
+        in_use = q.get("in_use", len(running))
+        reserve = f", interactive 예약 {q['interactive_reserve']}" if q.get("interactive_reserve") else ""
+        lines.append(f"■ {name}: 사용 {in_use}/{q['capacity']}{reserve} · 대기 {len(waiting)}")
+        for item in running[:limit]:
+            extra = f" ({item['running_s']:.0f}s)" if "running_s" in item else ""
+            lines.append(f"   ▶ {_who(item)}{extra}")
+        for i, item in enumerate(waiting[:limit], 1):
+            extra = f" 대기 {item['waited_s']:.0f}s" if "waited_s" in item else ""
+            if item.get("deadline_in_s") is not None:
+                extra += f" · 마감까지 {item['deadline_in_s']:.0f}s"
+            lines.append(f"   {i:>2}. {_who(item)}{extra}")
+        if len(waiting) > limit:
+            lines.append(f"   … 외 {len(waiting) - limit}건")
+    return "\n".join(lines)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Show scheduler queue state")
+    ap.add_argument("--url", default="", help="생성 서비스 주소 (기본 GENERATION_SERVICE_URL / 사이드카)")
+    ap.add_argument("--limit", type=int, default=10, help="대기열별 표시 건수")
+    ap.add_argument("--watch", type=float, default=0.0, help="N초마다 갱신")
+    ap.add_argument("--json", action="store_true")
+    args = ap.parse_args()
+
+    client = GenerationClient(args.url or None)
+    while True:
+        try:
+            queues = client.queues()
+        except Exception as e:
+            print(f"❌ 대기열 조회 실패 ({client.base_url}): {e}", file=sys.stderr)
+            return 1
+        if args.json:
+            print(json.dumps(queues, ensure_ascii=False, indent=2))
+        else:
+            if args.watch:
+                print("\033[2J\033[H", end="")
+            print(render(queues, args.limit))
+        if not args.watch:
+            return 0
+        time.sleep(args.watch)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
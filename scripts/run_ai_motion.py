@@ -5,11 +5,11 @@ import sys
 
 CUR = Path(__file__).resolve().parent
 ROOT = CUR.parent
-SRC = ROOT / "src"
-if str(SRC) not in sys.path:
-    sys.path.insert(0, str(SRC))
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
 
-from utils.ai_motion import animate_image, MotionSpec
+from src.utils.ai_motion import animate_image
+from src.utils.motion import motion_spec
 
 
 def main() -> None:
@@ -21,7 +21,7 @@ def main() -> None:
     ap.add_argument("--zoom_bg", type=float, default=1.02)
     args = ap.parse_args()
 
-    spec = MotionSpec(duration=args.duration, zoom_fg=args.zoom_fg, zoom_bg=args.zoom_bg)
+    spec = motion_spec("ai_motion", duration=args.duration, zoom_near=args.zoom_fg, zoom_far=args.zoom_bg)
     animate_image(args.image_url, args.out, spec)
     print(f"Done. MP4: {args.out}")
 
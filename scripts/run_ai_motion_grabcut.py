@@ -5,11 +5,10 @@ import sys
 
 CUR = Path(__file__).resolve().parent
 ROOT = CUR.parent
-SRC = ROOT / "src"
-if str(SRC) not in sys.path:
-    sys.path.insert(0, str(SRC))
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
 
-from utils.ai_motion_grabcut import animate_image_grabcut, MotionSpec
+from src.utils.ai_motion_grabcut import animate_image_grabcut, MotionSpec
 
 
 def main() -> None:
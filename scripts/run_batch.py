@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+배치 영상 생성 (엔진 레지스트리 공통 인터페이스)
+
+작업 파일은 JSONL 또는 CSV. 한 줄 = 한 작업:
+  {"engine": "grabcut", "image": "in.jpg", "out": "outputs/a.mp4", "duration": 5}
+  {"engine": "higgs", "image_url": "https://...", "prompt": "...", "motions": ["push_in"]}
+  {"engine": "auto", "image": "in.jpg", "deadline_s": 120, "candidates": ["runway", "higgs"], "hedge": true}
+
+``engine: auto`` 는 라우터가 통계로 마감을 맞출 엔진을 고르고(필요하면 헤지),
+선택 근거를 결과의 ``route`` 에 남긴다. ``candidates`` 가 없으면 ratio/duration 을
+지원하고 키가 있는 엔진 전체가 후보.
+
+알 수 없는 키는 엔진 ``options`` 로 전달된다. 벤더 작업은 스케줄러의 한도
+(동시 실행/요청 속도/크레딧)를 따른다. 작업마다 결과를 JSON 한 줄로 출력한다.
+
+같은 입력 사진(크롭/크기 차이 포함, 지각 해시)을 같은 엔진/프롬프트로 다시 렌더링하는 작업은
+건너뛴다 (``status: skipped`` + ``duplicate_of``). 배치 안의 앞 작업, 그리고 이전 배치에서 렌더링한
+사진(``--rendered-index``, 기본 ``RENDERED_INDEX_FILE``)을 본다. ``--allow-duplicates`` 로 끈다.
+
+배치 작업은 기본 ``batch`` 등급으로 슬롯을 기다린다 (UI 미리보기가 먼저).
+줄마다 ``priority`` / ``user`` / ``deadline_s`` 로, 전체는 ``--priority`` / ``--user`` 로 바꾼다.
+
+예)
+  python scripts/run_batch.py --list-engines
+  python scripts/run_batch.py jobs.jsonl --concurrency 4
+  python scripts/run_batch.py backfill.jsonl --priority backfill --user nightly
+  python scripts/run_batch.py retry.jsonl --allow-duplicates
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+CUR = Path(__file__).resolve().parent
+ROOT = CUR.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.engines import PRIORITIES, EngineRequest, QueueTag, Router, get_engine, get_scheduler, list_engines, select_engines
+from src.utils.logging_config import setup_logging
+from src.utils.perceptual import RENDERED_INDEX_FILE, RenderedIndex, hash_images, leaders
+
+_FIELDS = {
+    "engine", "image", "image_url", "out", "prompt", "ratio", "duration", "seed",
+    "deadline_s", "candidates", "hedge", "priority", "user",
+}
+DEFAULT_PRIORITY = "batch"
+DEFAULT_USER = os.getenv("BATCH_USER", "batch")
+
+
+def load_jobs(path: str) -> List[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".csv"):
+            return [dict(row) for row in csv.DictReader(f)]
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def to_tag(job: Dict[str, Any], idx: int) -> QueueTag:
+    deadline = job.get("deadline_s")
+    return QueueTag(
+        priority=job.get("priority") or DEFAULT_PRIORITY,
+        user=job.get("user") or DEFAULT_USER,
+        deadline_at=time.time() + float(deadline) if deadline not in (None, "") else None,
+        label=f"batch#{idx}",
+    )
+
+
+def to_request(job: Dict[str, Any], idx: int, out_dir: str) -> EngineRequest:
+    engine = job["engine"]
+    return EngineRequest(
+        output_path=job.get("out") or f"{out_dir}/batch_{idx:03d}_{engine}.mp4",
+        image_path=job.get("image") or None,
+        image_url=job.get("image_url") or None,
+        prompt=job.get("prompt") or "",
+        ratio=job.get("ratio") or "720:1280",
+        duration=int(job.get("duration") or 5),
+        seed=int(job["seed"]) if job.get("seed") not in (None, "") else None,
+        options={k: v for k, v in job.items() if k not in _FIELDS},
+        tag=to_tag(job, idx),
+    )
+
+
+def _candidates(job: Dict[str, Any], request: EngineRequest) -> Dict[str, Any]:
+    names = job.get("candidates")
+    if isinstance(names, str):
+        names = [n.strip() for n in names.split(",") if n.strip()]
+    if not names:
+        names = [e.name for e in select_engines(ratio=request.ratio, duration=request.duration)]
+    engines = {}
+    for name in names:
+        try:
+            engines[name] = get_engine(name)
+        except Exception as e:  # 키 없음 등 → 후보에서 제외
+            print(f"⚠️ {name} 후보 제외: {e}", file=sys.stderr)
+    return engines
+
+
+def _flag(value: Any, default: bool = True) -> bool:
+    if value in (None, ""):
+        return default
+    if isinstance(value, str):
+        return value.strip().lower() not in ("0", "false", "no")
+    return bool(value)
+
+
+def _image_bytes(job: Dict[str, Any]) -> Optional[bytes]:
+    if job.get("image"):
+        with open(job["image"], "rb") as f:
+            return f.read()
+    if job.get("image_url"):
+        import requests
+
+        r = requests.get(job["image_url"], timeout=30)
+        r.raise_for_status()
+        return r.content
+    return None
+
+
+def _render_key(job: Dict[str, Any]) -> Dict[str, Any]:
+    """같은 사진이라도 엔진/프롬프트가 다르면 다른 렌더링."""
+    return {"engine": job.get("engine"), "prompt": job.get("prompt") or ""}
+
+
+def find_duplicates(
+    jobs: List[Dict[str, Any]], index: Optional[RenderedIndex],
+) -> Tuple[List[Optional[Dict[str, Any]]], Dict[int, Any]]:
+    """``(작업마다 이미 렌더링했거나 배치 앞쪽에 있는 같은 사진 — 없으면 None, 작업 번호 → 사진 해시)``."""
+    hashed = []
+    for i, job in enumerate(jobs):
+        try:
+            data = _image_bytes(job)
+        except Exception as e:  # 읽지 못하면 검사 없이 실행 (엔진이 오류를 낸다)
+            print(f"⚠️ batch#{i} 이미지 해시 생략: {e}", file=sys.stderr)
+            continue
+        if data is not None:
+            hashed.append((i, data))
+    out: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+    if not hashed:
+        return out, {}
+    try:
+        hashes = hash_images([data for _, data in hashed])
+    except Exception as e:
+        print(f"⚠️ 이미지 해시 실패, 중복 검사 생략: {e}", file=sys.stderr)
+        return out, {}
+    groups: Dict[str, List[int]] = {}
+    for row, (i, _) in enumerate(hashed):
+        groups.setdefault(json.dumps(_render_key(jobs[i]), sort_keys=True), []).append(row)
+    for rows in groups.values():
+        sub = hashes[rows]
+        known = index.find(sub, **_render_key(jobs[hashed[rows[0]][0]])) if index is not None else [None] * len(rows)
+        for k, head in enumerate(leaders(sub)):
+            i = hashed[rows[k]][0]
+            if known[k] is not None:
+                out[i] = {"output": known[k].get("output"), "distance": known[k]["distance"]}
+            elif head != k:
+                out[i] = {"index": hashed[rows[head]][0]}
+    return out, {i: hashes[row] for row, (i, _) in enumerate(hashed)}
+
+
+async def run_jobs(
+    jobs: List[Dict[str, Any]], concurrency: int, out_dir: str, index: Optional[RenderedIndex] = None,
+) -> List[Dict[str, Any]]:
+    sem = asyncio.Semaphore(max(1, concurrency))
+    duplicates: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+    hashes: Dict[int, Any] = {}
+    if index is not None:
+        duplicates, hashes = await asyncio.to_thread(find_duplicates, jobs, index)
+
+    async def one(idx: int, job: Dict[str, Any]) -> Dict[str, Any]:
+        if duplicates[idx] is not None:
+            result = {"index": idx, "engine": job.get("engine"), "status": "skipped", "duplicate_of": duplicates[idx]}
+            print(json.dumps(result, ensure_ascii=False), flush=True)
+            return result
+        async with sem:
+            t0 = time.perf_counter()
+            result: Dict[str, Any] = {"index": idx, "engine": job.get("engine")}
+            try:
+                request = to_request(job, idx, out_dir)
+                if job["engine"] == "auto":
+                    deadline = float(job["deadline_s"]) if job.get("deadline_s") not in (None, "") else None
+                    routed = await asyncio.to_thread(
+                        Router().run, _candidates(job, request), request, deadline, _flag(job.get("hedge"))
+                    )
+                    result.update(output=routed.output_path, engine=routed.engine, route=routed.metadata)
+                else:
+                    engine = get_engine(job["engine"])
+                    result["estimated_cost"] = engine.estimate_cost(request)
+                    result["output"] = await get_scheduler().arun(engine, request)
+                result["status"] = "succeeded"
+                if idx in hashes:
+                    index.add(hashes[idx], output=result["output"], **_render_key(job))
+            except Exception as e:
+                result.update(status="failed", error=str(e))
+            result["elapsed_s"] = round(time.perf_counter() - t0, 2)
+            print(json.dumps(result, ensure_ascii=False), flush=True)
+            return result
+
+    return await asyncio.gather(*(one(i, job) for i, job in enumerate(jobs)))
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Batch video generation across registered engines")
+    ap.add_argument("jobs", nargs="?", help="JSONL / CSV 작업 파일")
+    ap.add_argument("--concurrency", type=int, default=2)
+    ap.add_argument("--out-dir", default="outputs")
+    ap.add_argument("--list-engines", action="store_true", help="등록된 엔진과 능력치 출력")
+    ap.add_argument("--priority", choices=PRIORITIES, default=DEFAULT_PRIORITY, help="줄에 priority 가 없을 때")
+    ap.add_argument("--user", default=DEFAULT_USER, help="공정 분배 단위 (줄에 user 가 없을 때)")
+    ap.add_argument("--rendered-index", default=RENDERED_INDEX_FILE, help="렌더링한 입력 사진 해시 (JSONL)")
+    ap.add_argument("--allow-duplicates", action="store_true", help="같은 사진 중복 검사를 끈다")
+    args = ap.parse_args()
+
+    if args.list_engines:
+        for e in list_engines():
+            c = e.capabilities
+            print(
+                f"{e.name:<11} {c.kind:<6} {'ok' if e.available else 'no-key':<6} "
+                f"~{c.expected_latency_s:>5.0f}s  {c.cost_per_second:g} {c.cost_unit}/s  {c.description}"
+            )
+        return 0
+    if not args.jobs:
+        ap.error("작업 파일이 필요합니다 (또는 --list-engines)")
+
+    setup_logging()
+    Path(args.out_dir).mkdir(parents=True, exist_ok=True)
+    jobs = load_jobs(args.jobs)
+    for job in jobs:
+        job["priority"] = job.get("priority") or args.priority
+        job["user"] = job.get("user") or args.user
+    index = None if args.allow_duplicates else RenderedIndex(args.rendered_index)
+    results = asyncio.run(run_jobs(jobs, args.concurrency, args.out_dir, index))
+    failed = sum(1 for r in results if r["status"] == "failed")
+    skipped = sum(1 for r in results if r["status"] == "skipped")
+    print(f"✅ {len(results) - failed - skipped} 성공 / ⏭️ {skipped} 중복 건너뜀 / ❌ {failed} 실패", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,11 +5,10 @@ import sys
 
 CUR = Path(__file__).resolve().parent
 ROOT = CUR.parent
-SRC = ROOT / "src"
-if str(SRC) not in sys.path:
-    sys.path.insert(0, str(SRC))
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
 
-from generators.gemini.veo import generate_video_from_image, GeminiVeoGenerator
+from src.generators.gemini.veo import generate_video_from_image, GeminiVeoGenerator
 
 
 def main() -> None:
@@ -10,11 +10,10 @@ import sys
 # Allow import from src/
 CUR = Path(__file__).resolve().parent
 ROOT = CUR.parent
-SRC = ROOT / "src"
-if str(SRC) not in sys.path:
-    sys.path.insert(0, str(SRC))
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
 
-from utils.image_slideshow import render_from_product
+from src.utils.image_slideshow import render_from_product
 
 
 def extract_product_id(input_str: str) -> str:
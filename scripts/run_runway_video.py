@@ -10,7 +10,7 @@ import os
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
 
-from generators.runway.video import RunwayVideoGenerator
+from src.generators.runway.video import RunwayVideoGenerator
 
 def main():
     import argparse
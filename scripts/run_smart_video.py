@@ -6,9 +6,9 @@ Smart Travel Marketing Video Generator Runner
 
 import sys
 import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
 
-from core.smart_video_generator import SmartVideoGenerator
+from src.core.smart_video_generator import SmartVideoGenerator
 
 def main():
     # 테스트용 여행 이미지들
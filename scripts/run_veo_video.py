@@ -5,11 +5,10 @@ import sys
 
 CUR = Path(__file__).resolve().parent
 ROOT = CUR.parent
-SRC = ROOT / "src"
-if str(SRC) not in sys.path:
-    sys.path.insert(0, str(SRC))
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
 
-from generators.veo.video import generate_video_from_url, VeoSpec
+from src.generators.veo.video import generate_video_from_url, VeoSpec
 
 
 def main() -> None:
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+트레이스(JSONL) 요약: 스팬 이름별 호출 수/실패 수/p50/p95/max
+
+예)
+  python scripts/trace_summary.py                       # logs/traces.jsonl
+  python scripts/trace_summary.py --prefix vendor.      # 벤더 호출만
+  python scripts/trace_summary.py --since-hours 24 --json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """최근접 순위(nearest-rank) 백분위."""
+    if not sorted_values:
+        return 0.0
+    idx = max(0, min(len(sorted_values) - 1, int(round(q / 100.0 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[idx]
+
+
+def load_records(path: str, since_ts: float = 0.0, prefix: str = "") -> List[dict]:
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if rec.get("ts", 0) < since_ts:
+                continue
+            if prefix and not rec.get("name", "").startswith(prefix):
+                continue
+            records.append(rec)
+    return records
+
+
+def summarize(records: List[dict]) -> List[Dict[str, object]]:
+    durations: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    for rec in records:
+        name = rec.get("name", "?")
+        durations[name].append(float(rec.get("duration_ms", 0.0)))
+        if rec.get("status") == "error":
+            errors[name] += 1
+
+    rows = []
+    for name, values in durations.items():
+        values.sort()
+        rows.append({
+            "name": name,
+            "count": len(values),
+            "errors": errors[name],
+            "p50_ms": round(percentile(values, 50), 1),
+            "p95_ms": round(percentile(values, 95), 1),
+            "max_ms": round(values[-1], 1),
+            "total_s": round(sum(values) / 1000.0, 2),
+        })
+    rows.sort(key=lambda r: r["total_s"], reverse=True)
+    return rows
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Summarize tracing spans (p50/p95 per stage)")
+    ap.add_argument("path", nargs="?", default=os.getenv("TRACE_FILE", os.path.join("logs", "traces.jsonl")))
+    ap.add_argument("--prefix", default="", help="스팬 이름 접두사 필터 (예: vendor., stage.)")
+    ap.add_argument("--since-hours", type=float, default=0.0, help="최근 N시간만")
+    ap.add_argument("--json", action="store_true", help="JSON 으로 출력")
+    args = ap.parse_args()
+
+    if not os.path.exists(args.path):
+        print(f"❌ 트레이스 파일이 없습니다: {args.path}")
+        return 1
+
+    since_ts = time.time() - args.since_hours * 3600 if args.since_hours else 0.0
+    records = load_records(args.path, since_ts, args.prefix)
+    rows = summarize(records)
+
+    if args.json:
+        print(json.dumps(rows, ensure_ascii=False, indent=2))
+        return 0
+
+    products = sum(1 for r in records if r.get("name") == "product")
+    print(f"📊 스팬 {len(records)}개 / 상품 {products}개 ({args.path})")
+    header = f"{'name':<32} {'count':>6} {'err':>4} {'p50(ms)':>10} {'p95(ms)':>10} {'max(ms)':>10} {'total(s)':>9}"
+    print(header)
+    print("-" * len(header))
+    for r in rows:
+        print(
+            f"{r['name']:<32} {r['count']:>6} {r['errors']:>4} "
+            f"{r['p50_ms']:>10.1f} {r['p95_ms']:>10.1f} {r['max_ms']:>10.1f} {r['total_s']:>9.2f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,233 @@
+"""로컬 사진 분석기 (CPU, 네트워크 없음) — 영상 전략 선택에 필요한 ``PhotoAnalysis`` 를 수십 ms 에.
+
+``choose_strategy`` 가 보는 것(인원, 구도, 주요 요소)만 추정한다.
+
+- 사람: Haar 얼굴(정면/측면) + HOG 전신 검출 (OpenCV 기본 모델, 다운로드 없음)
+- 장면/요소: HSV 색 분포(녹지, 하늘, 중앙의 따뜻한 고채도 = 음식), 엣지 밀도, 수평/수직 직선(건축)
+- 마케팅 점수: 선명도(Laplacian 분산), 노출, 채도
+- 선택: ``LOCAL_SCENE_MODEL`` (ONNX 장면 분류기, 예: Places365 MobileNet) + ``LOCAL_SCENE_LABELS``
+  (한 줄에 라벨 하나)를 주면 장면 종류를 그 결과로 덮어쓴다
+
+이미지는 긴 변 ``LOCAL_ANALYSIS_SIZE`` (기본 320px)로 줄여서 본다. 차량처럼 색/엣지로 구분되지 않는
+요소는 잡지 못하므로 정확도가 필요하면 원격 분석으로 보정한다 (``PHOTO_ANALYZER=refine``).
+"""
+
+import os
+import threading
+from dataclasses import dataclass
+from typing import List, Optional, Union
+
+import cv2
+import numpy as np
+
+from .photo_analysis import PhotoAnalysis
+
+
+LOCAL_ANALYSIS_SIZE = int(os.getenv("LOCAL_ANALYSIS_SIZE", "320"))
+LOCAL_SCENE_MODEL = os.getenv("LOCAL_SCENE_MODEL", "")
+LOCAL_SCENE_LABELS = os.getenv("LOCAL_SCENE_LABELS", "")
+
+# ONNX 라벨 → scene_type (라벨 문자열에 포함되면)
+_SCENE_KEYWORDS = {
+    "food": ("food", "restaurant", "kitchen", "bakery", "cafeteria", "market", "dining"),
+    "architecture": ("temple", "church", "palace", "tower", "castle", "pagoda", "building", "bridge", "mosque", "skyscraper"),
+    "indoor": ("room", "museum", "lobby", "hall", "gallery", "shop", "store", "bar", "indoor"),
+    "landscape": ("beach", "mountain", "valley", "field", "forest", "lake", "coast", "ocean", "desert", "canyon", "waterfall", "sky"),
+}
+
+
+@dataclass
+class SceneFeatures:
+    faces: int
+    face_area: float  # 가장 큰 얼굴 / 전체
+    persons: int
+    green: float
+    sky: float  # 위쪽 1/3 중 하늘색 비율
+    warm_center: float  # 가운데 절반 중 따뜻한 고채도 비율
+    edges: float
+    lines: float  # 수평/수직 직선 길이 합 / (가로+세로)
+    brightness: float  # 0..1
+    sharpness: float  # 0..1 (log Laplacian 분산)
+    colorfulness: float  # 0..1
+    scene_label: str = ""
+
+
+def decode(image: Union[bytes, np.ndarray]) -> np.ndarray:
+    """바이트(JPEG/PNG) 또는 BGR 배열 → 긴 변 ``LOCAL_ANALYSIS_SIZE`` 인 BGR."""
+    if isinstance(image, (bytes, bytearray)):
+        img = cv2.imdecode(np.frombuffer(image, np.uint8), cv2.IMREAD_COLOR)
+        if img is None:
+            raise ValueError("이미지를 디코딩할 수 없습니다")
+    else:
+        img = image
+    h, w = img.shape[:2]
+    scale = LOCAL_ANALYSIS_SIZE / max(h, w)
+    if scale < 1:
+        img = cv2.resize(img, (max(1, int(w * scale)), max(1, int(h * scale))), interpolation=cv2.INTER_AREA)
+    return img
+
+
+def _ratio(mask: np.ndarray) -> float:
+    return float(np.count_nonzero(mask)) / mask.size if mask.size else 0.0
+
+
+class LocalPhotoAnalyzer:
+    """검출기는 스레드마다 한 번 로드한다 (OpenCV 분류기는 스레드 간 공유가 안전하지 않다)."""
+
+    def __init__(self, model_path: str = LOCAL_SCENE_MODEL, labels_path: str = LOCAL_SCENE_LABELS) -> None:
+        self.model_path = model_path
+        self.labels: List[str] = []
+        if model_path and labels_path:
+            with open(labels_path, encoding="utf-8") as f:
+                self.labels = [line.strip() for line in f if line.strip()]
+        self._local = threading.local()
+
+    def _detectors(self):
+        d = self._local.__dict__
+        if "face" not in d:
+            root = cv2.data.haarcascades
+            d["face"] = cv2.CascadeClassifier(os.path.join(root, "haarcascade_frontalface_default.xml"))
+            d["profile"] = cv2.CascadeClassifier(os.path.join(root, "haarcascade_profileface.xml"))
+            hog = cv2.HOGDescriptor()
+            hog.setSVMDetector(cv2.HOGDescriptor_getDefaultPeopleDetector())
+            d["hog"] = hog
+            d["net"] = cv2.dnn.readNetFromONNX(self.model_path) if self.model_path and self.labels else None
+        return d
+
+    # ---------- 특징 ----------
+    def features(self, image: Union[bytes, np.ndarray]) -> SceneFeatures:
+        img = decode(image)
+        det = self._detectors()
+        h, w = img.shape[:2]
+        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        hsv = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
+        hue, sat, val = cv2.split(hsv)
+
+        min_face = max(16, min(h, w) // 20)
+        faces = list(det["face"].detectMultiScale(gray, 1.2, 5, minSize=(min_face, min_face)))
+        if not faces:
+            faces = list(det["profile"].detectMultiScale(gray, 1.2, 5, minSize=(min_face, min_face)))
+        persons, _ = det["hog"].detectMultiScale(gray, winStride=(8, 8), padding=(0, 0), scale=1.15)
+        face_area = max((fw * fh for _, _, fw, fh in faces), default=0) / float(h * w)
+
+        green = _ratio((hue >= 35) & (hue <= 85) & (sat > 60) & (val > 40))
+        top = slice(0, max(1, h // 3))
+        sky = _ratio(
+            ((hue[top] >= 90) & (hue[top] <= 130) & (sat[top] > 40) & (val[top] > 110))
+            | ((sat[top] < 30) & (val[top] > 200))
+        )
+        cy, cx = slice(h // 4, h - h // 4), slice(w // 4, w - w // 4)
+        warm_center = _ratio(((hue[cy, cx] <= 25) | (hue[cy, cx] >= 160)) & (sat[cy, cx] > 90) & (val[cy, cx] > 80))
+
+        edges = cv2.Canny(gray, 80, 160)
+        segs = cv2.HoughLinesP(edges, 1, np.pi / 180, threshold=40, minLineLength=min(h, w) // 6, maxLineGap=4)
+        length = 0.0
+        for x1, y1, x2, y2 in (segs[:, 0] if segs is not None else []):
+            dx, dy = abs(int(x2) - int(x1)), abs(int(y2) - int(y1))
+            if dx <= dy * 0.1 or dy <= dx * 0.1:  # 수직/수평에 가까운 선만
+                length += float(np.hypot(dx, dy))
+
+        lap = cv2.Laplacian(gray, cv2.CV_64F).var()
+        b, g, r = (c.astype(np.float32) for c in cv2.split(img))
+        rg, yb = r - g, 0.5 * (r + g) - b
+        colorful = float(np.sqrt(rg.std() ** 2 + yb.std() ** 2) + 0.3 * np.sqrt(rg.mean() ** 2 + yb.mean() ** 2))
+
+        return SceneFeatures(
+            faces=len(faces),
+            face_area=round(face_area, 4),
+            persons=len(persons),
+            green=round(green, 4),
+            sky=round(sky, 4),
+            warm_center=round(warm_center, 4),
+            edges=round(_ratio(edges), 4),
+            lines=round(length / (h + w), 4),
+            brightness=round(float(val.mean()) / 255.0, 4),
+            sharpness=round(min(1.0, float(np.log1p(lap) / np.log1p(2000.0))), 4),
+            colorfulness=round(min(1.0, colorful / 100.0), 4),
+            scene_label=self._scene_label(img, det["net"]),
+        )
+
+    def _scene_label(self, img: np.ndarray, net) -> str:
+        if net is None:
+            return ""
+        blob = cv2.dnn.blobFromImage(img, 1 / 255.0, (224, 224), mean=(0.485, 0.456, 0.406), swapRB=True, crop=True)
+        net.setInput(blob)
+        scores = net.forward().reshape(-1)
+        probs = np.exp(scores - scores.max())
+        probs /= probs.sum()
+        top = int(probs.argmax())
+        return self.labels[top] if probs[top] >= 0.3 and top < len(self.labels) else ""
+
+    # ---------- 분류 ----------
+    def analyze(self, image: Union[bytes, np.ndarray]) -> PhotoAnalysis:
+        return classify(self.features(image))
+
+    def analyze_batch(self, images: List[Union[bytes, np.ndarray]]) -> List[PhotoAnalysis]:
+        return [self.analyze(image) for image in images]
+
+
+def classify(f: SceneFeatures) -> PhotoAnalysis:
+    """특징 → ``PhotoAnalysis``. 신뢰도는 뚜렷한 단서가 몇 개인지로 정한다."""
+    people = max(f.faces, f.persons)
+    nature = f.green > 0.15 or (f.sky > 0.35 and f.edges < 0.08)
+    architecture = f.lines > 0.6
+    food = f.warm_center > 0.35 and f.sky < 0.2 and f.green < 0.1  # 흰 접시는 흐린 하늘처럼 보인다
+    elements = [name for name, hit in (
+        ("people", people > 0), ("nature", nature), ("architecture", architecture), ("food", food),
+    ) if hit]
+
+    scene = ""
+    label = f.scene_label.lower()
+    for kind, words in _SCENE_KEYWORDS.items():
+        if label and any(word in label for word in words):
+            scene = kind
+            break
+    if not scene:
+        if food and people == 0:
+            scene = "food"
+        elif architecture and not nature:
+            scene = "architecture"
+        elif people and (f.sky > 0.1 or f.green > 0.1):
+            scene = "activity"
+        elif nature:
+            scene = "landscape"
+        elif f.sky < 0.03 and f.green < 0.05:
+            scene = "indoor"
+        else:
+            scene = "outdoor"
+
+    if people >= 3:
+        composition = "group"
+    elif (people == 1 and f.face_area > 0.03) or (food and people == 0):
+        composition = "close_up"
+    else:
+        composition = "wide"
+
+    cues = sum((people > 0, nature, architecture, food, bool(f.scene_label)))
+    confidence = 0.4 if cues == 0 else min(0.9, 0.65 + 0.1 * (cues - 1) + (0.1 if f.faces else 0.0))
+    exposure = 1.0 - min(1.0, abs(f.brightness - 0.55) / 0.45)
+    marketing = 0.45 * f.sharpness + 0.3 * exposure + 0.25 * f.colorfulness
+    return PhotoAnalysis(
+        has_people=people > 0,
+        people_count=people,
+        scene_type=scene,
+        composition=composition,
+        dominant_elements=elements,
+        suggested_motion="",
+        confidence=round(confidence, 2),
+        marketing_score=round(min(1.0, marketing), 3),
+    )
+
+
+_analyzer: Optional[LocalPhotoAnalyzer] = None
+_analyzer_lock = threading.Lock()
+
+
+def get_local_analyzer() -> LocalPhotoAnalyzer:
+    """프로세스 공용 분석기."""
+    global _analyzer
+    with _analyzer_lock:
+        if _analyzer is None:
+            _analyzer = LocalPhotoAnalyzer()
+        return _analyzer
+
@@ -0,0 +1,236 @@
+"""여행 사진 분석 결과 (``PhotoAnalysis``), 구조화 응답 스키마, 결과 캐시.
+
+- 분석은 JSON 스키마(``response_schema``)로 받아 그대로 파싱한다 (키워드 매칭 없음)
+- 여러 장은 한 요청에 ``이미지 i`` 순서로 실어 ``{"photos": [...]}`` 로 받는다
+- ``PHOTO_ANALYZER``: ``local`` (기본, ``local_analysis``), ``refine`` (로컬 신뢰도가
+  ``PHOTO_ANALYZER_REFINE_BELOW`` 미만인 사진만 원격), ``remote`` (전부 Gemini)
+- 원격 결과는 이미지 내용 sha256 + ``PROMPT_VERSION`` 으로 캐시한다. 프롬프트/스키마를 바꾸면
+  버전을 올려 예전 결과를 버린다. ``PHOTO_ANALYSIS_CACHE_FILE`` (기본 ``logs/photo_analysis.jsonl``,
+  빈 값이면 메모리만)에 덧붙여 재시작 후에도 쓴다
+"""
+
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, fields
+from typing import Any, Dict, List, Optional
+
+from src.utils.metrics import record_cache
+
+
+logger = logging.getLogger(__name__)
+
+PROMPT_VERSION = "2"
+PHOTO_ANALYSIS_CACHE_FILE = os.getenv("PHOTO_ANALYSIS_CACHE_FILE", os.path.join("logs", "photo_analysis.jsonl"))
+PHOTO_ANALYSIS_CACHE_SIZE = int(os.getenv("PHOTO_ANALYSIS_CACHE_SIZE", "2000"))
+PHOTO_ANALYSIS_BATCH = int(os.getenv("PHOTO_ANALYSIS_BATCH", "8"))  # 요청 한 번에 실을 이미지 수
+ANALYZERS = ("local", "refine", "remote")
+PHOTO_ANALYZER = os.getenv("PHOTO_ANALYZER", "local")
+PHOTO_ANALYZER_REFINE_BELOW = float(os.getenv("PHOTO_ANALYZER_REFINE_BELOW", "0.6"))
+
+SCENE_TYPES = ["landscape", "activity", "food", "indoor", "outdoor", "architecture"]
+COMPOSITIONS = ["portrait", "group", "wide", "close_up"]
+ELEMENTS = ["people", "nature", "architecture", "food", "vehicle", "cultural_items"]
+
+ANALYSIS_PROMPT = """
+Analyze the travel/tourism photo(s) for a marketing video. For each photo report:
+1. Are there people in the image? How many?
+2. Scene type: landscape, activity, food, indoor, outdoor, architecture
+3. Composition: portrait, group, wide, close_up
+4. Main elements: people, nature, architecture, food, vehicle, cultural_items
+5. Best motion strategy for video marketing (one sentence)
+6. marketing_score: 0-1, how well the photo would work as a travel marketing video
+   (clear subject, good light, inviting scene; low for text-heavy, blurry or cluttered shots)
+"""
+
+
+@dataclass
+class PhotoAnalysis:
+    has_people: bool
+    people_count: int
+    scene_type: str  # "landscape", "activity", "food", "indoor", "outdoor"
+    composition: str  # "portrait", "group", "wide", "close_up"
+    dominant_elements: List[str]  # ["people", "nature", "architecture", "food", "vehicle"]
+    suggested_motion: str
+    confidence: float
+    marketing_score: float = 0.0
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "PhotoAnalysis":
+        """모델 응답(스키마 한 항목)을 정규화한다. 필수 필드가 없으면 ``ValueError``."""
+        try:
+            people = max(0, int(data.get("people_count") or 0))
+            return cls(
+                has_people=bool(data["has_people"]) or people > 0,
+                people_count=people,
+                scene_type=str(data["scene_type"]).strip().lower(),
+                composition=str(data["composition"]).strip().lower(),
+                dominant_elements=[str(e).strip().lower() for e in data.get("dominant_elements") or []],
+                suggested_motion=str(data.get("suggested_motion") or ""),
+                confidence=min(1.0, max(0.0, float(data.get("confidence", 0.5)))),
+                marketing_score=min(1.0, max(0.0, float(data.get("marketing_score", 0.0)))),
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"사진 분석 응답 형식 오류: {data!r}") from e
+
+
+def choose_strategy(analysis: PhotoAnalysis) -> str:
+    """분석 결과 → ``SmartVideoGenerator.video_strategies`` 키."""
+    if analysis.has_people:
+        if analysis.people_count == 1:
+            return "people_portrait" if "close" in analysis.composition else "people_activity"
+        return "people_group"
+    if "landscape" in analysis.scene_type or "nature" in analysis.dominant_elements:
+        return "landscape_wide"
+    if "architecture" in analysis.dominant_elements:
+        return "architecture"
+    if "food" in analysis.dominant_elements:
+        return "food_close"
+    if "vehicle" in analysis.dominant_elements:
+        return "transportation"
+    return "indoor_cultural"
+
+
+# 변형(A/B)용: 같은 사진에 어울리는 다른 전략 (가까운 순)
+RELATED_STRATEGIES = {
+    "people_portrait": ("people_activity", "landscape_wide"),
+    "people_group": ("people_activity", "people_portrait"),
+    "people_activity": ("people_group", "landscape_wide"),
+    "landscape_wide": ("architecture", "transportation"),
+    "architecture": ("landscape_wide", "indoor_cultural"),
+    "food_close": ("indoor_cultural",),
+    "transportation": ("landscape_wide", "people_activity"),
+    "indoor_cultural": ("architecture", "food_close"),
+}
+
+
+def variant_strategies(analysis: PhotoAnalysis, n: int) -> List[str]:
+    """변형 n 편의 전략 키: 최적 전략, 가까운 전략 순으로 모자라면 처음부터 되풀이."""
+    best = choose_strategy(analysis)
+    keys = [best, *RELATED_STRATEGIES.get(best, ())]
+    return [keys[i % len(keys)] for i in range(n)]
+
+
+def _photo_schema():
+    from google.genai import types
+
+    S, T = types.Schema, types.Type
+    props = {
+        "has_people": S(type=T.BOOLEAN),
+        "people_count": S(type=T.INTEGER),
+        "scene_type": S(type=T.STRING, enum=SCENE_TYPES),
+        "composition": S(type=T.STRING, enum=COMPOSITIONS),
+        "dominant_elements": S(type=T.ARRAY, items=S(type=T.STRING, enum=ELEMENTS)),
+        "suggested_motion": S(type=T.STRING),
+        "confidence": S(type=T.NUMBER),
+        "marketing_score": S(type=T.NUMBER),
+    }
+    return S(type=T.OBJECT, properties=props, required=list(props), property_ordering=list(props))
+
+
+def batch_schema():
+    """``{"photos": [{"index": i, ...분석}]}`` — 이미지 순서는 ``index`` (0부터)로 맞춘다."""
+    from google.genai import types
+
+    S, T = types.Schema, types.Type
+    item = _photo_schema()
+    item.properties = {"index": S(type=T.INTEGER), **item.properties}
+    item.required = ["index"] + item.required
+    item.property_ordering = ["index"] + item.property_ordering
+    return S(type=T.OBJECT, properties={"photos": S(type=T.ARRAY, items=item)}, required=["photos"])
+
+
+def parse_batch(text: str, count: int) -> List[Optional[PhotoAnalysis]]:
+    """배치 응답 → 입력 순서대로의 분석 목록 (빠졌거나 깨진 항목은 ``None``)."""
+    data = json.loads(text)
+    photos = data.get("photos") if isinstance(data, dict) else data
+    out: List[Optional[PhotoAnalysis]] = [None] * count
+    for pos, item in enumerate(photos or []):
+        if not isinstance(item, dict):
+            continue
+        index = item.get("index", pos)
+        if not isinstance(index, int) or not 0 <= index < count or out[index] is not None:
+            continue
+        try:
+            out[index] = PhotoAnalysis.from_json(item)
+        except ValueError as e:
+            logger.warning("%s", e)
+    return out
+
+
+class PhotoAnalysisCache:
+    """(이미지 sha256, 프롬프트 버전) → ``PhotoAnalysis``. 최근 ``max_entries`` 개를 메모리에 둔다."""
+
+    def __init__(self, path: Optional[str] = PHOTO_ANALYSIS_CACHE_FILE, max_entries: int = PHOTO_ANALYSIS_CACHE_SIZE) -> None:
+        self.path = path or None
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, PhotoAnalysis]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    @staticmethod
+    def key(digest: str, version: Optional[str] = None) -> str:
+        return f"{digest}:v{version or PROMPT_VERSION}"
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.path or not os.path.exists(self.path):
+            return
+        names = {f.name for f in fields(PhotoAnalysis)}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        row = json.loads(line)
+                        analysis = PhotoAnalysis(**{k: v for k, v in row["analysis"].items() if k in names})
+                    except (KeyError, TypeError, ValueError):
+                        continue
+                    self._remember(row["key"], analysis)
+        except OSError as e:
+            logger.warning("사진 분석 캐시 로드 실패 (%s): %s", self.path, e)
+
+    def _remember(self, key: str, analysis: PhotoAnalysis) -> None:
+        self._entries[key] = analysis
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, digest: str) -> Optional[PhotoAnalysis]:
+        with self._lock:
+            self._load()
+            analysis = self._entries.get(self.key(digest))
+            if analysis is not None:
+                self._entries.move_to_end(self.key(digest))
+        record_cache("photo_analysis", analysis is not None)
+        return analysis
+
+    def put(self, digest: str, analysis: PhotoAnalysis) -> None:
+        key = self.key(digest)
+        with self._lock:
+            self._load()
+            self._remember(key, analysis)
+            if not self.path:
+                return
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps({"key": key, "analysis": asdict(analysis)}, ensure_ascii=False) + "\n")
+            except OSError as e:
+                logger.warning("사진 분석 캐시 기록 실패 (%s): %s", self.path, e)
+
+
+_cache: Optional[PhotoAnalysisCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_analysis_cache() -> PhotoAnalysisCache:
+    """프로세스 공용 캐시."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = PhotoAnalysisCache()
+        return _cache
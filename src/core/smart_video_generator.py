@@ -1,34 +1,59 @@
 import os
 import time
-import requests
-from dataclasses import dataclass
-from typing import List, Dict, Optional
-from google import genai
-from google.genai import types
-import cv2
-import numpy as np
-from PIL import Image
-import io
+from typing import Dict, List, Optional, Tuple
 
-
-@dataclass
-class PhotoAnalysis:
-    has_people: bool
-    people_count: int
-    scene_type: str  # "landscape", "activity", "food", "indoor", "outdoor"
-    composition: str  # "portrait", "group", "wide", "close_up"
-    dominant_elements: List[str]  # ["people", "nature", "architecture", "food", "vehicle"]
-    suggested_motion: str
-    confidence: float
+from src.core.local_analysis import get_local_analyzer
+from src.core.photo_analysis import (
+    ANALYSIS_PROMPT,
+    ANALYZERS,
+    PHOTO_ANALYSIS_BATCH,
+    PHOTO_ANALYZER,
+    PHOTO_ANALYZER_REFINE_BELOW,
+    PhotoAnalysis,
+    PhotoAnalysisCache,
+    batch_schema,
+    choose_strategy,
+    get_analysis_cache,
+    parse_batch,
+    variant_strategies,
+)
+from src.utils.veo_operations import (
+    generated_videos,
+    max_videos_per_operation,
+    plan_operations,
+    refresh_operations,
+    save_variants,
+    submit_operations,
+)
+from src.utils.clients import get_genai_client
+from src.utils.download import save_generated_video
+from src.utils.gemini_assets import Asset, GeminiAssets, get_assets
+from src.utils.logging_config import setup_logging
+from src.utils.metrics import PHOTO_ANALYSIS_REQUESTS, VENDOR_PHASE_SECONDS
+from src.utils.progress import ProgressReporter, get_reporter
+from src.utils.tracing import traced
 
 
 class SmartVideoGenerator:
-    def __init__(self, api_key: Optional[str] = None):
+    poll_interval_s = 10.0
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        reporter: Optional[ProgressReporter] = None,
+        analysis_cache: Optional[PhotoAnalysisCache] = None,
+        analyzer: Optional[str] = None,
+    ):
+        self._reporter = reporter
+        self._analysis_cache = analysis_cache
+        self.analyzer = analyzer or PHOTO_ANALYZER
+        if self.analyzer not in ANALYZERS:
+            raise ValueError(f"알 수 없는 분석기: {self.analyzer} (가능: {', '.join(ANALYZERS)})")
         self.api_key = api_key or os.getenv("GEMINI_API_KEY")
         if not self.api_key:
             raise ValueError("GEMINI_API_KEY environment variable required")
         
-        self.client = genai.Client(api_key=self.api_key)
+        self._client = None
         
         # 여행 마케팅 전용 영상 전략 매핑
         self.video_strategies = {
@@ -77,210 +102,267 @@ class SmartVideoGenerator:
             }
         }
 
+    @property
+    def client(self):
+        """genai 클라이언트는 첫 호출 때 생성 (프로세스 캐시 공유)"""
+        if self._client is None:
+            self._client = get_genai_client(self.api_key)
+        return self._client
+
+    @property
+    def assets(self) -> GeminiAssets:
+        """입력 이미지 업로드 핸들 (분석/생성이 같은 다운로드·업로드를 공유)"""
+        return get_assets(self.client)
+
+    @property
+    def reporter(self) -> ProgressReporter:
+        return self._reporter or get_reporter("smart_video")
+
+    @property
+    def analysis_cache(self) -> PhotoAnalysisCache:
+        """사진 분석 캐시 (지정하지 않으면 프로세스 공용)"""
+        return self._analysis_cache or get_analysis_cache()
+
     def analyze_photo(self, image_url: str) -> PhotoAnalysis:
         """AI로 사진을 분석하여 최적의 영상 전략 결정"""
-        print(f"🔍 Analyzing photo: {image_url}")
-        
-        # Gemini Vision으로 이미지 분석
+        self.reporter.info("🔍 Analyzing photo", image_url=image_url)
+        return self.analyze_photos([image_url])[0]
+
+    @traced("analysis.photos")
+    def analyze_photos(self, image_urls: List[str]) -> List[PhotoAnalysis]:
+        """여러 장을 입력 순서대로 분석한다.
+
+        캐시(이미지 sha256 + 프롬프트 버전)에 원격 분석 결과가 있으면 그대로 쓴다. 나머지는
+        ``self.analyzer`` 에 따라:
+
+        - ``local``: 로컬 분석기만 (네트워크/업로드 없음, 캐시하지 않음)
+        - ``refine``: 로컬 분석 후 신뢰도가 ``PHOTO_ANALYZER_REFINE_BELOW`` 미만인 사진만 원격으로
+        - ``remote``: 전부 원격 (``PHOTO_ANALYSIS_BATCH`` 장씩 한 요청)
+
+        실패한 사진은 로컬 결과(없으면 기본 분석, confidence 0.5)로 채운다.
+        """
+        held: List[Optional[Asset]] = []
+        for url in image_urls:
+            try:
+                held.append(self.assets.acquire(url))
+            except Exception as e:
+                self.reporter.warning(f"⚠️ Image download failed, using fallback: {e}", image_url=url)
+                held.append(None)
         try:
-            # 이미지 다운로드
-            r = requests.get(image_url, timeout=30)
-            r.raise_for_status()
-            
-            temp_path = "analyze_temp.jpg"
-            with open(temp_path, "wb") as f:
-                f.write(r.content)
-            
-            # Gemini로 이미지 분석
-            uploaded_file = self.client.files.create(
-                path=temp_path,
-                config=types.CreateFileConfig(
-                    display_name="Photo Analysis"
-                )
-            )
-            
-            # 분석 프롬프트
-            analysis_prompt = """
-            Analyze this travel/tourism photo and provide:
-            1. Are there people in the image? How many?
-            2. Scene type: landscape, activity, food, indoor, outdoor, architecture
-            3. Composition: portrait, group, wide_shot, close_up
-            4. Main elements: people, nature, architecture, food, vehicle, cultural_items
-            5. Best motion strategy for video marketing
-            
-            Respond in JSON format:
-            {
-                "has_people": boolean,
-                "people_count": number,
-                "scene_type": "string",
-                "composition": "string", 
-                "dominant_elements": ["element1", "element2"],
-                "confidence": 0.9
-            }
-            """
-            
+            results: Dict[str, PhotoAnalysis] = {}
+            missing: Dict[str, Asset] = {}  # 같은 이미지가 두 번 있어도 한 번만
+            for asset in held:
+                if asset is None or asset.digest in results or asset.digest in missing:
+                    continue
+                cached = self.analysis_cache.get(asset.digest)
+                if cached is not None:
+                    results[asset.digest] = cached
+                else:
+                    missing[asset.digest] = asset
+            pending = list(missing.values())
+            if self.analyzer != "remote":
+                for asset in pending:
+                    try:
+                        results[asset.digest] = get_local_analyzer().analyze(asset.data)
+                    except Exception as e:
+                        self.reporter.warning(f"⚠️ Local analysis failed: {e}", source=asset.source)
+                if self.analyzer == "local":
+                    pending = []
+                else:
+                    pending = [
+                        a for a in pending
+                        if a.digest not in results or results[a.digest].confidence < PHOTO_ANALYZER_REFINE_BELOW
+                    ]
+            for i in range(0, len(pending), max(1, PHOTO_ANALYSIS_BATCH)):
+                chunk = pending[i:i + max(1, PHOTO_ANALYSIS_BATCH)]
+                try:
+                    analyses = self._analyze_batch(chunk)
+                except Exception as e:
+                    self.reporter.warning(f"⚠️ Analysis failed, using fallback: {e}")
+                    continue
+                for asset, analysis in zip(chunk, analyses):
+                    if analysis is not None:
+                        self.analysis_cache.put(asset.digest, analysis)
+                        results[asset.digest] = analysis
+            return [
+                (results.get(asset.digest) if asset is not None else None) or self._fallback_analysis()
+                for asset in held
+            ]
+        finally:
+            for asset in held:
+                if asset is not None:
+                    self.assets.release(asset)
+
+    @traced("vendor.gemini.analyze")
+    def _analyze_batch(self, assets: List[Asset]) -> List[Optional[PhotoAnalysis]]:
+        """사진 여러 장 → 구조화(JSON 스키마) 응답 한 번."""
+        from google.genai import types
+
+        parts = [
+            types.Part.from_text(text=ANALYSIS_PROMPT),
+            types.Part.from_text(text=f"There are {len(assets)} photos. Return one entry per photo with its index."),
+        ]
+        for i, asset in enumerate(assets):
+            # 이미지는 한 번만 올리고, 이후 생성 단계가 같은 핸들을 다시 쓴다
+            parts += [types.Part.from_text(text=f"Photo index {i}:"), asset.part()]
+        with VENDOR_PHASE_SECONDS.time(engine="gemini", phase="analyze"):
             response = self.client.models.generate_content(
                 model="gemini-2.0-flash-exp",
-                contents=[
-                    types.Content(
-                        parts=[
-                            types.Part.from_text(analysis_prompt),
-                            types.Part.from_uri(file_uri=uploaded_file.uri, mime_type=uploaded_file.mime_type)
-                        ]
-                    )
-                ]
-            )
-            
-            # JSON 파싱 시도
-            analysis_text = response.text
-            print(f"📊 Analysis result: {analysis_text}")
-            
-            # 간단한 분석 결과 생성 (실제로는 JSON 파싱)
-            analysis = PhotoAnalysis(
-                has_people="people" in analysis_text.lower() or "person" in analysis_text.lower(),
-                people_count=1 if "people" in analysis_text.lower() else 0,
-                scene_type="outdoor",  # 기본값
-                composition="wide",
-                dominant_elements=["people", "nature"],
-                suggested_motion="",
-                confidence=0.8
-            )
-            
-            # 정리
-            self.client.files.delete(uploaded_file.name)
-            os.remove(temp_path)
-            
-            return analysis
-            
-        except Exception as e:
-            print(f"⚠️ Analysis failed, using fallback: {e}")
-            # 폴백 분석
-            return PhotoAnalysis(
-                has_people=True,  # 기본 가정
-                people_count=1,
-                scene_type="outdoor",
-                composition="wide",
-                dominant_elements=["people", "nature"],
-                suggested_motion="",
-                confidence=0.5
+                contents=[types.Content(role="user", parts=parts)],
+                config=types.GenerateContentConfig(
+                    response_mime_type="application/json",
+                    response_schema=batch_schema(),
+                    temperature=0.0,
+                ),
             )
+        PHOTO_ANALYSIS_REQUESTS.inc(model="gemini-2.0-flash-exp")
+        self.reporter.detail("📊 Analysis result", photos=len(assets), text=response.text)
+        return parse_batch(response.text, len(assets))
+
+    @staticmethod
+    def _fallback_analysis() -> PhotoAnalysis:
+        return PhotoAnalysis(
+            has_people=True,  # 기본 가정
+            people_count=1,
+            scene_type="outdoor",
+            composition="wide",
+            dominant_elements=["people", "nature"],
+            suggested_motion="",
+            confidence=0.5
+        )
+
+    def rank_photos(self, image_urls: List[str]) -> List[Tuple[str, PhotoAnalysis]]:
+        """상품 후보 이미지를 마케팅 적합도(marketing_score, confidence) 순으로 정렬 (분석 요청 한 번)."""
+        analyses = self.analyze_photos(image_urls)
+        ranked = sorted(zip(image_urls, analyses), key=lambda p: (p[1].marketing_score, p[1].confidence), reverse=True)
+        self.reporter.info(
+            "🏆 Ranked photos", top=ranked[0][0] if ranked else None,
+            scores=[round(a.marketing_score, 2) for _, a in ranked],
+        )
+        return ranked
 
     def get_video_strategy(self, analysis: PhotoAnalysis) -> Dict[str, str]:
         """분석 결과에 따른 최적 영상 전략 선택"""
+        return self.video_strategies[choose_strategy(analysis)]
+
+    @staticmethod
+    def build_prompt(strategy: Dict[str, str]) -> str:
+        """전략 → Veo 프롬프트"""
+        return f"""
+        Create a compelling travel marketing video from this image.
         
-        if analysis.has_people:
-            if analysis.people_count == 1:
-                if "close" in analysis.composition:
-                    return self.video_strategies["people_portrait"]
-                else:
-                    return self.video_strategies["people_activity"]
-            else:
-                return self.video_strategies["people_group"]
-        else:
-            if "landscape" in analysis.scene_type or "nature" in analysis.dominant_elements:
-                return self.video_strategies["landscape_wide"]
-            elif "architecture" in analysis.dominant_elements:
-                return self.video_strategies["architecture"]
-            elif "food" in analysis.dominant_elements:
-                return self.video_strategies["food_close"]
-            elif "vehicle" in analysis.dominant_elements:
-                return self.video_strategies["transportation"]
-            else:
-                return self.video_strategies["indoor_cultural"]
+        Motion Strategy: {strategy['motion']}
+        Camera Movement: {strategy['camera']}
+        Marketing Mood: {strategy['mood']}
+        
+        The video should inspire wanderlust and make viewers want to book this travel experience.
+        Make it cinematic, professional, and emotionally engaging for travel marketing.
+        Duration: 8 seconds, high quality.
+        """
+
+    @traced("vendor.veo.generate")
+    def generate_marketing_variants(self, image_url: str, output_path: str = "marketing_video.mp4", variants: int = 3) -> List[str]:
+        """A/B 변형 여러 편을 한 번에 생성 (전략 표에서 최적 + 가까운 전략).
 
+        모델이 허용하면 한 작업에 여러 편을 요청하고, 아니면 작업 여러 개를 같이 기다린다.
+        결과는 동시에 내려받아 ``variant_paths(output_path, n)`` 에 저장한다.
+        """
+        reporter = self.reporter
+        analysis = self.analyze_photo(image_url)
+        keys = variant_strategies(analysis, variants)
+        reporter.info(f"🎯 Variant strategies: {', '.join(keys)}", strategies=keys)
+        prompts = [self.build_prompt(self.video_strategies[k]) for k in keys]
+        model = "veo-3.0-generate-001"
+        with self.assets.use(image_url) as asset:
+            plan = plan_operations(prompts, variants, max_videos_per_operation(model))
+            operations = submit_operations(self.client, model, plan, asset.image())
+        reporter.info(f"⏳ {len(operations)} operation(s) started for {variants} variants")
+
+        with VENDOR_PHASE_SECONDS.time(engine="veo", phase="run"):
+            while not all(op.done for op in operations):
+                reporter.progress("⏳ Creating marketing video variants...")
+                time.sleep(self.poll_interval_s)
+                operations = refresh_operations(self.client, operations)
+        failed = [str(op.error) for op in operations if getattr(op, "error", None)]
+        if failed:
+            raise RuntimeError(f"변형 생성 실패: {failed[0]}")
+
+        paths = save_variants(self.client, generated_videos(operations), output_path)
+        reporter.success(f"✅ {len(paths)} marketing video variants saved", paths=paths)
+        return paths
+
+    @traced("vendor.veo.generate")
     def generate_marketing_video(self, image_url: str, output_path: str = "marketing_video.mp4") -> str:
         """여행 마케팅용 맞춤형 영상 생성"""
         
-        print("🎬 Starting smart travel marketing video generation...")
+        reporter = self.reporter
+        reporter.info("🎬 Starting smart travel marketing video generation...")
+        
+        # 분석과 생성이 끝날 때까지 이미지 핸들을 잡아 둔다 (원격 파일 삭제는 백그라운드에서 나중에)
+        try:
+            asset = self.assets.acquire(image_url)
+        except Exception as e:
+            reporter.warning(f"⚠️ Image download failed: {e}")
+            asset = None
+        try:
+            return self._generate_marketing_video(asset, image_url, output_path)
+        finally:
+            if asset is not None:
+                self.assets.release(asset)
+
+    def _generate_marketing_video(self, asset: Optional[Asset], image_url: str, output_path: str) -> str:
+        reporter = self.reporter
         
         # 1. 사진 분석
         analysis = self.analyze_photo(image_url)
-        print(f"📊 Photo Analysis:")
-        print(f"   - People: {analysis.has_people} ({analysis.people_count} persons)")
-        print(f"   - Scene: {analysis.scene_type}")
-        print(f"   - Composition: {analysis.composition}")
-        print(f"   - Elements: {analysis.dominant_elements}")
+        reporter.info(
+            f"📊 Photo Analysis: people={analysis.has_people} ({analysis.people_count}), "
+            f"scene={analysis.scene_type}, composition={analysis.composition}",
+            elements=analysis.dominant_elements,
+        )
         
         # 2. 전략 선택
         strategy = self.get_video_strategy(analysis)
-        print(f"🎯 Selected Strategy:")
-        print(f"   - Motion: {strategy['motion']}")
-        print(f"   - Camera: {strategy['camera']}")
-        print(f"   - Mood: {strategy['mood']}")
+        reporter.info(f"🎯 Selected Strategy: {strategy['mood']}", **strategy)
         
         # 3. 맞춤형 프롬프트 생성
-        custom_prompt = f"""
-        Create a compelling travel marketing video from this image.
+        custom_prompt = self.build_prompt(strategy)
         
-        Motion Strategy: {strategy['motion']}
-        Camera Movement: {strategy['camera']}
-        Marketing Mood: {strategy['mood']}
-        
-        The video should inspire wanderlust and make viewers want to book this travel experience.
-        Make it cinematic, professional, and emotionally engaging for travel marketing.
-        Duration: 8 seconds, high quality.
-        """
-        
-        print(f"📝 Generated prompt: {custom_prompt}")
+        reporter.detail("📝 Generated prompt", prompt=custom_prompt)
         
         # 4. 영상 생성
         try:
-            # 이미지 다운로드 및 업로드
-            print("⬇️ Downloading and uploading image...")
-            r = requests.get(image_url, timeout=30)
-            r.raise_for_status()
-            
-            temp_path = "temp_marketing_image.jpg"
-            with open(temp_path, "wb") as f:
-                f.write(r.content)
-            
-            uploaded_file = self.client.files.create(
-                path=temp_path,
-                config=types.CreateFileConfig(
-                    display_name="Travel Marketing Image"
-                )
-            )
-            
-            print("⏳ Waiting for file processing...")
-            while uploaded_file.state.name == "PROCESSING":
-                time.sleep(2)
-                uploaded_file = self.client.files.get(uploaded_file.name)
-            
-            if uploaded_file.state.name == "FAILED":
-                raise Exception(f"File upload failed: {uploaded_file.error}")
-            
-            # 영상 생성
-            print("🎬 Generating marketing video...")
+            if asset is None:
+                raise RuntimeError("입력 이미지를 받지 못했습니다")
+
+            # 분석 때 받아 둔 이미지 바이트를 그대로 사용 (Veo 는 Files URI 를 받지 않는다)
+            reporter.info("🎬 Generating marketing video...")
             operation = self.client.models.generate_videos(
                 model="veo-3.0-generate-001",
                 prompt=custom_prompt,
-                image=uploaded_file,
+                image=asset.image(),
             )
             
-            print(f"⏳ Operation started: {operation.name}")
+            reporter.info(f"⏳ Operation started: {operation.name}")
             
-            while not operation.done:
-                print("⏳ Creating your marketing video...")
-                time.sleep(10)
-                operation = self.client.operations.get(operation)
+            with VENDOR_PHASE_SECONDS.time(engine="veo", phase="run"):
+                while not operation.done:
+                    reporter.progress("⏳ Creating your marketing video...")
+                    time.sleep(self.poll_interval_s)
+                    operation = self.client.operations.get(operation)
             
-            print("✅ Marketing video completed!")
+            reporter.success("✅ Marketing video completed!")
             
             # 다운로드
             generated_video = operation.response.generated_videos[0]
-            client.files.download(file=generated_video.video)
-            generated_video.video.save(output_path)
+            save_generated_video(self.client, generated_video, output_path)
             
-            # 정리
-            self.client.files.delete(uploaded_file.name)
-            os.remove(temp_path)
-            
-            print(f"💾 Marketing video saved: {output_path}")
+            reporter.info(f"💾 Marketing video saved: {output_path}")
             return output_path
             
         except Exception as e:
-            print(f"❌ Image-based generation failed: {e}")
-            print("🔄 Falling back to text-only generation...")
+            reporter.warning(f"❌ Image-based generation failed: {e}")
+            reporter.info("🔄 Falling back to text-only generation...")
             
             # 텍스트 기반 폴백
             fallback_prompt = f"A cinematic travel marketing video: {custom_prompt}"
@@ -290,16 +372,16 @@ class SmartVideoGenerator:
                 prompt=fallback_prompt,
             )
             
-            while not operation.done:
-                print("⏳ Creating fallback marketing video...")
-                time.sleep(10)
-                operation = self.client.operations.get(operation)
+            with VENDOR_PHASE_SECONDS.time(engine="veo", phase="run"):
+                while not operation.done:
+                    reporter.progress("⏳ Creating fallback marketing video...")
+                    time.sleep(self.poll_interval_s)
+                    operation = self.client.operations.get(operation)
             
             generated_video = operation.response.generated_videos[0]
-            client.files.download(file=generated_video.video)
-            generated_video.video.save(output_path)
+            save_generated_video(self.client, generated_video, output_path)
             
-            print(f"💾 Fallback marketing video saved: {output_path}")
+            reporter.info(f"💾 Fallback marketing video saved: {output_path}")
             return output_path
 
 
@@ -309,12 +391,17 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Smart Travel Marketing Video Generator")
     parser.add_argument("image_url", type=str, help="Travel image URL")
     parser.add_argument("--out", type=str, default="smart_marketing_video.mp4")
+    parser.add_argument("--variants", type=int, default=1, help="A/B 변형 수")
     
     args = parser.parse_args()
+    setup_logging()
     
     try:
         generator = SmartVideoGenerator()
-        result = generator.generate_marketing_video(args.image_url, args.out)
+        if args.variants > 1:
+            result = generator.generate_marketing_variants(args.image_url, args.out, args.variants)
+        else:
+            result = generator.generate_marketing_video(args.image_url, args.out)
         print(f"🎉 Travel marketing video ready: {result}")
     except Exception as e:
         print(f"❌ Error: {e}")
@@ -0,0 +1,188 @@
+"""UI 영상 스타일 설정 → 영상 생성 프롬프트 (리얼리즘 강화).
+
+Streamlit 화면의 카메라/인물/환경/색감 위젯 값을 그대로 받아 문장으로 잇는다.
+"""
+
+from typing import Any, Dict
+
+# UI 위젯 기본값과 같다
+DEFAULT_STYLE: Dict[str, Any] = {
+    "camera_movement": "push_in",
+    "camera_speed": "slow",
+    "camera_angle": "eye_level",
+    "focal_length": "35mm",
+    "person_motion": "walking",
+    "crowd_behavior": "ambient",
+    "interaction": "enjoying",
+    "motion_blur": 0.2,
+    "stabilization": True,
+    "environmental_motion": ["wind", "clouds"],
+    "lighting_mood": "natural",
+    "video_style": "cinematic",
+    "color_grade": "natural",
+    "film_grain": 0.0,
+    "vignette": 0.0,
+    "depth_of_field": False,
+    "bokeh_strength": 0.0,
+}
+
+
+def build_custom_prompt(settings: Dict[str, Any]) -> str:
+    """사용자 설정을 기반으로 프롬프트 자동 생성 (빠진 값은 ``DEFAULT_STYLE``)"""
+    style = {**DEFAULT_STYLE, **settings}
+    camera_movement, camera_speed, camera_angle = style["camera_movement"], style["camera_speed"], style["camera_angle"]
+    focal_length, stabilization, motion_blur = style["focal_length"], style["stabilization"], style["motion_blur"]
+    person_motion, crowd_behavior = style["person_motion"], style["crowd_behavior"]
+    environmental_motion, lighting_mood, video_style = style["environmental_motion"], style["lighting_mood"], style["video_style"]
+    color_grade, film_grain, vignette, depth_of_field = style["color_grade"], style["film_grain"], style["vignette"], style["depth_of_field"]
+
+    base_prompt = (
+        "Create a realistic, natural-looking 9:16 travel video from this image. "
+        "Emphasize photorealism and subtlety."
+    )
+
+    # 카메라 움직임
+    camera_descriptions = {
+        "push_in": "Add a slow push-in camera movement",
+        "pull_out": "Add a pull-out camera movement revealing more of the scene",
+        "pan_left": "Add a smooth left panning movement",
+        "pan_right": "Add a smooth right panning movement", 
+        "tilt_up": "Add an upward tilting movement",
+        "tilt_down": "Add a downward tilting movement",
+        "static": "Keep the camera static with no movement",
+        "orbit": "Add a subtle orbital camera movement around the subject"
+    }
+
+    camera_speeds = {
+        "very_slow": "very slowly",
+        "slow": "slowly", 
+        "medium": "at medium speed",
+        "fast": "quickly"
+    }
+
+    camera_angles = {
+        "eye_level": "from eye level",
+        "low_angle": "from a low angle looking up",
+        "high_angle": "from a high angle looking down",
+        "bird_eye": "from a bird's eye view",
+        "worm_eye": "from ground level looking up"
+    }
+
+    # 인물 동작
+    person_descriptions = {
+        "none": "Keep people completely still",
+        "walking": "Show people walking naturally",
+        "standing": "Show people standing with subtle movements",
+        "sitting": "Show people sitting comfortably",
+        "running": "Show people running or jogging",
+        "gesturing": "Show people making natural gestures",
+        "natural_micro": "Add natural micro-movements like breathing and small gestures"
+    }
+
+    crowd_descriptions = {
+        "static": "Keep background people completely still",
+        "ambient": "Add natural ambient movement to background people",
+        "busy": "Show busy, active background movement", 
+        "minimal": "Add minimal, subtle background movement"
+    }
+
+    # 환경 효과
+    env_descriptions = {
+        "wind": "gentle breeze moving elements",
+        "water": "water movement and ripples",
+        "clouds": "slow-moving clouds",
+        "leaves": "leaves rustling in the wind",
+        "flags": "flags waving gently",
+        "smoke": "subtle smoke or mist effects",
+        "sparkles": "magical sparkle effects",
+        "birds": "birds flying in the background"
+    }
+
+    # 조명 분위기
+    lighting_descriptions = {
+        "natural": "with natural lighting",
+        "golden_hour": "with warm golden hour lighting",
+        "blue_hour": "with cool blue hour lighting",
+        "dramatic": "with dramatic lighting and shadows",
+        "soft": "with soft, diffused lighting",
+        "bright": "with bright, vibrant lighting"
+    }
+
+    # 영상 스타일
+    style_descriptions = {
+        "cinematic": "Cinematic style with professional composition",
+        "documentary": "Documentary style with natural, realistic feel",
+        "commercial": "Commercial style with polished, marketing appeal",
+        "artistic": "Artistic style with creative composition",
+        "travel_vlog": "Travel vlog style with engaging, personal feel", 
+        "instagram": "Instagram-ready style with social media appeal"
+    }
+
+    # 프롬프트 조합
+    prompt_parts = [base_prompt]
+
+    # 카메라 설정
+    if camera_movement != "static":
+        camera_desc = f"{camera_descriptions[camera_movement]} {camera_speeds[camera_speed]} {camera_angles[camera_angle]}"
+        prompt_parts.append(camera_desc)
+
+    # 인물 움직임
+    if person_motion != "none":
+        prompt_parts.append(person_descriptions[person_motion])
+
+    prompt_parts.append(crowd_descriptions[crowd_behavior])
+
+    # 환경 효과
+    if environmental_motion:
+        env_effects = [env_descriptions[env] for env in environmental_motion]
+        prompt_parts.append(f"Include {', '.join(env_effects)}")
+
+    # 조명과 스타일
+    prompt_parts.append(f"{style_descriptions[video_style]} {lighting_descriptions[lighting_mood]}")
+
+    # 렌즈/안정화/모션 블러
+    prompt_parts.append(f"Use a {focal_length} lens")
+    if stabilization:
+        prompt_parts.append("Apply stabilization to reduce shake")
+    if motion_blur > 0:
+        prompt_parts.append("Include natural motion blur appropriate to movement")
+
+    # 컬러/그레인/비네트/DOF
+    grade_texts = {
+        "natural": "with natural color grading",
+        "teal_orange": "with teal and orange color grading",
+        "warm": "with warm color tones",
+        "cool": "with cool color tones",
+        "black_white": "in black and white",
+        "high_contrast": "with high contrast color grading",
+    }
+    prompt_parts.append(grade_texts.get(color_grade, "with natural color grading"))
+    if film_grain > 0:
+        prompt_parts.append("add subtle film grain")
+    if vignette > 0:
+        prompt_parts.append("apply subtle vignette")
+    if depth_of_field:
+        prompt_parts.append("shallow depth of field with pleasing bokeh")
+
+    # 기본 품질/리얼리즘 설정
+    prompt_parts.append(
+        "Maintain the original colors and atmosphere. Vertical format, high quality."
+    )
+    # 고정 종횡비(9:16) 강제 및 프레이밍 가이드
+    prompt_parts.append(
+        "Final output must be strictly 9:16 (1080x1920). If the source is not 9:16, perform a smart center-crop "
+        "or minimal padding to preserve composition; never stretch or squash the image."
+    )
+    # 리얼리즘/금지 사항 (AI 느낌 최소화)
+    prompt_parts.append(
+        "Photorealistic output. Avoid AI-like artifacts, oversaturation, over-sharpening, waxy skin, "
+        "flicker, jitter, warping, extra fingers/limbs, melting textures, or unintended text/logos."
+    )
+    prompt_parts.append(
+        "Preserve subject identity and geometry; do not add or remove objects, people, or change the scene layout."
+    )
+    prompt_parts.append(
+        "Keep motion subtle and physically plausible; no abrupt or surreal movements."
+    )
+
+    return ". ".join(prompt_parts) + "."
@@ -0,0 +1,34 @@
+"""영상 생성 엔진 공통 인터페이스 + 레지스트리.
+
+    from src.engines import get_engine, EngineRequest
+    path = get_engine("grabcut").run(EngineRequest(output_path="out.mp4", image_path="in.jpg"))
+"""
+
+from .base import (  # noqa: F401
+    EngineCancelled,
+    EngineCapabilities,
+    EngineError,
+    EngineRequest,
+    EngineTimeout,
+    InsufficientCredits,
+    JobHandle,
+    JobStatus,
+    LocalEngine,
+    QueueTag,
+    VendorEngine,
+    request_variants,
+    variant_paths,
+)
+from .fairqueue import PRIORITIES, FairQueue  # noqa: F401
+from .registry import (  # noqa: F401
+    get_capabilities,
+    get_engine,
+    list_engines,
+    register_engine,
+    select_engines,
+    temp_engine,
+    unregister_engine,
+)
+from .router import RouteDecision, RoutedResult, Router  # noqa: F401
+from .scheduler import VendorLimits, VendorScheduler, get_scheduler  # noqa: F401
+from .stats import EngineStats, Outcome, get_stats  # noqa: F401
@@ -0,0 +1,374 @@
+"""엔진 공통 인터페이스.
+
+- ``VendorEngine``: 원격 작업형 (submit → poll → fetch). Runway / Higgs / Veo
+- ``LocalEngine``: 로컬 렌더형 (render). parallax / depth / grabcut / slideshow / simulation
+
+모든 메서드는 동기 버전이 기본이고, ``a*`` 버전은 블로킹 호출을
+``asyncio.to_thread`` 로 돌리고 대기는 ``asyncio.sleep`` 으로 한다.
+스케줄러/배치 CLI 는 엔진 종류와 무관하게 ``run`` / ``arun`` 만 부르면 된다.
+"""
+
+import asyncio
+import email.utils
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.utils.metrics import RATE_LIMITED, VENDOR_POLLS, VendorPhaseClock, track_vendor_job
+from src.utils.motion import MotionSpec
+from src.utils.progress import ProgressReporter, get_reporter
+from src.utils.tracing import span
+
+from .jobs import get_job_store
+
+
+class EngineError(RuntimeError):
+    """엔진 작업 실패 (벤더가 failed 를 돌려준 경우 등)."""
+
+
+class EngineTimeout(EngineError, TimeoutError):
+    """폴링 제한 시간 초과. ``handle`` 로 나중에 다시 조회할 수 있다."""
+
+    def __init__(self, message: str, handle: "JobHandle") -> None:
+        super().__init__(message)
+        self.handle = handle
+
+
+class EngineCancelled(EngineError):
+    """호출자가 작업을 취소함 (예: 헤지에서 진 쪽)."""
+
+
+class InsufficientCredits(EngineError):
+    """예상 비용이 캐시된 크레딧 잔액을 넘는 경우."""
+
+
+def retry_after_of(exc: BaseException, default: float = 5.0) -> Optional[float]:
+    """429 응답에서 난 예외면 대기 초(``Retry-After`` 우선), 아니면 None.
+
+    ``requests.HTTPError`` 처럼 ``response`` 속성을 가진 예외를 대상으로 한다.
+    """
+    response = getattr(exc, "response", None)
+    if getattr(response, "status_code", None) != 429:
+        return None
+    value = (getattr(response, "headers", None) or {}).get("Retry-After")
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return default
+
+
+@dataclass(frozen=True)
+class EngineCapabilities:
+    kind: str  # "vendor" | "local"
+    ratios: Tuple[str, ...]  # "W:H"
+    durations: Tuple[int, ...]  # 초
+    cost_per_second: float = 0.0
+    cost_unit: str = "credits"  # credits | usd | cpu_s
+    expected_latency_s: float = 60.0
+    requires_env: Tuple[str, ...] = ()
+    description: str = ""
+    cpu_slots: int = 0  # 로컬 렌더가 차지하는 CPU 슬롯 수 (벤더는 0)
+
+    def estimate_cost(self, duration: float) -> float:
+        return round(self.cost_per_second * duration, 4)
+
+    def supports(self, ratio: Optional[str] = None, duration: Optional[int] = None) -> bool:
+        if ratio and self.ratios and ratio not in self.ratios:
+            return False
+        if duration and self.durations and int(duration) not in self.durations:
+            return False
+        return True
+
+
+@dataclass(frozen=True)
+class QueueTag:
+    """스케줄링 꼬리표: 우선순위 등급, 공정 분배 단위(사용자/팀), 마감(epoch 초)."""
+
+    priority: str = "interactive"  # interactive | batch | backfill
+    user: str = "default"
+    deadline_at: Optional[float] = None
+    label: str = ""  # 대기열 조회용 (상품 id / 작업 id 등)
+
+
+@dataclass
+class EngineRequest:
+    """엔진 공통 입력. 엔진별 추가 옵션은 ``options`` 에 둔다.
+
+    ``tag`` 는 실행 순서에만 쓰이고 결과에는 영향이 없다 (단일 비행 지문에서도 제외).
+    """
+
+    output_path: str
+    image_path: Optional[str] = None
+    image_url: Optional[str] = None
+    prompt: str = ""
+    ratio: str = "720:1280"
+    duration: int = 5
+    seed: Optional[int] = None
+    motion: Optional[MotionSpec] = None
+    options: Dict[str, Any] = field(default_factory=dict)
+    tag: QueueTag = field(default_factory=QueueTag)
+
+
+def request_variants(request: EngineRequest) -> int:
+    """``options["variants"]``: 한 작업으로 만들 변형(A/B) 수. 기본 1."""
+    n = int(request.options.get("variants") or 1)
+    if n < 1:
+        raise ValueError(f"variants 는 1 이상이어야 합니다: {n}")
+    return n
+
+
+def variant_paths(output_path: str, n: int) -> List[str]:
+    """변형 저장 경로. 0번은 ``output_path`` 그대로, 나머지는 ``{이름}_v{i}{확장자}``."""
+    stem, ext = os.path.splitext(output_path)
+    return [output_path] + [f"{stem}_v{i}{ext}" for i in range(1, n)]
+
+
+@dataclass
+class JobHandle:
+    engine: str
+    job_id: str
+    submitted_at: float = field(default_factory=time.time)
+    raw: Any = None  # 엔진별 상태 객체 (예: Veo operation)
+    webhook: bool = False  # 제출 때 콜백 URL 을 등록했는지
+
+
+@dataclass
+class JobStatus:
+    state: str  # queued | running | succeeded | failed
+    result_url: Optional[str] = None
+    error: Optional[str] = None
+    raw: Any = None
+
+    @property
+    def done(self) -> bool:
+        return self.state in ("succeeded", "failed")
+
+
+class Engine:
+    name = ""
+    capabilities: EngineCapabilities
+
+    def __init__(self, reporter: Optional[ProgressReporter] = None) -> None:
+        self._reporter = reporter
+
+    @property
+    def reporter(self) -> ProgressReporter:
+        return self._reporter or get_reporter(self.name)
+
+    def estimate_cost(self, request: EngineRequest) -> float:
+        return self.capabilities.estimate_cost(request.duration)
+
+    def credit_balance(self) -> Optional[float]:
+        """벤더 크레딧 잔액. 조회 API 가 없는 엔진은 None."""
+        return None
+
+    def run(self, request: EngineRequest) -> str:
+        raise NotImplementedError
+
+    async def arun(self, request: EngineRequest) -> str:
+        return await asyncio.to_thread(self.run, request)
+
+
+class VendorEngine(Engine):
+    poll_interval_s = 5.0
+    timeout_s = 900.0
+    webhook_fallback_interval_s = 60.0  # 콜백을 등록한 작업의 보조 폴링 주기
+
+    @property
+    def live(self) -> bool:
+        """False 면 벤더 호출 없이 자체 드라이런으로 끝난다 (스케줄링 대상 아님)."""
+        return True
+
+    # ---------- 엔진별 구현 ----------
+    def submit(self, request: EngineRequest) -> JobHandle:
+        raise NotImplementedError
+
+    def poll(self, handle: JobHandle) -> JobStatus:
+        raise NotImplementedError
+
+    def fetch(self, handle: JobHandle, status: JobStatus, output_path: str) -> str:
+        raise NotImplementedError
+
+    def cancel(self, handle: JobHandle) -> bool:
+        """벤더 작업 취소. 취소 API 가 없는 엔진은 False (결과만 버린다)."""
+        return False
+
+    def status_from_webhook(self, handle: JobHandle, payload: Any) -> Optional[JobStatus]:
+        """콜백 payload → 상태. None 이면 콜백을 신호로만 보고 즉시 한 번 폴링한다."""
+        return None
+
+    # ---------- 공통 흐름 ----------
+    def wait(
+        self,
+        handle: JobHandle,
+        *,
+        timeout_s: Optional[float] = None,
+        interval_s: Optional[float] = None,
+        on_status: Optional[Callable[[JobStatus], None]] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> JobStatus:
+        """완료까지 대기. 제출 때 콜백을 등록했으면(``handle.webhook``) 작업 저장소에서
+        콜백을 기다리고, 폴링은 ``webhook_fallback_interval_s`` 주기의 보조 수단이 된다.
+
+        ``on_status`` 는 매 상태로 호출되고, ``cancel`` 이 set 되면 벤더 작업을 취소하고
+        ``EngineCancelled`` 를 올린다."""
+        timeout_s = self.timeout_s if timeout_s is None else timeout_s
+        interval_s = self.poll_interval_s if interval_s is None else interval_s
+        if handle.webhook:
+            interval_s = max(interval_s, self.webhook_fallback_interval_s)
+        store = get_job_store()
+        phases = VendorPhaseClock(self.name)
+        pushed: Optional[JobStatus] = None
+        first = True
+        with span(f"vendor.{self.name}.poll", job_id=handle.job_id, webhook=handle.webhook) as sp:
+            t0 = time.monotonic()
+            try:
+                while True:
+                    if cancel is not None and cancel.is_set():
+                        sp.set(state="cancelled", vendor_cancelled=self.cancel(handle))
+                        raise EngineCancelled(f"{self.name} 작업 취소됨 ({handle.job_id})")
+                    if pushed is not None:
+                        status, pushed = pushed, None
+                    elif handle.webhook and first:
+                        status = None  # 제출 직후엔 콜백부터 기다린다
+                    else:
+                        status = self._poll_once(handle)
+                    first = False
+                    if status is not None:
+                        phases.update(status.state)
+                        self.reporter.progress(
+                            f"⏳ {self.name} 상태: {status.state} ({int(time.monotonic() - t0)}s)",
+                            job_id=handle.job_id, state=status.state,
+                        )
+                        if on_status is not None:
+                            on_status(status)
+                        if status.done:
+                            break
+                    elapsed = time.monotonic() - t0
+                    if elapsed >= timeout_s:
+                        raise EngineTimeout(f"{self.name} 작업이 {int(timeout_s)}초 안에 끝나지 않았습니다", handle)
+                    if handle.webhook:
+                        payload = store.take(self.name, handle.job_id, min(interval_s, timeout_s - elapsed), cancel)
+                        if payload is not None:
+                            sp.set(callback_s=round(time.monotonic() - t0, 3))
+                            pushed = self.status_from_webhook(handle, payload)
+                    elif status is not None:
+                        if cancel is not None:
+                            cancel.wait(interval_s)
+                        else:
+                            time.sleep(interval_s)
+            finally:
+                if handle.webhook:
+                    store.discard(self.name, handle.job_id)
+            sp.set(state=status.state, waited_s=round(time.monotonic() - t0, 1))
+        phases.finish()
+        if status.state == "failed":
+            raise EngineError(f"{self.name} 작업 실패: {status.error or '알 수 없는 오류'}")
+        return status
+
+    def _poll_once(self, handle: JobHandle) -> Optional[JobStatus]:
+        """429 면 ``Retry-After`` 만큼 쉬고 None (작업 실패로 보지 않는다)."""
+        VENDOR_POLLS.inc(engine=self.name)
+        try:
+            return self.poll(handle)
+        except Exception as e:
+            wait_s = retry_after_of(e)
+            if wait_s is None:
+                raise
+            RATE_LIMITED.inc(engine=self.name, call="poll")
+            time.sleep(wait_s)
+            return None
+
+    def run(self, request: EngineRequest) -> str:
+        with track_vendor_job(self.name):
+            handle = self.submit(request)
+            status = self.wait(handle)
+            return self.fetch(handle, status, request.output_path)
+
+    # ---------- async ----------
+    async def asubmit(self, request: EngineRequest) -> JobHandle:
+        return await asyncio.to_thread(self.submit, request)
+
+    async def apoll(self, handle: JobHandle) -> JobStatus:
+        return await asyncio.to_thread(self.poll, handle)
+
+    async def afetch(self, handle: JobHandle, status: JobStatus, output_path: str) -> str:
+        return await asyncio.to_thread(self.fetch, handle, status, output_path)
+
+    async def await_done(self, handle: JobHandle, *, timeout_s: Optional[float] = None, interval_s: Optional[float] = None) -> JobStatus:
+        if handle.webhook:
+            # 콜백 대기는 Condition 기반이라 스레드에서 기다린다
+            return await asyncio.to_thread(self.wait, handle, timeout_s=timeout_s, interval_s=interval_s)
+        timeout_s = self.timeout_s if timeout_s is None else timeout_s
+        interval_s = self.poll_interval_s if interval_s is None else interval_s
+        phases = VendorPhaseClock(self.name)
+        t0 = time.monotonic()
+        while True:
+            try:
+                VENDOR_POLLS.inc(engine=self.name)
+                status = await self.apoll(handle)
+            except Exception as e:
+                wait_s = retry_after_of(e)
+                if wait_s is None:
+                    raise
+                RATE_LIMITED.inc(engine=self.name, call="poll")
+                if time.monotonic() - t0 >= timeout_s:
+                    raise EngineTimeout(f"{self.name} 작업이 {int(timeout_s)}초 안에 끝나지 않았습니다", handle)
+                await asyncio.sleep(wait_s)
+                continue
+            phases.update(status.state)
+            if status.done:
+                break
+            if time.monotonic() - t0 >= timeout_s:
+                raise EngineTimeout(f"{self.name} 작업이 {int(timeout_s)}초 안에 끝나지 않았습니다", handle)
+            await asyncio.sleep(interval_s)
+        phases.finish()
+        if status.state == "failed":
+            raise EngineError(f"{self.name} 작업 실패: {status.error or '알 수 없는 오류'}")
+        return status
+
+    async def arun(self, request: EngineRequest) -> str:
+        with track_vendor_job(self.name):
+            handle = await self.asubmit(request)
+            status = await self.await_done(handle)
+            return await self.afetch(handle, status, request.output_path)
+
+
+class LocalEngine(Engine):
+    def render(self, request: EngineRequest) -> str:
+        raise NotImplementedError
+
+    def run(self, request: EngineRequest) -> str:
+        with span(f"encode.{self.name}"):
+            return self.render(request)
+
+    async def arender(self, request: EngineRequest) -> str:
+        return await asyncio.to_thread(self.run, request)
+
+    async def arun(self, request: EngineRequest) -> str:
+        return await self.arender(request)
+
+
+def load_image(request: EngineRequest):
+    """요청의 로컬 경로(우선) 또는 URL 에서 PIL 이미지를 읽는다."""
+    import io
+
+    from PIL import Image
+
+    if request.image_path:
+        return Image.open(request.image_path).convert("RGB")
+    if request.image_url:
+        import requests
+
+        r = requests.get(request.image_url, timeout=30)
+        r.raise_for_status()
+        return Image.open(io.BytesIO(r.content)).convert("RGB")
+    raise ValueError("image_path 또는 image_url 이 필요합니다")
@@ -0,0 +1,64 @@
+"""엔진별 능력치 선언.
+
+엔진 모듈(SDK/렌더러 import)과 분리해 두어, 목록 조회나 엔진 선택만 할 때는
+무거운 모듈을 로드하지 않는다. 비용은 대략치이며 스케줄러 추정용이다.
+"""
+
+from .base import EngineCapabilities
+
+
+# gen3a_turbo 기준 (5 credits/s). veo3 는 약 2배
+RUNWAY = EngineCapabilities(
+    kind="vendor",
+    ratios=("768:1280", "1280:768", "720:1280", "1280:720"),
+    durations=(5, 8, 10),
+    cost_per_second=5.0,
+    cost_unit="credits",
+    expected_latency_s=90.0,
+    requires_env=("RUNWAY_API_KEY",),
+    description="Runway gen3a_turbo / gen4_turbo / veo3",
+)
+
+HIGGS = EngineCapabilities(
+    kind="vendor",
+    ratios=("1080:1920", "720:1280"),
+    durations=tuple(range(2, 11)),
+    cost_per_second=1.0,
+    cost_unit="credits",
+    expected_latency_s=120.0,
+    requires_env=("HIGGS_API_KEY", "HIGGS_SECRET"),
+    description="HiggsField DoP (image URL 입력, 모션 프리셋)",
+)
+
+VEO = EngineCapabilities(
+    kind="vendor",
+    ratios=("720:1280", "1280:720"),
+    durations=(8,),
+    cost_per_second=0.4,
+    cost_unit="usd",
+    expected_latency_s=180.0,
+    requires_env=("GEMINI_API_KEY",),
+    description="Veo 3 (fast / standard)",
+)
+
+
+def _local(cpu_s_per_s: float, latency_s: float, description: str, cpu_slots: int = 1) -> EngineCapabilities:
+    # 로컬 렌더는 해상도/길이 제약이 없다 (ratios/durations 비움 = 모두 허용)
+    return EngineCapabilities(
+        kind="local",
+        ratios=(),
+        durations=(),
+        cost_per_second=cpu_s_per_s,
+        cost_unit="cpu_s",
+        expected_latency_s=latency_s,
+        description=description,
+        cpu_slots=cpu_slots,
+    )
+
+
+# cpu_slots: onnx/torch 추론과 ffmpeg 인코딩은 여러 코어를 쓴다
+PARALLAX = _local(3.0, 20.0, "rembg 전경 분리 + 2레이어 패럴랙스", cpu_slots=2)
+DEPTH = _local(4.0, 30.0, "MiDaS 깊이 추정 기반 패럴랙스", cpu_slots=2)
+GRABCUT = _local(1.5, 10.0, "GrabCut 전경 분리 패럴랙스 (모델 불필요)")
+SLIDESHOW = _local(0.5, 15.0, "여러 장 Ken Burns 슬라이드쇼 (ffmpeg)", cpu_slots=2)
+SIMULATION = _local(0.3, 5.0, "드라이런용 줌/패닝 시뮬레이션")
@@ -0,0 +1,232 @@
+"""우선순위 + 공정 분배 대기열.
+
+벤더 in-flight 슬롯, 로컬 렌더 CPU 슬롯, 생성 서비스 워커가 같은 순서 규칙을 쓴다.
+
+1) 우선순위 등급: ``interactive`` > ``batch`` > ``backfill`` (등급 사이는 엄격)
+2) 같은 등급 안에서 마감이 ``urgent_s`` 안으로 들어온 작업은 마감 순(EDF)으로 앞선다
+3) 나머지는 사용자/팀별 가중 공정 큐잉(WFQ): 가상 종료 시각
+   ``max(V, F_user) + cost / weight`` 가 작은 순. 500건 배치를 넣은 사용자도
+   다른 사용자의 한 건을 뒤로 밀지 못한다.
+
+슬롯은 순서대로만 내준다 (앞 작업이 슬롯을 못 받으면 뒤 작업도 기다린다).
+최근 ``reserve_window_s`` 안에 interactive 요청이 있었으면 ``interactive_reserve`` 만큼은
+interactive 전용으로 비워 두어, 긴 배치가 슬롯을 다 차지해도 미리보기 한 건은 바로
+들어간다. UI 사용이 없는 시간(야간 배치)에는 배치가 슬롯을 전부 쓴다.
+
+사용자 가중치: ``FAIR_SHARE_WEIGHTS="design=2,batch-bot=0.5"`` (기본 1).
+예약 슬롯 수 ``QUEUE_INTERACTIVE_RESERVE`` (기본 1, 용량 1 이면 0), 유지 시간 ``QUEUE_RESERVE_WINDOW_S``.
+"""
+
+import itertools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.utils.metrics import QUEUE_WAIT_SECONDS
+
+from .base import EngineCancelled, QueueTag
+
+
+PRIORITIES = ("interactive", "batch", "backfill")
+URGENT_S = float(os.getenv("QUEUE_URGENT_S", "120"))
+RESERVE_WINDOW_S = float(os.getenv("QUEUE_RESERVE_WINDOW_S", "600"))
+INTERACTIVE_RESERVE = int(os.getenv("QUEUE_INTERACTIVE_RESERVE", "1"))
+
+
+def priority_rank(priority: str) -> int:
+    try:
+        return PRIORITIES.index(priority)
+    except ValueError:
+        raise ValueError(f"알 수 없는 우선순위: {priority} (가능: {', '.join(PRIORITIES)})") from None
+
+
+def parse_weights(value: Optional[str] = None) -> Dict[str, float]:
+    """``"a=2,b=0.5"`` → ``{"a": 2.0, "b": 0.5}``."""
+    value = os.getenv("FAIR_SHARE_WEIGHTS", "") if value is None else value
+    weights = {}
+    for part in value.split(","):
+        if "=" in part:
+            user, w = part.split("=", 1)
+            weights[user.strip()] = max(0.01, float(w))
+    return weights
+
+
+@dataclass
+class _Entry:
+    item: Any
+    tag: QueueTag
+    slots: int
+    rank: int
+    start: float  # 가상 시작 시각
+    finish: float  # 가상 종료 시각
+    seq: int
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+    def key(self, now: float, urgent_s: float) -> Tuple:
+        deadline = self.tag.deadline_at
+        urgent = deadline is not None and deadline - now <= urgent_s
+        return (self.rank, 0 if urgent else 1, deadline if urgent else self.finish, self.seq)
+
+
+class FairOrder:
+    """WFQ 순서만 관리하는 대기 목록 (스레드 안전 아님 — 호출자가 잠근다)."""
+
+    def __init__(self, weights: Optional[Dict[str, float]] = None, urgent_s: float = URGENT_S, clock=time.time) -> None:
+        self.weights = parse_weights() if weights is None else weights
+        self.urgent_s = urgent_s
+        self._clock = clock
+        self._entries: List[_Entry] = []
+        self._vtime: Dict[int, float] = {}
+        self._last_finish: Dict[Tuple[int, str], float] = {}
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def push(self, item: Any, tag: QueueTag, cost: float = 1.0, slots: int = 1) -> _Entry:
+        rank = priority_rank(tag.priority)
+        v = self._vtime.get(rank, 0.0)
+        start = max(v, self._last_finish.get((rank, tag.user), 0.0))
+        finish = start + cost / self.weights.get(tag.user, 1.0)
+        self._last_finish[(rank, tag.user)] = finish
+        entry = _Entry(item, tag, slots, rank, start, finish, next(self._seq))
+        self._entries.append(entry)
+        return entry
+
+    def ordered(self) -> List[_Entry]:
+        now = self._clock()
+        return sorted(self._entries, key=lambda e: e.key(now, self.urgent_s))
+
+    def peek(self) -> Optional[_Entry]:
+        ordered = self.ordered()
+        return ordered[0] if ordered else None
+
+    def remove(self, entry: _Entry) -> None:
+        self._entries.remove(entry)
+        # 가상 시각은 내보낸 작업의 시작 시각까지 전진 (놀던 사용자가 밀린 몫을 몰아 받지 않게)
+        self._vtime[entry.rank] = max(self._vtime.get(entry.rank, 0.0), entry.start)
+
+    def pop(self) -> Optional[Any]:
+        entry = self.peek()
+        if entry is None:
+            return None
+        self.remove(entry)
+        return entry.item
+
+
+class FairQueue:
+    """용량 ``capacity`` 슬롯을 ``FairOrder`` 순서로 나눠 주는 세마포어."""
+
+    def __init__(
+        self,
+        name: str,
+        capacity: int,
+        interactive_reserve: Optional[int] = None,
+        weights: Optional[Dict[str, float]] = None,
+        urgent_s: float = URGENT_S,
+        reserve_window_s: float = RESERVE_WINDOW_S,
+    ) -> None:
+        self.name = name
+        self.capacity = max(1, capacity)
+        if interactive_reserve is None:
+            interactive_reserve = INTERACTIVE_RESERVE
+        self.interactive_reserve = max(0, min(interactive_reserve, self.capacity - 1))
+        self.reserve_window_s = reserve_window_s
+        self._last_interactive: Optional[float] = None
+        self._order = FairOrder(weights, urgent_s)
+        self._cond = threading.Condition()
+        self._in_use = 0
+        self._running: Dict[int, Tuple[QueueTag, int, float]] = {}
+
+    def _reserving(self) -> bool:
+        last = self._last_interactive
+        return bool(self.interactive_reserve) and last is not None and time.monotonic() - last <= self.reserve_window_s
+
+    def _fits(self, entry: _Entry) -> bool:
+        free = self.capacity - self._in_use
+        if entry.rank > 0 and self._reserving():
+            free -= self.interactive_reserve
+        return entry.slots <= free
+
+    def _grant(self) -> None:
+        head = self._order.peek()
+        while head is not None and self._fits(head):
+            self._order.remove(head)
+            self._in_use += head.slots
+            head.item.set()
+            head = self._order.peek()
+        self._cond.notify_all()
+
+    def acquire(
+        self, tag: QueueTag, slots: int = 1, cost: float = 1.0, cancel: Optional[threading.Event] = None
+    ) -> int:
+        """슬롯을 받을 때까지 기다린다. 돌려받은 번호로 ``release``."""
+        slots = min(max(1, slots), self.capacity)
+        granted = threading.Event()
+        t0 = time.monotonic()
+        with self._cond:
+            entry = self._order.push(granted, tag, cost, slots)
+            if entry.rank == 0:
+                self._last_interactive = time.monotonic()
+            self._grant()
+            while not granted.is_set():
+                if cancel is not None and cancel.is_set():
+                    self._order.remove(entry)
+                    self._grant()
+                    raise EngineCancelled(f"{self.name} 대기 중 취소됨")
+                self._cond.wait(0.25)
+            self._running[entry.seq] = (tag, slots, time.time())
+        QUEUE_WAIT_SECONDS.observe(time.monotonic() - t0, queue=self.name, priority=tag.priority)
+        return entry.seq
+
+    def release(self, ticket: int) -> None:
+        with self._cond:
+            _, slots, _ = self._running.pop(ticket)
+            self._in_use -= slots
+            self._grant()
+
+    @contextmanager
+    def slot(
+        self, tag: QueueTag, slots: int = 1, cost: float = 1.0, cancel: Optional[threading.Event] = None
+    ) -> Iterator[None]:
+        ticket = self.acquire(tag, slots, cost, cancel)
+        try:
+            yield
+        finally:
+            self.release(ticket)
+
+    @property
+    def waiting(self) -> int:
+        with self._cond:
+            return len(self._order)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """CLI / ``GET /queues`` 용 현재 상태 (대기열은 내줄 순서대로)."""
+        now = time.time()
+        with self._cond:
+            waiting = [
+                {
+                    "priority": e.tag.priority,
+                    "user": e.tag.user,
+                    "slots": e.slots,
+                    "waited_s": round(time.monotonic() - e.enqueued_at, 1),
+                    "deadline_in_s": None if e.tag.deadline_at is None else round(e.tag.deadline_at - now, 1),
+                    "label": e.tag.label,
+                }
+                for e in self._order.ordered()
+            ]
+            running = [
+                {"priority": t.priority, "user": t.user, "slots": s, "running_s": round(now - started, 1), "label": t.label}
+                for t, s, started in self._running.values()
+            ]
+        return {
+            "name": self.name,
+            "capacity": self.capacity,
+            "in_use": sum(r["slots"] for r in running),
+            "interactive_reserve": self.interactive_reserve if self._reserving() else 0,
+            "running": running,
+            "waiting": waiting,
+        }
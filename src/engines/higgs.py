@@ -0,0 +1,72 @@
+"""HiggsField image2video(DoP) 엔진."""
+
+import pathlib
+from typing import Any, Optional
+
+import requests
+
+from src.generators.higgs.video import HiggsSpec, HiggsVideoGenerator
+from src.utils.progress import ProgressReporter
+
+from . import capabilities as caps
+from .base import EngineRequest, JobHandle, JobStatus, VendorEngine
+from .jobs import callback_url, webhook_secret
+
+
+class HiggsEngine(VendorEngine):
+    name = "higgs"
+    capabilities = caps.HIGGS
+    poll_interval_s = 4.0
+    timeout_s = 600.0
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        api_secret: Optional[str] = None,
+        model: str = "dop-turbo",
+        reporter: Optional[ProgressReporter] = None,
+    ) -> None:
+        super().__init__(reporter)
+        self.model = model
+        self.generator = HiggsVideoGenerator(
+            output_dir=pathlib.Path("outputs"), reporter=reporter, api_key=api_key, api_secret=api_secret
+        )
+
+    def submit(self, request: EngineRequest) -> JobHandle:
+        opts = request.options
+        strength = float(opts.get("motion_strength", 0.5))
+        spec = HiggsSpec(
+            model=opts.get("model", self.model),
+            prompt=request.prompt,
+            motions=[{"id": mid, "strength": strength} for mid in opts.get("motions", [])],
+            seed=int(request.seed) if request.seed is not None else HiggsSpec.seed,
+        )
+        url = callback_url(self.name)
+        webhook = {"url": url, "secret": webhook_secret()} if url else None
+        job_set_id = self.generator.create_job_set(spec, image_url=request.image_url, webhook=webhook)
+        return JobHandle(self.name, job_set_id, webhook=webhook is not None)
+
+    def poll(self, handle: JobHandle) -> JobStatus:
+        try:
+            data = self.generator.get_job_set(handle.job_id)
+        except requests.HTTPError as e:
+            # 422: 아직 조회할 수 없는 job set (생성 직후). 대기열로 본다
+            if getattr(e.response, "status_code", None) == 422:
+                return JobStatus("queued", raw=None)
+            raise
+        return self._status(data)
+
+    def status_from_webhook(self, handle: JobHandle, payload: Any) -> Optional[JobStatus]:
+        # 콜백 본문은 GET /job-sets/{id} 응답과 같은 job set
+        return self._status(payload) if payload.get("jobs") else None
+
+    def _status(self, data) -> JobStatus:
+        state = self.generator.job_set_state(data)
+        url = self.generator.extract_video_url(data) if state == "succeeded" else None
+        if state == "succeeded" and not url:
+            return JobStatus("failed", error="HiggsField 결과에 video_url이 없습니다.", raw=data)
+        return JobStatus(state, result_url=url, raw=data)
+
+    def fetch(self, handle: JobHandle, status: JobStatus, output_path: str) -> str:
+        self.generator.download_result(status.result_url, pathlib.Path(output_path))
+        return output_path
@@ -0,0 +1,96 @@
+"""벤더 작업 완료 콜백(웹훅) 저장소.
+
+사이드카의 ``/webhooks/{engine}`` 라우트가 벤더 콜백을 받아 ``complete`` 하면
+``VendorEngine.wait`` 가 ``take`` 로 바로 깨어난다. 폴링은 느린 보조 수단으로만 남는다.
+
+웹훅은 ``WEBHOOK_PUBLIC_URL`` (벤더가 접근할 수 있는 사이드카 주소, 예: 터널 URL)이
+있을 때만 켜진다. 서명 비밀값은 ``WEBHOOK_SECRET`` (없으면 프로세스마다 생성해
+제출할 때 함께 등록한다).
+"""
+
+import os
+import secrets
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+_Key = Tuple[str, str]
+
+
+class JobStore:
+    """(engine, job_id) → 마지막 콜백 payload. 제출 응답보다 콜백이 먼저 와도 보관한다."""
+
+    def __init__(self, ttl_s: float = 3600.0) -> None:
+        self.ttl_s = ttl_s
+        self._payloads: Dict[_Key, Tuple[float, Any]] = {}
+        self._cond = threading.Condition()
+
+    def complete(self, engine: str, job_id: str, payload: Any) -> None:
+        with self._cond:
+            self._prune()
+            self._payloads[(engine, job_id)] = (time.monotonic(), payload)
+            self._cond.notify_all()
+
+    def take(
+        self,
+        engine: str,
+        job_id: str,
+        timeout_s: float,
+        cancel: Optional[threading.Event] = None,
+    ) -> Optional[Any]:
+        """콜백이 오면 payload 를 꺼내 돌려주고, ``timeout_s`` 가 지나거나 취소되면 None."""
+        key = (engine, job_id)
+        deadline = time.monotonic() + timeout_s
+        with self._cond:
+            while key not in self._payloads:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or (cancel is not None and cancel.is_set()):
+                    return None
+                # 취소 확인을 위해 잘게 나눠 기다린다
+                self._cond.wait(min(remaining, 0.5))
+            return self._payloads.pop(key)[1]
+
+    def discard(self, engine: str, job_id: str) -> None:
+        with self._cond:
+            self._payloads.pop((engine, job_id), None)
+
+    def _prune(self) -> None:
+        cutoff = time.monotonic() - self.ttl_s
+        for key in [k for k, (ts, _) in self._payloads.items() if ts < cutoff]:
+            del self._payloads[key]
+
+
+_store: Optional[JobStore] = None
+_store_lock = threading.Lock()
+_secret: Optional[str] = None
+
+
+def get_job_store() -> JobStore:
+    """프로세스 공용 작업 저장소 (웹훅 라우트와 엔진이 공유)."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = JobStore()
+    return _store
+
+
+def webhook_secret() -> str:
+    global _secret
+    if _secret is None:
+        _secret = os.getenv("WEBHOOK_SECRET") or secrets.token_hex(16)
+    return _secret
+
+
+def callback_url(engine: str) -> Optional[str]:
+    """제출에 실을 콜백 URL. 웹훅이 꺼져 있으면 None (엔진은 평소 주기로 폴링).
+
+    켜져 있으면 수신 서버(사이드카)가 떠 있도록 보장한다.
+    """
+    base = os.getenv("WEBHOOK_PUBLIC_URL", "").strip().rstrip("/")
+    if not base:
+        return None
+    from src.server.runner import start_background_server
+
+    start_background_server()
+    return f"{base}/webhooks/{engine}"
@@ -0,0 +1,76 @@
+"""로컬 렌더 엔진 (크레딧 소진 없음).
+
+렌더러 모듈(cv2/numpy/rembg/onnx)은 ``render`` 가 처음 불릴 때 import 한다.
+"""
+
+from src.utils.motion import motion_spec
+
+from . import capabilities as caps
+from .base import EngineRequest, LocalEngine, load_image
+
+
+def _spec(request: EngineRequest, renderer: str):
+    if request.motion is not None:
+        return request.motion
+    w, h = (int(x) for x in request.ratio.split(":"))
+    return motion_spec(renderer, width=w, height=h, duration=float(request.duration))
+
+
+class ParallaxEngine(LocalEngine):
+    name = "parallax"
+    capabilities = caps.PARALLAX
+
+    def render(self, request: EngineRequest) -> str:
+        from src.utils.ai_motion import animate_pil
+
+        animate_pil(load_image(request), request.output_path, _spec(request, "ai_motion"))
+        return request.output_path
+
+
+class DepthEngine(LocalEngine):
+    name = "depth"
+    capabilities = caps.DEPTH
+
+    def render(self, request: EngineRequest) -> str:
+        from src.utils.ai_motion_depth import render_depth_parallax
+
+        render_depth_parallax(load_image(request), request.output_path, _spec(request, "ai_motion_depth"))
+        return request.output_path
+
+
+class GrabcutEngine(LocalEngine):
+    name = "grabcut"
+    capabilities = caps.GRABCUT
+
+    def render(self, request: EngineRequest) -> str:
+        from src.utils.ai_motion_grabcut import render_parallax
+
+        render_parallax(load_image(request), request.output_path, _spec(request, "ai_motion_grabcut"))
+        return request.output_path
+
+
+class SlideshowEngine(LocalEngine):
+    name = "slideshow"
+    capabilities = caps.SLIDESHOW
+
+    def render(self, request: EngineRequest) -> str:
+        from src.utils.image_slideshow import CanvasSpec, ImageSlideshowRenderer, build_default_clips
+
+        images = request.options.get("images") or [request.image_path or request.image_url]
+        w, h = (int(x) for x in request.ratio.split(":"))
+        canvas = CanvasSpec(width=w, height=h, duration=float(request.duration))
+        clips = build_default_clips(images, total_duration=canvas.duration, num_clips=len(images))
+        ImageSlideshowRenderer(canvas).render(clips, output_mp4=request.output_path)
+        return request.output_path
+
+
+class SimulationEngine(LocalEngine):
+    name = "simulation"
+    capabilities = caps.SIMULATION
+
+    def render(self, request: EngineRequest) -> str:
+        from src.utils.simulation import render_simulation
+
+        w, h = (int(x) for x in request.ratio.split(":"))
+        fps = request.motion.fps if request.motion else 30
+        return render_simulation(load_image(request), request.output_path, duration=request.duration, fps=fps, width=w, height=h)
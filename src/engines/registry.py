@@ -0,0 +1,113 @@
+"""엔진 레지스트리.
+
+엔진 모듈은 ``"모듈:클래스"`` 문자열로만 등록해 두고 ``get_engine`` 이
+처음 불릴 때 import 한다. 능력치는 ``capabilities`` 모듈의 선언을 같이 등록해
+목록 조회/엔진 선택만으로는 SDK·렌더러가 로드되지 않는다.
+"""
+
+import importlib
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+from . import capabilities as caps
+from .base import Engine, EngineCapabilities
+
+
+@dataclass(frozen=True)
+class EngineEntry:
+    name: str
+    target: str  # "package.module:ClassName"
+    capabilities: EngineCapabilities
+
+    @property
+    def available(self) -> bool:
+        """필수 환경변수가 모두 설정돼 있는지 (키를 인자로 넘기는 경우는 호출자가 판단)."""
+        return all(os.getenv(k) for k in self.capabilities.requires_env)
+
+
+_ENTRIES: Dict[str, EngineEntry] = {}
+_CLASSES: Dict[str, type] = {}
+
+# 앱 세션 설정에서 쓰던 이름 → 엔진 이름
+ALIASES = {"runway_ai": "runway", "gemini_veo": "veo", "ai_motion": "parallax"}
+
+
+def register_engine(name: str, target: str, capabilities: EngineCapabilities) -> None:
+    _ENTRIES[name] = EngineEntry(name, target, capabilities)
+    _CLASSES.pop(name, None)
+
+
+def unregister_engine(name: str) -> None:
+    """등록 해제 (없으면 무시)."""
+    _ENTRIES.pop(name, None)
+    _CLASSES.pop(name, None)
+
+
+@contextmanager
+def temp_engine(cls: type, name: Optional[str] = None) -> Iterator[str]:
+    """``cls`` 를 ``with`` 안에서만 등록한다 (테스트용). 같은 이름의 기존 등록은 나올 때 되돌린다."""
+    name = name or cls.name
+    previous = _ENTRIES.get(name)
+    register_engine(name, f"{cls.__module__}:{cls.__qualname__}", cls.capabilities)
+    try:
+        yield name
+    finally:
+        unregister_engine(name)
+        if previous is not None:
+            _ENTRIES[name] = previous
+
+
+def _entry(name: str) -> EngineEntry:
+    key = ALIASES.get(name, name)
+    if key not in _ENTRIES:
+        raise ValueError(f"알 수 없는 엔진: {name} (사용 가능: {', '.join(sorted(_ENTRIES))})")
+    return _ENTRIES[key]
+
+
+def load_engine_class(name: str) -> type:
+    entry = _entry(name)
+    cls = _CLASSES.get(entry.name)
+    if cls is None:
+        module_name, _, cls_name = entry.target.partition(":")
+        cls = getattr(importlib.import_module(module_name), cls_name)
+        _CLASSES[entry.name] = cls
+    return cls
+
+
+def get_engine(name: str, **kwargs: Any) -> Engine:
+    """엔진 인스턴스 생성. ``kwargs`` 는 엔진 생성자로 그대로 전달."""
+    return load_engine_class(name)(**kwargs)
+
+
+def get_capabilities(name: str) -> EngineCapabilities:
+    return _entry(name).capabilities
+
+
+def list_engines(kind: Optional[str] = None) -> List[EngineEntry]:
+    return [e for e in _ENTRIES.values() if kind is None or e.capabilities.kind == kind]
+
+
+def select_engines(
+    ratio: Optional[str] = None,
+    duration: Optional[int] = None,
+    kind: Optional[str] = None,
+    available_only: bool = True,
+) -> List[EngineEntry]:
+    """조건을 만족하는 엔진을 예상 지연 시간 순으로."""
+    found = [
+        e for e in list_engines(kind)
+        if e.capabilities.supports(ratio, duration) and (e.available or not available_only)
+    ]
+    return sorted(found, key=lambda e: e.capabilities.expected_latency_s)
+
+
+register_engine("runway", "src.engines.runway:RunwayEngine", caps.RUNWAY)
+register_engine("higgs", "src.engines.higgs:HiggsEngine", caps.HIGGS)
+register_engine("veo", "src.engines.veo:VeoEngine", caps.VEO)
+register_engine("parallax", "src.engines.local:ParallaxEngine", caps.PARALLAX)
+register_engine("depth", "src.engines.local:DepthEngine", caps.DEPTH)
+register_engine("grabcut", "src.engines.local:GrabcutEngine", caps.GRABCUT)
+register_engine("slideshow", "src.engines.local:SlideshowEngine", caps.SLIDESHOW)
+register_engine("simulation", "src.engines.local:SimulationEngine", caps.SIMULATION)
@@ -0,0 +1,264 @@
+"""멀티 벤더 라우터 (마감 기반 선택 + 지연 헤지).
+
+1) 후보 엔진마다 최근 통계(``EngineStats``)로 지연 p50/p90 과 성공률을 예측한다.
+   표본이 ``min_samples`` 미만이면 능력치의 ``expected_latency_s`` 를 사전값으로 쓴다.
+2) p90 이 마감 안에 드는 엔진 중 기대 시간(p50 / 성공률)이 가장 짧은 엔진을 고른다.
+   마감을 맞출 엔진이 없으면 p90 이 가장 짧은 엔진.
+3) 헤지: 1순위가 대기열 p90(``hedge_quantile``) 시점까지 실행을 시작하지 않았거나
+   실패하면 2순위를 추가로 제출한다. 먼저 끝난 쪽이 이기고 진 쪽은 취소(가능하면)하거나 버린다.
+
+선택 근거는 ``RoutedResult.metadata["route"]`` 로 남긴다. ``cancel`` 이 켜지면 진행 중인 모든 시도를
+취소하고 헤지도 더 띄우지 않는다.
+"""
+
+import os
+import queue
+import threading
+import time
+from dataclasses import asdict, dataclass, field, replace
+from typing import Any, Dict, List, Mapping, Optional
+
+from src.utils.tracing import span
+
+from .base import Engine, EngineError, EngineRequest, VendorEngine, request_variants, variant_paths
+from .scheduler import VendorScheduler, get_scheduler
+from .stats import EngineStats
+
+# 호출자 취소를 확인하는 간격
+CANCEL_POLL_S = 0.2
+
+
+@dataclass
+class Candidate:
+    engine: str
+    p50_s: float
+    p90_s: float
+    success_rate: float
+    expected_s: float  # p50 / 성공률 (실패 후 재시도 비용 반영)
+    samples: int
+    source: str  # "stats" | "prior"
+    eligible: bool
+    note: str = ""
+
+
+@dataclass
+class RouteDecision:
+    primary: str
+    hedge: Optional[str]
+    hedge_after_s: Optional[float]
+    deadline_s: Optional[float]
+    reason: str
+    candidates: List[Candidate] = field(default_factory=list)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class RoutedResult:
+    output_path: str
+    engine: str
+    metadata: Dict[str, Any]
+
+
+class _Attempt:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.started = threading.Event()
+        self.cancel = threading.Event()
+        self.t0 = time.monotonic()
+        self.status = "running"
+        self.elapsed_s: Optional[float] = None
+
+
+def _attempt_path(output_path: str, engine: str) -> str:
+    root, ext = os.path.splitext(output_path)
+    return f"{root}.{engine}{ext or '.mp4'}"
+
+
+class Router:
+    def __init__(
+        self,
+        scheduler: Optional[VendorScheduler] = None,
+        stats: Optional[EngineStats] = None,
+        hedge_quantile: float = 0.9,
+        min_samples: int = 5,
+    ) -> None:
+        self.scheduler = scheduler or get_scheduler()
+        self.stats = stats or self.scheduler.stats
+        self.hedge_quantile = hedge_quantile
+        self.min_samples = min_samples
+
+    # ---------- 선택 ----------
+    def predict(self, engine: Engine, request: EngineRequest, deadline_s: Optional[float]) -> Candidate:
+        caps = engine.capabilities
+        n = self.stats.samples(engine.name)
+        p50 = self.stats.latency(engine.name, 0.5) if n >= self.min_samples else None
+        p90 = self.stats.latency(engine.name, 0.9) if n >= self.min_samples else None
+        source = "stats" if p50 is not None else "prior"
+        if p50 is None:
+            p50, p90 = caps.expected_latency_s, caps.expected_latency_s * 1.5
+        rate = self.stats.success_rate(engine.name)
+        cand = Candidate(
+            engine=engine.name,
+            p50_s=round(p50, 1),
+            p90_s=round(p90, 1),
+            success_rate=round(rate, 3),
+            expected_s=round(p50 / max(rate, 0.05), 1),
+            samples=n,
+            source=source,
+            eligible=True,
+        )
+        if not caps.supports(request.ratio, request.duration):
+            cand.eligible, cand.note = False, f"미지원 ratio/duration ({request.ratio}, {request.duration}s)"
+        elif deadline_s is not None and p90 > deadline_s:
+            cand.eligible, cand.note = False, f"p90 {p90:.0f}s > 마감 {deadline_s:.0f}s"
+        return cand
+
+    def choose(
+        self,
+        engines: Mapping[str, Engine],
+        request: EngineRequest,
+        deadline_s: Optional[float] = None,
+        hedge: bool = True,
+    ) -> RouteDecision:
+        if not engines:
+            raise ValueError("후보 엔진이 없습니다")
+        cands = [self.predict(e, request, deadline_s) for e in engines.values()]
+        eligible = sorted((c for c in cands if c.eligible), key=lambda c: c.expected_s)
+        # 마감 밖 엔진도 헤지 후보로는 남긴다 (1순위가 막히면 늦더라도 결과는 필요)
+        late = sorted((c for c in cands if not c.eligible and not c.note.startswith("미지원")), key=lambda c: c.p90_s)
+        if eligible:
+            ranked = eligible + late
+            top = ranked[0]
+            reason = (
+                f"{top.engine}: 기대 {top.expected_s:.0f}s (p50 {top.p50_s:.0f}s / 성공률 {top.success_rate:.0%}, "
+                f"{top.source} {top.samples}건)"
+            )
+            if deadline_s is not None:
+                reason += f", p90 {top.p90_s:.0f}s ≤ 마감 {deadline_s:.0f}s"
+        else:
+            ranked = late or sorted(cands, key=lambda c: c.p90_s)
+            top = ranked[0]
+            reason = f"마감 안에 드는 엔진 없음 → p90 최단 {top.engine} ({top.p90_s:.0f}s)"
+        backup = ranked[1].engine if hedge and len(ranked) > 1 else None
+        hedge_after = None
+        if backup:
+            queue_q = self.stats.queue_time(top.engine, self.hedge_quantile)
+            if queue_q is None or self.stats.samples(top.engine) < self.min_samples:
+                queue_q = engines[top.engine].capabilities.expected_latency_s * 0.25
+            hedge_after = round(queue_q, 1)
+        return RouteDecision(top.engine, backup, hedge_after, deadline_s, reason, cands)
+
+    # ---------- 실행 ----------
+    def run(
+        self,
+        engines: Mapping[str, Engine],
+        request: EngineRequest,
+        deadline_s: Optional[float] = None,
+        hedge: bool = True,
+        cancel: Optional[threading.Event] = None,
+    ) -> RoutedResult:
+        decision = self.choose(engines, request, deadline_s, hedge)
+        if deadline_s is not None and request.tag.deadline_at is None:
+            # 슬롯 대기열도 같은 마감을 보도록
+            request = replace(request, tag=replace(request.tag, deadline_at=time.time() + deadline_s))
+        results: "queue.Queue" = queue.Queue()
+        attempts: Dict[str, _Attempt] = {}
+        t0 = time.monotonic()
+
+        def launch(name: str) -> None:
+            att = attempts[name] = _Attempt(name)
+            engine = engines[name]
+            req = replace(request, output_path=_attempt_path(request.output_path, name))
+            if not isinstance(engine, VendorEngine):
+                att.started.set()  # 로컬 엔진은 대기열이 없다
+
+            def on_status(status) -> None:
+                if status.state != "queued":
+                    att.started.set()
+
+            def target() -> None:
+                try:
+                    path = self.scheduler.run(engine, req, on_status=on_status, cancel=att.cancel)
+                except BaseException as e:
+                    results.put((name, None, e))
+                    return
+                if att.cancel.is_set():
+                    # 취소가 늦게 도착해 결과가 생긴 경우 (진 쪽) → 변형까지 버린다
+                    for p in variant_paths(path, request_variants(req)):
+                        if os.path.exists(p):
+                            os.remove(p)
+                    results.put((name, None, EngineError("cancelled")))
+                    return
+                results.put((name, path, None))
+
+            threading.Thread(target=target, name=f"route-{name}", daemon=True).start()
+
+        hedge_reason = ""
+        winner: Optional[str] = None
+        winner_path: Optional[str] = None
+        errors: Dict[str, str] = {}
+        with span("router.run", primary=decision.primary, hedge=decision.hedge) as sp:
+            launch(decision.primary)
+            can_hedge = decision.hedge is not None
+            # 지연 헤지 타이머. 창이 지나도 2순위를 띄우지 않았으면 실패 헤지는 남긴다
+            timer = can_hedge
+            while len(errors) < len(attempts):
+                if cancel is not None and cancel.is_set():
+                    for att in attempts.values():
+                        att.cancel.set()
+                    can_hedge = timer = False
+                timeout = None
+                if timer:
+                    timeout = max(0.0, t0 + decision.hedge_after_s - time.monotonic())
+                if cancel is not None and not cancel.is_set():
+                    timeout = CANCEL_POLL_S if timeout is None else min(timeout, CANCEL_POLL_S)
+                try:
+                    name, path, err = results.get(timeout=timeout)
+                except queue.Empty:
+                    if not timer or time.monotonic() < t0 + decision.hedge_after_s:
+                        continue
+                    timer = False
+                    if not attempts[decision.primary].started.is_set():
+                        can_hedge = False
+                        hedge_reason = f"{decision.primary} 이(가) {decision.hedge_after_s:.0f}s 안에 시작하지 않음"
+                        launch(decision.hedge)
+                    continue
+                att = attempts[name]
+                att.elapsed_s = round(time.monotonic() - att.t0, 2)
+                if err is None:
+                    winner, winner_path = name, path
+                    att.status = "won"
+                    break
+                att.status = "cancelled" if att.cancel.is_set() else "failed"
+                errors[name] = str(err)[:200]
+                if can_hedge and name == decision.primary:
+                    can_hedge = timer = False
+                    hedge_reason = f"{decision.primary} 실패: {errors[name]}"
+                    launch(decision.hedge)
+            for other in attempts.values():
+                if other.name != winner and other.status == "running":
+                    other.cancel.set()
+                    other.status = "cancelled"
+            sp.set(winner=winner, hedged=len(attempts) > 1)
+
+        metadata = {
+            "route": decision.as_dict(),
+            "winner": winner,
+            "hedged": len(attempts) > 1,
+            "hedge_reason": hedge_reason,
+            "attempts": {a.name: {"status": a.status, "elapsed_s": a.elapsed_s} for a in attempts.values()},
+            "errors": errors,
+            "elapsed_s": round(time.monotonic() - t0, 2),
+        }
+        if winner is None:
+            if cancel is not None and cancel.is_set():
+                raise EngineError("cancelled")
+            raise EngineError(f"모든 엔진 실패: {errors}")
+        # 이긴 쪽 결과를 변형까지 원래 경로로 (없는 변형은 건너뛴다)
+        n = request_variants(request)
+        for src, dst in zip(variant_paths(winner_path, n), variant_paths(request.output_path, n)):
+            if src == winner_path or os.path.exists(src):
+                os.replace(src, dst)
+        return RoutedResult(request.output_path, winner, metadata)
@@ -0,0 +1,109 @@
+"""Runway image_to_video 엔진."""
+
+import os
+from typing import Any, Optional
+
+from src.generators.runway.video import RunwayVideoGenerator
+from src.utils.progress import ProgressReporter
+
+from . import capabilities as caps
+from .base import EngineRequest, JobHandle, JobStatus, VendorEngine
+from .jobs import callback_url
+
+
+# 모델별 초당 크레딧 (Runway 가격표 기준)
+CREDITS_PER_SECOND = {"gen3a_turbo": 5.0, "gen4_turbo": 5.0, "veo3": 40.0}
+
+
+class RunwayEngine(VendorEngine):
+    name = "runway"
+    capabilities = caps.RUNWAY
+    poll_interval_s = 10.0
+    timeout_s = 1800.0
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "gen3a_turbo",
+        force_live: bool = False,
+        reporter: Optional[ProgressReporter] = None,
+    ) -> None:
+        super().__init__(reporter)
+        self.model = model
+        self.force_live = force_live
+        self.generator = RunwayVideoGenerator(api_key=api_key, reporter=reporter)
+
+    @property
+    def live(self) -> bool:
+        return self.generator.live_mode or self.force_live
+
+    def credit_balance(self) -> float:
+        return float(self.generator.get_organization().get("creditBalance", 0) or 0)
+
+    def estimate_cost(self, request: EngineRequest) -> float:
+        model = request.options.get("model", self.model)
+        duration = request.duration
+        # 생성기와 같은 duration 보정 (veo3 8초 고정, gen3a_turbo 5/10)
+        if model == "veo3":
+            duration = 8
+        elif duration not in ((5, 10) if model == "gen3a_turbo" else (5, 8, 10)):
+            duration = 10
+        return CREDITS_PER_SECOND.get(model, self.capabilities.cost_per_second) * duration
+
+    def submit(self, request: EngineRequest) -> JobHandle:
+        if not request.image_path:
+            raise ValueError("Runway 엔진은 image_path 가 필요합니다")
+        # 콜백 필드는 계정별 기능이라 RUNWAY_WEBHOOK=1 일 때만 싣는다
+        url = callback_url(self.name) if os.getenv("RUNWAY_WEBHOOK") == "1" else None
+        task_id = self.generator.start_task(
+            image_path=request.image_path,
+            duration=request.duration,
+            seed=request.seed,
+            prompt=request.prompt or None,
+            model=request.options.get("model", self.model),
+            ratio=request.ratio,
+            force_live=self.force_live,
+            callback_url=url,
+        )
+        self.reporter.info(f"🚀 생성 작업 시작: {task_id}", task_id=task_id)
+        return JobHandle(self.name, task_id, webhook=url is not None)
+
+    def poll(self, handle: JobHandle) -> JobStatus:
+        return self._status(self.generator.get_task(handle.job_id))
+
+    def status_from_webhook(self, handle: JobHandle, payload: Any) -> Optional[JobStatus]:
+        # 콜백 본문은 GET /v1/tasks/{id} 응답과 같은 task
+        return self._status(payload) if payload.get("status") else None
+
+    def _status(self, data) -> JobStatus:
+        state = self.generator.task_state(data)
+        url = self.generator.extract_video_url(data) if state == "succeeded" else None
+        if state == "succeeded" and not url:
+            return JobStatus("failed", error=f"비디오 URL을 찾을 수 없습니다: {data}", raw=data)
+        return JobStatus(state, result_url=url, error=data.get("failure") or data.get("error"), raw=data)
+
+    def fetch(self, handle: JobHandle, status: JobStatus, output_path: str) -> str:
+        self.generator.download_video(status.result_url, output_path)
+        return output_path
+
+    def cancel(self, handle: JobHandle) -> bool:
+        try:
+            self.generator.cancel_task(handle.job_id)
+            return True
+        except Exception as e:
+            self.reporter.warning(f"⚠️ Runway 작업 취소 실패: {e}", task_id=handle.job_id)
+            return False
+
+    def run(self, request: EngineRequest) -> str:
+        if not self.live:
+            # 라이브 차단 상태: 생성기의 드라이런(플레이스홀더) 경로
+            return self.generator.generate_video_from_image(
+                image_path=request.image_path,
+                output_path=request.output_path,
+                duration=request.duration,
+                prompt=request.prompt or None,
+                model=request.options.get("model", self.model),
+                ratio=request.ratio,
+                dry_run=True,
+            )
+        return super().run(request)
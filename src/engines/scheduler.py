@@ -0,0 +1,419 @@
+"""벤더 스케줄러 (크레딧 캐시 + 토큰 버킷 + 동시 실행 상한).
+
+작업 하나가 벤더로 나가기까지:
+
+1) 예상 비용(``engine.estimate_cost``)을 캐시된 크레딧 잔액과 비교 (부족하면 ``InsufficientCredits``)
+2) 벤더별 in-flight 슬롯 대기 — 초과분은 여기서 줄을 선다
+3) 토큰 버킷에서 제출 토큰 1개 획득
+4) 제출. 429 면 ``Retry-After`` 만큼 버킷 전체를 멈추고 재시도 (지수 백오프 상한)
+5) 폴링/다운로드는 엔진 공통 흐름 (폴링 429 도 ``Retry-After`` 로 대기)
+
+크레딧 잔액은 ``credit_ttl_s`` 동안 캐시하고, 그 사이에 나간 작업의 예상 비용은
+로컬에서 차감해 둔다 (실패한 작업은 되돌림).
+한 프로세스(Streamlit 세션 전체)가 ``get_scheduler()`` 하나를 공유한다.
+
+한도는 환경변수로 덮어쓸 수 있다: ``{ENGINE}_RATE_PER_MIN``, ``{ENGINE}_BURST``,
+``{ENGINE}_MAX_INFLIGHT``, ``{ENGINE}_CREDIT_TTL`` (예: ``RUNWAY_MAX_INFLIGHT=2``).
+
+슬롯 대기 순서는 ``FairQueue`` (우선순위 등급 → 마감 → 사용자별 공정 분배, ``request.tag``).
+로컬 렌더는 엔진별 ``cpu_slots`` 만큼 공용 CPU 슬롯(``CPU_SLOTS``, 기본 코어 수)을 잡는다.
+
+같은 엔진/입력(이미지 내용, 프롬프트, 시드 등)의 요청이 동시에 들어오면 한 번만
+실행하고 나머지는 그 결과를 복사해 받는다 (``SingleFlight``, 출력 경로는 지문에서 제외).
+복사는 리더가 돌아가기 전에 끝내 둔다 (리더 작업 공간이 지워져도 팔로워 결과는 남는다).
+"""
+
+import asyncio
+import logging
+import os
+import random
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, Optional
+
+from src.utils.metrics import QUEUED_JOBS, RATE_LIMITED, VENDOR_CREDITS, track_vendor_job
+from src.utils.singleflight import SingleFlight, file_digest, fingerprint
+from src.utils.tracing import span
+
+from .base import (
+    Engine,
+    EngineCancelled,
+    EngineError,
+    EngineRequest,
+    InsufficientCredits,
+    JobStatus,
+    QueueTag,
+    VendorEngine,
+    request_variants,
+    retry_after_of,
+    variant_paths,
+)
+from .fairqueue import FairQueue
+from .stats import EngineStats, Outcome, get_stats
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class VendorLimits:
+    rate_per_min: float = 10.0  # 제출 토큰 보충 속도
+    burst: int = 2  # 버킷 크기
+    max_in_flight: int = 2  # 동시에 진행 중인 작업 수
+    credit_ttl_s: float = 300.0  # 크레딧 잔액 캐시 시간
+    max_retries: int = 5  # 제출 429 재시도 횟수
+    backoff_base_s: float = 2.0
+    max_backoff_s: float = 60.0
+
+    @classmethod
+    def from_env(cls, engine: str, base: "VendorLimits") -> "VendorLimits":
+        prefix = engine.upper()
+        overrides = {}
+        for field_name, env, cast in (
+            ("rate_per_min", "RATE_PER_MIN", float),
+            ("burst", "BURST", int),
+            ("max_in_flight", "MAX_INFLIGHT", int),
+            ("credit_ttl_s", "CREDIT_TTL", float),
+        ):
+            value = os.getenv(f"{prefix}_{env}")
+            if value:
+                overrides[field_name] = cast(value)
+        return replace(base, **overrides)
+
+
+CPU_SLOTS = int(os.getenv("CPU_SLOTS", "0")) or (os.cpu_count() or 2)
+
+DEFAULT_LIMITS: Dict[str, VendorLimits] = {
+    "runway": VendorLimits(rate_per_min=10, burst=2, max_in_flight=3),
+    "higgs": VendorLimits(rate_per_min=20, burst=4, max_in_flight=4),
+    "veo": VendorLimits(rate_per_min=10, burst=2, max_in_flight=2),
+}
+
+
+class TokenBucket:
+    """스레드 안전 토큰 버킷. ``pause(s)`` 로 429 이후 모든 대기자를 함께 멈춘다."""
+
+    def __init__(self, rate_per_s: float, burst: int, clock=time.monotonic) -> None:
+        self.rate = rate_per_s
+        self.capacity = max(1, burst)
+        self._clock = clock
+        self._tokens = float(self.capacity)
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """토큰을 하나 가져가면 0, 아니면 다시 시도할 때까지의 초."""
+        with self._lock:
+            now = self._clock()
+            if now < self._paused_until:
+                return self._paused_until - now
+            self._refill(now)
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate if self.rate > 0 else 1.0
+
+    def pause(self, seconds: float) -> None:
+        """``seconds`` 동안 토큰을 내주지 않고, 재개 시점엔 한 건(재시도)만 허용한다."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+            self._tokens = 1.0
+            self._updated = self._paused_until
+
+    def acquire(self, timeout_s: Optional[float] = None) -> bool:
+        deadline = None if timeout_s is None else self._clock() + timeout_s
+        while True:
+            wait_s = self.reserve()
+            if wait_s <= 0:
+                return True
+            if deadline is not None and self._clock() + wait_s > deadline:
+                return False
+            time.sleep(wait_s)
+
+
+_MISS = object()
+
+
+class CreditCache:
+    """벤더 크레딧 잔액 캐시. 캐시 기간 동안 나간 작업 비용은 로컬에서 차감한다."""
+
+    def __init__(self, engine: str, ttl_s: float) -> None:
+        self.engine = engine
+        self.ttl_s = ttl_s
+        self._balance: Optional[float] = None
+        self._fetched_at = 0.0
+        self._reserved = 0.0
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    def _cached(self):
+        """캐시가 유효하면 남은 잔액(또는 None), 만료면 ``_MISS``."""
+        with self._lock:
+            if self._fetched_at and time.monotonic() - self._fetched_at < self.ttl_s:
+                return None if self._balance is None else self._balance - self._reserved
+            return _MISS
+
+    def balance(self, source: Engine, force: bool = False) -> Optional[float]:
+        """남은 잔액 (캐시 만료 시 ``source.credit_balance()`` 로 갱신). 조회 불가면 None."""
+        cached = _MISS if force else self._cached()
+        if cached is not _MISS:
+            return cached
+        # 동시에 만료를 본 작업들이 한 번만 조회하도록
+        with self._refresh_lock:
+            cached = _MISS if force else self._cached()
+            if cached is not _MISS:
+                return cached
+            value = source.credit_balance()
+            with self._lock:
+                self._fetched_at = time.monotonic()
+                self._balance = value
+                self._reserved = 0.0
+            if value is not None:
+                VENDOR_CREDITS.set(value, engine=self.engine)
+            return value
+
+    def reserve(self, cost: float, source: Engine) -> None:
+        if self.balance(source) is None:
+            return
+        with self._lock:
+            remaining = self._balance - self._reserved
+            if remaining - cost < 0:
+                raise InsufficientCredits(
+                    f"{self.engine} 크레딧 부족: 잔액 {remaining:g}, 예상 비용 {cost:g}"
+                )
+            self._reserved += cost
+
+    def release(self, cost: float) -> None:
+        """실패한 작업의 예약분을 돌려놓는다."""
+        with self._lock:
+            self._reserved = max(0.0, self._reserved - cost)
+
+
+class _Vendor:
+    def __init__(self, name: str, limits: VendorLimits) -> None:
+        self.name = name
+        self.limits = limits
+        self.bucket = TokenBucket(limits.rate_per_min / 60.0, limits.burst)
+        self.slots = FairQueue(name, limits.max_in_flight)
+        self.credits = CreditCache(name, limits.credit_ttl_s)
+
+
+class VendorScheduler:
+    def __init__(self, limits: Optional[Dict[str, VendorLimits]] = None, stats: Optional[EngineStats] = None) -> None:
+        self._limits = dict(DEFAULT_LIMITS, **(limits or {}))
+        self.stats = stats or get_stats()
+        self._vendors: Dict[str, _Vendor] = {}
+        self._lock = threading.Lock()
+        self._flight: SingleFlight[str] = SingleFlight("engine")
+        self.cpu = FairQueue("cpu", CPU_SLOTS)
+
+    def vendor(self, name: str) -> _Vendor:
+        with self._lock:
+            v = self._vendors.get(name)
+            if v is None:
+                base = self._limits.get(name, VendorLimits())
+                v = self._vendors[name] = _Vendor(name, VendorLimits.from_env(name, base))
+            return v
+
+    def credits(self, engine: Engine, force: bool = False) -> Optional[float]:
+        """캐시된 크레딧 잔액 (화면 표시용)."""
+        return self.vendor(engine.name).credits.balance(engine, force=force)
+
+    @contextmanager
+    def _slot(
+        self, queue: FairQueue, tag: QueueTag, slots: int = 1, cost: float = 1.0, cancel: Optional[threading.Event] = None
+    ):
+        QUEUED_JOBS.inc(engine=queue.name)
+        try:
+            with span("scheduler.wait_slot", engine=queue.name, priority=tag.priority, user=tag.user):
+                ticket = queue.acquire(tag, slots, cost, cancel)
+        finally:
+            QUEUED_JOBS.dec(engine=queue.name)
+        try:
+            yield
+        finally:
+            queue.release(ticket)
+
+    def queues(self) -> Dict[str, dict]:
+        """벤더/CPU 대기열 상태 (``GET /queues``, ``scripts/queue_status.py``)."""
+        with self._lock:
+            vendors = list(self._vendors.values())
+        out = {v.name: v.slots.snapshot() for v in vendors}
+        out["cpu"] = self.cpu.snapshot()
+        return out
+
+    def _submit(self, v: _Vendor, engine: VendorEngine, request: EngineRequest):
+        attempt = 0
+        while True:
+            with span("scheduler.wait_token", engine=v.name):
+                v.bucket.acquire()
+            try:
+                return engine.submit(request)
+            except Exception as e:
+                wait_s = retry_after_of(e)
+                if wait_s is None or attempt >= v.limits.max_retries:
+                    raise
+                attempt += 1
+                # Retry-After 와 지수 백오프 중 큰 값 (+지터), 버킷 전체를 멈춘다
+                exp = v.limits.backoff_base_s * 2 ** (attempt - 1)
+                backoff = min(v.limits.max_backoff_s, max(wait_s, exp) + random.uniform(0, 0.1 * exp))
+                RATE_LIMITED.inc(engine=v.name, call="submit")
+                logger.warning("%s 429: %.1fs 후 재시도 (%d/%d)", v.name, backoff, attempt, v.limits.max_retries)
+                engine.reporter.warning(f"⏳ {v.name} 요청 한도 초과, {backoff:.0f}초 후 재시도", attempt=attempt)
+                v.bucket.pause(backoff)
+
+    def run(
+        self,
+        engine: Engine,
+        request: EngineRequest,
+        *,
+        on_status: Optional[Callable[[JobStatus], None]] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> str:
+        """한도를 지켜 작업을 실행하고 결과 경로를 돌려준다. 로컬 엔진은 그대로 실행.
+
+        끝난 작업(취소 제외)의 지연/대기/성공 여부는 ``stats`` 에 남는다.
+        같은 요청이 이미 진행 중이면 새로 제출하지 않고, 리더가 자기 결과를 돌려주기 전에
+        (변형 포함) 이쪽 ``output_path`` 로 복사해 둔다 — 리더 작업 공간이 곧 지워질 수 있다.
+        """
+        key = request_key(engine, request)
+        while True:
+            try:
+                path, shared = self._flight.do(
+                    key,
+                    lambda: self._run(engine, request, on_status=on_status, cancel=cancel),
+                    cancel=cancel,
+                    join=request,
+                    fan_out=lambda path, follower: share_result(engine.name, path, follower),
+                )
+            except InterruptedError as e:
+                raise EngineCancelled(str(e)) from None
+            except EngineCancelled:
+                if cancel is not None and cancel.is_set():
+                    raise
+                continue  # 붙어 있던 리더가 취소됐을 뿐 — 직접 다시 실행
+            break
+        if shared:
+            engine.reporter.info(f"🔗 {engine.name}: 진행 중인 동일 요청 결과를 공유했습니다", path=path)
+        return path
+
+    def _run(
+        self,
+        engine: Engine,
+        request: EngineRequest,
+        *,
+        on_status: Optional[Callable[[JobStatus], None]] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> str:
+        if not isinstance(engine, VendorEngine):
+            return self._run_local(engine, request, cancel)
+        if not engine.live:
+            # 드라이런(플레이스홀더)은 한도/통계 대상이 아니다
+            return engine.run(request)
+        v = self.vendor(engine.name)
+        cost = engine.estimate_cost(request)
+        v.credits.reserve(cost, engine)
+        submitted_at: Optional[float] = None
+        started_at: Optional[float] = None
+
+        def _on_status(status: JobStatus) -> None:
+            nonlocal started_at
+            if started_at is None and status.state != "queued":
+                started_at = time.monotonic()
+            if on_status is not None:
+                on_status(status)
+
+        try:
+            share = engine.capabilities.expected_latency_s  # 공정 분배 단위: 예상 소요 시간
+            with self._slot(v.slots, request.tag, cost=share, cancel=cancel), track_vendor_job(engine.name):
+                if cancel is not None and cancel.is_set():
+                    raise EngineCancelled(f"{v.name} 제출 전 취소됨")
+                handle = self._submit(v, engine, request)
+                submitted_at = time.monotonic()
+                status = engine.wait(handle, on_status=_on_status, cancel=cancel)
+                path = engine.fetch(handle, status, request.output_path)
+        except BaseException as e:
+            v.credits.release(cost)
+            if submitted_at is not None and not isinstance(e, EngineCancelled):
+                self.stats.record(Outcome(engine.name, False, time.monotonic() - submitted_at, error=str(e)[:200]))
+            raise
+        now = time.monotonic()
+        queue_s = (started_at or now) - submitted_at
+        self.stats.record(Outcome(engine.name, True, now - submitted_at, queue_s=queue_s))
+        return path
+
+    def _run_local(self, engine: Engine, request: EngineRequest, cancel: Optional[threading.Event] = None) -> str:
+        caps = engine.capabilities
+        slots = max(1, caps.cpu_slots)
+        with self._slot(self.cpu, request.tag, slots, cost=caps.expected_latency_s * slots, cancel=cancel):
+            return self._render_local(engine, request)
+
+    def _render_local(self, engine: Engine, request: EngineRequest) -> str:
+        t0 = time.monotonic()
+        try:
+            path = engine.run(request)
+        except Exception as e:
+            self.stats.record(Outcome(engine.name, False, time.monotonic() - t0, error=str(e)[:200]))
+            raise
+        self.stats.record(Outcome(engine.name, True, time.monotonic() - t0, queue_s=0.0))
+        return path
+
+    async def arun(self, engine: Engine, request: EngineRequest, **kwargs) -> str:
+        return await asyncio.to_thread(self.run, engine, request, **kwargs)
+
+
+def share_result(engine_name: str, path: str, request: EngineRequest) -> str:
+    """리더 결과(+변형)를 팔로워 ``request.output_path`` 로 복사. 0번이 없으면 ``EngineError``."""
+    if os.path.abspath(path) == os.path.abspath(request.output_path):
+        return path
+    os.makedirs(os.path.dirname(os.path.abspath(request.output_path)), exist_ok=True)
+    n = request_variants(request)
+    for i, (src, dst) in enumerate(zip(variant_paths(path, n), variant_paths(request.output_path, n))):
+        if os.path.isfile(src):
+            shutil.copyfile(src, dst)
+        elif i == 0:
+            raise EngineError(f"{engine_name}: 공유할 결과 파일이 없습니다 ({src})")
+        # 변형을 모르는 엔진은 0번만 만든다
+    return request.output_path
+
+
+def request_key(engine: Engine, request: EngineRequest) -> str:
+    """단일 비행 키: 엔진(+모델) + 출력 경로를 뺀 입력. 이미지는 경로 대신 내용 해시."""
+    image = request.image_path
+    if image and os.path.isfile(image):
+        image = file_digest(image)
+    return fingerprint(
+        engine.name,
+        getattr(engine, "model", None),
+        getattr(engine, "live", None),
+        image=image,
+        image_url=request.image_url,
+        prompt=request.prompt,
+        ratio=request.ratio,
+        duration=request.duration,
+        seed=request.seed,
+        motion=request.motion,
+        options=request.options,
+    )
+
+
+_scheduler: Optional[VendorScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> VendorScheduler:
+    """프로세스 공용 스케줄러."""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = VendorScheduler()
+    return _scheduler
@@ -0,0 +1,137 @@
+"""엔진별 지연/실패 통계.
+
+스케줄러가 작업이 끝날 때마다 ``record`` 하고, 라우터가 분위수와 성공률로
+엔진을 고른다. 최근 ``window`` 건만 메모리에 두고, ``path`` 가 있으면 JSONL 로
+덧붙여 재시작 후에도 이어서 쓴다 (``ENGINE_STATS_FILE``, 빈 값이면 저장 안 함).
+파일 줄 수가 들고 있는 기록의 두 배를 넘으면 엔진별 최근 ``window`` 건으로 다시 쓴다.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from dataclasses import asdict, dataclass
+from typing import Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+ENGINE_STATS_FILE = os.getenv("ENGINE_STATS_FILE", os.path.join("logs", "engine_stats.jsonl"))
+
+
+@dataclass
+class Outcome:
+    engine: str
+    ok: bool
+    latency_s: float  # 제출(또는 렌더 시작) → 결과 파일
+    queue_s: Optional[float] = None  # 제출 → 벤더가 실행을 시작한 시점
+    ts: float = 0.0
+    error: str = ""
+
+
+def quantile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    pos = q * (len(ordered) - 1)
+    lo = int(pos)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+
+
+class EngineStats:
+    def __init__(self, path: Optional[str] = ENGINE_STATS_FILE, window: int = 200) -> None:
+        self.path = path or None
+        self.window = window
+        self._outcomes: Dict[str, Deque[Outcome]] = defaultdict(lambda: deque(maxlen=window))
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._lines = 0  # 파일 줄 수
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    self._lines += 1
+                    try:
+                        o = Outcome(**json.loads(line))
+                    except (TypeError, ValueError):
+                        continue
+                    self._outcomes[o.engine].append(o)
+        except OSError as e:
+            logger.warning("엔진 통계 로드 실패 (%s): %s", self.path, e)
+            return
+        self._maybe_compact()
+
+    def _maybe_compact(self) -> None:
+        kept = sum(len(d) for d in self._outcomes.values())
+        if self._lines <= 2 * max(kept, self.window):
+            return
+        records = sorted((o for d in self._outcomes.values() for o in d), key=lambda o: o.ts)
+        tmp = f"{self.path}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                for o in records:
+                    f.write(json.dumps(asdict(o), ensure_ascii=False) + "\n")
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning("엔진 통계 정리 실패 (%s): %s", self.path, e)
+            return
+        self._lines = len(records)
+
+    def record(self, outcome: Outcome) -> None:
+        outcome.ts = outcome.ts or time.time()
+        with self._lock:
+            self._load()
+            self._outcomes[outcome.engine].append(outcome)
+            if not self.path:
+                return
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(asdict(outcome), ensure_ascii=False) + "\n")
+            except OSError as e:
+                logger.warning("엔진 통계 기록 실패 (%s): %s", self.path, e)
+                return
+            self._lines += 1
+            self._maybe_compact()
+
+    def outcomes(self, engine: str) -> List[Outcome]:
+        with self._lock:
+            self._load()
+            return list(self._outcomes.get(engine, ()))
+
+    def latency(self, engine: str, q: float) -> Optional[float]:
+        """성공한 작업의 지연 분위수 (표본 없으면 None)."""
+        return quantile([o.latency_s for o in self.outcomes(engine) if o.ok], q)
+
+    def queue_time(self, engine: str, q: float) -> Optional[float]:
+        return quantile([o.queue_s for o in self.outcomes(engine) if o.queue_s is not None], q)
+
+    def success_rate(self, engine: str) -> float:
+        """보정 성공률 (성공 2건을 미리 깔아 둔다: 표본이 없으면 1.0, 초반 실패 1건에 과민하지 않게)."""
+        outs = self.outcomes(engine)
+        return (sum(1 for o in outs if o.ok) + 2) / (len(outs) + 2)
+
+    def samples(self, engine: str) -> int:
+        return len(self.outcomes(engine))
+
+
+_stats: Optional[EngineStats] = None
+_stats_lock = threading.Lock()
+
+
+def get_stats() -> EngineStats:
+    """프로세스 공용 통계 저장소."""
+    global _stats
+    if _stats is None:
+        with _stats_lock:
+            if _stats is None:
+                _stats = EngineStats(ENGINE_STATS_FILE)
+    return _stats
@@ -0,0 +1,95 @@
+"""Veo (google-genai generate_videos) 엔진.
+
+``src/generators/gemini/`` 의 실험용 스크립트들은 그대로 두고,
+앱/배치에서 쓰는 Veo 경로는 이 엔진 하나로 모은다.
+
+변형(A/B) 모드: ``options["variants"] = n`` 이면 한 작업으로 n 편을 만든다.
+모델이 허용하는 만큼(``number_of_videos``) 한 작업에 묶고, 나머지는 작업을 더 제출해
+같이 기다린다. ``options["variant_prompts"]`` 를 주면 변형마다 프롬프트를 돌려 쓴다
+(프롬프트가 같은 변형끼리만 한 작업에 묶인다). 결과는 동시에 내려받아
+``variant_paths(output_path, n)`` 에 저장한다. 작업 묶기/대기/저장은 ``src.utils.veo_operations``.
+"""
+
+from typing import Optional
+
+from src.utils.clients import get_genai_client
+from src.utils.progress import ProgressReporter
+from src.utils.veo_operations import (
+    generated_videos,
+    max_videos_per_operation,
+    plan_operations,
+    refresh_operations,
+    save_variants,
+    submit_operations,
+)
+
+from . import capabilities as caps
+from .base import EngineRequest, JobHandle, JobStatus, VendorEngine, request_variants
+
+
+# Veo 는 W:H 가 아니라 "9:16" 형식
+_ASPECT = {"720:1280": "9:16", "1280:720": "16:9"}
+
+
+class VeoEngine(VendorEngine):
+    name = "veo"
+    capabilities = caps.VEO
+    poll_interval_s = 10.0
+    timeout_s = 600.0
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "veo-3.0-fast-generate-001",
+        resolution: str = "720p",
+        reporter: Optional[ProgressReporter] = None,
+    ) -> None:
+        super().__init__(reporter)
+        self.api_key = api_key
+        self.model = model
+        self.resolution = resolution
+
+    @property
+    def client(self):
+        return get_genai_client(self.api_key)
+
+    def estimate_cost(self, request: EngineRequest) -> float:
+        return super().estimate_cost(request) * request_variants(request)
+
+    def submit(self, request: EngineRequest) -> JobHandle:
+        from google.genai import types
+
+        image = None
+        if request.image_path:
+            image = types.Image.from_file(location=request.image_path)
+        model = request.options.get("model", self.model)
+        n = request_variants(request)
+        prompts = list(request.options.get("variant_prompts") or []) or [request.prompt]
+        plan = plan_operations(prompts, n, max_videos_per_operation(model))
+        operations = submit_operations(
+            self.client, model, plan, image, request.seed,
+            aspect_ratio=_ASPECT.get(request.ratio, "9:16"),
+            resolution=request.options.get("resolution", self.resolution),
+            person_generation="allow_adult",
+        )
+        names = [op.name for op in operations]
+        self.reporter.info(f"⏳ Operation started: {names[0]}", operation=names[0], operations=names, variants=n)
+        return JobHandle(self.name, names[0], raw=operations)
+
+    def poll(self, handle: JobHandle) -> JobStatus:
+        operations = refresh_operations(self.client, handle.raw)
+        handle.raw = operations
+        if not all(op.done for op in operations):
+            # Veo 는 대기열 상태를 노출하지 않아 제출 이후를 실행 구간으로 본다
+            return JobStatus("running", raw=operations)
+        for op in operations:
+            if getattr(op, "error", None):
+                return JobStatus("failed", error=str(op.error), raw=operations)
+            response = getattr(op, "response", None)
+            if not (response and getattr(response, "generated_videos", None)):
+                return JobStatus("failed", error="생성된 영상이 없습니다", raw=operations)
+        return JobStatus("succeeded", raw=operations)
+
+    def fetch(self, handle: JobHandle, status: JobStatus, output_path: str) -> str:
+        videos = generated_videos(status.raw)
+        return save_variants(self.client, videos, output_path)[0]
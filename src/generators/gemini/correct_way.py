@@ -4,6 +4,8 @@ import requests
 from google import genai
 from google.genai import types
 
+from src.utils.download import save_generated_video
+
 
 class GeminiCorrectVideoGenerator:
     def __init__(self, api_key: str = None):
@@ -74,8 +76,7 @@ class GeminiCorrectVideoGenerator:
             generated_video = operation.response.generated_videos[0]
             
             # 공식 문서 방식
-            self.client.files.download(file=generated_video.video)
-            generated_video.video.save(output_path)
+            save_generated_video(self.client, generated_video, output_path)
             
             print(f"🎉 SUCCESS! Video saved: {output_path}")
             return output_path
@@ -118,8 +119,7 @@ class GeminiCorrectVideoGenerator:
                     operation = self.client.operations.get(operation)
                 
                 generated_video = operation.response.generated_videos[0]
-                self.client.files.download(file=generated_video.video)
-                generated_video.video.save(output_path)
+                save_generated_video(self.client, generated_video, output_path)
                 
                 print(f"💾 Fallback video saved: {output_path}")
                 return output_path
@@ -1,10 +1,11 @@
 import os
 import time
-import requests
 from google import genai
-from google.genai import types
-import cv2
-import tempfile
+
+from src.core.local_analysis import get_local_analyzer
+from src.core.photo_analysis import choose_strategy
+from src.utils.download import save_generated_video
+from src.utils.gemini_assets import get_assets
 
 
 class GeminiImageVideoGenerator:
@@ -27,17 +28,22 @@ class GeminiImageVideoGenerator:
         }
 
     def analyze_image_content(self, image_url: str) -> str:
-        """이미지 내용을 분석하여 적절한 프롬프트 선택"""
+        """이미지 내용을 분석하여 적절한 프롬프트 선택 (로컬 분석기, API 호출 없음)"""
         print(f"🔍 Analyzing image content...")
         
-        # 간단한 휴리스틱으로 이미지 타입 결정
-        # 실제로는 Gemini Vision으로 분석할 수 있지만, 우선 기본 전략 사용
+        try:
+            with get_assets(self.client).use(image_url) as asset:
+                analysis = get_local_analyzer().analyze(asset.data)
+        except Exception as e:
+            print(f"⚠️ Local analysis failed, using default: {e}")
+            return "landscape"
         
-        if "people" in image_url.lower() or "person" in image_url.lower():
+        strategy = choose_strategy(analysis)
+        if strategy.startswith("people_"):
             return "people_activity"
-        elif "food" in image_url.lower() or "dish" in image_url.lower():
-            return "food_scene"  
-        elif "temple" in image_url.lower() or "palace" in image_url.lower() or "museum" in image_url.lower():
+        elif strategy == "food_close":
+            return "food_scene"
+        elif strategy in ("architecture", "indoor_cultural"):
             return "cultural_site"
         else:
             return "landscape"
@@ -48,69 +54,29 @@ class GeminiImageVideoGenerator:
         print("🎬 Starting Gemini image-based video generation...")
         print(f"📸 Image URL: {image_url}")
         
+        # 1. 이미지 분석 및 프롬프트 선택
+        content_type = self.analyze_image_content(image_url)
+        prompt = self.travel_prompts[content_type]
+        
+        print(f"🎯 Content type: {content_type}")
+        print(f"📝 Using prompt: {prompt}")
+        
         try:
-            # 1. 이미지 다운로드
+            # 2. 이미지 준비 (같은 이미지는 프로세스에서 한 번만 내려받는다)
             print("⬇️ Downloading image...")
-            response = requests.get(image_url, timeout=30)
-            response.raise_for_status()
-            
-            # 임시 파일 생성
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.jpg') as temp_file:
-                temp_file.write(response.content)
-                temp_path = temp_file.name
-            
-            print(f"💾 Image saved to: {temp_path}")
-            
-            # 2. 이미지 분석 및 프롬프트 선택
-            content_type = self.analyze_image_content(image_url)
-            prompt = self.travel_prompts[content_type]
-            
-            print(f"🎯 Content type: {content_type}")
-            print(f"📝 Using prompt: {prompt}")
-            
-            # 3. Gemini에 파일 업로드 (올바른 API 방식)
-            print("📤 Uploading to Gemini...")
-            
-            try:
-                # 최신 API 방식 시도
-                uploaded_file = self.client.files.upload(temp_path)
-                print(f"✅ File uploaded successfully: {uploaded_file.name}")
+            with get_assets(self.client).use(image_url) as asset:
+                # 3. 영상 생성 (Veo 는 Files 업로드/처리 대기 없이 이미지 바이트를 받는다)
+                print("🎬 Generating video with Veo...")
                 
-            except Exception as upload_error:
-                print(f"❌ Upload failed: {upload_error}")
-                raise upload_error
-            
-            # 4. 파일 처리 대기
-            print("⏳ Waiting for file processing...")
-            max_wait = 60  # 최대 60초 대기
-            wait_time = 0
-            
-            while uploaded_file.state.name == "PROCESSING" and wait_time < max_wait:
-                time.sleep(2)
-                wait_time += 2
-                uploaded_file = self.client.files.get(uploaded_file.name)
-                print(f"⏳ Processing... ({wait_time}s)")
-            
-            if uploaded_file.state.name == "FAILED":
-                raise Exception(f"File processing failed: {uploaded_file.error}")
-            
-            if uploaded_file.state.name == "PROCESSING":
-                print("⚠️ File still processing, proceeding anyway...")
-            
-            print(f"✅ File ready: {uploaded_file.state.name}")
-            
-            # 5. 영상 생성
-            print("🎬 Generating video with Veo...")
-            
-            operation = self.client.models.generate_videos(
-                model="veo-3.0-generate-001",
-                prompt=prompt,
-                image=uploaded_file,
-            )
+                operation = self.client.models.generate_videos(
+                    model="veo-3.0-generate-001",
+                    prompt=prompt,
+                    image=asset.image(),
+                )
             
             print(f"🚀 Video generation started: {operation.name}")
             
-            # 6. 생성 완료 대기
+            # 4. 생성 완료 대기
             max_generation_time = 300  # 5분
             wait_time = 0
             
@@ -125,20 +91,14 @@ class GeminiImageVideoGenerator:
             
             print("✅ Video generation completed!")
             
-            # 7. 결과 다운로드
+            # 5. 결과 다운로드
             generated_video = operation.response.generated_videos[0]
             
             print("💾 Downloading video...")
-            # 올바른 다운로드 방식 (video_bytes 사용)
-            with open(output_path, 'wb') as f:
-                f.write(generated_video.video.video_bytes)
+            save_generated_video(self.client, generated_video, output_path)
             
             print(f"🎉 Travel marketing video saved: {output_path}")
             
-            # 8. 정리
-            self.client.files.delete(uploaded_file.name)
-            os.unlink(temp_path)
-            
             return output_path
             
         except Exception as e:
@@ -159,8 +119,7 @@ class GeminiImageVideoGenerator:
                 operation = self.client.operations.get(operation)
             
             generated_video = operation.response.generated_videos[0]
-            with open(output_path, 'wb') as f:
-                f.write(generated_video.video.video_bytes)
+            save_generated_video(self.client, generated_video, output_path)
             
             print(f"💾 Fallback video saved: {output_path}")
             return output_path
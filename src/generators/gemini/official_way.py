@@ -1,10 +1,11 @@
 import os
 import time
-import requests
-import tempfile
 from google import genai
 from google.genai import types
 
+from src.utils.download import save_generated_video
+from src.utils.gemini_assets import get_assets
+
 
 class GeminiOfficialVideoGenerator:
     def __init__(self, api_key: str = None):
@@ -20,65 +21,42 @@ class GeminiOfficialVideoGenerator:
         print("🎬 Starting Official Gemini Video Generation...")
         print(f"📸 Image URL: {image_url}")
         
+        # 여행 마케팅 프롬프트
+        travel_prompt = """
+        Transform this travel destination into a cinematic marketing video.
+        
+        Create natural, inspiring movement:
+        - If there are people: subtle breathing, gentle expressions, natural movement
+        - If it's a landscape: gentle wind effects, soft lighting changes
+        - If it's architecture: atmospheric ambience, subtle environmental effects
+        
+        Make it feel alive and compelling for travel marketing.
+        Duration: 8 seconds, cinematic quality, inspiring wanderlust.
+        """
+        
         try:
-            # Step 1: 이미지 다운로드 및 업로드
+            # Step 1: 이미지 준비 (같은 이미지는 프로세스에서 한 번만 내려받는다)
             print("⬇️ Downloading image...")
-            response = requests.get(image_url, timeout=30)
-            response.raise_for_status()
-            
-            # 임시 파일로 저장
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.jpg') as temp_file:
-                temp_file.write(response.content)
-                temp_path = temp_file.name
-            
-            print(f"💾 Image saved: {temp_path}")
-            
-            # Step 2: Gemini에 파일 업로드 (공식 방식)
-            print("📤 Uploading to Gemini...")
-            uploaded_file = self.client.files.upload(file=temp_path)
-            print(f"✅ File uploaded: {uploaded_file.name}")
-            
-            # 파일 처리 대기
-            print("⏳ Waiting for file processing...")
-            while uploaded_file.state.name == "PROCESSING":
-                time.sleep(2)
-                uploaded_file = self.client.files.get(uploaded_file.name)
-            
-            if uploaded_file.state.name == "FAILED":
-                raise Exception(f"File processing failed")
-            
-            print(f"✅ File ready: {uploaded_file.state.name}")
-            
-            # Step 3: 여행 마케팅 프롬프트
-            travel_prompt = """
-            Transform this travel destination into a cinematic marketing video.
-            
-            Create natural, inspiring movement:
-            - If there are people: subtle breathing, gentle expressions, natural movement
-            - If it's a landscape: gentle wind effects, soft lighting changes
-            - If it's architecture: atmospheric ambience, subtle environmental effects
-            
-            Make it feel alive and compelling for travel marketing.
-            Duration: 8 seconds, cinematic quality, inspiring wanderlust.
-            """
-            
-            # Step 4: 영상 생성 (공식 문서 방식)
-            print("🎬 Generating video with Veo 3...")
-            
-            operation = self.client.models.generate_videos(
-                model="veo-3.0-generate-001",
-                prompt=travel_prompt,
-                image=uploaded_file,  # 업로드된 파일 객체 직접 사용
-                config=types.GenerateVideosConfig(
-                    aspect_ratio="9:16",  # 세로형 (인스타그램/틱톡용)
-                    resolution="720p",
-                    person_generation="allow_adult"
+            with get_assets(self.client).use(image_url) as asset:
+                print(f"✅ Image ready: {len(asset.data) // 1024}KB")
+                
+                # Step 2: 영상 생성 (Veo 는 Files 업로드 없이 이미지 바이트를 받는다)
+                print("🎬 Generating video with Veo 3...")
+                
+                operation = self.client.models.generate_videos(
+                    model="veo-3.0-generate-001",
+                    prompt=travel_prompt,
+                    image=asset.image(),
+                    config=types.GenerateVideosConfig(
+                        aspect_ratio="9:16",  # 세로형 (인스타그램/틱톡용)
+                        resolution="720p",
+                        person_generation="allow_adult"
+                    )
                 )
-            )
             
             print(f"🚀 Video generation started: {operation.name}")
             
-            # Step 5: 작업 완료 대기 (공식 폴링 방식)
+            # Step 3: 작업 완료 대기 (공식 폴링 방식)
             print("⏳ Polling operation status...")
             while not operation.done:
                 print("⏳ Waiting for video generation to complete...")
@@ -87,20 +65,15 @@ class GeminiOfficialVideoGenerator:
             
             print("✅ Video generation completed!")
             
-            # Step 6: 다운로드 (공식 방식)
+            # Step 4: 다운로드 (공식 방식)
             print("💾 Downloading video...")
             generated_video = operation.response.generated_videos[0]
             
             # 공식 문서 방식: files.download + save
-            self.client.files.download(file=generated_video.video)
-            generated_video.video.save(output_path)
+            save_generated_video(self.client, generated_video, output_path)
             
             print(f"🎉 Official video saved: {output_path}")
             
-            # Step 7: 정리
-            self.client.files.delete(uploaded_file.name)
-            os.unlink(temp_path)
-            
             return output_path
             
         except Exception as e:
@@ -131,8 +104,7 @@ class GeminiOfficialVideoGenerator:
                     operation = self.client.operations.get(operation)
                 
                 generated_video = operation.response.generated_videos[0]
-                self.client.files.download(file=generated_video.video)
-                generated_video.video.save(output_path)
+                save_generated_video(self.client, generated_video, output_path)
                 
                 print(f"💾 Fallback video saved: {output_path}")
                 return output_path
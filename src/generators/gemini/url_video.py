@@ -3,6 +3,8 @@ import time
 from google import genai
 from google.genai import types
 
+from src.utils.download import save_generated_video
+
 
 class GeminiURLVideoGenerator:
     def __init__(self, api_key: str = None):
@@ -64,9 +66,7 @@ class GeminiURLVideoGenerator:
             
             print("💾 Downloading video...")
             # 올바른 비디오 다운로드 방법
-            video_data = self.client.files.download(generated_video.video)
-            with open(output_path, 'wb') as f:
-                f.write(video_data)
+            save_generated_video(self.client, generated_video, output_path)
             
             print(f"🎉 URL-based travel video saved: {output_path}")
             return output_path
@@ -95,9 +95,7 @@ class GeminiURLVideoGenerator:
                 
                 generated_video = operation.response.generated_videos[0]
                 
-                video_data = self.client.files.download(generated_video.video)
-                with open(output_path, 'wb') as f:
-                    f.write(video_data)
+                save_generated_video(self.client, generated_video, output_path)
                 
                 print(f"💾 Fallback video saved: {output_path}")
                 return output_path
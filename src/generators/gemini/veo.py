@@ -5,6 +5,17 @@ from typing import Optional
 from google import genai
 from google.genai import types
 
+from src.utils.veo_operations import (
+    generated_videos,
+    max_videos_per_operation,
+    plan_operations,
+    refresh_operations,
+    save_variants,
+    submit_operations,
+)
+from src.utils.download import save_generated_video
+from src.utils.gemini_assets import get_assets
+
 
 @dataclass
 class VeoSpec:
@@ -44,58 +55,39 @@ class GeminiVeoGenerator:
         
         # Download the generated video
         generated_video = operation.response.generated_videos[0]
-        self.client.files.download(file=generated_video.video)
-        generated_video.video.save(output_path)
+        save_generated_video(self.client, generated_video, output_path)
         
         print(f"💾 Video saved to: {output_path}")
         return output_path
 
-    def generate_from_image_url(self, image_url: str, prompt: str, output_path: str = "veo_output.mp4") -> str:
-        """Generate video from image URL + text prompt"""
-        # For image-to-video, we need to upload the image first
+    def generate_from_image_url(self, image_url: str, prompt: str, output_path: str = "veo_output.mp4", variants: int = 1) -> str:
+        """Generate video from image URL + text prompt
+
+        ``variants`` > 1 이면 같은 프롬프트로 여러 편을 한 번에 요청하고 (모델이 허용하는 만큼
+        한 작업에, 나머지는 작업을 더 제출) ``output_path`` 옆에 ``_v1``, ``_v2`` ... 로 저장한다.
+        """
         print(f"🖼️ Processing image: {image_url}")
+        model = "veo-3.0-generate-001"
         
-        # Download image
-        import requests
-        r = requests.get(image_url, timeout=30)
-        r.raise_for_status()
-        
-        # Upload to Gemini
-        temp_path = "temp_image.jpg"
-        with open(temp_path, "wb") as f:
-            f.write(r.content)
-        
-        # Upload image to Gemini Files API
-        with open(temp_path, "rb") as f:
-            uploaded_file = self.client.files.upload(file=f, mime_type="image/jpeg")
-        print(f"📤 Image uploaded: {uploaded_file.name}")
-        
-        # Generate video with image + prompt
-        operation = self.client.models.generate_videos(
-            model="veo-3.0-generate-001",
-            prompt=prompt,
-            image=uploaded_file,
-        )
+        # Download once per process (Veo takes image bytes, no Files upload needed)
+        with get_assets(self.client).use(image_url) as asset:
+            plan = plan_operations([prompt], variants, max_videos_per_operation(model))
+            operations = submit_operations(self.client, model, plan, asset.image())
         
-        print(f"⏳ Operation started: {operation.name}")
+        print(f"⏳ Operation started: {', '.join(op.name for op in operations)}")
         
         # Poll until completion
-        while not operation.done:
+        while not all(op.done for op in operations):
             print("⏳ Waiting for video generation to complete...")
             time.sleep(10)
-            operation = self.client.operations.get(operation)
+            operations = refresh_operations(self.client, operations)
         
         print("✅ Video generation completed!")
         
-        # Download the generated video
-        generated_video = operation.response.generated_videos[0]
-        self.client.files.download(file=generated_video.video)
-        generated_video.video.save(output_path)
+        # Download the generated videos (동시에)
+        paths = save_variants(self.client, generated_videos(operations), output_path)
         
-        # Cleanup
-        os.remove(temp_path)
-        
-        print(f"💾 Video saved to: {output_path}")
+        print(f"💾 Video saved to: {', '.join(paths)}")
         return output_path
 
 
@@ -112,13 +104,14 @@ if __name__ == "__main__":
     parser.add_argument("--image", type=str, help="Image URL for image-to-video")
     parser.add_argument("--prompt", type=str, required=True, help="Text prompt")
     parser.add_argument("--out", type=str, default="gemini_veo_output.mp4", help="Output path")
+    parser.add_argument("--variants", type=int, default=1, help="Number of variants (image-to-video)")
     
     args = parser.parse_args()
     
     generator = GeminiVeoGenerator()
     
     if args.image:
-        result = generator.generate_from_image_url(args.image, args.prompt, args.out)
+        result = generator.generate_from_image_url(args.image, args.prompt, args.out, args.variants)
     else:
         result = generator.generate_from_prompt(args.prompt, args.out)
     
@@ -1,8 +1,9 @@
 import os
 import time
-import requests
 from google import genai
-from google.genai import types
+
+from src.utils.download import save_generated_video
+from src.utils.gemini_assets import get_assets
 
 
 def generate_video_from_image_fixed(image_url: str, prompt: str, output_path: str = "veo_fixed_output.mp4") -> str:
@@ -17,46 +18,16 @@ def generate_video_from_image_fixed(image_url: str, prompt: str, output_path: st
     print(f"🖼️ Processing image: {image_url}")
     print(f"📝 Prompt: {prompt}")
     
-    # Download image
-    print("⬇️ Downloading image...")
-    r = requests.get(image_url, timeout=30)
-    r.raise_for_status()
-    
-    temp_path = "temp_image.jpg"
-    with open(temp_path, "wb") as f:
-        f.write(r.content)
-    
     try:
-        # Upload image using correct API
-        print("📤 Uploading image to Gemini Files...")
-        
-        # Method: Create file from local path
-        uploaded_file = client.files.create(
-            path=temp_path,
-            config=types.CreateFileConfig(
-                display_name="Travel Image for Video Generation"
+        # Download image once (Veo takes image bytes, no Files upload needed)
+        print("⬇️ Downloading image...")
+        with get_assets(client).use(image_url) as asset:
+            print("🎬 Starting video generation with image...")
+            operation = client.models.generate_videos(
+                model="veo-3.0-generate-001",
+                prompt=prompt,
+                image=asset.image(),
             )
-        )
-        print(f"✅ Image uploaded: {uploaded_file.name}")
-        
-        # Wait for processing
-        print("⏳ Waiting for file processing...")
-        while uploaded_file.state.name == "PROCESSING":
-            time.sleep(2)
-            uploaded_file = client.files.get(uploaded_file.name)
-        
-        if uploaded_file.state.name == "FAILED":
-            raise Exception(f"File upload failed: {uploaded_file.error}")
-        
-        print("✅ File processing completed!")
-        
-        # Generate video with uploaded image
-        print("🎬 Starting video generation with image...")
-        operation = client.models.generate_videos(
-            model="veo-3.0-generate-001",
-            prompt=prompt,
-            image=uploaded_file,
-        )
         
         print(f"⏳ Operation started: {operation.name}")
         
@@ -70,11 +41,7 @@ def generate_video_from_image_fixed(image_url: str, prompt: str, output_path: st
         
         # Download video
         generated_video = operation.response.generated_videos[0]
-        client.files.download(file=generated_video.video)
-        generated_video.video.save(output_path)
-        
-        # Cleanup uploaded file
-        client.files.delete(uploaded_file.name)
+        save_generated_video(client, generated_video, output_path)
         
         print(f"💾 Video saved to: {output_path}")
         return output_path
@@ -99,16 +66,10 @@ def generate_video_from_image_fixed(image_url: str, prompt: str, output_path: st
         print("✅ Video generation completed!")
         
         generated_video = operation.response.generated_videos[0]
-        client.files.download(file=generated_video.video)
-        generated_video.video.save(output_path)
+        save_generated_video(client, generated_video, output_path)
         
         print(f"💾 Fallback video saved to: {output_path}")
         return output_path
-        
-    finally:
-        # Cleanup temp file
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
 
 
 if __name__ == "__main__":
@@ -4,6 +4,8 @@ import requests
 from google import genai
 from google.genai import types
 
+from src.utils.download import save_generated_video
+
 
 def generate_video_from_image_simple(image_url: str, prompt: str, output_path: str = "veo_output.mp4") -> str:
     """Simple Gemini Veo 3 video generation from image URL"""
@@ -61,8 +63,7 @@ def generate_video_from_image_simple(image_url: str, prompt: str, output_path: s
                 
                 # Download video
                 generated_video = operation.response.generated_videos[0]
-                client.files.download(file=generated_video.video)
-                generated_video.video.save(output_path)
+                save_generated_video(client, generated_video, output_path)
                 
                 print(f"💾 Video saved to: {output_path}")
                 return output_path
@@ -86,8 +87,7 @@ def generate_video_from_image_simple(image_url: str, prompt: str, output_path: s
         
         # Download video
         generated_video = operation.response.generated_videos[0]
-        client.files.download(file=generated_video.video)
-        generated_video.video.save(output_path)
+        save_generated_video(client, generated_video, output_path)
         
         print(f"💾 Video saved to: {output_path}")
         return output_path
@@ -2,11 +2,17 @@ import os
 import time
 import json
 import pathlib
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional, Dict, Any, List
 
 import requests
 
+from src.utils.download import download_file
+from src.utils.faststart import ensure_faststart
+from src.utils.metrics import VENDOR_PHASE_SECONDS, VendorPhaseClock, track_vendor_job
+from src.utils.progress import ProgressReporter, get_reporter
+from src.utils.tracing import traced
+
 
 @dataclass
 class HiggsSpec:
@@ -20,19 +26,30 @@ class HiggsSpec:
     aspect_ratio: str = "9:16"
     resolution: str = "1080x1920"
     duration_seconds: int = 14
+    motions: List[Dict[str, Any]] = field(default_factory=list)  # [{"id": ..., "strength": ...}]
+    seed: int = 500000
+    enhance_prompt: bool = True
 
 
 class HiggsVideoGenerator:
     """HiggsField 영상 생성 어댑터(스켈레톤).
 
-    실제 엔드포인트/스키마 수신 후 _create_task/_poll_task/_download_result를 업데이트한다.
+    실제 엔드포인트/스키마 수신 후 create_job_set/_poll_task/download_result를 업데이트한다.
     """
 
-    def __init__(self, output_dir: pathlib.Path) -> None:
+    def __init__(
+        self,
+        output_dir: pathlib.Path,
+        reporter: Optional[ProgressReporter] = None,
+        api_key: Optional[str] = None,
+        api_secret: Optional[str] = None,
+    ) -> None:
         self.output_dir = pathlib.Path(output_dir)
+        self.reporter = reporter or get_reporter("higgs")
         # Higgsfield job-sets: https://platform.higgsfield.ai
-        self.api_key = os.getenv("HIGGS_API_KEY", "")
-        self.api_secret = os.getenv("HIGGS_SECRET", "")
+        # UI 입력값(인자)이 환경변수보다 우선
+        self.api_key = (api_key or os.getenv("HIGGS_API_KEY", "")).strip()
+        self.api_secret = (api_secret or os.getenv("HIGGS_SECRET", "")).strip()
         self.base_url = os.getenv("HIGGS_BASE_URL", "https://platform.higgsfield.ai")
         self.api_version = os.getenv("HIGGS_API_VERSION", "v1")
 
@@ -43,20 +60,22 @@ class HiggsVideoGenerator:
         self.session = requests.Session()
 
     # ---------- Public API ----------
-    def generate(self, spec: HiggsSpec, *, image_path: Optional[str] = None) -> pathlib.Path:
+    @traced("vendor.higgs.generate")
+    def generate(self, spec: HiggsSpec, *, image_url: str) -> pathlib.Path:
         """영상 생성 전체 플로우.
 
         1) 작업 생성 → 2) 상태 폴링 → 3) 결과 다운로드
         """
 
-        task_id = self._create_task(spec=spec, image_path=image_path)
-        result = self._poll_task(task_id=task_id, timeout_sec=900, interval_sec=5)
-        video_url = result.get("video_url")
-        if not video_url:
-            raise RuntimeError("HiggsField 결과에 video_url이 없습니다.")
+        with track_vendor_job("higgs"):
+            task_id = self.create_job_set(spec=spec, image_url=image_url)
+            result = self._poll_task(task_id=task_id, timeout_sec=900, interval_sec=5)
+            video_url = result.get("video_url")
+            if not video_url:
+                raise RuntimeError("HiggsField 결과에 video_url이 없습니다.")
 
-        output_path = self.output_dir / f"higgs_{int(time.time())}.mp4"
-        self._download_result(url=video_url, output_path=output_path)
+            output_path = self.output_dir / f"higgs_{int(time.time())}.mp4"
+            self.download_result(url=video_url, output_path=output_path)
         return output_path
 
     # ---------- Internal helpers (to be finalized with real API spec) ----------
@@ -70,21 +89,62 @@ class HiggsVideoGenerator:
             headers["hf-secret"] = self.api_secret
         return headers
 
-    def _create_task(self, spec: HiggsSpec, image_path: Optional[str]) -> str:
-        # 생성 엔드포인트는 공개 문서에 없어 안전하게 미구현 처리
-        raise NotImplementedError("HiggsField 생성 API는 미구현입니다. 기존 job_set_id로 폴링을 사용하세요.")
+    @traced("vendor.higgs.submit")
+    def create_job_set(self, spec: HiggsSpec, image_url: str, webhook: Optional[Dict[str, str]] = None) -> str:
+        """POST /v1/image2video/dop → job_set_id.
 
+        Higgs 는 공개 URL 만 입력으로 받는다 (로컬 파일 업로드 없음).
+        ``webhook`` ({"url", "secret"}) 을 주면 완료 시 Higgs 가 job set 을 콜백으로 보낸다.
+        """
+        if not self.api_secret:
+            raise RuntimeError("HIGGS_SECRET가 설정되지 않았습니다. 생성 API에는 시크릿이 필요합니다.")
+        if not (isinstance(image_url, str) and image_url.startswith("http")):
+            raise ValueError("HiggsField 입력 이미지는 http(s) URL 이어야 합니다.")
+        payload = {
+            "webhook": webhook,
+            "params": {
+                "model": spec.model,
+                "prompt": spec.prompt,
+                "seed": spec.seed,
+                "motions": spec.motions,
+                "input_images": [
+                    {"type": "image_url", "image_url": image_url}
+                ],
+                "enhance_prompt": spec.enhance_prompt,
+            },
+        }
+        resp = self.session.post(
+            f"{self.base_url}/{self.api_version}/image2video/dop",
+            headers=self._headers(),
+            json=payload,
+            timeout=30,
+        )
+        if resp.status_code >= 400:
+            # HTTPError(response=...) 로 올려 호출자가 429/Retry-After 를 볼 수 있게 한다
+            raise requests.HTTPError(f"HiggsField 생성 실패: {resp.status_code} {resp.text}", response=resp)
+        job = resp.json()
+        job_set_id = job.get("id")
+        if not job_set_id:
+            raise RuntimeError(f"HiggsField 응답에 id(job_set_id)가 없습니다: {json.dumps(job, ensure_ascii=False)}")
+        self.reporter.info(f"🚀 HiggsField 작업 생성: {job_set_id}", job_set_id=job_set_id, model=spec.model)
+        return job_set_id
+
+    @traced("vendor.higgs.poll")
     def _poll_task(self, task_id: str, *, timeout_sec: int, interval_sec: int) -> Dict[str, Any]:
         # GET /v1/job-sets/{job_set_id}
         status_url = f"{self.base_url}/{self.api_version}/job-sets/{task_id}"
         waited = 0
+        phases = VendorPhaseClock("higgs")
         while waited <= timeout_sec:
             resp = self.session.get(status_url, headers=self._headers(), timeout=30)
             if resp.status_code == 200:
                 data = resp.json()
                 status = self._aggregate_status(data)
+                phases.update(self._queue_state(data))
+                self.reporter.progress(f"⏳ HiggsField 상태: {status} ({waited}s)", job_set_id=task_id, status=status, waited_s=waited)
                 if status == "completed":
-                    video_url = self._extract_first_video_url(data)
+                    phases.finish()
+                    video_url = self.extract_video_url(data)
                     return {"video_url": video_url, "raw": data}
                 if status in ("failed", "error"):
                     raise RuntimeError(f"HiggsField 작업 실패: {json.dumps(data, ensure_ascii=False)}")
@@ -113,7 +173,23 @@ class HiggsVideoGenerator:
             return "unknown"
 
     @staticmethod
-    def _extract_first_video_url(job_set: Dict[str, Any]) -> Optional[str]:
+    def _queue_state(job_set: Dict[str, Any]) -> str:
+        """모든 job 이 queued 면 'queued', 하나라도 시작했으면 'running'."""
+        statuses = {str(job.get("status", "")).lower() for job in job_set.get("jobs", [])}
+        return "queued" if statuses <= {"queued", ""} else "running"
+
+    @classmethod
+    def job_set_state(cls, job_set: Dict[str, Any]) -> str:
+        """queued / running / succeeded / failed 로 정규화 (엔진 공통 상태)"""
+        status = cls._aggregate_status(job_set)
+        if status == "completed":
+            return "succeeded"
+        if status == "failed":
+            return "failed"
+        return cls._queue_state(job_set)
+
+    @staticmethod
+    def extract_video_url(job_set: Dict[str, Any]) -> Optional[str]:
         try:
             for job in job_set.get("jobs", []):
                 results = job.get("results") or {}
@@ -130,17 +206,14 @@ class HiggsVideoGenerator:
         status_url = f"{self.base_url}/{self.api_version}/job-sets/{job_set_id}"
         resp = self.session.get(status_url, headers=self._headers(), timeout=30)
         if resp.status_code != 200:
-            raise RuntimeError(f"HiggsField 조회 실패: {resp.status_code} {resp.text}")
+            raise requests.HTTPError(f"HiggsField 조회 실패: {resp.status_code} {resp.text}", response=resp)
         return resp.json()
 
-    def _download_result(self, url: str, output_path: pathlib.Path) -> None:
-        with self.session.get(url, stream=True, timeout=300) as r:
-            r.raise_for_status()
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(output_path, "wb") as f:
-                for chunk in r.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
+    @traced("vendor.higgs.download")
+    def download_result(self, url: str, output_path: pathlib.Path) -> None:
+        with VENDOR_PHASE_SECONDS.time(engine="higgs", phase="download"):
+            download_file(url, str(output_path), source="higgs")
+        ensure_faststart(str(output_path))
 
 
 
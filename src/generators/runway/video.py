@@ -8,16 +8,23 @@ import requests
 import time
 from typing import Optional, Dict, Any
 from PIL import Image
-import json
+
+from src.utils.download import download_file
+from src.utils.faststart import ensure_faststart
+from src.utils.logging_config import setup_logging
+from src.utils.metrics import VENDOR_PHASE_SECONDS, VendorPhaseClock, track_vendor_job
+from src.utils.progress import ProgressReporter, get_reporter
+from src.utils.tracing import traced
 
 
 class RunwayVideoGenerator:
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, reporter: Optional[ProgressReporter] = None):
+        self._reporter = reporter
         self.api_key = api_key or os.getenv("RUNWAY_API_KEY")
         if not self.api_key:
             raise ValueError("RUNWAY_API_KEY 환경변수가 필요합니다")
         
-        self.base_url = "https://api.dev.runwayml.com"
+        self.base_url = os.getenv("RUNWAY_BASE_URL", "https://api.dev.runwayml.com")
         self.headers = {
             'Authorization': f'Bearer {self.api_key}',
             'Content-Type': 'application/json',
@@ -25,7 +32,13 @@ class RunwayVideoGenerator:
         }
         # 글로벌 세이프가드: RUNWAY_LIVE=1 일 때만 실제 호출 허용
         self.live_mode = os.getenv('RUNWAY_LIVE', '0') == '1'
+
+    @property
+    def reporter(self) -> ProgressReporter:
+        """진행 이벤트 출력 대상 (생성자 인자 > 현재 컨텍스트 > 로그 전용)"""
+        return self._reporter or get_reporter("runway")
     
+    @traced("vendor.runway.generate")
     def generate_video_from_image(
         self, 
         image_path: str, 
@@ -54,28 +67,12 @@ class RunwayVideoGenerator:
             str: 생성된 비디오 경로
         """
         try:
-            # 로그를 웹앱과 터미널 모두에 출력
-            try:
-                import streamlit as st
-                st.info(f"🎬 Runway AI로 비디오 생성 시작...")
-                st.info(f"📁 입력: {image_path}")
-                st.info(f"📁 출력: {output_path}")
-            except:
-                pass
-            
-            print(f"🎬 Runway AI로 비디오 생성 시작...")
-            print(f"📁 입력: {image_path}")
-            print(f"📁 출력: {output_path}")
+            reporter = self.reporter
+            reporter.info("🎬 Runway AI로 비디오 생성 시작...", input=image_path, output=output_path)
             
             # 1단계: 이미지를 base64로 인코딩
             base64_image = self._encode_image_to_base64(image_path)
-            
-            try:
-                import streamlit as st
-                st.info(f"📤 이미지 인코딩 완료")
-            except:
-                pass
-            print(f"📤 이미지 인코딩 완료")
+            reporter.info("📤 이미지 인코딩 완료", base64_len=len(base64_image))
             
             # 모델별 허용 duration 규칙 적용
             request_duration = duration
@@ -100,16 +97,10 @@ class RunwayVideoGenerator:
             # force_live=True 이면 환경변수 없이도 라이브 호출 허용
             effective_dry_run = dry_run or (not self.live_mode and not force_live)
             if effective_dry_run:
-                try:
-                    import streamlit as st
-                    st.info("🧪 드라이런 모드: Runway API 호출 없이 로직 검증")
-                    if not self.live_mode and not force_live:
-                        st.warning("🔐 RUNWAY_LIVE=1 미설정 → 강제 드라이런 모드")
-                    st.json(payload_preview)
-                except:
-                    pass
-                print("🧪 드라이런 모드 실행 (페이로드 미전송):")
-                print(json.dumps(payload_preview, ensure_ascii=False))
+                reporter.info("🧪 드라이런 모드: Runway API 호출 없이 로직 검증")
+                if not self.live_mode and not force_live:
+                    reporter.warning("🔐 RUNWAY_LIVE=1 미설정 → 강제 드라이런 모드")
+                reporter.detail("🧪 드라이런 페이로드 (미전송)", **payload_preview)
 
                 # 플레이스홀더 비디오 생성 (선택 비율에 맞춘 짧은 샘플)
                 self._create_placeholder_video(output_path, ratio)
@@ -118,33 +109,35 @@ class RunwayVideoGenerator:
             # 2단계: 비디오 생성 작업 시작 (실제 API 호출)
             if not self.live_mode and not force_live:
                 raise RuntimeError("RUNWAY_LIVE=1 이 설정되지 않아 라이브 호출이 차단되었습니다.")
-            task_id = self._start_generation_task(
-                base64_image=base64_image,
-                duration=request_duration,
-                seed=seed,
-                prompt=prompt,
-                model=model,
-                ratio=ratio
-            )
-            print(f"🚀 생성 작업 시작: {task_id}")
-            
-            # 3단계: 작업 완료 대기
-            video_url = self._wait_for_completion(task_id)
-            print(f"✅ 생성 완료: {video_url}")
-            
-            # 4단계: 비디오 다운로드
-            self._download_video(video_url, output_path)
-            print(f"💾 다운로드 완료: {output_path}")
+            with track_vendor_job("runway"):
+                task_id = self._start_generation_task(
+                    base64_image=base64_image,
+                    duration=request_duration,
+                    seed=seed,
+                    prompt=prompt,
+                    model=model,
+                    ratio=ratio
+                )
+                reporter.info(f"🚀 생성 작업 시작: {task_id}", task_id=task_id)
+                
+                # 3단계: 작업 완료 대기
+                video_url = self._wait_for_completion(task_id)
+                reporter.info("✅ 생성 완료", task_id=task_id, video_url=video_url)
+                
+                # 4단계: 비디오 다운로드
+                self.download_video(video_url, output_path)
+                reporter.info(f"💾 다운로드 완료: {output_path}")
             
             return output_path
             
         except Exception as e:
-            print(f"❌ Runway AI 비디오 생성 실패: {e}")
+            self.reporter.error(f"❌ Runway AI 비디오 생성 실패: {e}")
             raise
     
     def _encode_image_to_base64(self, image_path: str) -> str:
         """이미지를 base64로 인코딩 (크기 제한)"""
         import base64
+        import io
         from PIL import Image
         
         # 이미지 크기 확인 및 조정
@@ -155,31 +148,48 @@ class RunwayVideoGenerator:
             if img.size[0] > max_size[0] or img.size[1] > max_size[1]:
                 img.thumbnail(max_size, Image.LANCZOS)
                 
-                # 임시로 리사이즈된 이미지 저장
-                import tempfile
-                with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as tmp:
-                    img.save(tmp.name, 'JPEG', quality=85, optimize=True)
-                    temp_path = tmp.name
+                # 리사이즈된 이미지는 메모리에서 바로 인코딩 (임시 파일 없음)
+                buf = io.BytesIO()
+                img.save(buf, 'JPEG', quality=85, optimize=True)
+                image_data = buf.getvalue()
             else:
-                temp_path = image_path
+                with open(image_path, 'rb') as f:
+                    image_data = f.read()
         
         # 파일 크기 확인
-        import os
-        file_size = os.path.getsize(temp_path)
+        file_size = len(image_data)
         if file_size > 16 * 1024 * 1024:  # 16MB 초과
             raise Exception(f"이미지 파일이 너무 큽니다: {file_size / 1024 / 1024:.1f}MB (최대 16MB)")
         
-        # base64 인코딩
-        with open(temp_path, 'rb') as f:
-            image_data = f.read()
-        
-        # 임시 파일 정리
-        if temp_path != image_path:
-            os.unlink(temp_path)
-        
         base64_image = base64.b64encode(image_data).decode('utf-8')
         return f"data:image/jpeg;base64,{base64_image}"
     
+    def start_task(
+        self,
+        image_path: str,
+        duration: int = 8,
+        seed: Optional[int] = None,
+        prompt: Optional[str] = None,
+        model: str = "gen3a_turbo",
+        ratio: Optional[str] = None,
+        force_live: bool = False,
+        callback_url: Optional[str] = None
+    ) -> str:
+        """이미지 인코딩 + 작업 생성까지만 수행하고 task ID 반환 (폴링은 호출자 몫)"""
+        if not self.live_mode and not force_live:
+            raise RuntimeError("RUNWAY_LIVE=1 이 설정되지 않아 라이브 호출이 차단되었습니다.")
+        base64_image = self._encode_image_to_base64(image_path)
+        return self._start_generation_task(
+            base64_image=base64_image,
+            duration=duration,
+            seed=seed,
+            prompt=prompt,
+            model=model,
+            ratio=ratio,
+            callback_url=callback_url
+        )
+
+    @traced("vendor.runway.submit")
     def _start_generation_task(
         self, 
         base64_image: str, 
@@ -187,7 +197,8 @@ class RunwayVideoGenerator:
         seed: Optional[int] = None,
         prompt: Optional[str] = None,
         model: str = "gen3a_turbo",
-        ratio: Optional[str] = None
+        ratio: Optional[str] = None,
+        callback_url: Optional[str] = None
     ) -> str:
         """비디오 생성 작업 시작"""
         # Runway API 문서에 따른 올바른 페이로드 (해상도 추가)
@@ -221,6 +232,8 @@ class RunwayVideoGenerator:
             payload['promptText'] = prompt
         if seed is not None:
             payload['seed'] = seed
+        if callback_url:
+            payload['callbackUrl'] = callback_url
         
         response = requests.post(
             f"{self.base_url}/v1/image_to_video",
@@ -229,31 +242,20 @@ class RunwayVideoGenerator:
             timeout=60
         )
         
-        # 오류 상세 정보 출력
+        # 오류 상세 정보 출력 (base64 이미지는 길이만)
         if response.status_code != 200:
-            try:
-                import streamlit as st
-                error_detail = response.json() if response.text else "응답 없음"
-                st.error(f"❌ Runway API 오류 ({response.status_code}): {error_detail}")
-                print(f"❌ 요청 페이로드: {payload}")
-                print(f"❌ 응답 상태: {response.status_code}")
-                print(f"❌ 응답 내용: {response.text}")
-            except:
-                print(f"❌ 요청 페이로드: {payload}")
-                print(f"❌ 응답 상태: {response.status_code}")
-                print(f"❌ 응답 내용: {response.text}")
+            logged_payload = {k: v for k, v in payload.items() if k != 'promptImage'}
+            logged_payload['promptImage_len'] = len(base64_image)
+            self.reporter.error(
+                f"❌ Runway API 오류 ({response.status_code}): {response.text[:500] or '응답 없음'}",
+                status_code=response.status_code,
+                payload=logged_payload,
+            )
         
         response.raise_for_status()
         
         result = response.json()
-        
-        # Streamlit에서도 보이도록 로그 출력
-        try:
-            import streamlit as st
-            st.info(f"🔍 Runway API 응답: {result}")
-            print(f"🔍 API 응답: {result}")  # 터미널 로그
-        except:
-            print(f"🔍 API 응답: {result}")  # 터미널 로그만
+        self.reporter.detail("🔍 Runway API 응답", response=result)
         
         # 가능한 키들 확인
         if 'task_id' in result:
@@ -264,72 +266,84 @@ class RunwayVideoGenerator:
             return result['taskId']
         else:
             error_msg = f"응답에서 task ID를 찾을 수 없습니다. 응답 키: {list(result.keys())}, 전체 응답: {result}"
-            try:
-                import streamlit as st
-                st.error(f"❌ {error_msg}")
-                print(f"❌ {error_msg}")
-            except:
-                print(f"❌ {error_msg}")
+            self.reporter.error(f"❌ {error_msg}")
             raise Exception(error_msg)
     
+    def get_organization(self) -> Dict[str, Any]:
+        """조직 정보 (크레딧 잔액 ``creditBalance`` 포함)"""
+        response = requests.get(f"{self.base_url}/v1/organization", headers=self.headers, timeout=10)
+        response.raise_for_status()
+        return response.json()
+
+    def get_task(self, task_id: str) -> Dict[str, Any]:
+        """작업 상태 1회 조회"""
+        response = requests.get(
+            f"{self.base_url}/v1/tasks/{task_id}",  # v1 추가
+            headers=self.headers,
+            timeout=30
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def cancel_task(self, task_id: str) -> None:
+        """진행 중 작업 취소 (완료된 작업이면 삭제)"""
+        response = requests.delete(f"{self.base_url}/v1/tasks/{task_id}", headers=self.headers, timeout=30)
+        response.raise_for_status()
+
+    @staticmethod
+    def task_state(result: Dict[str, Any]) -> str:
+        """Runway 작업 상태를 queued / running / succeeded / failed 로 정규화"""
+        status = str(result.get('status', '')).upper()
+        if status in ('COMPLETED', 'SUCCEEDED'):
+            return 'succeeded'
+        if status in ('FAILED', 'CANCELLED'):
+            return 'failed'
+        if status in ('PENDING', 'THROTTLED', ''):
+            return 'queued'
+        return 'running'
+
+    @traced("vendor.runway.poll")
     def _wait_for_completion(self, task_id: str, max_wait_time: int = 1800) -> str:
         """작업 완료 대기 (최대 30분)"""
         start_time = time.time()
+        phases = VendorPhaseClock("runway")
         
         while time.time() - start_time < max_wait_time:
             # 작업 상태 확인
-            response = requests.get(
-                f"{self.base_url}/v1/tasks/{task_id}",  # v1 추가
-                headers=self.headers,
-                timeout=30
-            )
-            response.raise_for_status()
-            
-            result = response.json()
+            result = self.get_task(task_id)
             status = result.get('status')
+            state = self.task_state(result)
+            phases.update(status)
             
-            # 웹앱과 터미널 모두에 상태 표시
-            try:
-                import streamlit as st
-                elapsed = int(time.time() - start_time)
-                st.info(f"⏳ 상태: {status} (대기 시간: {elapsed}초)")
-            except:
-                pass
-            print(f"⏳ 상태: {status}")
+            # 반복 상태 갱신: 한 자리표시자 덮어쓰기 + 로그 간격 제한
+            elapsed = int(time.time() - start_time)
+            self.reporter.progress(f"⏳ 상태: {status} (대기 시간: {elapsed}초)", task_id=task_id, status=status, elapsed_s=elapsed)
             
-            if status in ['completed', 'COMPLETED', 'SUCCEEDED']:
+            if state == 'succeeded':
                 # 비디오 URL 찾기 (여러 응답 형태 대응)
-                video_url = self._extract_video_url(result)
+                video_url = self.extract_video_url(result)
                 if video_url:
+                    phases.finish()
                     return video_url
                 # 응답에서 비디오 URL을 찾을 수 없는 경우
-                try:
-                    import streamlit as st
-                    st.info(f"🔍 완료된 작업 응답: {result}")
-                except:
-                    pass
-                print(f"🔍 완료된 작업 응답: {result}")
+                self.reporter.detail("🔍 완료된 작업 응답", response=result)
                 raise Exception(f"비디오 URL을 찾을 수 없습니다. 응답: {result}")
-            elif status in ['failed', 'FAILED']:
-                raise Exception(f"비디오 생성 실패: {result.get('error', '알 수 없는 오류')}")
+            elif state == 'failed':
+                raise Exception(f"비디오 생성 실패: {result.get('error') or result.get('failure') or '알 수 없는 오류'}")
             
             # 10초 대기
             time.sleep(10)
         
         raise Exception("비디오 생성 시간 초과 (30분)")
     
-    def _download_video(self, video_url: str, output_path: str):
-        """생성된 비디오 다운로드"""
-        response = requests.get(video_url, timeout=120)
-        response.raise_for_status()
-        
-        # 출력 디렉토리 생성
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        
-        with open(output_path, 'wb') as f:
-            f.write(response.content)
+    @traced("vendor.runway.download")
+    def download_video(self, video_url: str, output_path: str):
+        """생성된 비디오 다운로드 (스트리밍 + 이어받기)"""
+        with VENDOR_PHASE_SECONDS.time(engine="runway", phase="download"):
+            download_file(video_url, output_path, source="runway")
+        ensure_faststart(output_path)
 
-    def _extract_video_url(self, result: Any) -> Optional[str]:
+    def extract_video_url(self, result: Any) -> Optional[str]:
         """Runway 작업 응답에서 비디오 URL을 최대한 유연하게 추출"""
         try:
             # 딕셔너리 최상위 후보 키
@@ -371,7 +385,7 @@ class RunwayVideoGenerator:
             if isinstance(result, str) and result.startswith('http'):
                 return result
         except Exception as e:
-            print(f"⚠️ 비디오 URL 파싱 중 오류: {e}")
+            self.reporter.warning(f"⚠️ 비디오 URL 파싱 중 오류: {e}")
         return None
 
     def _create_placeholder_video(self, output_path: str, ratio: Optional[str]):
@@ -391,13 +405,9 @@ class RunwayVideoGenerator:
                 .overwrite_output()
                 .run()
             )
-            try:
-                import streamlit as st
-                st.success(f"✅ 플레이스홀더 비디오 생성: {output_path} ({width}x{height})")
-            except:
-                pass
+            self.reporter.success(f"✅ 플레이스홀더 비디오 생성: {output_path} ({width}x{height})")
         except Exception as e:
-            print(f"⚠️ ffmpeg 생성 실패, OpenCV 대체 시도: {e}")
+            self.reporter.warning(f"⚠️ ffmpeg 생성 실패, OpenCV 대체 시도: {e}")
             try:
                 import cv2
                 import numpy as np
@@ -411,13 +421,10 @@ class RunwayVideoGenerator:
                 for _ in range(total_frames):
                     writer.write(black)
                 writer.release()
-                try:
-                    import streamlit as st
-                    st.success(f"✅ (OpenCV) 플레이스홀더 생성: {output_path} ({width}x{height})")
-                except:
-                    pass
+                ensure_faststart(output_path)
+                self.reporter.success(f"✅ (OpenCV) 플레이스홀더 생성: {output_path} ({width}x{height})")
             except Exception as e2:
-                print(f"⚠️ OpenCV 생성도 실패: {e2}")
+                self.reporter.warning(f"⚠️ OpenCV 생성도 실패: {e2}")
                 # 최종 실패 시 최소한의 파일로 대체 (유효하지 않을 수 있음)
                 os.makedirs(os.path.dirname(output_path), exist_ok=True)
                 with open(output_path, 'wb') as f:
@@ -448,6 +455,7 @@ def main():
     parser.add_argument('--seed', type=int, help='시드값')
     
     args = parser.parse_args()
+    setup_logging()
     
     try:
         generator = RunwayVideoGenerator()
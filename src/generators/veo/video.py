@@ -3,9 +3,10 @@ import time
 import requests
 from dataclasses import dataclass
 from typing import Optional
-from google.cloud import aiplatform
-from google.oauth2 import service_account
-import json
+
+from src.utils.clients import ensure_vertex
+from src.utils.logging_config import setup_logging
+from src.utils.progress import ProgressReporter, get_reporter
 
 
 @dataclass
@@ -17,18 +18,19 @@ class VeoSpec:
 
 
 class VeoVideoGenerator:
-    def __init__(self, project_id: Optional[str] = None, location: str = "us-central1"):
+    def __init__(self, project_id: Optional[str] = None, location: str = "us-central1", reporter: Optional[ProgressReporter] = None):
+        self.reporter = reporter or get_reporter("veo")
         self.project_id = project_id or os.getenv("GOOGLE_CLOUD_PROJECT")
         self.location = location
         if not self.project_id:
             raise ValueError("GOOGLE_CLOUD_PROJECT environment variable required")
-        
-        aiplatform.init(project=self.project_id, location=self.location)
+        # aiplatform.init 은 실제 호출 직전에 한 번만 (ensure_vertex)
 
     def generate_from_image(self, image_url: str, prompt: Optional[str] = None, spec: Optional[VeoSpec] = None) -> str:
         """Generate video from image using Veo on Vertex AI"""
         spec = spec or VeoSpec()
         prompt = prompt or spec.prompt
+        ensure_vertex(self.project_id, self.location)
         
         # Veo API endpoint (this is conceptual - actual endpoint may differ)
         endpoint = f"https://{self.location}-aiplatform.googleapis.com/v1/projects/{self.project_id}/locations/{self.location}/publishers/google/models/veo:predict"
@@ -49,11 +51,13 @@ class VeoVideoGenerator:
         
         # Note: This is a placeholder implementation
         # Actual Veo API may have different structure
-        print(f"Would call Veo API with:")
-        print(f"- Image: {image_url}")
-        print(f"- Prompt: {prompt}")
-        print(f"- Duration: {spec.duration}s")
-        print(f"- Resolution: {spec.resolution}")
+        self.reporter.info(
+            "Would call Veo API",
+            image_url=image_url,
+            prompt=prompt,
+            duration=spec.duration,
+            resolution=spec.resolution,
+        )
         
         # For now, return placeholder
         return "veo_output_placeholder.mp4"
@@ -62,7 +66,7 @@ class VeoVideoGenerator:
         """Generate video from local image file"""
         # Upload image to GCS first, then call generate_from_image
         # This would require GCS integration
-        print(f"Would upload {image_path} to GCS, then generate video to {output_path}")
+        self.reporter.info(f"Would upload {image_path} to GCS, then generate video to {output_path}")
         return output_path
 
 
@@ -70,7 +74,7 @@ def generate_video_from_url(image_url: str, output_path: str, prompt: Optional[s
     """Convenience function to generate video from image URL"""
     generator = VeoVideoGenerator()
     result = generator.generate_from_image(image_url, prompt, spec)
-    print(f"Video generation completed: {result}")
+    generator.reporter.success(f"Video generation completed: {result}")
     return result
 
 
@@ -86,6 +90,7 @@ if __name__ == "__main__":
     parser.add_argument("--motion", type=str, default="medium", choices=["low", "medium", "high"])
     
     args = parser.parse_args()
+    setup_logging()
     
     spec = VeoSpec(
         duration=args.duration,
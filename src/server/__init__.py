@@ -0,0 +1,2 @@
+# Sidecar HTTP server
+# Streamlit 옆에서 함께 뜨는 로컬 HTTP 서버 (미디어 스트리밍 등)
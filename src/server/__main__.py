@@ -0,0 +1,36 @@
+"""헤드리스 서버 단독 실행 (Streamlit 없이): ``python -m src.server --port 3001``
+
+생성 작업 API(/jobs), 미디어, 웹훅, 메트릭을 한 프로세스에서 제공한다.
+UI 는 ``GENERATION_SERVICE_URL`` 로 이 서버를 가리키면 된다.
+"""
+
+import argparse
+
+from src.utils.artifacts import start_retention_sweeper
+from src.utils.logging_config import setup_logging
+from src.utils.metrics import start_snapshot_writer
+from src.utils.workspace import sweep_orphans
+
+from .media import MEDIA_ROOT
+from .runner import SIDECAR_HOST, SIDECAR_PORT, build_app, warn_if_exposed
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Headless generation service")
+    ap.add_argument("--host", default=SIDECAR_HOST)
+    ap.add_argument("--port", type=int, default=SIDECAR_PORT)
+    ap.add_argument("--media-root", default=MEDIA_ROOT)
+    args = ap.parse_args()
+
+    import uvicorn
+
+    setup_logging()
+    start_snapshot_writer()
+    sweep_orphans()  # 이전 프로세스가 남긴 스크래치 작업 공간 정리
+    start_retention_sweeper()  # 오래된/용량 초과 산출물 정리 (고정한 작업 제외)
+    warn_if_exposed(args.host)
+    uvicorn.run(build_app(args.media_root), host=args.host, port=args.port, log_level="warning", access_log=False)
+
+
+if __name__ == "__main__":
+    main()
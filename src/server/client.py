@@ -0,0 +1,119 @@
+"""생성 서비스 HTTP 클라이언트 (Streamlit UI / 스크립트용).
+
+``GENERATION_SERVICE_URL`` 이 없으면 같은 프로세스의 사이드카(``SIDECAR_PORT``)로 보낸다.
+``JOBS_API_TOKEN`` 이 있으면 ``Authorization: Bearer`` 로 싣는다.
+"""
+
+import base64
+import json
+import os
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from .runner import SIDECAR_PORT, public_base_url
+
+
+def service_url() -> str:
+    return os.getenv("GENERATION_SERVICE_URL", f"http://127.0.0.1:{SIDECAR_PORT}").rstrip("/")
+
+
+class GenerationClient:
+    def __init__(
+        self, base_url: Optional[str] = None, public_url: Optional[str] = None, timeout_s: float = 30.0, token: Optional[str] = None,
+    ) -> None:
+        self.base_url = (base_url or service_url()).rstrip("/")
+        # 브라우저에 넘길 결과 URL (내부 주소와 다를 수 있다)
+        self.public_url = (public_url or os.getenv("GENERATION_SERVICE_PUBLIC_URL") or (
+            public_base_url() if base_url is None and "GENERATION_SERVICE_URL" not in os.environ else self.base_url
+        )).rstrip("/")
+        self.timeout_s = timeout_s
+        import requests  # 앱 기동 경로에서 미루기 위해 여기서
+
+        self.session = requests.Session()
+        token = os.getenv("JOBS_API_TOKEN") if token is None else token
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+
+    def submit(
+        self,
+        engine: str,
+        settings: Dict[str, Any],
+        product_id: str = "",
+        image_bytes: Optional[bytes] = None,
+        priority: str = "interactive",
+        user: str = "default",
+        deadline_s: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """작업 제출. ``image_bytes`` 는 서비스가 로컬 파일에 접근할 수 없을 때 함께 보낸다."""
+        settings = dict(settings)
+        if image_bytes is not None:
+            settings["image_base64"] = base64.b64encode(image_bytes).decode()
+        spec = {"product_id": product_id, "engine": engine, "settings": settings, "priority": priority, "user": user}
+        if deadline_s is not None:
+            spec["deadline_s"] = deadline_s
+        resp = self.session.post(f"{self.base_url}/jobs", json=spec, timeout=self.timeout_s)
+        if resp.status_code >= 400:
+            raise RuntimeError(f"작업 제출 실패 ({resp.status_code}): {resp.text[:300]}")
+        return resp.json()
+
+    def get(self, job_id: str) -> Dict[str, Any]:
+        resp = self.session.get(f"{self.base_url}/jobs/{job_id}", timeout=self.timeout_s)
+        resp.raise_for_status()
+        return resp.json()
+
+    def cancel(self, job_id: str) -> Dict[str, Any]:
+        resp = self.session.delete(f"{self.base_url}/jobs/{job_id}", timeout=self.timeout_s)
+        resp.raise_for_status()
+        return resp.json()
+
+    def events(self, job_id: str, cursor: int = 0) -> Iterator[Dict[str, Any]]:
+        """SSE 이벤트를 dict 로 흘려준다. 마지막은 ``{"kind": "end", "job": {...}}``."""
+        with self.session.get(
+            f"{self.base_url}/jobs/{job_id}/events", params={"cursor": cursor}, stream=True, timeout=(self.timeout_s, 60)
+        ) as resp:
+            resp.raise_for_status()
+            name, data = "message", []
+            for line in resp.iter_lines(decode_unicode=True):
+                if line is None:
+                    continue
+                if not line:
+                    if data:
+                        payload = json.loads("\n".join(data))
+                        if name == "end":
+                            yield {"kind": "end", "job": payload}
+                            return
+                        yield payload
+                    name, data = "message", []
+                elif line.startswith("event:"):
+                    name = line[6:].strip()
+                elif line.startswith("data:"):
+                    data.append(line[5:].strip())
+
+    def wait(self, job_id: str, on_event: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """끝날 때까지 진행 이벤트를 받고 최종 작업 상태를 돌려준다 (스트림이 끊기면 이어받는다)."""
+        import requests
+
+        cursor = 0
+        for _ in range(20):
+            try:
+                for event in self.events(job_id, cursor):
+                    if event.get("kind") == "end":
+                        return event["job"]
+                    cursor = event["seq"] + 1
+                    if on_event is not None:
+                        on_event(event)
+            except requests.RequestException:
+                pass
+            job = self.get(job_id)
+            if job["state"] in ("succeeded", "failed", "cancelled"):
+                return job
+        return self.get(job_id)
+
+    def queues(self) -> Dict[str, Any]:
+        resp = self.session.get(f"{self.base_url}/queues", timeout=self.timeout_s)
+        resp.raise_for_status()
+        return resp.json()
+
+    def artifact_url(self, job_id: str, download: bool = False, variant: Optional[int] = None) -> str:
+        url = f"{self.public_url}/jobs/{job_id}/artifact"
+        query = "&".join(q for q in ("download=1" if download else "", f"variant={variant}" if variant is not None else "") if q)
+        return f"{url}?{query}" if query else url
@@ -0,0 +1,449 @@
+"""헤드리스 영상 생성 서비스 (작업 큐 + 워커 풀).
+
+Streamlit 스크립트 스레드 밖에서 생성을 돌린다. 브라우저 탭 수나 새로고침과
+무관하게 작업이 계속되고, UI 는 HTTP 로 제출/조회/진행 스트림만 한다
+(``src.server.jobs_api`` 라우트, ``src.server.client`` 클라이언트).
+
+작업 하나 = 엔진 하나(또는 ``"auto"`` → 라우터). 벤더 한도는 공용
+``VendorScheduler`` 가 지키고, 워커 수(``GENERATION_WORKERS``)는 동시에
+진행할 작업 수의 상한이다.
+
+같은 상품/엔진/설정(이미지 포함)의 작업이 아직 진행 중이면 새로 만들지 않고 그 작업을
+돌려준다 (더블클릭·여러 사용자 중복 제출). 붙은 클라이언트가 남아 있는 동안 취소는
+붙은 수만 줄인다.
+
+대기 중인 작업은 제출 순서가 아니라 ``FairOrder`` 순서(우선순위 등급 → 마감 → 사용자별
+공정 분배)로 워커에 들어간다. 같은 꼬리표가 엔진 요청에 실려 벤더/CPU 슬롯 대기에도 쓰인다.
+
+``settings.options.variants = n`` 이면 (변형을 지원하는 엔진에서) 한 작업이 n 편을 만든다.
+0번이 ``output_path``, 전체 목록은 ``metadata["variants"]`` (``/jobs/{id}/artifact?variant=i``).
+
+작업마다 스크래치 작업 공간(``src.utils.workspace``)을 열어 입력 이미지, 로컬 렌더러의
+중간 파일, 결과 영상을 두고, 작업이 끝나면 (실패/취소 포함) 통째로 지운다. 성공한 결과는 그 전에
+산출물 저장소(``src.utils.artifacts``)에 내용 주소로 게시하고 매니페스트를 남긴다
+(엔진 단일 비행으로 합쳐진 다른 작업은 리더가 돌아가기 전에 자기 작업 공간으로 결과를 복사받는다)
+(``output_path`` 는 저장소의 로컬 경로, ``metadata["artifacts"]`` 는 role → sha256).
+
+끝난 작업은 ``GENERATION_JOB_TTL_S`` 가 지나거나 ``GENERATION_JOB_HISTORY`` 개를 넘으면 (오래 끝난 것부터)
+메모리에서 뺀다. 그 뒤의 기록은 매니페스트다 (``/jobs/{id}/artifact``, ``/products/{pid}/artifacts``).
+"""
+
+import base64
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+from src.engines import (
+    EngineError,
+    EngineRequest,
+    EngineTimeout,
+    QueueTag,
+    Router,
+    get_capabilities,
+    get_engine,
+    get_scheduler,
+    request_variants,
+    variant_paths,
+)
+from src.engines.fairqueue import FairOrder, priority_rank
+from src.utils.artifacts import ArtifactStore, LocalBackend, Manifest, get_artifact_store, sha256_file
+from src.utils.metrics import COALESCED_REQUESTS
+from src.utils.progress import ProgressEvent, ProgressReporter
+from src.utils.singleflight import fingerprint
+from src.utils.tracing import span
+from src.utils.workspace import Workspace, workspace
+
+logger = logging.getLogger(__name__)
+
+GENERATION_WORKERS = int(os.getenv("GENERATION_WORKERS", "4"))
+GENERATION_OUT_DIR = os.getenv("GENERATION_OUT_DIR", "outputs")
+GENERATION_JOB_HISTORY = int(os.getenv("GENERATION_JOB_HISTORY", "200"))
+GENERATION_JOB_TTL_S = float(os.getenv("GENERATION_JOB_TTL_S", "3600"))
+
+TERMINAL = ("succeeded", "failed", "cancelled")
+# 원격 클라이언트가 엔진 생성자에 넘길 수 있는 인자
+ENGINE_OPTIONS = ("model", "force_live", "api_key", "api_secret", "resolution")
+_MAX_EVENTS = 500
+
+
+def _mask(options: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        k: _mask(v) if isinstance(v, dict) else ("***" if k in ("api_key", "api_secret") else v)
+        for k, v in options.items()
+    }
+
+
+@dataclass
+class GenerationJob:
+    id: str
+    product_id: str
+    engine: str
+    settings: Dict[str, Any]
+    state: str = "queued"  # queued | running | succeeded | failed | cancelled
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    output_path: Optional[str] = None
+    error: Optional[str] = None
+    error_type: Optional[str] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    priority: str = "interactive"
+    user: str = "default"
+    deadline_at: Optional[float] = None
+    fingerprint: str = ""
+    attached: int = 1  # 이 작업을 기다리는 제출 수 (중복 제출이 붙으면 증가)
+    events: List[Dict[str, Any]] = field(default_factory=list, repr=False)
+
+    @property
+    def done(self) -> bool:
+        return self.state in TERMINAL
+
+    def public(self) -> Dict[str, Any]:
+        """API 응답용 (이벤트/비밀값 제외)."""
+        data = asdict(self)
+        data.pop("events")
+        settings = dict(data["settings"])
+        settings.pop("image_base64", None)
+        settings["engine_options"] = _mask(settings.get("engine_options") or {})
+        data["settings"] = settings
+        data["event_count"] = len(self.events)
+        return data
+
+
+class _JobReporter(ProgressReporter):
+    """엔진 진행 이벤트를 작업 이벤트 목록에 쌓는다 (로그도 그대로)."""
+
+    def __init__(self, service: "GenerationService", job: GenerationJob, source: str = "") -> None:
+        super().__init__(source)
+        self.service = service
+        self.job = job
+
+    def emit(self, event: ProgressEvent) -> None:
+        super().emit(event)
+        if event.kind == "detail":
+            return
+        self.service._event(self.job, event.kind, event.message, source=event.source)
+
+
+def _engine_kwargs(options: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    return {k: v for k, v in (options or {}).items() if k in ENGINE_OPTIONS}
+
+
+class GenerationService:
+    def __init__(
+        self,
+        workers: int = GENERATION_WORKERS,
+        out_dir: str = GENERATION_OUT_DIR,
+        store: Optional[ArtifactStore] = None,
+        history: int = GENERATION_JOB_HISTORY,
+        job_ttl_s: float = GENERATION_JOB_TTL_S,
+    ) -> None:
+        self.out_dir = out_dir
+        self.store = store or ArtifactStore(LocalBackend(os.path.join(out_dir, "artifacts")))
+        self.workers = workers
+        self.history = history
+        self.job_ttl_s = job_ttl_s
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="gen-worker")
+        self._jobs: Dict[str, GenerationJob] = {}
+        self._cancels: Dict[str, threading.Event] = {}
+        self._inflight: Dict[str, str] = {}  # 지문 → 진행 중인 작업 id
+        self._pending = FairOrder()
+        self._cond = threading.Condition()
+
+    # ---------- 제출/조회 ----------
+    def submit(self, spec: Dict[str, Any]) -> GenerationJob:
+        """``{"product_id", "engine", "settings": {...}}`` → 대기열에 넣은 작업."""
+        engine = str(spec.get("engine") or "").strip()
+        if not engine:
+            raise ValueError("engine 이 필요합니다")
+        if engine != "auto":
+            get_capabilities(engine)  # 알 수 없는 엔진이면 KeyError
+        settings = dict(spec.get("settings") or {})
+        if not (settings.get("image_url") or settings.get("image_path") or settings.get("image_base64")):
+            raise ValueError("settings.image_url / image_path / image_base64 중 하나가 필요합니다")
+        product_id = str(spec.get("product_id") or "adhoc")
+        priority = str(spec.get("priority") or "interactive")
+        priority_rank(priority)  # 알 수 없는 등급이면 ValueError
+        user = str(spec.get("user") or "default")
+        deadline_at = time.time() + float(spec["deadline_s"]) if spec.get("deadline_s") not in (None, "") else None
+        key = fingerprint(engine, product_id, settings)
+        with self._cond:
+            existing = self._jobs.get(self._inflight.get(key, ""))
+            if existing is not None and not existing.done:
+                existing.attached += 1
+                attached = existing
+            else:
+                attached = None
+                job = GenerationJob(
+                    id=uuid.uuid4().hex[:12],
+                    product_id=product_id,
+                    engine=engine,
+                    settings=settings,
+                    priority=priority,
+                    user=user,
+                    deadline_at=deadline_at,
+                    fingerprint=key,
+                )
+                self._jobs[job.id] = job
+                self._cancels[job.id] = threading.Event()
+                self._inflight[key] = job.id
+                share = 60.0 if engine == "auto" else get_capabilities(engine).expected_latency_s
+                self._pending.push(job, self._tag(job), cost=share)
+        if attached is not None:
+            COALESCED_REQUESTS.inc(flight="job")
+            self._event(attached, "attach", "동일한 진행 중 작업에 연결됨", attached=attached.attached)
+            return attached
+        self._event(job, "state", "대기열에 추가됨", state="queued")
+        # 워커는 제출 순서가 아니라 대기열 순서로 다음 작업을 꺼낸다
+        self._pool.submit(self._run_next)
+        return job
+
+    def get(self, job_id: str) -> GenerationJob:
+        with self._cond:
+            return self._jobs[job_id]
+
+    def list(self, limit: int = 50) -> List[GenerationJob]:
+        with self._cond:
+            return sorted(self._jobs.values(), key=lambda j: j.created_at, reverse=True)[:limit]
+
+    def cancel(self, job_id: str) -> GenerationJob:
+        job = self.get(job_id)
+        with self._cond:
+            if not job.done and job.attached > 1:
+                # 다른 제출도 이 작업을 기다리고 있다 — 연결만 하나 끊는다
+                job.attached -= 1
+                detached = True
+            else:
+                detached = False
+        if detached:
+            self._event(job, "detach", "연결 하나가 취소됨", attached=job.attached)
+            return job
+        if not job.done:
+            self._cancels[job_id].set()
+            if job.state == "queued":
+                self._finish(job, "cancelled", error="취소됨")
+        return job
+
+    def events(self, job_id: str, cursor: int = 0, timeout_s: float = 15.0) -> List[Dict[str, Any]]:
+        """``seq >= cursor`` 인 이벤트. 새 이벤트가 없으면 ``timeout_s`` 까지 기다린다 (SSE 용)."""
+        deadline = time.monotonic() + timeout_s
+        with self._cond:
+            job = self._jobs[job_id]
+            while not (job.events and job.events[-1]["seq"] >= cursor) and not job.done:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            return [e for e in job.events if e["seq"] >= cursor]
+
+    def queue(self) -> Dict[str, Any]:
+        """대기열 상태 (워커에 들어갈 순서대로)."""
+        now = time.time()
+        with self._cond:
+            waiting = [
+                {
+                    "id": e.item.id,
+                    "product_id": e.item.product_id,
+                    "engine": e.item.engine,
+                    "priority": e.tag.priority,
+                    "user": e.tag.user,
+                    "deadline_in_s": None if e.tag.deadline_at is None else round(e.tag.deadline_at - now, 1),
+                }
+                for e in self._pending.ordered()
+                if not e.item.done
+            ]
+            running = [
+                {"id": j.id, "product_id": j.product_id, "engine": j.engine, "priority": j.priority, "user": j.user}
+                for j in self._jobs.values()
+                if j.state == "running"
+            ]
+        return {"name": "service", "capacity": self.workers, "running": running, "waiting": waiting}
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            counts: Dict[str, int] = {}
+            for job in self._jobs.values():
+                counts[job.state] = counts.get(job.state, 0) + 1
+            return counts
+
+    def shutdown(self, wait: bool = False) -> None:
+        for cancel in self._cancels.values():
+            cancel.set()
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+    # ---------- 내부 ----------
+    def _event(self, job: GenerationJob, kind: str, message: str, **data: Any) -> None:
+        with self._cond:
+            seq = job.events[-1]["seq"] + 1 if job.events else 0
+            job.events.append({"seq": seq, "ts": time.time(), "kind": kind, "message": message, **data})
+            if len(job.events) > _MAX_EVENTS:
+                # 폴링 진행 메시지가 길게 쌓이지 않도록 가장 오래된 progress 부터 버린다 (seq 는 유지)
+                drop = next((i for i, e in enumerate(job.events) if e["kind"] == "progress"), 0)
+                del job.events[drop]
+            self._cond.notify_all()
+
+    def _finish(self, job: GenerationJob, state: str, error: Optional[str] = None, error_type: Optional[str] = None) -> None:
+        with self._cond:
+            if job.done:
+                return
+            job.state = state
+            job.error = error
+            job.error_type = error_type
+            job.finished_at = time.time()
+            if self._inflight.get(job.fingerprint) == job.id:
+                del self._inflight[job.fingerprint]
+        self._event(job, "state", error or "완료", state=state)
+        with self._cond:
+            self._evict()
+
+    def _evict(self) -> None:
+        """TTL 이 지났거나 ``history`` 개를 넘는 끝난 작업을 뺀다 (``_cond`` 를 잡고 호출)."""
+        done = sorted((j for j in self._jobs.values() if j.done), key=lambda j: j.finished_at or 0.0)
+        excess = len(done) - self.history
+        cutoff = time.time() - self.job_ttl_s
+        for i, job in enumerate(done):
+            if i >= excess and (job.finished_at or 0.0) >= cutoff:
+                break
+            del self._jobs[job.id]
+            self._cancels.pop(job.id, None)
+
+    def _input_image(self, job: GenerationJob, ws: Workspace) -> Optional[str]:
+        settings = job.settings
+        if settings.get("image_base64"):
+            path = ws.path("input.jpg")
+            with open(path, "wb") as f:
+                f.write(base64.b64decode(settings["image_base64"]))
+            ws.track(path)
+            return path
+        return settings.get("image_path") or None
+
+    def _tag(self, job: GenerationJob) -> QueueTag:
+        return QueueTag(job.priority, job.user, job.deadline_at, label=f"{job.product_id}/{job.id}")
+
+    @staticmethod
+    def _route_deadline(job: GenerationJob) -> Optional[float]:
+        """라우터 마감(초). 작업 마감(``deadline_s`` → ``deadline_at``)의 남은 시간이 우선이고,
+        없을 때만 예전 ``settings.deadline_s`` (라우터 전용)를 쓴다."""
+        if job.deadline_at is not None:
+            return max(0.0, job.deadline_at - time.time())
+        value = job.settings.get("deadline_s")
+        return float(value) if value not in (None, "") else None
+
+    def _request(self, job: GenerationJob, ws: Workspace) -> EngineRequest:
+        s = job.settings
+        return EngineRequest(
+            output_path=ws.path(f"{job.engine}_{job.id}.mp4"),
+            image_path=self._input_image(job, ws),
+            image_url=s.get("image_url") or None,
+            prompt=s.get("prompt") or "",
+            ratio=s.get("ratio") or "720:1280",
+            duration=int(s.get("duration") or 5),
+            seed=int(s["seed"]) if s.get("seed") not in (None, "") else None,
+            options=dict(s.get("options") or {}),
+            tag=self._tag(job),
+        )
+
+    def _publish(self, job: GenerationJob, request: EngineRequest, path: str, engine: str) -> Manifest:
+        """결과(+변형)를 저장소에 게시. 입력/파라미터/시간은 매니페스트에."""
+        files = {"video": path}
+        for i, p in enumerate(variant_paths(path, request_variants(request))[1:], start=1):
+            if os.path.isfile(p):
+                files[f"variant_{i}"] = p
+        inputs: Dict[str, Any] = {"image_url": request.image_url}
+        if request.image_path and os.path.isfile(request.image_path):
+            inputs["image_sha256"] = sha256_file(request.image_path)
+        now = time.time()
+        started = job.started_at or now
+        return self.store.publish(
+            job.id,
+            job.product_id,
+            engine,
+            files,
+            inputs=inputs,
+            params={
+                "prompt": request.prompt,
+                "ratio": request.ratio,
+                "duration": request.duration,
+                "seed": request.seed,
+                "options": _mask(request.options),
+                "requested_engine": job.engine,
+            },
+            timings={"queued_s": round(started - job.created_at, 3), "run_s": round(now - started, 3)},
+        )
+
+    def _run_next(self) -> None:
+        with self._cond:
+            job = self._pending.pop()
+        if job is not None:
+            self._run(job)
+
+    def _run(self, job: GenerationJob) -> None:
+        if job.done:  # 대기 중 취소 (이미 메모리에서 빠졌을 수도 있다)
+            return
+        cancel = self._cancels[job.id]
+        if cancel.is_set():
+            return
+        with self._cond:
+            job.state = "running"
+            job.started_at = time.time()
+        self._event(job, "state", "실행 중", state="running")
+        reporter = _JobReporter(self, job, job.engine)
+        try:
+            with span("service.job", job_id=job.id, product_id=job.product_id, engine=job.engine):
+                with workspace(f"job-{job.id}") as ws:
+                    request = self._request(job, ws)
+                    options = job.settings.get("engine_options") or {}
+                    if job.engine == "auto":
+                        # auto: engine_options 는 {엔진명: {...}}
+                        engines = {
+                            n: get_engine(n, reporter=reporter.child(n), **_engine_kwargs(options.get(n)))
+                            for n in job.settings.get("candidates") or []
+                        }
+                        routed = Router().run(
+                            engines, request, self._route_deadline(job), bool(job.settings.get("hedge", True)), cancel=cancel
+                        )
+                        path, engine_name = routed.output_path, routed.engine
+                        job.metadata["route"] = routed.metadata
+                    else:
+                        engine = get_engine(job.engine, reporter=reporter, **_engine_kwargs(options))
+                        path, engine_name = get_scheduler().run(engine, request, cancel=cancel), job.engine
+                    # 작업 공간이 지워지기 전에 저장소로
+                    if not os.path.isfile(path):
+                        raise EngineError(f"{engine_name}: 결과 파일이 없습니다 ({path})")
+                    manifest = self._publish(job, request, path, engine_name)
+        except EngineTimeout as e:
+            job.metadata["vendor_job_id"] = e.handle.job_id
+            self._finish(job, "failed", str(e), type(e).__name__)
+        except Exception as e:
+            logger.warning("생성 작업 실패 (%s): %s", job.id, e)
+            state = "cancelled" if cancel.is_set() else "failed"
+            self._finish(job, state, str(e), type(e).__name__)
+        else:
+            videos = [a for a in manifest.artifacts if a.role == "video" or a.role.startswith("variant_")]
+            job.output_path = self.store.local_path(videos[0])
+            if len(videos) > 1:
+                job.metadata["variants"] = [self.store.local_path(a) for a in videos]
+            job.metadata["artifacts"] = {a.role: a.sha256 for a in manifest.artifacts}
+            self._finish(job, "succeeded")
+        finally:
+            if job.settings.get("image_base64"):
+                job.settings["image_base64"] = None  # 입력 바이트는 들고 있지 않는다
+
+
+_service: Optional[GenerationService] = None
+_service_lock = threading.Lock()
+
+
+def get_generation_service() -> GenerationService:
+    """프로세스 공용 생성 서비스 (사이드카/헤드리스 서버가 공유)."""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = GenerationService(store=get_artifact_store())
+    return _service
@@ -0,0 +1,269 @@
+"""생성 작업 HTTP API.
+
+- ``POST /jobs``               {"product_id", "engine", "settings", "priority"?, "user"?, "deadline_s"?} → 202 + 작업
+- ``GET /jobs``                최근 작업 목록 (+ 상태별 개수, ``?limit=`` 1..500)
+- ``GET /jobs/{id}``           작업 상태
+- ``DELETE /jobs/{id}``        취소
+- ``GET /jobs/{id}/events``    진행 이벤트 SSE (``?cursor=`` 또는 Last-Event-ID 로 이어받기)
+- ``GET /jobs/{id}/artifact``  결과 영상 (Range 지원, ``?download=1``, 변형은 ``?variant=i``). 메모리에서 빠진 작업은 매니페스트로
+- ``POST /jobs/{id}/pin``      산출물 보존 고정 (``DELETE`` 로 해제)
+- ``GET /products/{pid}/artifacts``  상품의 산출물 작업 목록 (저장소 상품 색인, 최신순)
+- ``GET /queues``              서비스/벤더/CPU 대기열 상태 (``scripts/queue_status.py``)
+
+마감은 하나다: 최상위 ``deadline_s`` 는 작업 마감으로 대기열 순서(서비스/벤더/CPU)를 정하고, ``engine="auto"`` 면
+라우터도 그 남은 시간으로 엔진을 고른다. ``settings.deadline_s`` 는 최상위 값이 없을 때만 쓰는 예전 라우터 전용 마감이다
+(라우터가 대기열 꼬리표에도 같은 마감을 싣는다).
+
+접근 제어:
+- ``JOBS_API_TOKEN`` 이 있으면 결과 영상(``artifact``, 브라우저 ``<video>`` 용)을 뺀 모든 라우트에
+  ``Authorization: Bearer <토큰>`` 이 필요하다 (없거나 틀리면 401)
+- 토큰이 없으면 루프백 호출만 받는다 (원격 호출은 401). 사이드카를 밖으로 열면 토큰도 함께 둔다
+- 원격 호출은 토큰이 있어도 서버의 로컬 파일을 가리킬 수 없다: ``settings.image_path`` 와
+  ``options`` / ``engine_options`` 안의 이미지 참조(``images``, ``url`` 등)는 http(s) 만 받는다.
+  유료 실시간 호출(``engine_options.force_live``)도 루프백 전용이다 (403)
+"""
+
+import asyncio
+import hmac
+import ipaddress
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+from sse_starlette.sse import EventSourceResponse
+from starlette.requests import Request
+from starlette.responses import FileResponse, JSONResponse
+from starlette.routing import Route
+
+from src.engines import get_scheduler
+
+from .generation import GenerationService, get_generation_service
+
+JOBS_API_TOKEN = os.getenv("JOBS_API_TOKEN", "")
+# 원격 호출자가 보낼 수 없는 설정 (로컬 파일 읽기 / 유료 실시간 호출)
+LOCAL_ONLY_SETTINGS = ("image_path",)
+LOCAL_ONLY_ENGINE_OPTIONS = ("force_live",)
+# 옵션 안에서 이미지/파일을 가리키는 키 — 원격 호출은 http(s) URL 만
+IMAGE_REF_KEYS = ("image", "images", "image_url", "image_urls", "image_path", "url", "urls", "path", "paths")
+MAX_LIST_LIMIT = 500
+
+
+def _links(job_id: str) -> dict:
+    return {
+        "self": f"/jobs/{job_id}",
+        "events": f"/jobs/{job_id}/events",
+        "artifact": f"/jobs/{job_id}/artifact",
+    }
+
+
+def _int_param(value: Optional[str], name: str, default: int) -> int:
+    """정수 쿼리/헤더 값. 형식이 틀리거나 음수면 ``ValueError`` (→ 400)."""
+    if value in (None, ""):
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise ValueError(f"{name} 은(는) 정수여야 합니다: {value[:40]!r}") from None
+    if number < 0:
+        raise ValueError(f"{name} 은(는) 0 이상이어야 합니다: {number}")
+    return number
+
+
+def _is_loopback(request: Request) -> bool:
+    host = request.client.host if request.client else ""
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return host == "localhost"
+
+
+def _is_http(value: Any) -> bool:
+    return isinstance(value, str) and value.lower().startswith(("http://", "https://"))
+
+
+def _local_refs(value: Any, where: str) -> List[str]:
+    """``IMAGE_REF_KEYS`` 아래에서 http(s) 가 아닌 문자열이 있는 위치."""
+    found: List[str] = []
+    if isinstance(value, dict):
+        for k, v in value.items():
+            if k in IMAGE_REF_KEYS:
+                refs = v if isinstance(v, (list, tuple)) else [v]
+                if any(isinstance(r, str) and r and not _is_http(r) for r in refs):
+                    found.append(f"{where}.{k}")
+                found += [f for r in refs if isinstance(r, dict) for f in _local_refs(r, f"{where}.{k}")]
+            else:
+                found += _local_refs(v, f"{where}.{k}")
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            found += _local_refs(item, where)
+    return found
+
+
+def _local_only(settings: Dict[str, Any]) -> List[str]:
+    """원격 호출에서 거부할 설정 위치 (``auto`` 는 엔진별 ``engine_options`` 도 본다)."""
+    found = [k for k in LOCAL_ONLY_SETTINGS if settings.get(k)]
+    if settings.get("image_url") and not _is_http(settings["image_url"]):
+        found.append("image_url")
+    options = settings.get("engine_options") or {}
+    scopes = ([options] + [v for v in options.values() if isinstance(v, dict)]) if isinstance(options, dict) else []
+    for scope in scopes:
+        found += [f"engine_options.{k}" for k in LOCAL_ONLY_ENGINE_OPTIONS if scope.get(k)]
+    found += _local_refs(options, "engine_options") + _local_refs(settings.get("options") or {}, "options")
+    return sorted(set(found))
+
+
+def job_routes(service: Optional[GenerationService] = None, token: Optional[str] = None) -> List[Route]:
+    token = JOBS_API_TOKEN if token is None else token
+
+    def svc() -> GenerationService:
+        return service or get_generation_service()
+
+    def guarded(handler):
+        """토큰이 있으면 ``Authorization: Bearer`` 확인, 없으면 루프백 호출만 받는다."""
+        async def wrapper(request: Request):
+            if token:
+                if not hmac.compare_digest(request.headers.get("authorization", ""), f"Bearer {token}"):
+                    return JSONResponse({"error": "인증이 필요합니다"}, status_code=401)
+            elif not _is_loopback(request):
+                return JSONResponse({"error": "JOBS_API_TOKEN 이 없어 원격 호출은 받지 않습니다"}, status_code=401)
+            return await handler(request)
+
+        return wrapper
+
+    def not_found(job_id: str) -> JSONResponse:
+        return JSONResponse({"error": f"알 수 없는 작업: {job_id}"}, status_code=404)
+
+    async def create(request: Request):
+        try:
+            spec = await request.json()
+        except ValueError:
+            return JSONResponse({"error": "JSON 본문이 필요합니다"}, status_code=400)
+        spec = spec if isinstance(spec, dict) else {}
+        settings = spec.get("settings")
+        if not _is_loopback(request) and isinstance(settings, dict):
+            denied = _local_only(settings)
+            if denied:
+                return JSONResponse({"error": f"원격 호출에서는 쓸 수 없는 설정: {', '.join(denied)}"}, status_code=403)
+        try:
+            job = svc().submit(spec)
+        except KeyError as e:
+            return JSONResponse({"error": f"알 수 없는 엔진: {e}"}, status_code=400)
+        except ValueError as e:
+            return JSONResponse({"error": str(e)}, status_code=400)
+        return JSONResponse({**job.public(), "links": _links(job.id)}, status_code=202)
+
+    async def index(request: Request):
+        try:
+            limit = _int_param(request.query_params.get("limit"), "limit", 50)
+        except ValueError as e:
+            return JSONResponse({"error": str(e)}, status_code=400)
+        jobs = svc().list(max(1, min(limit, MAX_LIST_LIMIT)))
+        return JSONResponse({"counts": svc().stats(), "jobs": [j.public() for j in jobs]})
+
+    async def detail(request: Request):
+        job_id = request.path_params["job_id"]
+        try:
+            job = svc().cancel(job_id) if request.method == "DELETE" else svc().get(job_id)
+        except KeyError:
+            return not_found(job_id)
+        return JSONResponse({**job.public(), "links": _links(job.id)})
+
+    async def events(request: Request):
+        job_id = request.path_params["job_id"]
+        try:
+            svc().get(job_id)
+        except KeyError:
+            return not_found(job_id)
+        last_id = request.headers.get("last-event-id")
+        try:
+            if last_id:
+                cursor = _int_param(last_id, "Last-Event-ID", 0) + 1
+            else:
+                cursor = _int_param(request.query_params.get("cursor"), "cursor", 0)
+        except ValueError as e:
+            return JSONResponse({"error": str(e)}, status_code=400)
+
+        async def stream():
+            nonlocal cursor
+            while True:
+                try:
+                    batch = await asyncio.to_thread(svc().events, job_id, cursor, 15.0)
+                    for event in batch:
+                        cursor = event["seq"] + 1
+                        yield {"id": str(event["seq"]), "event": event["kind"], "data": json.dumps(event, ensure_ascii=False)}
+                    job = svc().get(job_id)
+                    if job.done and not svc().events(job_id, cursor, 0):
+                        yield {"event": "end", "data": json.dumps(job.public(), ensure_ascii=False)}
+                        return
+                except KeyError:  # 스트림 도중 메모리에서 빠졌다
+                    return
+                if await request.is_disconnected():
+                    return
+
+        # ping 으로 프록시 유휴 타임아웃을 막는다
+        return EventSourceResponse(stream(), ping=10)
+
+    async def artifact(request: Request):
+        job_id = request.path_params["job_id"]
+        try:
+            job = svc().get(job_id)
+        except KeyError:
+            job = None
+        if job is not None:
+            if job.state != "succeeded" or not job.output_path or not os.path.isfile(job.output_path):
+                return JSONResponse({"error": f"결과 없음 (state={job.state})"}, status_code=409)
+            product_id, engine = job.product_id, job.engine
+            variants = job.metadata.get("variants") or [job.output_path]
+        else:
+            # 메모리에서 빠진 작업 → 매니페스트
+            try:
+                manifest = await asyncio.to_thread(svc().store.manifest, job_id)
+            except KeyError:
+                return not_found(job_id)
+            product_id, engine = manifest.product_id, manifest.engine
+            videos = [a for a in manifest.artifacts if a.role == "video" or a.role.startswith("variant_")]
+            variants = [await asyncio.to_thread(svc().store.local_path, a) for a in videos]
+            if not variants:
+                return JSONResponse({"error": "결과 없음"}, status_code=409)
+        path = variants[0]
+        variant = request.query_params.get("variant")
+        if variant not in (None, ""):
+            if not variant.isdigit() or int(variant) >= len(variants):
+                return JSONResponse({"error": f"알 수 없는 변형: {variant} (0..{len(variants) - 1})"}, status_code=404)
+            path = variants[int(variant)]
+        download = request.query_params.get("download") == "1"
+        # 저장소 경로는 내용 해시라 내려받을 이름은 따로 붙인다
+        suffix = f"_v{variant}" if variant not in (None, "", "0") else ""
+        return FileResponse(
+            path,
+            media_type="video/mp4",
+            filename=f"{product_id}_{engine}_{job_id}{suffix}.mp4" if download else None,
+            content_disposition_type="attachment" if download else "inline",
+        )
+
+    async def pin(request: Request):
+        job_id = request.path_params["job_id"]
+        try:
+            manifest = svc().store.pin(job_id, pinned=request.method == "POST")
+        except KeyError:
+            return JSONResponse({"error": f"산출물 없음: {job_id}"}, status_code=404)
+        return JSONResponse({"job_id": job_id, "pinned": manifest.pinned})
+
+    async def product_artifacts(request: Request):
+        product_id = request.path_params["product_id"]
+        return JSONResponse({"product_id": product_id, "jobs": svc().store.list_product(product_id)})
+
+    async def queues(request: Request):
+        return JSONResponse({"service": svc().queue(), **get_scheduler().queues()})
+
+    return [
+        Route("/jobs", guarded(create), methods=["POST"]),
+        Route("/jobs", guarded(index), methods=["GET"]),
+        Route("/jobs/{job_id}", guarded(detail), methods=["GET", "DELETE"]),
+        Route("/jobs/{job_id}/events", guarded(events)),
+        # 브라우저 <video> 는 헤더를 못 붙인다 — 추측하기 어려운 작업 id 로만 접근
+        Route("/jobs/{job_id}/artifact", artifact, methods=["GET", "HEAD"]),
+        Route("/jobs/{job_id}/pin", guarded(pin), methods=["POST", "DELETE"]),
+        Route("/products/{product_id}/artifacts", guarded(product_artifacts)),
+        Route("/queues", guarded(queues)),
+    ]
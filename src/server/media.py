@@ -0,0 +1,48 @@
+"""생성 산출물 정적 서빙 (HTTP Range 지원).
+
+Streamlit 웹소켓으로 영상 바이트를 보내는 대신 브라우저가
+``/media/<상대경로>`` 를 Range 요청으로 점진적으로 받아 재생/탐색한다.
+"""
+
+import mimetypes
+import os
+from typing import List
+
+from starlette.requests import Request
+from starlette.responses import FileResponse, PlainTextResponse
+from starlette.routing import Route
+
+
+MEDIA_ROOT = os.getenv("MEDIA_ROOT", "outputs")
+
+
+def resolve_media_path(rel_path: str, root: str = MEDIA_ROOT) -> str:
+    """``root`` 밖으로 나가는 경로(../ 등)는 거부한다."""
+    base = os.path.realpath(root)
+    full = os.path.realpath(os.path.join(base, rel_path))
+    if os.path.commonpath([base, full]) != base:
+        raise PermissionError(rel_path)
+    return full
+
+
+def media_routes(root: str = MEDIA_ROOT) -> List[Route]:
+    async def serve_media(request: Request):
+        rel_path = request.path_params["path"]
+        try:
+            full = resolve_media_path(rel_path, root)
+        except PermissionError:
+            return PlainTextResponse("forbidden", status_code=403)
+        if not os.path.isfile(full):
+            return PlainTextResponse("not found", status_code=404)
+        media_type = mimetypes.guess_type(full)[0] or "application/octet-stream"
+        download = request.query_params.get("download") == "1"
+        # FileResponse 가 Range/If-Range/ETag 를 처리하고 파일을 청크로 스트리밍한다
+        return FileResponse(
+            full,
+            media_type=media_type,
+            filename=os.path.basename(full) if download else None,
+            content_disposition_type="attachment" if download else "inline",
+            headers={"Cache-Control": "private, max-age=3600"},
+        )
+
+    return [Route("/media/{path:path}", serve_media, methods=["GET", "HEAD"])]
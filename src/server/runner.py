@@ -0,0 +1,86 @@
+"""사이드카 서버 기동.
+
+Streamlit 프로세스 안에서 uvicorn 을 데몬 스레드로 한 번만 띄운다.
+라우트(/health, /metrics, /media, /webhooks, /jobs)는 ``build_app`` 에서 조립한다.
+
+기본은 루프백(127.0.0.1)에만 연다. 컨테이너처럼 밖에서 접근해야 하면 ``SIDECAR_HOST=0.0.0.0`` 과
+``JOBS_API_TOKEN`` 을 함께 준다 (``src.server.jobs_api`` 접근 제어).
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Optional
+from urllib.parse import quote
+
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from src.utils.metrics import REGISTRY
+
+from .jobs_api import JOBS_API_TOKEN, job_routes
+from .media import MEDIA_ROOT, media_routes
+from .webhooks import webhook_routes
+
+logger = logging.getLogger(__name__)
+
+SIDECAR_HOST = os.getenv("SIDECAR_HOST", "127.0.0.1")
+SIDECAR_PORT = int(os.getenv("SIDECAR_PORT", "3001"))
+
+_server = None
+_lock = threading.Lock()
+
+
+def build_app(media_root: str = MEDIA_ROOT) -> Starlette:
+    async def health(request):
+        return PlainTextResponse("ok")
+
+    async def metrics(request):
+        return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+    routes = [Route("/health", health), Route("/metrics", metrics)] + media_routes(media_root) + webhook_routes() + job_routes()
+    return Starlette(routes=routes)
+
+
+def warn_if_exposed(host: str) -> None:
+    if host not in ("127.0.0.1", "localhost", "::1") and not JOBS_API_TOKEN:
+        logger.warning("사이드카가 %s 에 열렸지만 JOBS_API_TOKEN 이 없습니다 (원격 /jobs 호출은 모두 401)", host)
+
+
+def start_background_server(host: str = SIDECAR_HOST, port: int = SIDECAR_PORT, media_root: str = MEDIA_ROOT):
+    """사이드카를 (프로세스당 한 번) 띄우고 uvicorn Server 를 돌려준다."""
+    global _server
+    with _lock:
+        if _server is not None:
+            return _server
+        import uvicorn
+
+        warn_if_exposed(host)
+        config = uvicorn.Config(build_app(media_root), host=host, port=port, log_level="warning", access_log=False)
+        server = uvicorn.Server(config)
+        # 스레드에서 돌리므로 시그널 핸들러 설치를 막는다
+        server.install_signal_handlers = lambda: None
+        thread = threading.Thread(target=server.run, name="sidecar-server", daemon=True)
+        thread.start()
+        deadline = time.monotonic() + 5.0
+        while not server.started and thread.is_alive() and time.monotonic() < deadline:
+            time.sleep(0.02)
+        if not server.started:
+            logger.warning("사이드카 서버 기동 실패 (%s:%s)", host, port)
+        _server = server
+        return server
+
+
+def public_base_url() -> str:
+    """브라우저가 접근할 사이드카 주소 (``SIDECAR_PUBLIC_URL`` 우선)."""
+    return os.getenv("SIDECAR_PUBLIC_URL", f"http://localhost:{SIDECAR_PORT}").rstrip("/")
+
+
+def media_url(path: str, download: bool = False, media_root: Optional[str] = None) -> str:
+    """``outputs/...`` 파일 경로를 사이드카 미디어 URL 로 변환한다."""
+    root = os.path.realpath(media_root or MEDIA_ROOT)
+    rel = os.path.relpath(os.path.realpath(path), root).replace(os.sep, "/")
+    url = f"{public_base_url()}/media/{quote(rel)}"
+    return url + "?download=1" if download else url
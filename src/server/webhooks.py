@@ -0,0 +1,71 @@
+"""벤더 작업 완료 콜백 수신 (``POST /webhooks/{engine}``).
+
+서명 검증 후 payload 의 작업 id 로 ``JobStore`` 를 완료 처리한다.
+등록된 벤더 엔진이 아닌 경로는 메트릭에 남기지 않고 404 (라벨이 경로 값으로 늘어나지 않게).
+검증은 둘 중 하나:
+- ``X-Webhook-Signature: sha256=<hex>``: 본문의 HMAC-SHA256 (비밀값 = ``webhook_secret()``)
+- ``X-Webhook-Secret: <secret>``: 제출 때 등록한 비밀값을 그대로 돌려주는 벤더(Higgs)
+"""
+
+import hashlib
+import hmac
+import json
+from typing import Any, Callable, List, Mapping, Optional
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+
+from src.engines import list_engines
+from src.engines.jobs import JobStore, get_job_store, webhook_secret
+from src.utils.metrics import WEBHOOK_EVENTS
+
+
+def sign(secret: str, body: bytes) -> str:
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def verify_signature(secret: str, body: bytes, headers: Mapping[str, str]) -> bool:
+    signature = headers.get("x-webhook-signature")
+    if signature:
+        return hmac.compare_digest(sign(secret, body), signature if "=" in signature else f"sha256={signature}")
+    echoed = headers.get("x-webhook-secret")
+    return bool(echoed) and hmac.compare_digest(echoed, secret)
+
+
+def job_id_of(payload: Any) -> Optional[str]:
+    """Higgs job set / Runway task 공통: 최상위 id (또는 task_id / job_set_id)."""
+    if not isinstance(payload, dict):
+        return None
+    for key in ("id", "job_set_id", "task_id", "taskId"):
+        if payload.get(key):
+            return str(payload[key])
+    return None
+
+
+def webhook_routes(
+    store: Optional[JobStore] = None,
+    secret: Optional[Callable[[], str]] = None,
+) -> List[Route]:
+    async def receive(request: Request):
+        engine = request.path_params["engine"]
+        if engine not in {e.name for e in list_engines("vendor")}:
+            return PlainTextResponse("unknown engine", status_code=404)
+        body = await request.body()
+        if not verify_signature((secret or webhook_secret)(), body, request.headers):
+            WEBHOOK_EVENTS.inc(engine=engine, result="rejected")
+            return PlainTextResponse("invalid signature", status_code=401)
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            WEBHOOK_EVENTS.inc(engine=engine, result="invalid")
+            return PlainTextResponse("invalid json", status_code=400)
+        job_id = job_id_of(payload)
+        if not job_id:
+            WEBHOOK_EVENTS.inc(engine=engine, result="invalid")
+            return PlainTextResponse("missing job id", status_code=400)
+        (store or get_job_store()).complete(engine, job_id, payload)
+        WEBHOOK_EVENTS.inc(engine=engine, result="accepted")
+        return JSONResponse({"ok": True, "job_id": job_id})
+
+    return [Route("/webhooks/{engine}", receive, methods=["POST"])]
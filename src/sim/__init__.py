@@ -0,0 +1,3 @@
+# Local vendor API simulator
+# 크레딧 없이 Runway / Higgs / Veo 어댑터를 부하/지연 테스트하기 위한 로컬 대역 서버
+from .vendor_api import SimConfig, SimServer, VendorSimulator, serve, synthetic_mp4  # noqa: F401
@@ -0,0 +1,37 @@
+"""시뮬레이터 단독 실행: ``python -m src.sim --port 8800 --queue-s 2 --run-s 10``"""
+
+import argparse
+import time
+
+from .vendor_api import SimConfig, serve
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Local Runway / Higgs / Veo API simulator")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8800)
+    for name, default in (("queue-s", 0.5), ("run-s", 2.0), ("jitter", 0.2), ("failure-rate", 0.0),
+                          ("submits-per-s", 0.0), ("random-429", 0.0), ("retry-after-s", 1.0), ("credits", 10000.0)):
+        ap.add_argument(f"--{name}", type=float, default=default)
+    ap.add_argument("--max-running", type=int, default=0)
+    ap.add_argument("--video-kb", type=int, default=256)
+    args = ap.parse_args()
+
+    sim = serve(SimConfig(
+        queue_s=args.queue_s, run_s=args.run_s, jitter=args.jitter, failure_rate=args.failure_rate,
+        submits_per_s=args.submits_per_s, max_running=args.max_running, random_429_rate=args.random_429,
+        retry_after_s=args.retry_after_s, video_bytes=args.video_kb * 1024, credits=args.credits,
+    ), host=args.host, port=args.port)
+    print(f"🧪 벤더 시뮬레이터: {sim.base_url}")
+    for key, value in sim.env().items():
+        print(f"export {key}={value}")
+    print("export RUNWAY_LIVE=1 RUNWAY_API_KEY=sim HIGGS_API_KEY=sim HIGGS_SECRET=sim GEMINI_API_KEY=sim")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        sim.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""로컬 사진 분석기 벤치마크: 지연(ms/장)과 원격(Gemini) 분석 결과와의 일치율.
+
+라벨 세트는 JSONL — 한 줄에 ``{"image": 경로|URL, "analysis": PhotoAnalysis 필드}``.
+``label_remote`` 로 원격 분석 결과를 라벨로 저장해 두고 로컬 분석기를 바꿀 때마다 비교한다.
+라벨이 없으면 합성 이미지 세트(풍경/음식/건축/실내, 사람 없음)로 돈다.
+
+일치율은 필드별(인원 유무, 인원 ±1, 장면, 구도, 요소 Jaccard)과, 실제로 중요한
+영상 전략(``choose_strategy``) 기준으로 낸다. CLI 는 ``scripts/bench_local_analysis.py``.
+"""
+
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, field, fields
+from typing import Any, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+import requests
+
+from src.core.local_analysis import LocalPhotoAnalyzer, get_local_analyzer
+from src.core.photo_analysis import PhotoAnalysis, choose_strategy
+from src.engines.stats import quantile
+
+Sample = Tuple[str, bytes, PhotoAnalysis]  # (이름, 이미지 바이트, 라벨)
+
+
+@dataclass
+class AgreementReport:
+    samples: int
+    p50_ms: float
+    p95_ms: float
+    mean_ms: float
+    has_people: float
+    people_count: float  # ±1 이내
+    scene_type: float
+    composition: float
+    elements_jaccard: float
+    strategy: float
+    mismatches: List[Dict[str, str]] = field(default_factory=list)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    def summary(self) -> str:
+        return (
+            f"로컬 분석 {self.samples}장: p50 {self.p50_ms:.1f}ms / p95 {self.p95_ms:.1f}ms · "
+            f"전략 일치 {self.strategy:.0%}, 사람 {self.has_people:.0%}, 인원±1 {self.people_count:.0%}, "
+            f"장면 {self.scene_type:.0%}, 구도 {self.composition:.0%}, 요소 J {self.elements_jaccard:.2f}"
+        )
+
+
+def _label(**kw) -> PhotoAnalysis:
+    base = dict(has_people=False, people_count=0, composition="wide", dominant_elements=[], suggested_motion="", confidence=1.0)
+    base.update(kw)
+    return PhotoAnalysis(**base)
+
+
+def _jpeg(img: np.ndarray) -> bytes:
+    return cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, 90])[1].tobytes()
+
+
+def synthetic_samples(per_kind: int = 3, size: Tuple[int, int] = (960, 720), seed: int = 7) -> List[Sample]:
+    """그려서 만든 라벨 세트 (BGR). 얼굴 검출은 실제 사진으로만 확인할 수 있어 사람은 없다."""
+    rng = np.random.default_rng(seed)
+    h, w = size
+    out: List[Sample] = []
+    for i in range(per_kind):
+        noise = lambda: rng.normal(0, 6, (h, w, 3))  # noqa: E731 — 평평한 면만 있지 않도록
+
+        # 풍경: 파란 하늘 + 초록 언덕
+        img = np.zeros((h, w, 3), np.float64)
+        img[: h // 2] = (235, 180 - i * 10, 110)
+        img[h // 2:] = (40, 150 + i * 10, 60)
+        out.append((f"landscape-{i}", _jpeg(np.clip(img + noise(), 0, 255).astype(np.uint8)),
+                    _label(scene_type="landscape", dominant_elements=["nature"])))
+
+        # 음식: 어두운 식탁 위 가운데 빨강/주황 요리
+        img = np.full((h, w, 3), (40, 50, 60), np.float64)
+        cv2.circle(img, (w // 2, h // 2), int(min(h, w) * 0.38), (235, 235, 235), -1)
+        cv2.circle(img, (w // 2, h // 2), int(min(h, w) * 0.3), (30, 70 + i * 20, 210), -1)
+        out.append((f"food-{i}", _jpeg(np.clip(img + noise(), 0, 255).astype(np.uint8)),
+                    _label(scene_type="food", composition="close_up", dominant_elements=["food"])))
+
+        # 건축: 흐린 하늘 아래 창문 격자 건물
+        img = np.full((h, w, 3), (200, 195, 190), np.float64)
+        cv2.rectangle(img, (w // 10, h // 4), (w - w // 10, h), (120, 140, 170), -1)
+        step = 50 + i * 8
+        for x in range(w // 10 + 20, w - w // 10 - 30, step):
+            for y in range(h // 4 + 20, h - 30, step):
+                cv2.rectangle(img, (x, y), (x + step // 2, y + step // 2), (60, 50, 40), -1)
+        out.append((f"architecture-{i}", _jpeg(np.clip(img + noise(), 0, 255).astype(np.uint8)),
+                    _label(scene_type="architecture", dominant_elements=["architecture"])))
+
+        # 실내: 어둑한 베이지 벽과 가구 윤곽
+        img = np.full((h, w, 3), (90, 110, 130), np.float64)
+        cv2.rectangle(img, (w // 5, h // 2), (w // 2, h - h // 6), (50, 60, 80), -1)
+        cv2.ellipse(img, (int(w * 0.72), int(h * 0.6)), (w // 8, h // 10), 0, 0, 360, (70, 80, 100), -1)
+        out.append((f"indoor-{i}", _jpeg(np.clip(img + noise(), 0, 255).astype(np.uint8)),
+                    _label(scene_type="indoor", dominant_elements=[])))
+    return out
+
+
+def _read(image: str) -> bytes:
+    if os.path.isfile(image):
+        with open(image, "rb") as f:
+            return f.read()
+    r = requests.get(image, timeout=30)
+    r.raise_for_status()
+    return r.content
+
+
+def load_labels(path: str) -> List[Sample]:
+    names = {f.name for f in fields(PhotoAnalysis)}
+    out: List[Sample] = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            label = PhotoAnalysis(**{k: v for k, v in row["analysis"].items() if k in names})
+            out.append((row["image"], _read(row["image"]), label))
+    return out
+
+
+def label_remote(images: List[str], path: str, generator=None) -> int:
+    """원격 분석 결과를 라벨 세트로 저장한다 (한 번 호출로 ``PHOTO_ANALYSIS_BATCH`` 장씩)."""
+    from src.core.smart_video_generator import SmartVideoGenerator
+
+    generator = generator or SmartVideoGenerator(analyzer="remote")
+    analyses = generator.analyze_photos(images)
+    with open(path, "w", encoding="utf-8") as f:
+        for image, analysis in zip(images, analyses):
+            f.write(json.dumps({"image": image, "analysis": asdict(analysis)}, ensure_ascii=False) + "\n")
+    return len(images)
+
+
+def run_agreement(samples: List[Sample], analyzer: Optional[LocalPhotoAnalyzer] = None) -> AgreementReport:
+    analyzer = analyzer or get_local_analyzer()
+    if samples:
+        analyzer.analyze(samples[0][1])  # 검출기 로드는 재지 않는다
+    latencies: List[float] = []
+    hits = {k: 0.0 for k in ("has_people", "people_count", "scene_type", "composition", "elements", "strategy")}
+    mismatches: List[Dict[str, str]] = []
+    for name, data, label in samples:
+        t0 = time.perf_counter()
+        got = analyzer.analyze(data)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        hits["has_people"] += got.has_people == label.has_people
+        hits["people_count"] += abs(got.people_count - label.people_count) <= 1
+        hits["scene_type"] += got.scene_type == label.scene_type
+        hits["composition"] += got.composition == label.composition
+        a, b = set(got.dominant_elements), set(label.dominant_elements)
+        hits["elements"] += len(a & b) / len(a | b) if a | b else 1.0
+        want, have = choose_strategy(label), choose_strategy(got)
+        if want == have:
+            hits["strategy"] += 1
+        else:
+            mismatches.append({"image": name, "expected": want, "local": have, "scene": got.scene_type})
+    n = max(1, len(samples))
+
+    def q(p: float) -> float:
+        v = quantile(latencies, p)
+        return round(v, 2) if v is not None else 0.0
+
+    return AgreementReport(
+        samples=len(samples),
+        p50_ms=q(0.5),
+        p95_ms=q(0.95),
+        mean_ms=round(sum(latencies) / n, 2),
+        has_people=round(hits["has_people"] / n, 3),
+        people_count=round(hits["people_count"] / n, 3),
+        scene_type=round(hits["scene_type"] / n, 3),
+        composition=round(hits["composition"] / n, 3),
+        elements_jaccard=round(hits["elements"] / n, 3),
+        strategy=round(hits["strategy"] / n, 3),
+        mismatches=mismatches,
+    )
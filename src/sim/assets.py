@@ -0,0 +1,155 @@
+"""입력 이미지 업로드 벤치마크: 마케팅 영상 한 편당 업로드 수와 소요 시간.
+
+시뮬레이터의 ``/images/{name}`` 을 상품 이미지 CDN 으로 두고 같은 이미지 몇 장으로 여러 편을 만든다.
+
+- ``before``: 예전 흐름 그대로 — 분석과 생성이 각각 이미지를 내려받아 Files API 에 올리고,
+  ACTIVE 를 기다렸다가 쓰고, 바로 지운다 (영상 한 편에 다운로드 2 / 업로드 2 / 삭제 2)
+- ``after``: ``SmartVideoGenerator`` + ``GeminiAssets`` — 이미지당 다운로드/업로드 한 번,
+  삭제는 끝난 뒤 백그라운드 (여기서는 ``close()`` 로 마지막에 한꺼번에)
+
+CLI 는 ``scripts/bench_gemini_assets.py``.
+"""
+
+import io
+import os
+import tempfile
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from src.engines.stats import quantile
+from src.utils.download import save_generated_video
+
+from .vendor_api import SimServer
+
+MODES = ("before", "after")
+
+
+@dataclass
+class AssetsReport:
+    mode: str
+    videos: int
+    images: int
+    succeeded: int
+    wall_s: float
+    per_video_p50_s: float
+    per_video_mean_s: float
+    downloads: int
+    uploads: int
+    deletes: int
+    vendor_requests: Dict[str, int] = field(default_factory=dict)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    def summary(self) -> str:
+        return (
+            f"{self.mode:<6} {self.succeeded}/{self.videos}편 (이미지 {self.images}장): "
+            f"편당 p50 {self.per_video_p50_s:.2f}s / 평균 {self.per_video_mean_s:.2f}s, "
+            f"다운로드 {self.downloads} · 업로드 {self.uploads} · 삭제 {self.deletes}"
+        )
+
+
+def _legacy_upload(client, image_url: str):
+    from google.genai import types
+
+    r = requests.get(image_url, timeout=30)
+    r.raise_for_status()
+    f = client.files.upload(file=io.BytesIO(r.content), config=types.UploadFileConfig(mime_type="image/jpeg"))
+    while f.state and f.state.name == "PROCESSING":
+        time.sleep(2)  # 예전 코드의 고정 간격
+        f = client.files.get(name=f.name)
+    return f, r.content
+
+
+def _legacy_video(client, image_url: str, output_path: str, poll_interval_s: float) -> str:
+    from google.genai import types
+
+    # 분석: 받아서 올리고, 쓰고, 지운다
+    f, _ = _legacy_upload(client, image_url)
+    client.models.generate_content(
+        model="gemini-2.0-flash-exp",
+        contents=[types.Part.from_text(text="Analyze this travel photo"), types.Part.from_uri(file_uri=f.uri, mime_type=f.mime_type)],
+    )
+    client.files.delete(name=f.name)
+    # 생성: 다시 받아서 올리고, 쓰고, 지운다
+    f, data = _legacy_upload(client, image_url)
+    try:
+        operation = client.models.generate_videos(
+            model="veo-3.0-generate-001",
+            prompt="travel marketing video",
+            image=types.Image(image_bytes=data, mime_type="image/jpeg"),
+        )
+        while not operation.done:
+            time.sleep(poll_interval_s)
+            operation = client.operations.get(operation)
+        return save_generated_video(client, operation.response.generated_videos[0], output_path)
+    finally:
+        client.files.delete(name=f.name)
+
+
+def run_assets(
+    sim: SimServer,
+    mode: str = "after",
+    videos: int = 6,
+    images: int = 2,
+    *,
+    out_dir: Optional[str] = None,
+    poll_interval_s: float = 0.1,
+) -> AssetsReport:
+    """``images`` 장을 돌려 가며 ``videos`` 편을 차례로 만든다."""
+    if mode not in MODES:
+        raise ValueError(f"알 수 없는 모드: {mode} (가능: {', '.join(MODES)})")
+    from src.core.photo_analysis import PhotoAnalysisCache
+    from src.core.smart_video_generator import SmartVideoGenerator
+    from src.utils.clients import get_genai_client
+    from src.utils.gemini_assets import get_assets
+
+    os.environ.update(sim.env())
+    out_dir = out_dir or tempfile.mkdtemp(prefix="sim_assets_")
+    os.makedirs(out_dir, exist_ok=True)
+    client = get_genai_client("sim")
+    # 분석 캐시는 비워서 시작 (이전 실행 결과로 분석/업로드를 건너뛰지 않도록)
+    generator = SmartVideoGenerator(api_key="sim", analysis_cache=PhotoAnalysisCache(path=None), analyzer="remote")
+    generator.poll_interval_s = poll_interval_s
+    before_requests = Counter(sim.simulator.requests)
+
+    latencies: List[float] = []
+    t0 = time.monotonic()
+    for i in range(videos):
+        url = f"{sim.base_url}/images/product-{i % max(1, images)}.jpg"
+        output_path = os.path.join(out_dir, f"{mode}_{i:04d}.mp4")
+        started = time.monotonic()
+        if mode == "before":
+            _legacy_video(client, url, output_path, poll_interval_s)
+        else:
+            generator.generate_marketing_video(url, output_path)
+        if os.path.exists(output_path):
+            latencies.append(time.monotonic() - started)
+    wall = time.monotonic() - t0
+    if mode == "after":
+        get_assets(client).close()  # 배치 종료: 남은 핸들 정리
+
+    requests_ = Counter(sim.simulator.requests)
+    requests_.subtract(before_requests)
+
+    def q(p: float) -> float:
+        v = quantile(latencies, p)
+        return round(v, 3) if v is not None else 0.0
+
+    return AssetsReport(
+        mode=mode,
+        videos=videos,
+        images=images,
+        succeeded=len(latencies),
+        wall_s=round(wall, 3),
+        per_video_p50_s=q(0.5),
+        per_video_mean_s=round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+        downloads=requests_["GET image"],
+        uploads=requests_["POST gemini.upload"],
+        deletes=requests_["DELETE gemini.file"],
+        vendor_requests={k: v for k, v in requests_.items() if v},
+    )
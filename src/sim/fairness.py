@@ -0,0 +1,116 @@
+"""대기열 정책 벤치마크: 큰 배치가 도는 중에 들어온 interactive 미리보기의 지연.
+
+실제 ``FairQueue`` 에 스레드로 작업을 흘려 보낸다 (작업 실행은 sleep, 시간은 축소).
+
+- ``fifo``: 모두 같은 등급/사용자, 예약 슬롯 없음 → 기존 세마포어와 같은 도착 순
+- ``priority``: 등급(interactive/batch) + 사용자별 공정 분배, 예약 슬롯 없음
+- ``fair``: ``priority`` + interactive 예약 슬롯 (미리보기 즉시 시작, 대신 배치 처리량 감소)
+
+CLI 는 ``scripts/bench_fair_queue.py``.
+"""
+
+import random
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+from src.engines import FairQueue, QueueTag
+from src.engines.stats import quantile
+
+POLICIES = ("fifo", "priority", "fair")
+
+
+@dataclass
+class FairnessReport:
+    policy: str
+    capacity: int
+    batch_jobs: int
+    interactive_jobs: int
+    wall_s: float
+    interactive_p50_s: float
+    interactive_p95_s: float
+    interactive_max_s: float
+    batch_p50_s: float
+    batch_makespan_s: float
+    per_user_p95_s: Dict[str, float] = field(default_factory=dict)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    def summary(self) -> str:
+        return (
+            f"{self.policy:<8} interactive p50 {self.interactive_p50_s:.2f}s / p95 {self.interactive_p95_s:.2f}s "
+            f"/ max {self.interactive_max_s:.2f}s · batch p50 {self.batch_p50_s:.2f}s, "
+            f"완료 {self.batch_makespan_s:.2f}s (슬롯 {self.capacity})"
+        )
+
+
+def run_fairness(
+    policy: str = "fair",
+    capacity: int = 3,
+    batch_jobs: int = 200,
+    batch_users: int = 2,
+    interactive_jobs: int = 20,
+    interactive_users: int = 3,
+    service_s: float = 0.05,
+    interactive_gap_s: Optional[float] = None,
+    seed: int = 7,
+) -> FairnessReport:
+    """배치 ``batch_jobs`` 건을 한꺼번에 넣고, 그동안 interactive 를 ``interactive_gap_s`` 간격(지수분포)으로 넣는다."""
+    if policy not in POLICIES:
+        raise ValueError(f"알 수 없는 정책: {policy} (가능: {', '.join(POLICIES)})")
+    rng = random.Random(seed)
+    queue = FairQueue(f"bench-{policy}", capacity, interactive_reserve=None if policy == "fair" else 0)
+    tagged = policy != "fifo"
+    # 배치가 다 끝나기 전에 interactive 가 고르게 들어오도록
+    gap = interactive_gap_s if interactive_gap_s is not None else batch_jobs * service_s / capacity / (interactive_jobs + 1)
+    latencies: Dict[str, List[float]] = {"interactive": [], "batch": []}
+    per_user: Dict[str, List[float]] = {}
+    lock = threading.Lock()
+
+    def job(kind: str, user: str, duration: float) -> None:
+        t0 = time.monotonic()
+        tag = QueueTag(kind, user) if tagged else QueueTag("batch", "all")
+        with queue.slot(tag, cost=duration):
+            time.sleep(duration)
+        elapsed = time.monotonic() - t0
+        with lock:
+            latencies[kind].append(elapsed)
+            if kind == "interactive":
+                per_user.setdefault(user, []).append(elapsed)
+
+    threads = []
+    t0 = time.monotonic()
+    for i in range(batch_jobs):
+        user = f"batch-{i % batch_users}"
+        t = threading.Thread(target=job, args=("batch", user, service_s * rng.uniform(0.8, 1.2)), daemon=True)
+        t.start()
+        threads.append(t)
+    for i in range(interactive_jobs):
+        time.sleep(rng.expovariate(1.0 / gap) if gap > 0 else 0)
+        user = f"ui-{i % interactive_users}"
+        t = threading.Thread(target=job, args=("interactive", user, service_s * rng.uniform(0.8, 1.2)), daemon=True)
+        t.start()
+        threads.append(t)
+    for t in threads:
+        t.join()
+    wall = time.monotonic() - t0
+
+    def q(values: List[float], p: float) -> float:
+        v = quantile(values, p)
+        return round(v, 3) if v is not None else 0.0
+
+    return FairnessReport(
+        policy=policy,
+        capacity=capacity,
+        batch_jobs=batch_jobs,
+        interactive_jobs=interactive_jobs,
+        wall_s=round(wall, 3),
+        interactive_p50_s=q(latencies["interactive"], 0.5),
+        interactive_p95_s=q(latencies["interactive"], 0.95),
+        interactive_max_s=round(max(latencies["interactive"], default=0.0), 3),
+        batch_p50_s=q(latencies["batch"], 0.5),
+        batch_makespan_s=round(max(latencies["batch"], default=0.0), 3),
+        per_user_p95_s={u: q(v, 0.95) for u, v in sorted(per_user.items())},
+    )
@@ -0,0 +1,142 @@
+"""시뮬레이터 대상 부하 테스트: 실제 엔진 어댑터로 N 건을 동시에 돌려
+처리량과 꼬리 지연을 잰다. CLI 는 ``scripts/load_test.py``.
+"""
+
+import os
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Optional
+
+from src.engines import EngineRequest, EngineStats, VendorLimits, VendorScheduler, get_engine
+from src.engines.stats import quantile
+
+from .vendor_api import SimServer
+
+# 시뮬레이터는 키를 검사하지 않는다
+_ENGINE_KWARGS: Dict[str, Dict[str, Any]] = {
+    "runway": {"api_key": "sim", "force_live": True},
+    "higgs": {"api_key": "sim", "api_secret": "sim"},
+    "veo": {"api_key": "sim"},
+}
+
+
+@dataclass
+class LoadReport:
+    engine: str
+    jobs: int
+    concurrency: int
+    succeeded: int
+    failed: int
+    wall_s: float
+    throughput_per_min: float
+    p50_s: Optional[float]
+    p90_s: Optional[float]
+    p99_s: Optional[float]
+    rejected_429: int
+    vendor_requests: Dict[str, int] = field(default_factory=dict)
+    errors: Dict[str, int] = field(default_factory=dict)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    def summary(self) -> str:
+        def fmt(v):
+            return "-" if v is None else f"{v:.2f}s"
+
+        return (
+            f"{self.engine}: {self.succeeded}/{self.jobs} 성공 (동시 {self.concurrency}), "
+            f"{self.wall_s:.1f}s, {self.throughput_per_min:.1f} jobs/min, "
+            f"p50 {fmt(self.p50_s)} / p90 {fmt(self.p90_s)} / p99 {fmt(self.p99_s)}, 429 {self.rejected_429}건"
+        )
+
+
+def _input_image(path: Optional[str]) -> str:
+    if path:
+        return path
+    from PIL import Image
+
+    fd, tmp = tempfile.mkstemp(suffix=".jpg", prefix="sim_input_")
+    os.close(fd)
+    Image.new("RGB", (720, 1280), (40, 60, 90)).save(tmp)
+    return tmp
+
+
+def run_load(
+    sim: SimServer,
+    engine: str = "runway",
+    jobs: int = 20,
+    concurrency: int = 5,
+    *,
+    out_dir: Optional[str] = None,
+    image_path: Optional[str] = None,
+    poll_interval_s: float = 0.2,
+    scheduler_limits: Optional[VendorLimits] = None,
+) -> LoadReport:
+    """``sim`` 을 가리키도록 환경변수를 바꾼 뒤 ``engine`` 어댑터로 ``jobs`` 건을 돌린다.
+
+    ``scheduler_limits`` 를 주면 ``VendorScheduler`` (429 백오프/동시 실행 한도)를 거친다.
+    """
+    os.environ.update(sim.env())
+    os.environ.setdefault("RUNWAY_LIVE", "1")
+    out_dir = out_dir or tempfile.mkdtemp(prefix="sim_load_")
+    os.makedirs(out_dir, exist_ok=True)
+    image = _input_image(image_path)
+    scheduler = (
+        VendorScheduler({engine: scheduler_limits}, stats=EngineStats(path=None)) if scheduler_limits else None
+    )
+    before_429 = sim.simulator.rejected[engine]
+    before_requests = Counter(sim.simulator.requests)
+
+    def one(i: int):
+        adapter = get_engine(engine, **_ENGINE_KWARGS.get(engine, {}))
+        adapter.poll_interval_s = poll_interval_s
+        request = EngineRequest(
+            output_path=os.path.join(out_dir, f"{engine}_{i:04d}.mp4"),
+            image_path=image,
+            image_url=f"{sim.base_url}/files/input.jpg",
+            prompt="simulated load",
+            duration=5,
+            seed=i,  # 건마다 다른 요청 (같으면 스케줄러가 한 건으로 합친다)
+        )
+        t0 = time.monotonic()
+        try:
+            if scheduler is not None:
+                scheduler.run(adapter, request)
+            else:
+                adapter.run(request)
+            return time.monotonic() - t0, None
+        except Exception as e:
+            return time.monotonic() - t0, type(e).__name__
+
+    t0 = time.monotonic()
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        results = list(pool.map(one, range(jobs)))
+    wall = time.monotonic() - t0
+
+    latencies = [lat for lat, err in results if err is None]
+
+    def q(p: float) -> Optional[float]:
+        v = quantile(latencies, p)
+        return None if v is None else round(v, 3)
+
+    errors = Counter(err for _, err in results if err)
+    requests = Counter(sim.simulator.requests)
+    requests.subtract(before_requests)
+    return LoadReport(
+        engine=engine,
+        jobs=jobs,
+        concurrency=concurrency,
+        succeeded=len(latencies),
+        failed=jobs - len(latencies),
+        wall_s=round(wall, 3),
+        throughput_per_min=round(len(latencies) / wall * 60, 2) if wall else 0.0,
+        p50_s=q(0.5),
+        p90_s=q(0.9),
+        p99_s=q(0.99),
+        rejected_429=sim.simulator.rejected[engine] - before_429,
+        vendor_requests={k: v for k, v in requests.items() if v},
+        errors=dict(errors),
+    )
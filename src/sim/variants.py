@@ -0,0 +1,91 @@
+"""Veo 변형(A/B) 생성 벤치마크: 변형 한 편당 벽시계 시간.
+
+- ``sequential``: 예전 흐름 — 변형마다 작업 하나를 제출해 끝까지 기다리고 내려받은 뒤 다음 변형
+- ``concurrent``: ``VeoEngine`` 변형 모드, 작업당 1편 (Veo 3 기본) — 작업 n 개를 같이 기다린다
+- ``multi``: ``VeoEngine`` 변형 모드, 작업당 n 편 (``number_of_videos``, Veo 2 처럼 허용되는 모델)
+
+세 모드 모두 결과 다운로드 지연(``SimConfig.download_s``)을 포함한다. 시뮬레이터는 영상 수와
+무관하게 작업 시간이 같다고 가정한다. CLI 는 ``scripts/bench_veo_variants.py``.
+"""
+
+import os
+import tempfile
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Optional
+
+from src.engines import EngineRequest, get_engine, variant_paths
+from src.utils import veo_operations
+
+from .vendor_api import SimServer
+
+MODES = ("sequential", "concurrent", "multi")
+
+
+@dataclass
+class VariantsReport:
+    mode: str
+    variants: int
+    produced: int
+    operations: int
+    wall_s: float
+    per_variant_s: float
+    vendor_requests: Dict[str, int] = field(default_factory=dict)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    def summary(self) -> str:
+        return (
+            f"{self.mode:<10} {self.produced}/{self.variants}편, 작업 {self.operations}개: "
+            f"전체 {self.wall_s:.2f}s, 변형당 {self.per_variant_s:.2f}s"
+        )
+
+
+def run_variants(
+    sim: SimServer,
+    mode: str = "concurrent",
+    variants: int = 4,
+    *,
+    out_dir: Optional[str] = None,
+    poll_interval_s: float = 0.1,
+) -> VariantsReport:
+    if mode not in MODES:
+        raise ValueError(f"알 수 없는 모드: {mode} (가능: {', '.join(MODES)})")
+    os.environ.update(sim.env())
+    out_dir = out_dir or tempfile.mkdtemp(prefix="sim_variants_")
+    os.makedirs(out_dir, exist_ok=True)
+    engine = get_engine("veo", api_key="sim")
+    engine.poll_interval_s = poll_interval_s
+    output_path = os.path.join(out_dir, f"{mode}.mp4")
+    prompts = [f"variant {i}" for i in range(variants)]
+    before = Counter(sim.simulator.requests)
+
+    saved = veo_operations.VEO_MAX_VIDEOS_PER_OPERATION
+    veo_operations.VEO_MAX_VIDEOS_PER_OPERATION = variants if mode == "multi" else 1
+    t0 = time.monotonic()
+    try:
+        if mode == "sequential":
+            for i, path in enumerate(variant_paths(output_path, variants)):
+                engine.run(EngineRequest(output_path=path, prompt=prompts[i]))
+        else:
+            # multi: 프롬프트가 같아야 한 작업에 묶인다
+            options = {"variants": variants, "variant_prompts": prompts if mode == "concurrent" else []}
+            engine.run(EngineRequest(output_path=output_path, prompt=prompts[0], options=options))
+    finally:
+        veo_operations.VEO_MAX_VIDEOS_PER_OPERATION = saved
+    wall = time.monotonic() - t0
+
+    requests_ = Counter(sim.simulator.requests)
+    requests_.subtract(before)
+    produced = sum(os.path.isfile(p) for p in variant_paths(output_path, variants))
+    return VariantsReport(
+        mode=mode,
+        variants=variants,
+        produced=produced,
+        operations=requests_["POST veo.submit"],
+        wall_s=round(wall, 3),
+        per_variant_s=round(wall / max(1, produced), 3),
+        vendor_requests={k: v for k, v in requests_.items() if v},
+    )
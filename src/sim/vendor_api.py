@@ -0,0 +1,397 @@
+"""벤더 API 시뮬레이터 (Runway / Higgs / Veo 응답 모양 흉내).
+
+실제 어댑터가 그대로 붙도록 경로와 응답 스키마를 맞춘다:
+
+- Runway: ``POST /v1/image_to_video``, ``GET|DELETE /v1/tasks/{id}``, ``GET /v1/organization``
+- Higgs:  ``POST /v1/image2video/dop``, ``GET /v1/job-sets/{id}``, ``GET /v1/motions``
+- Veo:    ``POST /v1beta/models/{model}:predictLongRunning`` (``sampleCount`` 만큼 결과), ``GET /v1beta/{operation}``
+- Gemini: ``POST /upload/v1beta/files`` (resumable 업로드), ``GET|DELETE /v1beta/files/{id}``,
+          ``POST /v1beta/models/{model}:generateContent`` (사진 분석, 첨부 이미지마다 ``{"photos": [...]}`` 한 항목)
+- 결과:   ``GET /files/{id}.mp4`` (합성 MP4, ``video_bytes`` 크기)
+- 입력:   ``GET /images/{name}`` (이름별로 다른 합성 JPEG, 상품 이미지 CDN 흉내)
+
+대기열 지연/실행 시간/실패율/429(초당 제출 한도, 동시 실행 한도, 무작위)를
+``SimConfig`` 로 조절한다. 어댑터는 ``RUNWAY_BASE_URL`` / ``HIGGS_BASE_URL`` /
+``GEMINI_BASE_URL`` 을 시뮬레이터 주소로 두면 된다.
+"""
+
+import asyncio
+import io
+import itertools
+import json
+import random
+import struct
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+MOTIONS = [
+    {"id": "push_in", "name": "Push In", "description": "천천히 다가가는 카메라"},
+    {"id": "pull_out", "name": "Pull Out", "description": "천천히 멀어지는 카메라"},
+    {"id": "orbit_left", "name": "Orbit Left", "description": "피사체 주위를 왼쪽으로 회전"},
+    {"id": "crane_up", "name": "Crane Up", "description": "위로 올라가는 카메라"},
+]
+
+
+@dataclass
+class SimConfig:
+    queue_s: float = 0.5  # 제출 → 실행 시작
+    run_s: float = 2.0  # 실행 시작 → 완료
+    jitter: float = 0.2  # queue_s / run_s 에 곱하는 ±비율
+    failure_rate: float = 0.0  # 완료 시 failed 로 끝날 확률
+    submits_per_s: float = 0.0  # 초당 제출 한도 (0 = 무제한), 넘으면 429
+    max_running: int = 0  # 벤더별 동시 작업 한도 (0 = 무제한), 넘으면 429
+    random_429_rate: float = 0.0  # 한도와 무관한 무작위 429 비율
+    retry_after_s: float = 1.0
+    video_bytes: int = 256 * 1024
+    credits: float = 10_000.0  # Runway 조직 잔액 (제출마다 5/s 차감)
+    image_s: float = 0.0  # 입력 이미지 다운로드 지연
+    upload_s: float = 0.0  # Files API 업로드 지연
+    file_processing_s: float = 0.0  # 업로드 후 PROCESSING → ACTIVE
+    analyze_s: float = 0.0  # generateContent 응답 지연
+    download_s: float = 0.0  # 결과 영상 다운로드 지연
+    veo_max_samples: int = 4  # Veo 작업당 sampleCount 상한 (넘으면 400)
+    seed: Optional[int] = None
+
+
+@dataclass
+class SimJob:
+    id: str
+    vendor: str
+    created: float
+    queue_s: float
+    run_s: float
+    fail: bool
+    cancelled: bool = False
+    samples: int = 1  # Veo sampleCount
+
+    def state(self, now: float) -> str:
+        if self.cancelled:
+            return "cancelled"
+        age = now - self.created
+        if age < self.queue_s:
+            return "queued"
+        if age < self.queue_s + self.run_s:
+            return "running"
+        return "failed" if self.fail else "succeeded"
+
+
+def synthetic_mp4(size: int, seed: int = 0) -> bytes:
+    """ftyp + mdat 로 된 합성 MP4 (재생용이 아니라 다운로드/용량 테스트용)."""
+    ftyp = struct.pack(">I4s4sI", 24, b"ftyp", b"isom", 0x200) + b"isomiso2"
+    body = max(0, size - len(ftyp) - 8)
+    rng = random.Random(seed)
+    payload = bytes(rng.getrandbits(8) for _ in range(min(body, 4096)))
+    payload = (payload * (body // max(1, len(payload)) + 1))[:body]
+    return ftyp + struct.pack(">I4s", body + 8, b"mdat") + payload
+
+
+def synthetic_jpeg(name: str, size: tuple = (720, 1280)) -> bytes:
+    """이름마다 색이 다른 합성 JPEG."""
+    from PIL import Image
+
+    rng = random.Random(name)
+    buf = io.BytesIO()
+    Image.new("RGB", size, tuple(rng.randrange(256) for _ in range(3))).save(buf, "JPEG", quality=90)
+    return buf.getvalue()
+
+
+def photo_analysis(seed: str) -> Dict:
+    """사진 분석 응답 한 항목 (같은 입력이면 같은 결과)."""
+    rng = random.Random(seed)
+    people = rng.choice([0, 0, 1, 2, 4])
+    return {
+        "has_people": people > 0,
+        "people_count": people,
+        "scene_type": rng.choice(["landscape", "activity", "food", "indoor", "outdoor", "architecture"]),
+        "composition": rng.choice(["portrait", "group", "wide", "close_up"]),
+        "dominant_elements": rng.sample(["people", "nature", "architecture", "food", "vehicle"], 2),
+        "suggested_motion": "slow push in",
+        "confidence": round(rng.uniform(0.6, 0.95), 2),
+        "marketing_score": round(rng.uniform(0.1, 0.95), 2),
+    }
+
+
+class VendorSimulator:
+    def __init__(self, config: Optional[SimConfig] = None) -> None:
+        self.config = config or SimConfig()
+        self.credits = self.config.credits
+        self.jobs: Dict[str, SimJob] = {}
+        self.requests: Counter = Counter()  # "METHOD route" → 횟수
+        self.rejected: Counter = Counter()  # vendor → 429 횟수
+        self._submits: Dict[str, List[float]] = {}
+        self._ids = itertools.count(1)
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._video: Optional[bytes] = None
+        self.files: Dict[str, Dict] = {}  # Gemini Files API: id → {"mime", "size", "created"}
+        self.base_url = ""  # 결과 URL 에 쓰인다 (serve 가 채움, 없으면 요청 호스트)
+
+    # ---------- 상태 ----------
+    def video(self) -> bytes:
+        if self._video is None:
+            self._video = synthetic_mp4(self.config.video_bytes, self.config.seed or 0)
+        return self._video
+
+    def _jittered(self, value: float) -> float:
+        j = self.config.jitter
+        return max(0.0, value * (1 + self._rng.uniform(-j, j)))
+
+    def _running(self, vendor: str, now: float) -> int:
+        return sum(1 for job in self.jobs.values() if job.vendor == vendor and job.state(now) in ("queued", "running"))
+
+    def submit(self, vendor: str, cost: float = 0.0) -> Optional[SimJob]:
+        """한도 안이면 작업을 만들고, 넘으면 None (→ 429)."""
+        cfg = self.config
+        now = time.monotonic()
+        with self._lock:
+            recent = [t for t in self._submits.get(vendor, []) if now - t < 1.0]
+            limited = (
+                (cfg.submits_per_s and len(recent) >= cfg.submits_per_s)
+                or (cfg.max_running and self._running(vendor, now) >= cfg.max_running)
+                or self._rng.random() < cfg.random_429_rate
+            )
+            if limited:
+                self.rejected[vendor] += 1
+                self._submits[vendor] = recent
+                return None
+            self._submits[vendor] = recent + [now]
+            self.credits -= cost
+            job = SimJob(
+                id=f"{vendor}-{next(self._ids):06d}",
+                vendor=vendor,
+                created=now,
+                queue_s=self._jittered(cfg.queue_s),
+                run_s=self._jittered(cfg.run_s),
+                fail=self._rng.random() < cfg.failure_rate,
+            )
+            self.jobs[job.id] = job
+            return job
+
+    def _too_many(self) -> JSONResponse:
+        return JSONResponse(
+            {"error": "rate limited"}, status_code=429, headers={"Retry-After": f"{self.config.retry_after_s:g}"}
+        )
+
+    def _file_url(self, request: Request, job: SimJob, sample: int = 0) -> str:
+        base = self.base_url or str(request.base_url).rstrip("/")
+        return f"{base}/files/{job.id}{f'-{sample}' if sample else ''}.mp4"
+
+    def _count(self, request: Request, route: str) -> None:
+        with self._lock:
+            self.requests[f"{request.method} {route}"] += 1
+
+    # ---------- Runway ----------
+    async def runway_submit(self, request: Request):
+        self._count(request, "runway.submit")
+        body = await request.json()
+        job = self.submit("runway", cost=5.0 * float(body.get("duration") or 5))
+        return self._too_many() if job is None else JSONResponse({"id": job.id})
+
+    async def runway_task(self, request: Request):
+        self._count(request, "runway.task")
+        job = self.jobs.get(request.path_params["task_id"])
+        if job is None:
+            return JSONResponse({"error": "not found"}, status_code=404)
+        if request.method == "DELETE":
+            job.cancelled = True
+            return Response(status_code=204)
+        state = job.state(time.monotonic())
+        body = {"id": job.id, "status": {
+            "queued": "PENDING", "running": "RUNNING", "succeeded": "SUCCEEDED",
+            "failed": "FAILED", "cancelled": "CANCELLED",
+        }[state]}
+        if state == "running":
+            body["progress"] = round(min(1.0, (time.monotonic() - job.created - job.queue_s) / max(job.run_s, 1e-6)), 2)
+        if state == "succeeded":
+            body["output"] = [self._file_url(request, job)]
+        if state == "failed":
+            body["failure"] = "simulated failure"
+        return JSONResponse(body)
+
+    async def runway_org(self, request: Request):
+        self._count(request, "runway.organization")
+        return JSONResponse({"creditBalance": self.credits})
+
+    # ---------- Higgs ----------
+    async def higgs_submit(self, request: Request):
+        self._count(request, "higgs.submit")
+        job = self.submit("higgs")
+        if job is None:
+            return self._too_many()
+        return JSONResponse({"id": job.id, "jobs": [{"status": "queued"}]})
+
+    async def higgs_job_set(self, request: Request):
+        self._count(request, "higgs.job_set")
+        job = self.jobs.get(request.path_params["job_set_id"])
+        if job is None:
+            return JSONResponse({"detail": "not found"}, status_code=422)
+        state = job.state(time.monotonic())
+        entry = {"status": {"running": "in_progress", "succeeded": "completed"}.get(state, state)}
+        if state == "succeeded":
+            url = self._file_url(request, job)
+            entry["results"] = {"raw": {"url": url}, "min": {"url": url}}
+        return JSONResponse({"id": job.id, "jobs": [entry]})
+
+    async def higgs_motions(self, request: Request):
+        self._count(request, "higgs.motions")
+        return JSONResponse(MOTIONS)
+
+    # ---------- Veo (Gemini API long-running operation) + Gemini Files / generateContent ----------
+    async def veo(self, request: Request):
+        path = request.path_params["path"]
+        if path.startswith("files/"):
+            return self._gemini_file(request, path.split("/", 1)[1])
+        if request.method == "POST" and path.endswith(":generateContent"):
+            self._count(request, "gemini.generate")
+            body = await request.json()
+            await asyncio.sleep(self.config.analyze_s)
+            uris = [
+                p["fileData"]["fileUri"]
+                for c in body.get("contents", []) for p in c.get("parts", []) if "fileData" in p
+            ]
+            text = json.dumps({"photos": [dict(photo_analysis(uri), index=i) for i, uri in enumerate(uris)]})
+            return JSONResponse({"candidates": [{"content": {"role": "model", "parts": [{"text": text}]}}]})
+        if request.method == "POST" and path.endswith(":predictLongRunning"):
+            self._count(request, "veo.submit")
+            body = json.loads(await request.body() or b"{}")
+            samples = int((body.get("parameters") or {}).get("sampleCount") or 1)
+            if not 1 <= samples <= self.config.veo_max_samples:
+                return JSONResponse(
+                    {"error": {"code": 400, "message": f"sampleCount {samples} not supported", "status": "INVALID_ARGUMENT"}},
+                    status_code=400,
+                )
+            job = self.submit("veo")
+            if job is None:
+                return self._too_many()
+            job.samples = samples
+            model = path.rsplit(":", 1)[0]
+            return JSONResponse({"name": f"{model}/operations/{job.id}"})
+        self._count(request, "veo.operation")
+        job = self.jobs.get(path.rsplit("/", 1)[-1])
+        if job is None:
+            return JSONResponse({"error": {"code": 404, "message": "not found", "status": "NOT_FOUND"}}, status_code=404)
+        state = job.state(time.monotonic())
+        body = {"name": path}
+        if state == "succeeded":
+            body["done"] = True
+            body["response"] = {
+                "@type": "type.googleapis.com/google.ai.generativelanguage.v1beta.PredictLongRunningResponse",
+                "generateVideoResponse": {"generatedSamples": [
+                    {"video": {"uri": self._file_url(request, job, k)}} for k in range(job.samples)
+                ]},
+            }
+        elif state in ("failed", "cancelled"):
+            body["done"] = True
+            body["error"] = {"code": 13, "message": "simulated failure"}
+        return JSONResponse(body)
+
+    def _file_body(self, request: Request, file_id: str) -> Dict:
+        f = self.files[file_id]
+        ready = time.monotonic() - f["created"] >= self.config.file_processing_s
+        base = self.base_url or str(request.base_url).rstrip("/")
+        expires = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(time.time() + 48 * 3600))
+        return {
+            "name": f"files/{file_id}",
+            "mimeType": f["mime"],
+            "sizeBytes": str(f["size"]),
+            "uri": f"{base}/v1beta/files/{file_id}",
+            "state": "ACTIVE" if ready else "PROCESSING",
+            "expirationTime": expires,
+        }
+
+    def _gemini_file(self, request: Request, file_id: str):
+        self._count(request, "gemini.file")
+        if file_id not in self.files:
+            return JSONResponse({"error": {"code": 404, "message": "not found", "status": "NOT_FOUND"}}, status_code=404)
+        if request.method == "DELETE":
+            del self.files[file_id]
+            return JSONResponse({})
+        return JSONResponse(self._file_body(request, file_id))
+
+    async def gemini_upload_start(self, request: Request):
+        self._count(request, "gemini.upload")
+        await request.body()
+        file_id = f"asset-{next(self._ids):06d}"
+        self.files[file_id] = {"mime": request.headers.get("x-goog-upload-header-content-type", ""), "size": 0, "created": 0.0}
+        base = self.base_url or str(request.base_url).rstrip("/")
+        return JSONResponse({}, headers={"x-goog-upload-url": f"{base}/upload/v1beta/files/session/{file_id}"})
+
+    async def gemini_upload_data(self, request: Request):
+        file_id = request.path_params["file_id"]
+        body = await request.body()
+        await asyncio.sleep(self.config.upload_s)
+        f = self.files[file_id]
+        f["size"] += len(body)
+        f["created"] = time.monotonic()
+        return JSONResponse({"file": self._file_body(request, file_id)}, headers={"x-goog-upload-status": "final"})
+
+    async def image(self, request: Request):
+        self._count(request, "image")
+        await asyncio.sleep(self.config.image_s)
+        return Response(synthetic_jpeg(request.path_params["name"]), media_type="image/jpeg")
+
+    # ---------- 결과 파일 ----------
+    async def file(self, request: Request):
+        self._count(request, "file")
+        await asyncio.sleep(self.config.download_s)
+        return Response(self.video(), media_type="video/mp4", headers={"Accept-Ranges": "none"})
+
+    def build_app(self) -> Starlette:
+        return Starlette(routes=[
+            Route("/v1/image_to_video", self.runway_submit, methods=["POST"]),
+            Route("/v1/tasks/{task_id}", self.runway_task, methods=["GET", "DELETE"]),
+            Route("/v1/organization", self.runway_org),
+            Route("/v1/image2video/dop", self.higgs_submit, methods=["POST"]),
+            Route("/v1/job-sets/{job_set_id}", self.higgs_job_set),
+            Route("/v1/motions", self.higgs_motions),
+            Route("/upload/v1beta/files", self.gemini_upload_start, methods=["POST"]),
+            Route("/upload/v1beta/files/session/{file_id}", self.gemini_upload_data, methods=["POST"]),
+            Route("/v1beta/{path:path}", self.veo, methods=["GET", "POST", "DELETE"]),
+            Route("/images/{name}", self.image),
+            Route("/files/{name}", self.file),
+        ])
+
+
+@dataclass
+class SimServer:
+    simulator: VendorSimulator
+    base_url: str
+    _server: object = field(repr=False, default=None)
+
+    def env(self) -> Dict[str, str]:
+        """어댑터를 시뮬레이터로 돌리는 환경변수."""
+        return {
+            "RUNWAY_BASE_URL": self.base_url,
+            "HIGGS_BASE_URL": self.base_url,
+            "GEMINI_BASE_URL": self.base_url,
+        }
+
+    def stop(self) -> None:
+        self._server.should_exit = True
+
+
+def serve(config: Optional[SimConfig] = None, host: str = "127.0.0.1", port: int = 0) -> SimServer:
+    """시뮬레이터를 데몬 스레드로 띄운다 (``port=0`` 이면 빈 포트)."""
+    import uvicorn
+
+    sim = VendorSimulator(config)
+    server = uvicorn.Server(uvicorn.Config(sim.build_app(), host=host, port=port, log_level="warning", access_log=False))
+    server.install_signal_handlers = lambda: None
+    thread = threading.Thread(target=server.run, name="vendor-sim", daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 5.0
+    while not server.started and thread.is_alive() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    if not server.started:
+        raise RuntimeError(f"시뮬레이터 기동 실패 ({host}:{port})")
+    bound = server.servers[0].sockets[0].getsockname()[1]
+    sim.base_url = f"http://{host}:{bound}"
+    return SimServer(sim, sim.base_url, server)
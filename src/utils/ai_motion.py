@@ -1,23 +1,12 @@
 import io
-import os
-import tempfile
 import subprocess
 import requests
-from dataclasses import dataclass
 from typing import Optional
 from PIL import Image
-from rembg import remove
 
-
-@dataclass
-class MotionSpec:
-    width: int = 1080
-    height: int = 1920
-    duration: float = 5.0
-    fps: int = 30
-    zoom_fg: float = 1.06
-    zoom_bg: float = 1.02
-    blur_bg: int = 20
+from .metrics import track_render
+from .motion import MotionSpec, motion_spec
+from .workspace import Workspace, workspace
 
 
 def download_image(url: str) -> Image.Image:
@@ -27,6 +16,9 @@ def download_image(url: str) -> Image.Image:
 
 
 def segment_foreground(img: Image.Image) -> Image.Image:
+    # rembg(onnxruntime) 는 무거워서 실제 분리할 때만 로드
+    from rembg import remove
+
     # rembg returns RGBA with transparent background
     out = remove(img)
     if not isinstance(out, Image.Image):
@@ -34,7 +26,7 @@ def segment_foreground(img: Image.Image) -> Image.Image:
     return out
 
 
-def composite_layers(fg: Image.Image, bg: Image.Image, spec: MotionSpec) -> tuple[str, str]:
+def composite_layers(fg: Image.Image, bg: Image.Image, spec: MotionSpec, ws: Workspace) -> tuple[str, str]:
     # Save separate PNGs for fg and bg, both at canvas size with transparency
     canvas = (spec.width, spec.height)
     # Fit background: cover
@@ -49,11 +41,11 @@ def composite_layers(fg: Image.Image, bg: Image.Image, spec: MotionSpec) -> tupl
     y = (canvas[1] - fg_fit.height)//2
     fg_canvas.paste(fg_fit, (x,y), fg_fit)
 
-    tmpdir = tempfile.mkdtemp()
-    fg_path = os.path.join(tmpdir, "fg.png")
-    bg_path = os.path.join(tmpdir, "bg.png")
+    fg_path = ws.path("fg.png")
+    bg_path = ws.path("bg.png")
     fg_canvas.save(fg_path)
     bg_fit.save(bg_path)
+    ws.track(fg_path, bg_path)
     return fg_path, bg_path
 
 
@@ -61,8 +53,8 @@ def render_parallax(fg_path: str, bg_path: str, out_mp4: str, spec: MotionSpec)
     w, h = spec.width, spec.height
     frames = int(spec.duration * spec.fps)
     # Build zoom expressions
-    zfg = f"zoom='1+({spec.zoom_fg}-1)*on/{frames}'"
-    zbg = f"zoom='1+({spec.zoom_bg}-1)*on/{frames}'"
+    zfg = f"zoom='1+({spec.zoom_near}-1)*on/{frames}'"
+    zbg = f"zoom='1+({spec.zoom_far}-1)*on/{frames}'"
 
     filter_complex = (
         f"[0:v]scale={w}:{h},boxblur={spec.blur_bg}:1,zoompan={zbg}:d={frames}:s={w}x{h}[bg];"
@@ -81,17 +73,24 @@ def render_parallax(fg_path: str, bg_path: str, out_mp4: str, spec: MotionSpec)
         "-pix_fmt", "yuv420p",
         out_mp4,
     ]
-    subprocess.run(cmd, check=True)
+    with track_render("ai_motion", frames):
+        subprocess.run(cmd, check=True)
 
 
 def animate_image(url: str, out_mp4: str, spec: Optional[MotionSpec] = None) -> None:
-    spec = spec or MotionSpec()
-    img = download_image(url)
+    animate_pil(download_image(url), out_mp4, spec)
+
+
+def animate_pil(img: Image.Image, out_mp4: str, spec: Optional[MotionSpec] = None) -> None:
+    spec = spec or motion_spec("ai_motion")
+    img = img.convert("RGBA")
     fg = segment_foreground(img)
     # Background as original without alpha
     bg = img.convert("RGB")
-    fg_path, bg_path = composite_layers(fg, bg, spec)
-    render_parallax(fg_path, bg_path, out_mp4, spec)
+    # 레이어 PNG 는 작업 공간(tmpfs)에 두고 렌더 후 삭제
+    with workspace("ai_motion") as ws:
+        fg_path, bg_path = composite_layers(fg, bg, spec, ws)
+        render_parallax(fg_path, bg_path, out_mp4, spec)
 
 
 if __name__ == "__main__":
@@ -102,5 +101,5 @@ if __name__ == "__main__":
     p.add_argument("--duration", type=float, default=5.0)
     args = p.parse_args()
 
-    spec = MotionSpec(duration=args.duration)
+    spec = motion_spec("ai_motion", duration=args.duration)
     animate_image(args.image_url, args.out, spec)
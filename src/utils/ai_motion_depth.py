@@ -2,27 +2,21 @@ import io
 import os
 import urllib.request
 import tempfile
+import time
 import subprocess
 import requests
 import numpy as np
-from dataclasses import dataclass
 from typing import Optional
 from PIL import Image
 import cv2
 
-
-MidasURL = "https://github.com/isl-org/MiDaS/releases/download/v3/dpt_slim_384.onnx"
+from .metrics import record_render
+from .motion import MotionSpec, motion_spec
+from .workspace import workspace
 
 
-@dataclass
-class MotionSpec:
-    width: int = 1080
-    height: int = 1920
-    duration: float = 5.0
-    fps: int = 30
-    zoom_near: float = 1.06  # foreground zoom factor
-    zoom_far: float = 1.01   # background zoom factor
-    blur_bg: int = 12
+MidasURL = "https://github.com/isl-org/MiDaS/releases/download/v3/dpt_slim_384.onnx"
+MidasPath = os.path.join(tempfile.gettempdir(), "mrt_midas", "dpt_slim_384.onnx")
 
 
 def download_image(url: str) -> Image.Image:
@@ -32,12 +26,10 @@ def download_image(url: str) -> Image.Image:
 
 
 def ensure_midas_model() -> str:
-    cache_dir = os.path.join(tempfile.gettempdir(), "mrt_midas")
-    os.makedirs(cache_dir, exist_ok=True)
-    model_path = os.path.join(cache_dir, "dpt_slim_384.onnx")
-    if not os.path.exists(model_path):
-        urllib.request.urlretrieve(MidasURL, model_path)
-    return model_path
+    os.makedirs(os.path.dirname(MidasPath), exist_ok=True)
+    if not os.path.exists(MidasPath):
+        urllib.request.urlretrieve(MidasURL, MidasPath)
+    return MidasPath
 
 
 def estimate_depth(img: np.ndarray, model_path: str) -> np.ndarray:
@@ -66,6 +58,7 @@ def render_depth_parallax(img: Image.Image, out_mp4: str, spec: MotionSpec) -> N
     y = (spec.height - nh) // 2
     canvas[y:y+nh, x:x+nw] = resized
 
+    t0 = time.perf_counter()
     # Estimate depth on canvas
     model_path = ensure_midas_model()
     depth = estimate_depth(canvas, model_path)
@@ -75,43 +68,46 @@ def render_depth_parallax(img: Image.Image, out_mp4: str, spec: MotionSpec) -> N
     mask_far = 1 - mask_near
 
     frames = int(spec.duration * spec.fps)
-    tmpdir = tempfile.mkdtemp()
-    pattern = os.path.join(tmpdir, "frame_%05d.png")
-
-    for t in range(frames):
-        alpha_near = 1.0 + (spec.zoom_near - 1.0) * (t / frames)
-        alpha_far  = 1.0 + (spec.zoom_far  - 1.0) * (t / frames)
-        # Zoom near/far differently
-        near = cv2.resize(canvas, None, fx=alpha_near, fy=alpha_near, interpolation=cv2.INTER_CUBIC)
-        far  = cv2.resize(canvas, None, fx=alpha_far,  fy=alpha_far,  interpolation=cv2.INTER_CUBIC)
-        far  = cv2.GaussianBlur(far, (0,0), spec.blur_bg)
-
-        # Center-crop back to canvas size
-        def center_crop(imgx):
-            h2, w2 = imgx.shape[:2]
-            sx = max(0, (w2 - spec.width)//2)
-            sy = max(0, (h2 - spec.height)//2)
-            return imgx[sy:sy+spec.height, sx:sx+spec.width]
-
-        near_c = center_crop(near)
-        far_c  = center_crop(far)
-
-        # Composite with mask
-        mask3 = np.dstack([mask_near*255]*3).astype(np.uint8)
-        invmask3 = 255 - mask3
-        comp = ((near_c * (mask3/255.0)) + (far_c * (invmask3/255.0))).astype(np.uint8)
-        cv2.imwrite(pattern % t, comp)
-
-    # Encode with ffmpeg
-    ff_cmd = [
-        "ffmpeg", "-y", "-r", str(spec.fps), "-i", os.path.join(tmpdir, "frame_%05d.png"),
-        "-pix_fmt", "yuv420p", "-movflags", "+faststart", out_mp4
-    ]
-    subprocess.run(ff_cmd, check=True)
+    # 프레임 PNG 는 작업 공간(tmpfs 우선)에 쓰고 인코딩 후 통째로 삭제 (PNG ≈ 원본의 절반으로 추정)
+    with workspace("depth", expected_bytes=frames * spec.width * spec.height * 3 // 2) as ws:
+        pattern = ws.path("frame_%05d.png")
+
+        for t in range(frames):
+            alpha_near = 1.0 + (spec.zoom_near - 1.0) * (t / frames)
+            alpha_far  = 1.0 + (spec.zoom_far  - 1.0) * (t / frames)
+            # Zoom near/far differently
+            near = cv2.resize(canvas, None, fx=alpha_near, fy=alpha_near, interpolation=cv2.INTER_CUBIC)
+            far  = cv2.resize(canvas, None, fx=alpha_far,  fy=alpha_far,  interpolation=cv2.INTER_CUBIC)
+            far  = cv2.GaussianBlur(far, (0,0), spec.blur_bg)
+
+            # Center-crop back to canvas size
+            def center_crop(imgx):
+                h2, w2 = imgx.shape[:2]
+                sx = max(0, (w2 - spec.width)//2)
+                sy = max(0, (h2 - spec.height)//2)
+                return imgx[sy:sy+spec.height, sx:sx+spec.width]
+
+            near_c = center_crop(near)
+            far_c  = center_crop(far)
+
+            # Composite with mask
+            mask3 = np.dstack([mask_near*255]*3).astype(np.uint8)
+            invmask3 = 255 - mask3
+            comp = ((near_c * (mask3/255.0)) + (far_c * (invmask3/255.0))).astype(np.uint8)
+            cv2.imwrite(pattern % t, comp)
+            ws.track(pattern % t)
+
+        # Encode with ffmpeg
+        ff_cmd = [
+            "ffmpeg", "-y", "-r", str(spec.fps), "-i", pattern,
+            "-pix_fmt", "yuv420p", "-movflags", "+faststart", out_mp4
+        ]
+        subprocess.run(ff_cmd, check=True)
+    record_render("ai_motion_depth", frames, time.perf_counter() - t0)
 
 
 def animate_image_depth(url: str, out_mp4: str, spec: Optional[MotionSpec] = None) -> None:
-    spec = spec or MotionSpec()
+    spec = spec or motion_spec("ai_motion_depth")
     img = download_image(url)
     render_depth_parallax(img, out_mp4, spec)
 
@@ -1,24 +1,15 @@
 import io
-import os
-import tempfile
+import time
 import subprocess
 import requests
 import numpy as np
-from dataclasses import dataclass
 from typing import Optional
 from PIL import Image
 import cv2
 
-
-@dataclass
-class MotionSpec:
-    width: int = 1080
-    height: int = 1920
-    duration: float = 5.0
-    fps: int = 30
-    zoom_near: float = 1.06  # foreground zoom factor
-    zoom_far: float = 1.01   # background zoom factor
-    blur_bg: int = 12
+from .metrics import record_render
+from .motion import MotionSpec, motion_spec
+from .workspace import workspace
 
 
 def download_image(url: str) -> Image.Image:
@@ -57,6 +48,7 @@ def grabcut_foreground(img_bgr: np.ndarray) -> np.ndarray:
 
 
 def render_parallax(img: Image.Image, out_mp4: str, spec: MotionSpec) -> None:
+    t0 = time.perf_counter()
     img_bgr = cv2.cvtColor(np.array(img), cv2.COLOR_RGB2BGR)
     canvas = fit_to_canvas(img_bgr, spec.width, spec.height)
 
@@ -65,38 +57,41 @@ def render_parallax(img: Image.Image, out_mp4: str, spec: MotionSpec) -> None:
     mask_bg_3 = 1.0 - mask_fg_3
 
     frames = int(spec.duration * spec.fps)
-    tmpdir = tempfile.mkdtemp()
-    pattern = os.path.join(tmpdir, "frame_%05d.png")
+    # 프레임 PNG 는 작업 공간(tmpfs 우선)에 쓰고 인코딩 후 통째로 삭제 (PNG ≈ 원본의 절반으로 추정)
+    with workspace("grabcut", expected_bytes=frames * spec.width * spec.height * 3 // 2) as ws:
+        pattern = ws.path("frame_%05d.png")
 
-    for t in range(frames):
-        a_near = 1.0 + (spec.zoom_near - 1.0) * (t / frames)
-        a_far  = 1.0 + (spec.zoom_far  - 1.0) * (t / frames)
+        for t in range(frames):
+            a_near = 1.0 + (spec.zoom_near - 1.0) * (t / frames)
+            a_far  = 1.0 + (spec.zoom_far  - 1.0) * (t / frames)
 
-        near = cv2.resize(canvas, None, fx=a_near, fy=a_near, interpolation=cv2.INTER_CUBIC)
-        far  = cv2.resize(canvas, None, fx=a_far,  fy=a_far,  interpolation=cv2.INTER_CUBIC)
-        far  = cv2.GaussianBlur(far, (0,0), spec.blur_bg)
+            near = cv2.resize(canvas, None, fx=a_near, fy=a_near, interpolation=cv2.INTER_CUBIC)
+            far  = cv2.resize(canvas, None, fx=a_far,  fy=a_far,  interpolation=cv2.INTER_CUBIC)
+            far  = cv2.GaussianBlur(far, (0,0), spec.blur_bg)
 
-        def center_crop(imgx):
-            h2, w2 = imgx.shape[:2]
-            sx = max(0, (w2 - spec.width)//2)
-            sy = max(0, (h2 - spec.height)//2)
-            return imgx[sy:sy+spec.height, sx:sx+spec.width]
+            def center_crop(imgx):
+                h2, w2 = imgx.shape[:2]
+                sx = max(0, (w2 - spec.width)//2)
+                sy = max(0, (h2 - spec.height)//2)
+                return imgx[sy:sy+spec.height, sx:sx+spec.width]
 
-        near_c = center_crop(near)
-        far_c  = center_crop(far)
+            near_c = center_crop(near)
+            far_c  = center_crop(far)
 
-        comp = (near_c.astype(np.float32) * mask_fg_3 + far_c.astype(np.float32) * mask_bg_3).astype(np.uint8)
-        cv2.imwrite(pattern % t, comp)
+            comp = (near_c.astype(np.float32) * mask_fg_3 + far_c.astype(np.float32) * mask_bg_3).astype(np.uint8)
+            cv2.imwrite(pattern % t, comp)
+            ws.track(pattern % t)
 
-    ff_cmd = [
-        "ffmpeg", "-y", "-r", str(spec.fps), "-i", os.path.join(tmpdir, "frame_%05d.png"),
-        "-pix_fmt", "yuv420p", "-movflags", "+faststart", out_mp4
-    ]
-    subprocess.run(ff_cmd, check=True)
+        ff_cmd = [
+            "ffmpeg", "-y", "-r", str(spec.fps), "-i", pattern,
+            "-pix_fmt", "yuv420p", "-movflags", "+faststart", out_mp4
+        ]
+        subprocess.run(ff_cmd, check=True)
+    record_render("ai_motion_grabcut", frames, time.perf_counter() - t0)
 
 
 def animate_image_grabcut(url: str, out_mp4: str, spec: Optional[MotionSpec] = None) -> None:
-    spec = spec or MotionSpec()
+    spec = spec or motion_spec("ai_motion_grabcut")
     img = download_image(url)
     render_parallax(img, out_mp4, spec)
 
@@ -0,0 +1,532 @@
+"""생성 산출물 저장소 (내용 주소 경로 + 작업 매니페스트 + 보존 정책).
+
+결과 영상을 ``runway_video_{ts}.mp4`` / ``outputs/{pid}/final_{engine}.mp4`` 처럼 시각/이름으로 두면
+동시에 만든 결과가 서로 덮어쓰고, 지우는 곳이 없어 볼륨이 끝없이 커진다. 대신
+
+- 객체: ``objects/ab/<sha256>.mp4`` — 내용 해시가 경로라 충돌이 없고 같은 결과는 한 번만 저장
+- 매니페스트: ``manifests/<job_id>.json`` — 입력/파라미터/엔진/시간/산출물(파생 포함) 목록
+- 상품 색인: ``index/products/<pid>.json`` — 상품별 작업 목록을 파일 하나로 읽는다 (디렉터리 스캔 없음)
+- 게시 순서: 객체 → 매니페스트 → 색인. 각 쓰기는 임시 파일 + rename (GCS 는 업로드 자체가 원자적)
+  이라 중간에 죽어도 반쯤 쓴 파일이 보이지 않고, 남은 객체는 보존 정리에서 지운다.
+  해시/업로드는 잠금 밖에서 하고, 매니페스트를 쓰기 직전 잠금 안에서 객체가 아직 있는지 다시 본다
+  (이미 있던 객체를 재사용하는 사이 정리가 이전 작업과 함께 지웠으면 다시 올린다)
+- 보존: ``ARTIFACT_MAX_AGE_DAYS`` 보다 오래됐거나 전체가 ``ARTIFACT_MAX_GB`` 를 넘으면 오래된 작업부터
+  지운다. ``pin`` 한 작업은 남긴다. 어떤 매니페스트도 가리키지 않는 객체만 실제로 지운다
+- 백엔드: ``LocalBackend`` (기본, ``ARTIFACT_ROOT``) / ``GCSBackend`` (``ARTIFACT_BACKEND=gcs``,
+  ``ARTIFACT_BUCKET``). GCS 객체는 재생/서빙할 때 ``ARTIFACT_CACHE_DIR`` 로 받아 둔다
+
+매니페스트/색인 갱신은 프로세스 안에서만 직렬화한다 (UI 와 사이드카 서비스는 한 프로세스).
+"""
+
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+from .metrics import ARTIFACT_BYTES, ARTIFACT_EVICTIONS
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_BACKEND = os.getenv("ARTIFACT_BACKEND", "local")  # local | gcs
+ARTIFACT_ROOT = os.getenv("ARTIFACT_ROOT", os.path.join("outputs", "artifacts"))
+ARTIFACT_BUCKET = os.getenv("ARTIFACT_BUCKET", "")
+ARTIFACT_PREFIX = os.getenv("ARTIFACT_PREFIX", "display-ads")
+ARTIFACT_CACHE_DIR = os.getenv("ARTIFACT_CACHE_DIR", os.path.join("outputs", "artifact-cache"))
+ARTIFACT_MAX_BYTES = int(float(os.getenv("ARTIFACT_MAX_GB", "20")) * 1024 ** 3)
+ARTIFACT_MAX_AGE_S = float(os.getenv("ARTIFACT_MAX_AGE_DAYS", "30")) * 86400
+ARTIFACT_SWEEP_INTERVAL_S = float(os.getenv("ARTIFACT_SWEEP_INTERVAL_S", "3600"))
+# 게시 중(객체는 올렸고 매니페스트는 아직)인 객체를 지우지 않도록 이보다 새 객체는 고아라도 둔다
+ORPHAN_GRACE_S = 600.0
+
+CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class BlobInfo:
+    key: str
+    size: int
+    updated: float  # epoch 초
+
+
+# ---------- 백엔드 ----------
+class StorageBackend:
+    """키(``/`` 구분 상대 경로) → 바이트. 쓰기는 원자적이어야 한다 (다 쓰기 전에는 안 보임)."""
+
+    name = "base"
+
+    def put_file(self, key: str, src_path: str) -> None:
+        raise NotImplementedError
+
+    def put_bytes(self, key: str, data: bytes) -> None:
+        raise NotImplementedError
+
+    def get_bytes(self, key: str) -> bytes:
+        """없으면 ``FileNotFoundError``."""
+        raise NotImplementedError
+
+    def exists(self, key: str) -> bool:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        """없어도 오류 없음."""
+        raise NotImplementedError
+
+    def list(self, prefix: str) -> Iterator[BlobInfo]:
+        raise NotImplementedError
+
+    def local_path(self, key: str) -> str:
+        """재생/서빙용 로컬 파일 경로."""
+        raise NotImplementedError
+
+
+class LocalBackend(StorageBackend):
+    """로컬 파일 시스템 (``root`` 아래). 임시 파일(``.part-*``)에 쓰고 ``os.replace``."""
+
+    name = "local"
+
+    def __init__(self, root: str = ARTIFACT_ROOT) -> None:
+        self.root = root
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, *key.split("/"))
+
+    def _atomic_write(self, key: str, write) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        part = f"{path}.part-{uuid.uuid4().hex[:8]}"
+        try:
+            with open(part, "wb") as f:
+                write(f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(part, path)
+        finally:
+            if os.path.exists(part):
+                os.unlink(part)
+
+    def put_file(self, key: str, src_path: str) -> None:
+        def write(f):
+            with open(src_path, "rb") as src:
+                shutil.copyfileobj(src, f, CHUNK_SIZE)
+
+        self._atomic_write(key, write)
+
+    def put_bytes(self, key: str, data: bytes) -> None:
+        self._atomic_write(key, lambda f: f.write(data))
+
+    def get_bytes(self, key: str) -> bytes:
+        with open(self._path(key), "rb") as f:
+            return f.read()
+
+    def exists(self, key: str) -> bool:
+        return os.path.isfile(self._path(key))
+
+    def delete(self, key: str) -> None:
+        try:
+            os.unlink(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def list(self, prefix: str) -> Iterator[BlobInfo]:
+        base = self._path(prefix)
+        for dirpath, _, filenames in os.walk(base):
+            for name in filenames:
+                if ".part-" in name:
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                key = os.path.relpath(path, self.root).replace(os.sep, "/")
+                yield BlobInfo(key, st.st_size, st.st_mtime)
+
+    def local_path(self, key: str) -> str:
+        return self._path(key)
+
+
+class GCSBackend(StorageBackend):
+    """Google Cloud Storage (``google-cloud-storage`` 클라이언트 인터페이스).
+
+    ``client`` 를 주지 않으면 ``storage.Client()`` 를 만든다. 테스트는 같은 메서드를 가진 로컬 대역을 넘긴다.
+    """
+
+    name = "gcs"
+
+    def __init__(self, bucket: str, prefix: str = ARTIFACT_PREFIX, client=None, cache_dir: str = ARTIFACT_CACHE_DIR) -> None:
+        if client is None:
+            from google.cloud import storage
+
+            client = storage.Client()
+        self.client = client
+        self.bucket = client.bucket(bucket)
+        self.prefix = prefix.strip("/")
+        self.cache_dir = cache_dir
+
+    def _name(self, key: str) -> str:
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def put_file(self, key: str, src_path: str) -> None:
+        self.bucket.blob(self._name(key)).upload_from_filename(src_path)
+
+    def put_bytes(self, key: str, data: bytes) -> None:
+        self.bucket.blob(self._name(key)).upload_from_string(data)
+
+    def get_bytes(self, key: str) -> bytes:
+        try:
+            return self.bucket.blob(self._name(key)).download_as_bytes()
+        except Exception as e:
+            if type(e).__name__ == "NotFound":
+                raise FileNotFoundError(key) from e
+            raise
+
+    def exists(self, key: str) -> bool:
+        return bool(self.bucket.blob(self._name(key)).exists())
+
+    def delete(self, key: str) -> None:
+        try:
+            self.bucket.blob(self._name(key)).delete()
+        except Exception as e:
+            if type(e).__name__ != "NotFound":
+                raise
+        cached = os.path.join(self.cache_dir, *key.split("/"))
+        if os.path.exists(cached):
+            os.unlink(cached)
+
+    def list(self, prefix: str) -> Iterator[BlobInfo]:
+        skip = len(self.prefix) + 1 if self.prefix else 0
+        for blob in self.client.list_blobs(self.bucket, prefix=self._name(prefix)):
+            updated = blob.updated.timestamp() if blob.updated is not None else 0.0
+            yield BlobInfo(blob.name[skip:], int(blob.size or 0), updated)
+
+    def local_path(self, key: str) -> str:
+        path = os.path.join(self.cache_dir, *key.split("/"))
+        if not os.path.isfile(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            part = f"{path}.part-{uuid.uuid4().hex[:8]}"
+            self.bucket.blob(self._name(key)).download_to_filename(part)
+            os.replace(part, path)
+        return path
+
+    def cache(self, key: str, src_path: str) -> None:
+        """방금 올린 파일을 캐시에 복사해 둔다 (바로 재생할 때 다시 받지 않도록)."""
+        path = os.path.join(self.cache_dir, *key.split("/"))
+        if not os.path.isfile(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            part = f"{path}.part-{uuid.uuid4().hex[:8]}"
+            shutil.copyfile(src_path, part)
+            os.replace(part, path)
+
+
+# ---------- 매니페스트 ----------
+@dataclass
+class Artifact:
+    role: str  # video | variant_1 | final_text ...
+    key: str
+    sha256: str
+    size: int
+    media_type: str
+    derived_from: Optional[str] = None  # 원본 산출물 role (텍스트 오버레이 등)
+
+
+@dataclass
+class Manifest:
+    job_id: str
+    product_id: str
+    engine: str
+    created_at: float = field(default_factory=time.time)
+    inputs: Dict[str, Any] = field(default_factory=dict)
+    params: Dict[str, Any] = field(default_factory=dict)
+    timings: Dict[str, float] = field(default_factory=dict)
+    artifacts: List[Artifact] = field(default_factory=list)
+    pinned: bool = False
+
+    def artifact(self, role: str = "video") -> Optional[Artifact]:
+        return next((a for a in self.artifacts if a.role == role), None)
+
+    @property
+    def size(self) -> int:
+        return sum(a.size for a in self.artifacts)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Manifest":
+        data = dict(data)
+        data["artifacts"] = [Artifact(**a) for a in data.get("artifacts") or []]
+        return cls(**data)
+
+
+@dataclass
+class SweepResult:
+    evicted: List[str] = field(default_factory=list)  # 지운 작업 id
+    deleted_objects: int = 0
+    freed_bytes: int = 0
+    total_bytes: int = 0
+
+
+def sha256_file(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _safe(name: str) -> str:
+    return re.sub(r"[^\w.-]", "_", str(name)) or "_"
+
+
+class ArtifactStore:
+    def __init__(
+        self,
+        backend: Optional[StorageBackend] = None,
+        max_bytes: int = ARTIFACT_MAX_BYTES,
+        max_age_s: float = ARTIFACT_MAX_AGE_S,
+    ) -> None:
+        self.backend = backend or LocalBackend()
+        self.max_bytes = max_bytes
+        self.max_age_s = max_age_s
+        self._lock = threading.RLock()
+
+    # ---------- 게시 ----------
+    def put_object(self, path: str, role: str = "video", derived_from: Optional[str] = None) -> Artifact:
+        """파일 하나를 내용 주소로 저장 (이미 있으면 그대로)."""
+        digest = sha256_file(path)
+        ext = os.path.splitext(path)[1].lower() or ".bin"
+        key = f"objects/{digest[:2]}/{digest}{ext}"
+        if not self.backend.exists(key):
+            self.backend.put_file(key, path)
+        if isinstance(self.backend, GCSBackend):
+            self.backend.cache(key, path)
+        media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        return Artifact(role, key, digest, os.path.getsize(path), media_type, derived_from)
+
+    def publish(
+        self,
+        job_id: str,
+        product_id: str,
+        engine: str,
+        files: Dict[str, str],
+        inputs: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        timings: Optional[Dict[str, float]] = None,
+    ) -> Manifest:
+        """작업 산출물(``{role: 파일 경로}``)을 저장하고 매니페스트/상품 색인을 쓴다."""
+        artifacts = [self.put_object(path, role) for role, path in files.items()]
+        sources = dict(zip((a.key for a in artifacts), files.values()))
+        manifest = Manifest(
+            job_id=job_id,
+            product_id=str(product_id),
+            engine=engine,
+            inputs=inputs or {},
+            params=params or {},
+            timings=timings or {},
+            artifacts=artifacts,
+        )
+        with self._lock:
+            self._restore_objects(sources)
+            self._write_manifest(manifest)
+            self._index_update(manifest.product_id, lambda jobs: [_index_entry(manifest)] + [j for j in jobs if j["job_id"] != job_id])
+        return manifest
+
+    def add_artifact(self, job_id: str, role: str, path: str, derived_from: Optional[str] = "video") -> Manifest:
+        """기존 작업에 파생 산출물(텍스트 오버레이 결과 등)을 더한다. 같은 role 은 바꾼다."""
+        artifact = self.put_object(path, role, derived_from)
+        with self._lock:
+            self._restore_objects({artifact.key: path})
+            manifest = self.manifest(job_id)
+            manifest.artifacts = [a for a in manifest.artifacts if a.role != role] + [artifact]
+            self._write_manifest(manifest)
+            entry = _index_entry(manifest)
+            self._index_update(manifest.product_id, lambda jobs: [entry if j["job_id"] == job_id else j for j in jobs])
+        return manifest
+
+    # ---------- 조회 ----------
+    def manifest(self, job_id: str) -> Manifest:
+        """없으면 ``KeyError``."""
+        try:
+            data = self.backend.get_bytes(f"manifests/{_safe(job_id)}.json")
+        except FileNotFoundError:
+            raise KeyError(job_id) from None
+        return Manifest.from_dict(json.loads(data))
+
+    def list_product(self, product_id: str) -> List[Dict[str, Any]]:
+        """상품의 작업 목록 (최신순, 색인 파일 하나)."""
+        return self._index_read(str(product_id))
+
+    def local_path(self, artifact: Artifact) -> str:
+        return self.backend.local_path(artifact.key)
+
+    def pin(self, job_id: str, pinned: bool = True) -> Manifest:
+        """보존 정리에서 제외 (``pinned=False`` 로 해제)."""
+        with self._lock:
+            manifest = self.manifest(job_id)
+            manifest.pinned = pinned
+            self._write_manifest(manifest)
+            entry = _index_entry(manifest)
+            self._index_update(manifest.product_id, lambda jobs: [entry if j["job_id"] == job_id else j for j in jobs])
+        return manifest
+
+    def delete(self, job_id: str) -> Manifest:
+        """매니페스트와 색인 항목을 지운다. 객체는 다음 ``sweep`` 에서 (다른 작업이 안 쓰면) 지운다."""
+        with self._lock:
+            manifest = self.manifest(job_id)
+            self._drop(manifest)
+        return manifest
+
+    # ---------- 보존 ----------
+    def sweep(self, now: Optional[float] = None) -> SweepResult:
+        """나이/용량 한도를 넘은 작업(고정 제외)과 고아 객체를 지운다."""
+        now = time.time() if now is None else now
+        result = SweepResult()
+        with self._lock:
+            manifests = []
+            for blob in self.backend.list("manifests/"):
+                try:
+                    manifests.append(Manifest.from_dict(json.loads(self.backend.get_bytes(blob.key))))
+                except (FileNotFoundError, ValueError, TypeError) as e:
+                    logger.warning("매니페스트를 읽지 못함 (%s): %s", blob.key, e)
+            manifests.sort(key=lambda m: m.created_at)
+            objects = {b.key: b for b in self.backend.list("objects/")}
+            refs: Dict[str, int] = {}
+            for m in manifests:
+                for key in {a.key for a in m.artifacts}:
+                    refs[key] = refs.get(key, 0) + 1
+
+            def release(m: Manifest, reason: str) -> None:
+                self._drop(m)
+                result.evicted.append(m.job_id)
+                ARTIFACT_EVICTIONS.inc(reason=reason)
+                for key in {a.key for a in m.artifacts}:
+                    refs[key] -= 1
+                    if refs[key] == 0 and key in objects:
+                        self.backend.delete(key)
+                        result.deleted_objects += 1
+                        result.freed_bytes += objects.pop(key).size
+
+            for key, blob in list(objects.items()):
+                if key not in refs and now - blob.updated > ORPHAN_GRACE_S:
+                    self.backend.delete(key)
+                    result.deleted_objects += 1
+                    result.freed_bytes += objects.pop(key).size
+                    ARTIFACT_EVICTIONS.inc(reason="orphan")
+            kept = []
+            for m in manifests:
+                if not m.pinned and self.max_age_s > 0 and now - m.created_at > self.max_age_s:
+                    release(m, "age")
+                else:
+                    kept.append(m)
+            total = sum(b.size for b in objects.values())
+            for m in kept:
+                if self.max_bytes <= 0 or total <= self.max_bytes:
+                    break
+                if m.pinned:
+                    continue
+                before = result.freed_bytes
+                release(m, "size")
+                total -= result.freed_bytes - before
+            result.total_bytes = total
+        ARTIFACT_BYTES.set(total, backend=self.backend.name)
+        if result.evicted or result.deleted_objects:
+            logger.info(
+                "산출물 정리: 작업 %d개, 객체 %d개, %.1f MB 해제 (남은 %.1f MB)",
+                len(result.evicted), result.deleted_objects, result.freed_bytes / 1e6, total / 1e6,
+            )
+        return result
+
+    # ---------- 내부 ----------
+    def _restore_objects(self, sources: Dict[str, str]) -> None:
+        """``{키: 원본 경로}`` 중 그 사이 정리에서 지워진 객체를 다시 올린다 (``_lock`` 을 잡고 호출)."""
+        for key, path in sources.items():
+            if not self.backend.exists(key):
+                logger.info("게시 중 정리된 객체를 다시 올림: %s", key)
+                self.backend.put_file(key, path)
+
+    def _write_manifest(self, manifest: Manifest) -> None:
+        data = json.dumps(manifest.to_dict(), ensure_ascii=False, indent=1).encode()
+        self.backend.put_bytes(f"manifests/{_safe(manifest.job_id)}.json", data)
+
+    def _drop(self, manifest: Manifest) -> None:
+        self.backend.delete(f"manifests/{_safe(manifest.job_id)}.json")
+        self._index_update(manifest.product_id, lambda jobs: [j for j in jobs if j["job_id"] != manifest.job_id])
+
+    def _index_key(self, product_id: str) -> str:
+        return f"index/products/{_safe(product_id)}.json"
+
+    def _index_read(self, product_id: str) -> List[Dict[str, Any]]:
+        try:
+            return json.loads(self.backend.get_bytes(self._index_key(product_id)))["jobs"]
+        except FileNotFoundError:
+            return []
+
+    def _index_update(self, product_id: str, change) -> None:
+        jobs = change(self._index_read(product_id))
+        key = self._index_key(product_id)
+        if jobs:
+            self.backend.put_bytes(key, json.dumps({"product_id": product_id, "jobs": jobs}, ensure_ascii=False).encode())
+        else:
+            self.backend.delete(key)
+
+
+def _index_entry(manifest: Manifest) -> Dict[str, Any]:
+    return {
+        "job_id": manifest.job_id,
+        "engine": manifest.engine,
+        "created_at": manifest.created_at,
+        "pinned": manifest.pinned,
+        "artifacts": {a.role: a.key for a in manifest.artifacts},
+    }
+
+
+def make_backend(kind: str = ARTIFACT_BACKEND) -> StorageBackend:
+    if kind == "local":
+        return LocalBackend(ARTIFACT_ROOT)
+    if kind == "gcs":
+        if not ARTIFACT_BUCKET:
+            raise ValueError("ARTIFACT_BACKEND=gcs 에는 ARTIFACT_BUCKET 이 필요합니다")
+        return GCSBackend(ARTIFACT_BUCKET)
+    raise ValueError(f"알 수 없는 산출물 백엔드: {kind} (local | gcs)")
+
+
+_store: Optional[ArtifactStore] = None
+_store_lock = threading.Lock()
+_sweeper: Optional[threading.Thread] = None
+
+
+def get_artifact_store() -> ArtifactStore:
+    """프로세스 공용 저장소 (``ARTIFACT_BACKEND``)."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ArtifactStore(make_backend())
+    return _store
+
+
+def start_retention_sweeper(store: Optional[ArtifactStore] = None, interval_s: float = ARTIFACT_SWEEP_INTERVAL_S) -> None:
+    """시작할 때 한 번, 이후 ``interval_s`` 마다 ``sweep``. 프로세스당 한 번만 시작."""
+    global _sweeper
+    with _store_lock:
+        if _sweeper is not None or interval_s <= 0:
+            return
+
+        def _loop() -> None:
+            while True:
+                try:
+                    (store or get_artifact_store()).sweep()
+                except Exception as e:
+                    logger.warning("산출물 정리 실패: %s", e)
+                time.sleep(interval_s)
+
+        _sweeper = threading.Thread(target=_loop, name="artifact-sweeper", daemon=True)
+        _sweeper.start()
@@ -0,0 +1,29 @@
+"""상품 카탈로그(myrealtrip API) 조회.
+
+여러 세션이 같은 상품을 동시에 열면 같은 URL 을 한 번만 호출하고 응답을 나눠 갖는다
+(``SingleFlight``). 응답 캐시는 하지 않는다 — 끝난 뒤의 호출은 다시 나간다.
+"""
+
+import copy
+from typing import Any
+
+import requests
+
+from .singleflight import SingleFlight
+
+CATALOG_TIMEOUT_S = 20
+
+_flight: SingleFlight[Any] = SingleFlight("catalog")
+
+
+def get_json(url: str, timeout: float = CATALOG_TIMEOUT_S) -> Any:
+    """GET → JSON. 4xx/5xx 는 ``requests.HTTPError``."""
+
+    def fetch() -> Any:
+        resp = requests.get(url, timeout=timeout)
+        resp.raise_for_status()
+        return resp.json()
+
+    data, shared = _flight.do(url, fetch)
+    # 호출자가 응답을 고쳐 써도 서로 영향이 없도록 팔로워는 복사본을 받는다
+    return copy.deepcopy(data) if shared else data
@@ -0,0 +1,57 @@
+"""벤더 SDK 클라이언트 (지연 생성 + 프로세스 캐시).
+
+무거운 SDK(google-genai, Vertex AI)는 해당 엔진이 실제로 선택되어
+클라이언트가 처음 필요할 때만 import 한다. 모듈 import 시점에는
+네트워크/인증/SDK 로딩이 일어나지 않는다.
+"""
+
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+
+_lock = threading.Lock()
+_genai_clients: Dict[Tuple[Optional[str], str], Any] = {}
+_vertex_inited: Dict[Tuple[str, str], bool] = {}
+
+
+def get_genai_client(api_key: Optional[str] = None):
+    """``google.genai.Client`` 를 API 키별로 한 번만 만든다.
+
+    ``api_key`` 가 없으면 SDK 기본값(GEMINI_API_KEY / GOOGLE_API_KEY)을 쓴다.
+    ``GEMINI_BASE_URL`` 이 있으면 그 주소로 보낸다 (로컬 시뮬레이터 등).
+    """
+    key = (api_key, os.getenv("GEMINI_BASE_URL", ""))
+    client = _genai_clients.get(key)
+    if client is not None:
+        return client
+    with _lock:
+        client = _genai_clients.get(key)
+        if client is None:
+            from google import genai
+
+            kwargs: Dict[str, Any] = {"api_key": api_key} if api_key else {}
+            if key[1]:
+                from google.genai import types
+
+                kwargs["http_options"] = types.HttpOptions(base_url=key[1])
+            client = genai.Client(**kwargs)
+            _genai_clients[key] = client
+        return client
+
+
+def ensure_vertex(project_id: Optional[str] = None, location: str = "us-central1") -> str:
+    """``aiplatform.init`` 을 (프로젝트, 리전)별로 한 번만 호출하고 프로젝트 ID 를 돌려준다."""
+    project_id = project_id or os.getenv("GOOGLE_CLOUD_PROJECT")
+    if not project_id:
+        raise ValueError("GOOGLE_CLOUD_PROJECT environment variable required")
+    key = (project_id, location)
+    if _vertex_inited.get(key):
+        return project_id
+    with _lock:
+        if not _vertex_inited.get(key):
+            from google.cloud import aiplatform
+
+            aiplatform.init(project=project_id, location=location)
+            _vertex_inited[key] = True
+    return project_id
@@ -0,0 +1,360 @@
+"""영상 다운로드 매니저.
+
+벤더(Runway/Higgs/Veo) 결과물을 한 가지 방식으로 내려받는다.
+
+- 큰 청크 스트리밍 → 임시 파일(``.part``) → 원자적 rename
+- 연결이 끊기면 HTTP Range 로 이어받기
+- 대용량 파일은 Range 세그먼트 병렬 다운로드(선택)
+- 크기/sha256 검증
+"""
+
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+import requests
+
+from .faststart import ensure_faststart
+from .metrics import DOWNLOADED_BYTES, VENDOR_PHASE_SECONDS
+from .tracing import span
+
+
+CHUNK_SIZE = 1024 * 1024  # 1 MiB
+PARALLEL_THRESHOLD = 64 * 1024 * 1024  # 64 MiB 이상이면 병렬 세그먼트
+RETRYABLE_ERRORS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+ProgressCallback = Callable[[int, Optional[int]], None]
+
+
+class DownloadError(RuntimeError):
+    """재시도 후에도 다운로드를 끝내지 못한 경우."""
+
+
+class IntegrityError(DownloadError):
+    """크기/체크섬 검증 실패."""
+
+
+@dataclass
+class DownloadResult:
+    path: str
+    size: int
+    sha256: str
+    resumes: int = 0
+    segments: int = 1
+    elapsed_s: float = 0.0
+
+
+class _Retryable(Exception):
+    """내부용: 응답 코드 기반 재시도 신호."""
+
+
+class DownloadManager:
+    """스트리밍 + 이어받기 + 병렬 세그먼트 다운로드."""
+
+    def __init__(
+        self,
+        session: Optional[requests.Session] = None,
+        chunk_size: int = CHUNK_SIZE,
+        max_retries: int = 5,
+        backoff_s: float = 0.5,
+        parallel_threshold: int = PARALLEL_THRESHOLD,
+        max_segments: int = 4,
+        timeout: Tuple[float, float] = (10.0, 60.0),
+    ) -> None:
+        self.session = session or requests.Session()
+        self.chunk_size = chunk_size
+        self.max_retries = max_retries
+        self.backoff_s = backoff_s
+        self.parallel_threshold = parallel_threshold
+        self.max_segments = max(1, max_segments)
+        self.timeout = timeout
+
+    # ---------- Public API ----------
+    def download(
+        self,
+        url: str,
+        output_path: str,
+        *,
+        headers: Optional[Dict[str, str]] = None,
+        expected_size: Optional[int] = None,
+        expected_sha256: Optional[str] = None,
+        parallel: Optional[bool] = None,
+        progress: Optional[ProgressCallback] = None,
+        source: str = "other",
+    ) -> DownloadResult:
+        """``url`` 을 ``output_path`` 로 내려받는다.
+
+        ``parallel`` 이 None 이면 서버가 Range 를 지원하고 파일이
+        ``parallel_threshold`` 이상일 때만 세그먼트 병렬 다운로드를 쓴다.
+        ``source`` 는 메트릭 라벨(벤더 이름)이다.
+        """
+        output_path = os.fspath(output_path)
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        part_path = output_path + ".part"
+        headers = dict(headers or {})
+        t0 = time.perf_counter()
+
+        total, accepts_ranges = self._probe(url, headers)
+        if expected_size is not None and total is not None and total != expected_size:
+            raise IntegrityError(f"크기 불일치: 서버 {total} != 기대값 {expected_size}")
+        if parallel is None:
+            parallel = bool(accepts_ranges and total and total >= self.parallel_threshold)
+
+        with span("download", parallel=bool(parallel and accepts_ranges and total), size=total) as sp:
+            if parallel and accepts_ranges and total:
+                resumes, segments = self._download_segments(url, part_path, headers, total, progress)
+                digest = _sha256_file(part_path, self.chunk_size)
+            else:
+                resumes, digest, total = self._download_stream(url, part_path, headers, total, accepts_ranges, progress)
+                segments = 1
+            sp.set(resumes=resumes, segments=segments)
+
+        size = os.path.getsize(part_path)
+        expected = expected_size if expected_size is not None else total
+        if expected is not None and size != expected:
+            os.unlink(part_path)
+            raise IntegrityError(f"크기 불일치: 받은 {size} != 기대값 {expected}")
+        if expected_sha256 and digest.lower() != expected_sha256.lower():
+            os.unlink(part_path)
+            raise IntegrityError(f"체크섬 불일치: {digest} != {expected_sha256}")
+
+        os.replace(part_path, output_path)
+        DOWNLOADED_BYTES.inc(size, source=source)
+        return DownloadResult(
+            path=output_path,
+            size=size,
+            sha256=digest,
+            resumes=resumes,
+            segments=segments,
+            elapsed_s=time.perf_counter() - t0,
+        )
+
+    # ---------- Internal helpers ----------
+    def _probe(self, url: str, headers: Dict[str, str]) -> Tuple[Optional[int], bool]:
+        """HEAD 로 크기와 Range 지원 여부 확인 (실패해도 다운로드는 진행)."""
+        try:
+            r = self.session.head(url, headers=headers, timeout=self.timeout, allow_redirects=True)
+            if r.status_code >= 400:
+                return None, False
+            length = r.headers.get("Content-Length")
+            total = int(length) if length and length.isdigit() else None
+            accepts = r.headers.get("Accept-Ranges", "").lower() == "bytes"
+            return total, accepts
+        except requests.RequestException:
+            return None, False
+
+    def _sleep_backoff(self, attempt: int) -> None:
+        time.sleep(self.backoff_s * (2 ** max(0, attempt - 1)))
+
+    def _download_stream(
+        self,
+        url: str,
+        part_path: str,
+        headers: Dict[str, str],
+        total: Optional[int],
+        accepts_ranges: bool,
+        progress: Optional[ProgressCallback],
+    ) -> Tuple[int, str, Optional[int]]:
+        hasher = hashlib.sha256()
+        offset = 0
+        # 이전 프로세스가 남긴 .part 가 있으면 이어받는다
+        if accepts_ranges and os.path.exists(part_path):
+            offset = os.path.getsize(part_path)
+            if total is not None and offset > total:
+                offset = 0
+            else:
+                _hash_prefix(part_path, offset, hasher, self.chunk_size)
+
+        attempts = 0
+        resumes = 0
+        while True:
+            req_headers = dict(headers)
+            if offset:
+                req_headers["Range"] = f"bytes={offset}-"
+            try:
+                with self.session.get(url, headers=req_headers, stream=True, timeout=self.timeout) as r:
+                    if offset and r.status_code == 416 and total is not None and offset >= total:
+                        break
+                    if r.status_code == 429 or r.status_code >= 500:
+                        raise _Retryable(f"HTTP {r.status_code}")
+                    r.raise_for_status()
+                    if offset and r.status_code != 206:
+                        # 서버가 Range 를 무시함 → 처음부터
+                        offset = 0
+                        hasher = hashlib.sha256()
+                    if r.headers.get("Accept-Ranges", "").lower() == "bytes":
+                        accepts_ranges = True
+                    if total is None:
+                        total = _total_from_response(r, offset)
+                    with open(part_path, "ab" if offset else "wb") as f:
+                        for chunk in r.iter_content(chunk_size=self.chunk_size):
+                            if not chunk:
+                                continue
+                            f.write(chunk)
+                            hasher.update(chunk)
+                            offset += len(chunk)
+                            if progress:
+                                progress(offset, total)
+                if total is None or offset >= total:
+                    break
+                raise requests.ConnectionError(f"응답이 조기 종료됨 ({offset}/{total})")
+            except RETRYABLE_ERRORS + (_Retryable,) as e:
+                attempts += 1
+                if attempts > self.max_retries:
+                    raise DownloadError(f"다운로드 실패 ({attempts - 1}회 재시도): {e}") from e
+                resumes += 1
+                if not accepts_ranges:
+                    offset = 0
+                    hasher = hashlib.sha256()
+                self._sleep_backoff(attempts)
+        return resumes, hasher.hexdigest(), total
+
+    def _download_segments(
+        self,
+        url: str,
+        part_path: str,
+        headers: Dict[str, str],
+        total: int,
+        progress: Optional[ProgressCallback],
+    ) -> Tuple[int, int]:
+        n = min(self.max_segments, max(1, total // self.chunk_size))
+        step = total // n
+        ranges = [(i * step, total - 1 if i == n - 1 else (i + 1) * step - 1) for i in range(n)]
+
+        with open(part_path, "wb") as f:
+            f.truncate(total)
+
+        lock = threading.Lock()
+        done = [0]
+        resumes = [0]
+
+        def _fetch(rng: Tuple[int, int]) -> None:
+            start, end = rng
+            pos = start
+            attempts = 0
+            with open(part_path, "r+b") as f:
+                while pos <= end:
+                    req_headers = dict(headers)
+                    req_headers["Range"] = f"bytes={pos}-{end}"
+                    try:
+                        with self.session.get(url, headers=req_headers, stream=True, timeout=self.timeout) as r:
+                            if r.status_code == 429 or r.status_code >= 500:
+                                raise _Retryable(f"HTTP {r.status_code}")
+                            r.raise_for_status()
+                            if r.status_code != 206:
+                                raise DownloadError("서버가 Range 요청을 지원하지 않습니다")
+                            f.seek(pos)
+                            for chunk in r.iter_content(chunk_size=self.chunk_size):
+                                if not chunk:
+                                    continue
+                                chunk = chunk[: end + 1 - pos]
+                                f.write(chunk)
+                                pos += len(chunk)
+                                with lock:
+                                    done[0] += len(chunk)
+                                    if progress:
+                                        progress(done[0], total)
+                        if pos <= end:
+                            raise requests.ConnectionError(f"세그먼트 조기 종료 ({pos}/{end})")
+                    except RETRYABLE_ERRORS + (_Retryable,) as e:
+                        attempts += 1
+                        if attempts > self.max_retries:
+                            raise DownloadError(f"세그먼트 다운로드 실패: {e}") from e
+                        with lock:
+                            resumes[0] += 1
+                        self._sleep_backoff(attempts)
+
+        with ThreadPoolExecutor(max_workers=n) as pool:
+            for fut in [pool.submit(_fetch, rng) for rng in ranges]:
+                fut.result()
+        return resumes[0], n
+
+
+def _total_from_response(r: requests.Response, offset: int) -> Optional[int]:
+    content_range = r.headers.get("Content-Range", "")
+    if "/" in content_range:
+        tail = content_range.rsplit("/", 1)[1]
+        if tail.isdigit():
+            return int(tail)
+    length = r.headers.get("Content-Length")
+    if length and length.isdigit():
+        return int(length) + (offset if r.status_code == 206 else 0)
+    return None
+
+
+def _hash_prefix(path: str, length: int, hasher, chunk_size: int) -> None:
+    with open(path, "rb") as f:
+        remaining = length
+        while remaining > 0:
+            buf = f.read(min(chunk_size, remaining))
+            if not buf:
+                break
+            hasher.update(buf)
+            remaining -= len(buf)
+
+
+def _sha256_file(path: str, chunk_size: int = CHUNK_SIZE) -> str:
+    hasher = hashlib.sha256()
+    _hash_prefix(path, os.path.getsize(path), hasher, chunk_size)
+    return hasher.hexdigest()
+
+
+_default_manager: Optional[DownloadManager] = None
+_default_lock = threading.Lock()
+
+
+def get_download_manager() -> DownloadManager:
+    """프로세스 공용 DownloadManager (세션/커넥션 풀 재사용)."""
+    global _default_manager
+    with _default_lock:
+        if _default_manager is None:
+            _default_manager = DownloadManager()
+        return _default_manager
+
+
+def download_file(url: str, output_path: str, **kwargs) -> DownloadResult:
+    """공용 매니저로 다운로드하는 편의 함수."""
+    return get_download_manager().download(url, output_path, **kwargs)
+
+
+def save_generated_video(client, generated_video, output_path: str) -> str:
+    """Veo(genai) 생성 결과를 저장한다.
+
+    결과에 다운로드 URI 가 있으면 DownloadManager 로 스트리밍하고, 인라인 바이트(``video_bytes``)면
+    그대로 쓴다. 둘 다 아니고 파일 이름/URI 만 있으면 SDK 의 ``files.download`` + ``save`` 로 받는다.
+    """
+    video = generated_video.video
+    uri = getattr(video, "uri", None)
+    data = getattr(video, "video_bytes", None)
+    if isinstance(uri, str) and uri.startswith("http"):
+        api_key = (
+            getattr(getattr(client, "_api_client", None), "api_key", None)
+            or os.getenv("GEMINI_API_KEY")
+            or os.getenv("GOOGLE_API_KEY")
+        )
+        headers = {"x-goog-api-key": api_key} if api_key else {}
+        with VENDOR_PHASE_SECONDS.time(engine="veo", phase="download"):
+            download_file(uri, output_path, headers=headers, source="veo")
+    elif data:
+        # files.download 는 이름 없는 인라인 결과에 ValueError("File name is required")
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        part = f"{output_path}.part"
+        with open(part, "wb") as f:
+            f.write(data)
+        os.replace(part, output_path)
+    elif uri or getattr(video, "name", None):
+        with VENDOR_PHASE_SECONDS.time(engine="veo", phase="download"):
+            client.files.download(file=video)
+            video.save(output_path)
+    else:
+        raise RuntimeError("Veo 결과에 영상(URI/바이트)이 없습니다")
+    ensure_faststart(output_path)
+    return output_path
@@ -0,0 +1,73 @@
+"""MP4 faststart 보정.
+
+브라우저가 Range 요청으로 바로 재생/탐색하려면 ``moov`` atom 이
+``mdat`` 보다 앞에 있어야 한다. OpenCV VideoWriter 나 벤더 결과물은
+이를 보장하지 않으므로, 필요할 때만 ffmpeg 로 스트림 복사 remux 한다.
+"""
+
+import logging
+import os
+import shutil
+import struct
+import subprocess
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+FASTSTART_FLAGS = ["-movflags", "+faststart"]
+
+
+def _top_level_atoms(path: str, limit: int = 64):
+    """파일 앞부분의 최상위 atom 이름을 순서대로 돌려준다."""
+    names = []
+    size_total = os.path.getsize(path)
+    with open(path, "rb") as f:
+        pos = 0
+        while pos < size_total and len(names) < limit:
+            f.seek(pos)
+            header = f.read(8)
+            if len(header) < 8:
+                break
+            size, name = struct.unpack(">I4s", header)
+            if size == 1:
+                size = struct.unpack(">Q", f.read(8))[0]
+            elif size == 0:
+                size = size_total - pos
+            if size < 8:
+                break
+            names.append(name.decode("latin-1"))
+            pos += size
+    return names
+
+
+def is_faststart(path: str) -> bool:
+    """``moov`` 가 ``mdat`` 보다 앞이면 True."""
+    try:
+        atoms = _top_level_atoms(path)
+    except (OSError, struct.error):
+        return False
+    if "moov" not in atoms:
+        return False
+    return "mdat" not in atoms or atoms.index("moov") < atoms.index("mdat")
+
+
+def ensure_faststart(path: str, ffmpeg_bin: Optional[str] = None) -> bool:
+    """필요하면 ``+faststart`` 로 remux 한다. 결과가 faststart 면 True."""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return False
+    if is_faststart(path):
+        return True
+    ffmpeg_bin = ffmpeg_bin or shutil.which("ffmpeg")
+    if not ffmpeg_bin:
+        logger.warning("ffmpeg 없음: faststart remux 생략 (%s)", path)
+        return False
+    tmp_path = path + ".faststart.mp4"
+    cmd = [ffmpeg_bin, "-y", "-loglevel", "error", "-i", path, "-c", "copy", *FASTSTART_FLAGS, tmp_path]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        logger.warning("faststart remux 실패 (%s): %s", path, result.stderr.strip()[:500])
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        return False
+    os.replace(tmp_path, path)
+    return True
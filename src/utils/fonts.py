@@ -0,0 +1,233 @@
+"""폰트 레지스트리: 폰트 폴더를 한 번 훑어 페이스를 패밀리/글리프 범위(한글 등)로 색인한다.
+
+미리보기(PIL)와 자막(ASS/libass)이 같은 페이스를 고르도록 둘 다 여기서 폰트를 찾는다.
+
+- ``FONT_DIRS``: 훑을 폴더 (``os.pathsep`` 구분). 비우면 macOS/리눅스 기본 폰트 폴더
+- ``OVERLAY_FONT``: 선택. 폰트 파일 경로 또는 패밀리 이름 (가장 먼저 고른다)
+- ``FONT_CACHE_SIZE``: (페이스, 크기) 별 ``FreeTypeFont`` LRU 크기
+
+문구에 쓰인 문자 체계(한글/한자/가나/라틴)를 모두 가진 페이스 중 ``PREFERRED_FAMILIES`` 순,
+굵은 페이스 순으로 고른다. 맞는 페이스가 없으면 PIL 기본 폰트 (한글은 네모로 나온다).
+"""
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+from .metrics import record_cache
+
+logger = logging.getLogger(__name__)
+
+FONT_DIRS = os.getenv("FONT_DIRS", "")
+OVERLAY_FONT = os.getenv("OVERLAY_FONT", "")
+FONT_CACHE_SIZE = int(os.getenv("FONT_CACHE_SIZE", "32"))
+
+DEFAULT_FONT_DIRS = (
+    "/System/Library/Fonts",
+    "/Library/Fonts",
+    "~/Library/Fonts",
+    "/usr/share/fonts",
+    "/usr/local/share/fonts",
+    "~/.local/share/fonts",
+    "~/.fonts",
+)
+FONT_EXTENSIONS = (".ttf", ".otf", ".ttc", ".otc")
+# 한글 글리프가 있는 패밀리 우선 (macOS → Debian fonts-noto-cjk / fonts-nanum)
+PREFERRED_FAMILIES = ("Apple SD Gothic Neo", "Noto Sans CJK KR", "Noto Sans KR", "NanumGothic", "Malgun Gothic")
+
+# 문자 체계별 (범위, 페이스가 가졌는지 볼 표본 문자)
+SCRIPTS: Dict[str, Tuple[Tuple[Tuple[int, int], ...], str]] = {
+    "hangul": (((0xAC00, 0xD7A3), (0x1100, 0x11FF), (0x3130, 0x318F)), "가힣ㄱ"),
+    "han": (((0x4E00, 0x9FFF),), "中文"),
+    "kana": (((0x3040, 0x30FF),), "あア"),
+    "latin": (((0x41, 0x5A), (0x61, 0x7A), (0xC0, 0x24F)), "Aaé"),
+}
+
+
+def text_scripts(text: str) -> FrozenSet[str]:
+    """``text`` 에 쓰인 문자 체계."""
+    found = set()
+    for ch in set(text):
+        cp = ord(ch)
+        for script, (ranges, _) in SCRIPTS.items():
+            if any(lo <= cp <= hi for lo, hi in ranges):
+                found.add(script)
+                break
+    return frozenset(found)
+
+
+@dataclass(frozen=True)
+class FontFace:
+    path: str
+    index: int  # .ttc 안의 페이스 번호
+    family: str
+    style: str
+    weight: int
+    scripts: FrozenSet[str]
+
+    @property
+    def bold(self) -> bool:
+        return self.weight >= 600
+
+    @property
+    def fonts_dir(self) -> str:
+        return os.path.dirname(self.path)
+
+    def covers(self, scripts: Iterable[str]) -> bool:
+        return set(scripts) <= self.scripts
+
+
+def read_faces(path: str) -> List[FontFace]:
+    """폰트 파일 하나의 페이스들 (이름 표/cmap 만 읽는다). 읽을 수 없으면 빈 목록."""
+    from fontTools.ttLib import TTCollection, TTFont
+
+    try:
+        if path.lower().endswith((".ttc", ".otc")):
+            fonts = TTCollection(path, lazy=True).fonts
+        else:
+            fonts = [TTFont(path, lazy=True)]
+    except Exception as e:
+        logger.debug(f"폰트를 읽을 수 없습니다: {path} ({e})")
+        return []
+    faces = []
+    for index, font in enumerate(fonts):
+        try:
+            cmap = font.getBestCmap() or {}
+            names = font["name"]
+            weight = font["OS/2"].usWeightClass if "OS/2" in font else 400
+            scripts = frozenset(
+                script for script, (_, sample) in SCRIPTS.items() if all(ord(ch) in cmap for ch in sample)
+            )
+            faces.append(FontFace(
+                path=path,
+                index=index,
+                family=names.getBestFamilyName() or os.path.splitext(os.path.basename(path))[0],
+                style=names.getBestSubFamilyName() or "Regular",
+                weight=int(weight),
+                scripts=scripts,
+            ))
+        except Exception as e:
+            logger.debug(f"폰트 페이스를 읽을 수 없습니다: {path}#{index} ({e})")
+        finally:
+            font.close()
+    return faces
+
+
+def scan_font_dirs(dirs: Sequence[str]) -> List[FontFace]:
+    faces: List[FontFace] = []
+    seen = set()
+    for d in dirs:
+        root_dir = os.path.expanduser(d)
+        if not os.path.isdir(root_dir):
+            continue
+        for root, _, files in os.walk(root_dir):
+            for name in sorted(files):
+                path = os.path.realpath(os.path.join(root, name))
+                if name.lower().endswith(FONT_EXTENSIONS) and path not in seen:
+                    seen.add(path)
+                    faces.extend(read_faces(path))
+    return faces
+
+
+class FontRegistry:
+    """폴더를 한 번 훑은 페이스 색인 + (페이스, 크기) 별 ``FreeTypeFont`` LRU."""
+
+    def __init__(
+        self,
+        dirs: Optional[Sequence[str]] = None,
+        preferred: Optional[str] = None,
+        cache_size: int = FONT_CACHE_SIZE,
+    ) -> None:
+        self.dirs = list(dirs) if dirs is not None else (
+            [d for d in FONT_DIRS.split(os.pathsep) if d] or list(DEFAULT_FONT_DIRS)
+        )
+        preferred = OVERLAY_FONT if preferred is None else preferred
+        self.faces = scan_font_dirs(self.dirs)
+        self._preferred_family = ""
+        if preferred and os.path.isfile(preferred):
+            explicit = read_faces(os.path.realpath(preferred))
+            self.faces = explicit + [f for f in self.faces if f.path != os.path.realpath(preferred)]
+            if explicit:
+                self._preferred_family = explicit[0].family
+        elif preferred:
+            self._preferred_family = preferred
+        self.by_family: Dict[str, List[FontFace]] = {}
+        for face in self.faces:
+            self.by_family.setdefault(face.family.lower(), []).append(face)
+        self.cache_size = cache_size
+        self._fonts: "OrderedDict[Tuple[str, int, int], object]" = OrderedDict()
+        self._lock = threading.Lock()
+        logger.info(f"🔤 폰트 {len(self.faces)}개 페이스 색인 (한글 {sum('hangul' in f.scripts for f in self.faces)}개)")
+
+    @property
+    def families(self) -> List[str]:
+        return sorted({f.family for f in self.faces})
+
+    def _rank(self, face: FontFace, bold: bool) -> Tuple:
+        family = face.family.lower()
+        order = [p.lower() for p in ((self._preferred_family,) if self._preferred_family else ()) + PREFERRED_FAMILIES]
+        return (
+            order.index(family) if family in order else len(order),
+            "hangul" not in face.scripts,  # 라틴 문구도 한글 폰트로 (같은 화면의 문구끼리 모양이 맞도록)
+            face.bold != bold,
+            abs(face.weight - (700 if bold else 400)),
+            face.family,
+            face.path,
+            face.index,
+        )
+
+    def find(self, text: str = "", family: Optional[str] = None, bold: bool = True) -> Optional[FontFace]:
+        """``text`` 의 문자 체계를 가장 많이 가진 페이스 중 가장 알맞은 것. 페이스가 없으면 ``None``."""
+        needed = text_scripts(text)
+        candidates = self.by_family.get(family.lower(), []) if family else self.faces
+        if not candidates:
+            return None
+        return min(candidates, key=lambda f: (len(needed - f.scripts),) + self._rank(f, bold))
+
+    def font(self, size: int, text: str = "", face: Optional[FontFace] = None, bold: bool = True):
+        """``face`` (없으면 ``find(text)``) 의 ``size`` 크기 ``FreeTypeFont``. 맞는 페이스가 없으면 PIL 기본 폰트."""
+        from PIL import ImageFont
+
+        face = face or self.find(text, bold=bold)
+        if face is None:
+            return ImageFont.load_default(size=size)
+        key = (face.path, face.index, int(size))
+        with self._lock:
+            font = self._fonts.get(key)
+            if font is not None:
+                self._fonts.move_to_end(key)
+        record_cache("font", font is not None)
+        if font is not None:
+            return font
+        font = ImageFont.truetype(face.path, int(size), index=face.index)
+        with self._lock:
+            self._fonts[key] = font
+            self._fonts.move_to_end(key)
+            while len(self._fonts) > self.cache_size:
+                self._fonts.popitem(last=False)
+        return font
+
+    def cached(self) -> int:
+        return len(self._fonts)
+
+
+_registry: Optional[FontRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> FontRegistry:
+    """프로세스 공용 레지스트리 (처음 부를 때 폴더를 훑는다)."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = FontRegistry()
+    return _registry
+
+
+def load_font(size: int, text: str = ""):
+    """공용 레지스트리에서 ``text`` 를 그릴 수 있는 ``size`` 크기 폰트."""
+    return get_registry().font(size, text)
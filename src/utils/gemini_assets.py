@@ -0,0 +1,256 @@
+"""Gemini Files API 입력 이미지 핸들 (이미지당 한 번 업로드, 만료 추적, 백그라운드 지연 삭제).
+
+같은 상품 이미지를 사진 분석(``generate_content``)과 영상 생성(``generate_videos``)에서
+각각 내려받고 올리고 지우던 것을 한 번으로 모은다.
+
+- ``with assets.use(url) as asset:`` → ``asset.part()`` (분석 입력), ``asset.image()`` (Veo 입력)
+- 이미지는 내용 sha256 으로 식별 (URL 이 달라도 같은 이미지면 하나), 다운로드/업로드는
+  동시 요청을 하나로 합친다 (``SingleFlight``)
+- 업로드는 처음 ``asset.part()`` 가 필요할 때 한 번. 원격 파일 ``expiration_time`` (보통 48시간)이
+  ``GEMINI_ASSET_EXPIRY_MARGIN_S`` 안으로 들어오면 다시 올린다
+- 마지막 사용자가 놓은 뒤 ``GEMINI_ASSET_LINGER_S`` (기본 600초) 동안 재사용을 기다렸다가
+  백그라운드 스레드가 ``files.delete`` 한다 (요청 경로에서 삭제 왕복을 하지 않는다)
+
+Veo 의 ``image`` 입력은 Files URI 를 받지 않는다 (``image_bytes`` / GCS 만). 생성에는 이미 받아 둔
+바이트를 그대로 실어 보내므로 다운로드도 이미지당 한 번이다.
+
+업로드 수는 ``vendor_uploads{engine="gemini"}``, 재사용은 ``cache_requests{cache="gemini_files"}``.
+"""
+
+import hashlib
+import io
+import logging
+import mimetypes
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, Optional, Union
+
+import requests
+
+from .metrics import VENDOR_PHASE_SECONDS, VENDOR_UPLOADS, record_cache
+from .singleflight import SingleFlight
+
+
+logger = logging.getLogger(__name__)
+
+ASSET_LINGER_S = float(os.getenv("GEMINI_ASSET_LINGER_S", "600"))
+ASSET_EXPIRY_MARGIN_S = float(os.getenv("GEMINI_ASSET_EXPIRY_MARGIN_S", "300"))
+FILE_TTL_S = 48 * 3600  # 응답에 expiration_time 이 없을 때
+PROCESSING_TIMEOUT_S = 60.0
+
+
+@dataclass
+class Asset:
+    digest: str
+    data: bytes
+    mime_type: str
+    source: str = ""
+    file: Optional[Any] = None  # google.genai.types.File
+    expires_at: float = 0.0
+    refs: int = 0
+    release_at: Optional[float] = None
+    _owner: Optional["GeminiAssets"] = field(default=None, repr=False)
+
+    def remote(self):
+        """업로드된 ``types.File`` (필요하면 이때 한 번 업로드)."""
+        return self._owner.remote(self)
+
+    def part(self):
+        """``generate_content`` 입력 (Files URI 참조)."""
+        from google.genai import types
+
+        f = self.remote()
+        return types.Part.from_uri(file_uri=f.uri, mime_type=f.mime_type or self.mime_type)
+
+    def image(self):
+        """``generate_videos`` 입력 (인라인 바이트)."""
+        from google.genai import types
+
+        return types.Image(image_bytes=self.data, mime_type=self.mime_type)
+
+
+def _expiry(f: Any) -> float:
+    expires = getattr(f, "expiration_time", None)
+    return expires.timestamp() if expires is not None else time.time() + FILE_TTL_S
+
+
+def _state(f: Any) -> str:
+    state = getattr(f, "state", None)
+    return getattr(state, "name", None) or str(state or "ACTIVE")
+
+
+class GeminiAssets:
+    """클라이언트 하나에 딸린 업로드 핸들 캐시."""
+
+    def __init__(self, client, linger_s: float = ASSET_LINGER_S, expiry_margin_s: float = ASSET_EXPIRY_MARGIN_S) -> None:
+        self.client = client
+        self.linger_s = linger_s
+        self.expiry_margin_s = expiry_margin_s
+        self.stats: Counter = Counter()  # downloads / uploads / reused / deleted
+        self._assets: Dict[str, Asset] = {}
+        self._sources: Dict[str, str] = {}  # URL/경로 → digest
+        self._cond = threading.Condition()
+        self._downloads: SingleFlight = SingleFlight("gemini_asset_download")
+        self._uploads: SingleFlight = SingleFlight("gemini_asset_upload")
+        self._reaper: Optional[threading.Thread] = None
+        self._closed = False
+
+    # ---------- 잡기 / 놓기 ----------
+    def acquire(self, source: Union[str, bytes], mime_type: Optional[str] = None) -> Asset:
+        """이미지(URL, 로컬 경로, 바이트)를 잡는다. 다 쓰면 ``release``."""
+        if isinstance(source, (bytes, bytearray)):
+            data, mime, key = bytes(source), mime_type or "image/jpeg", ""
+        else:
+            key = source
+            with self._cond:
+                asset = self._assets.get(self._sources.get(key, ""))
+                if asset is not None:
+                    return self._hold(asset)
+            (data, mime), _ = self._downloads.do(key, lambda: self._fetch(key))
+            mime = mime_type or mime
+        digest = hashlib.sha256(data).hexdigest()
+        with self._cond:
+            asset = self._assets.get(digest)
+            if asset is None:
+                asset = self._assets[digest] = Asset(digest, data, mime, source=key, _owner=self)
+            if key:
+                self._sources[key] = digest
+            return self._hold(asset)
+
+    def _hold(self, asset: Asset) -> Asset:
+        asset.refs += 1
+        asset.release_at = None
+        return asset
+
+    def release(self, asset: Asset) -> None:
+        with self._cond:
+            asset.refs -= 1
+            if asset.refs <= 0:
+                asset.release_at = time.monotonic() + self.linger_s
+                self._ensure_reaper()
+                self._cond.notify_all()
+
+    @contextmanager
+    def use(self, source: Union[str, bytes], mime_type: Optional[str] = None) -> Iterator[Asset]:
+        asset = self.acquire(source, mime_type)
+        try:
+            yield asset
+        finally:
+            self.release(asset)
+
+    def _count(self, name: str) -> None:
+        with self._cond:
+            self.stats[name] += 1
+
+    def _fetch(self, source: str):
+        self._count("downloads")
+        if os.path.isfile(source):
+            with open(source, "rb") as f:
+                data = f.read()
+            return data, mimetypes.guess_type(source)[0] or "image/jpeg"
+        r = requests.get(source, timeout=30)
+        r.raise_for_status()
+        ctype = r.headers.get("Content-Type", "").split(";")[0].strip()
+        return r.content, ctype if ctype.startswith("image/") else "image/jpeg"
+
+    # ---------- 업로드 ----------
+    def remote(self, asset: Asset):
+        f = asset.file
+        if f is not None and asset.expires_at - self.expiry_margin_s > time.time():
+            self._count("reused")
+            record_cache("gemini_files", True)
+            return f
+        record_cache("gemini_files", False)
+        f, _ = self._uploads.do(asset.digest, lambda: self._upload(asset))
+        return f
+
+    def _upload(self, asset: Asset):
+        from google.genai import types
+
+        with VENDOR_PHASE_SECONDS.time(engine="gemini", phase="upload"):
+            f = self.client.files.upload(
+                file=io.BytesIO(asset.data),
+                config=types.UploadFileConfig(mime_type=asset.mime_type, display_name=f"asset-{asset.digest[:12]}"),
+            )
+            f = self._wait_active(f)
+        VENDOR_UPLOADS.inc(engine="gemini")
+        self._count("uploads")
+        asset.file, asset.expires_at = f, _expiry(f)
+        return f
+
+    def _wait_active(self, f):
+        # 이미지는 보통 바로 ACTIVE — 고정 2초 대신 짧게 시작해 늘린다
+        delay, deadline = 0.2, time.monotonic() + PROCESSING_TIMEOUT_S
+        while _state(f) == "PROCESSING" and time.monotonic() < deadline:
+            time.sleep(delay)
+            delay = min(delay * 2, 2.0)
+            f = self.client.files.get(name=f.name)
+        if _state(f) == "FAILED":
+            raise RuntimeError(f"Gemini 파일 처리 실패: {getattr(f, 'error', None)}")
+        return f
+
+    # ---------- 지연 삭제 ----------
+    def _ensure_reaper(self) -> None:
+        if self._reaper is None or not self._reaper.is_alive():
+            self._reaper = threading.Thread(target=self._reap, name="gemini-asset-reaper", daemon=True)
+            self._reaper.start()
+
+    def _take_due(self, force: bool = False) -> list:
+        now = time.monotonic()
+        due = [
+            a for a in self._assets.values()
+            if a.refs <= 0 and a.release_at is not None and (force or a.release_at <= now)
+        ]
+        for a in due:
+            del self._assets[a.digest]
+            for key in [k for k, d in self._sources.items() if d == a.digest]:
+                del self._sources[key]
+        return due
+
+    def _reap(self) -> None:
+        while True:
+            with self._cond:
+                if self._closed:
+                    return
+                due = self._take_due()
+                if not due:
+                    pending = [a.release_at for a in self._assets.values() if a.release_at is not None]
+                    self._cond.wait(max(0.0, min(pending) - time.monotonic()) if pending else None)
+                    continue
+            for asset in due:
+                self._delete(asset)
+
+    def _delete(self, asset: Asset) -> None:
+        if asset.file is None or asset.expires_at <= time.time():
+            return  # 올린 적 없거나 이미 만료
+        try:
+            self.client.files.delete(name=asset.file.name)
+            self._count("deleted")
+        except Exception as e:
+            logger.warning("Gemini 파일 삭제 실패 (%s): %s", asset.file.name, e)
+
+    def close(self) -> None:
+        """쓰지 않는 핸들을 지금 모두 지운다 (CLI/배치 종료 시)."""
+        with self._cond:
+            self._closed = True
+            due = self._take_due(force=True)
+            self._cond.notify_all()
+        for asset in due:
+            self._delete(asset)
+
+
+_managers: Dict[int, GeminiAssets] = {}
+_managers_lock = threading.Lock()
+
+
+def get_assets(client) -> GeminiAssets:
+    """클라이언트별 공용 ``GeminiAssets`` (``get_genai_client`` 가 클라이언트를 캐시하므로 프로세스 공용)."""
+    with _managers_lock:
+        manager = _managers.get(id(client))
+        if manager is None or manager.client is not client or manager._closed:
+            manager = _managers[id(client)] = GeminiAssets(client)
+        return manager
@@ -1,13 +1,16 @@
 import os
 import math
 import json
-import tempfile
 import subprocess
 import urllib.parse
 import requests
 from dataclasses import dataclass
 from typing import List, Optional
 
+from .catalog import get_json
+from .metrics import track_render
+from .workspace import workspace
+
 
 @dataclass
 class CanvasSpec:
@@ -32,6 +35,10 @@ class ImageSlideshowRenderer:
     def _download_images(self, urls: List[str], workdir: str) -> List[str]:
         paths: List[str] = []
         for idx, url in enumerate(urls):
+            if os.path.isfile(url):
+                # 로컬 파일은 그대로 입력으로 사용
+                paths.append(url)
+                continue
             parsed = urllib.parse.urlparse(url)
             ext = os.path.splitext(parsed.path)[1] or ".jpg"
             out_path = os.path.join(workdir, f"img_{idx:02d}{ext}")
@@ -67,9 +74,10 @@ class ImageSlideshowRenderer:
         return chain
 
     def render(self, clips: List[ClipSpec], output_mp4: str, thumb_jpg: Optional[str] = None) -> None:
-        with tempfile.TemporaryDirectory() as workdir:
+        with workspace("slideshow") as ws:
             # 1) Download images
-            image_paths = self._download_images([c.url for c in clips], workdir)
+            image_paths = self._download_images([c.url for c in clips], ws.root)
+            ws.track(*[p for p in image_paths if p.startswith(ws.root)])
 
             # 2) Build inputs
             cmd = ["ffmpeg", "-y"]
@@ -104,7 +112,9 @@ class ImageSlideshowRenderer:
                 output_mp4,
             ]
 
-            subprocess.run(cmd, check=True)
+            total_frames = int(self.canvas.duration * self.canvas.fps)
+            with track_render("slideshow", total_frames):
+                subprocess.run(cmd, check=True)
 
             if thumb_jpg:
                 subprocess.run([
@@ -122,9 +132,7 @@ def build_default_clips(image_urls: List[str], total_duration: float = 15.0, num
 
 def fetch_header_images(product_id: str) -> List[str]:
     api = f"https://api3.myrealtrip.com/traveler-experiences/api/web/v2/traveler/products/{product_id}/header"
-    r = requests.get(api, timeout=30)
-    r.raise_for_status()
-    data = r.json().get("data", {})
+    data = get_json(api, timeout=30).get("data", {})
     urls = [img.get("url") for img in data.get("images", []) if isinstance(img, dict) and img.get("url")]
     return urls
 
@@ -0,0 +1,159 @@
+"""로깅 파이프라인.
+
+요청 경로에서는 ``QueueHandler`` 로 레코드를 큐에 넣기만 하고,
+파일/콘솔 쓰기는 ``QueueListener`` 백그라운드 스레드가 맡는다.
+
+- 파일: JSON 한 줄 레코드 (trace_id/span_id, ``extra={"fields": {...}}`` 포함)
+- 콘솔: 사람이 읽는 한 줄 포맷 (INFO 이상)
+- ``extra={"rate_key": ...}`` 가 붙은 반복 메시지(폴링 진행 등)는 키별로 간격 제한
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, Optional, Tuple
+
+from .tracing import current_span
+
+
+LOG_DIR = os.getenv("LOG_DIR", "logs")
+LOG_LEVEL = os.getenv("LOG_LEVEL", "DEBUG")
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(50 * 1024 * 1024)))
+LOG_BACKUPS = int(os.getenv("LOG_BACKUPS", "5"))
+LOG_RATE_INTERVAL = float(os.getenv("LOG_RATE_INTERVAL", "10"))
+
+_STD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+
+class JsonFormatter(logging.Formatter):
+    """레코드를 JSON 한 줄로 직렬화한다."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "thread": record.threadName,
+        }
+        for key in ("trace_id", "span_id", "event"):
+            value = getattr(record, key, None)
+            if value:
+                payload[key] = value
+        fields = getattr(record, "fields", None)
+        if isinstance(fields, dict):
+            payload.update(fields)
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            payload["suppressed"] = suppressed
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exc"] = record.exc_text
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class ContextFilter(logging.Filter):
+    """현재 트레이싱 스팬 ID 를 레코드에 붙인다 (요청 스레드에서 실행)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        span = current_span()
+        if span is not None and span.sampled:
+            record.trace_id = span.trace_id
+            record.span_id = span.span_id
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    """``rate_key`` 별로 ``interval`` 초에 한 번만 통과시킨다.
+
+    레벨이 WARNING 이상이거나 ``rate_key`` 가 없는 레코드는 그대로 통과한다.
+    막힌 개수는 다음 통과 레코드의 ``suppressed`` 에 실린다.
+    """
+
+    def __init__(self, interval: float = LOG_RATE_INTERVAL) -> None:
+        super().__init__()
+        self.interval = interval
+        self._state: Dict[Tuple[str, str], Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = getattr(record, "rate_key", None)
+        if not key or record.levelno >= logging.WARNING:
+            return True
+        state_key = (record.name, str(key))
+        now = time.monotonic()
+        with self._lock:
+            last, dropped = self._state.get(state_key, (0.0, 0))
+            if now - last < self.interval:
+                self._state[state_key] = (last, dropped + 1)
+                return False
+            self._state[state_key] = (now, 0)
+        record.suppressed = dropped
+        return True
+
+
+_listener: Optional[QueueListener] = None
+_setup_lock = threading.Lock()
+
+
+def setup_logging(log_dir: str = LOG_DIR, level: str = LOG_LEVEL, console: bool = True) -> logging.Logger:
+    """루트 로거에 큐 핸들러를 붙이고 백그라운드 리스너를 시작한다 (프로세스당 한 번)."""
+    global _listener
+    root_logger = logging.getLogger()
+    with _setup_lock:
+        if _listener is not None:
+            return root_logger
+        os.makedirs(log_dir, exist_ok=True)
+
+        file_handler = RotatingFileHandler(
+            filename=os.path.join(log_dir, "app.jsonl"),
+            maxBytes=LOG_MAX_BYTES,
+            backupCount=LOG_BACKUPS,
+            encoding="utf-8",
+            delay=True,
+        )
+        file_handler.setLevel(logging.DEBUG)
+        file_handler.setFormatter(JsonFormatter())
+        handlers = [file_handler]
+        if console:
+            stream_handler = logging.StreamHandler()
+            stream_handler.setLevel(logging.INFO)
+            stream_handler.setFormatter(logging.Formatter(
+                fmt="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+                datefmt="%Y-%m-%d %H:%M:%S",
+            ))
+            handlers.append(stream_handler)
+
+        log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+        queue_handler = QueueHandler(log_queue)
+        queue_handler.addFilter(RateLimitFilter())
+        queue_handler.addFilter(ContextFilter())
+
+        for h in list(root_logger.handlers):
+            root_logger.removeHandler(h)
+        root_logger.addHandler(queue_handler)
+        root_logger.setLevel(getattr(logging, str(level).upper(), logging.DEBUG))
+        # 서드파티 DEBUG 소음은 줄인다
+        for name in ("urllib3", "httpx", "httpcore", "PIL", "watchdog"):
+            logging.getLogger(name).setLevel(logging.INFO)
+
+        _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+    return root_logger
+
+
+def shutdown_logging() -> None:
+    """큐에 남은 레코드를 모두 쓰고 리스너를 멈춘다."""
+    global _listener
+    with _setup_lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,403 @@
+"""메트릭 레지스트리 (카운터/게이지/히스토그램).
+
+프로세스 안에서 값을 모으고 Prometheus 텍스트 포맷으로 내보낸다.
+사이드카 서버가 ``/metrics`` 로 노출하고, 주간 리포트를 위해
+주기적으로 스냅샷을 JSONL(``METRICS_FILE``)에 덧붙인다. 파일이 ``METRICS_MAX_BYTES`` 를 넘으면 앱 로그
+(``RotatingFileHandler``)와 같은 규칙으로 ``.1`` … ``.{METRICS_BACKUPS}`` 로 돌린다.
+
+- 트레이싱 스팬 종료 시 ``span_seconds{span=...}`` 로 단계 지연이 자동 기록된다
+- 벤더 대기/실행/다운로드 시간은 ``vendor_phase_seconds{engine,phase}``
+"""
+
+import atexit
+import bisect
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .tracing import get_tracer
+
+
+NAMESPACE = "display_ads"
+METRICS_FILE = os.getenv("METRICS_FILE", os.path.join("logs", "metrics.jsonl"))
+METRICS_SNAPSHOT_INTERVAL = float(os.getenv("METRICS_SNAPSHOT_INTERVAL", "60"))
+METRICS_MAX_BYTES = int(os.getenv("METRICS_MAX_BYTES", str(20 * 1024 * 1024)))
+METRICS_BACKUPS = int(os.getenv("METRICS_BACKUPS", "5"))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+FPS_BUCKETS = (1, 2, 5, 10, 15, 20, 30, 45, 60, 90, 120, 240)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: 라벨 {self.labelnames} 가 필요합니다 (받은 값: {tuple(labels)})")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        if amount < 0:
+            raise ValueError("카운터는 감소할 수 없습니다")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        with self._lock:
+            items = list(self._values.items())
+        return [(self.name + "_total", _format_labels(self.labelnames, k), v) for k, v in items]
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {"|".join(k): v for k, v in self._values.items()}
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    @contextmanager
+    def track_inprogress(self, **labels: str):
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        with self._lock:
+            items = list(self._values.items())
+        return [(self.name, _format_labels(self.labelnames, k), v) for k, v in items]
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {"|".join(k): v for k, v in self._values.items()}
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 라벨 조합별 [버킷별 카운트..., +Inf 카운트], 합계
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+                self._sums[key] = 0.0
+            counts[idx] += 1
+            self._sums[key] += value
+
+    @contextmanager
+    def time(self, **labels: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - t0, **labels)
+
+    def count(self, **labels: str) -> int:
+        return sum(self._counts.get(self._key(labels), ()))
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        out = []
+        with self._lock:
+            items = [(k, list(c), self._sums[k]) for k, c in self._counts.items()]
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, c in zip(self.buckets + (math.inf,), counts):
+                cumulative += c
+                le = _format_value(bound)
+                out.append((self.name + "_bucket", _format_labels(self.labelnames, key, ("le", le)), cumulative))
+            out.append((self.name + "_sum", _format_labels(self.labelnames, key), total))
+            out.append((self.name + "_count", _format_labels(self.labelnames, key), cumulative))
+        return out
+
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        with self._lock:
+            return {
+                "|".join(k): {"counts": list(c), "sum": self._sums[k]}
+                for k, c in self._counts.items()
+            }
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, documentation: str, labelnames: Iterable[str], **kwargs):
+        full = f"{NAMESPACE}_{name}"
+        with self._lock:
+            metric = self._metrics.get(full)
+            if metric is None:
+                metric = self._metrics[full] = cls(full, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"{full} 는 이미 {metric.kind} 로 등록되어 있습니다")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        """Prometheus 텍스트 노출 포맷 (0.0.4)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for m in metrics:
+            lines.append(f"# HELP {m.name} {m.documentation}")
+            lines.append(f"# TYPE {m.name} {m.kind}")
+            for sample_name, labels, value in m.samples():
+                lines.append(f"{sample_name}{labels} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict[str, object]:
+        """주간 리포트용 누적값 스냅샷."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        out: Dict[str, object] = {}
+        for m in metrics:
+            entry: Dict[str, object] = {"type": m.kind, "labels": list(m.labelnames), "values": m.snapshot()}
+            if isinstance(m, Histogram):
+                entry["buckets"] = list(m.buckets)
+            out[m.name] = entry
+        return out
+
+
+REGISTRY = MetricsRegistry()
+
+# ---------- 공용 메트릭 ----------
+SPAN_SECONDS = REGISTRY.histogram("span_seconds", "Duration of traced spans (stage latency)", ["span", "status"])
+VENDOR_PHASE_SECONDS = REGISTRY.histogram(
+    "vendor_phase_seconds", "Vendor job time by phase (queue/run/download)", ["engine", "phase"]
+)
+VENDOR_JOBS = REGISTRY.counter("vendor_jobs", "Vendor generation jobs by outcome", ["engine", "status"])
+INFLIGHT_JOBS = REGISTRY.gauge("inflight_jobs", "Generation jobs currently in flight", ["engine"])
+QUEUE_WAIT_SECONDS = REGISTRY.histogram(
+    "queue_wait_seconds", "Time spent waiting for a scheduler slot", ["queue", "priority"]
+)
+QUEUED_JOBS = REGISTRY.gauge("scheduler_queued_jobs", "Jobs waiting for a vendor slot or rate token", ["engine"])
+RATE_LIMITED = REGISTRY.counter("vendor_rate_limited", "Vendor 429 responses", ["engine", "call"])
+VENDOR_POLLS = REGISTRY.counter("vendor_polls", "Vendor status polling requests", ["engine"])
+VENDOR_UPLOADS = REGISTRY.counter("vendor_uploads", "Input files uploaded to vendor file storage", ["engine"])
+PHOTO_ANALYSIS_REQUESTS = REGISTRY.counter("photo_analysis_requests", "Gemini photo analysis calls (one per batch)", ["model"])
+WEBHOOK_EVENTS = REGISTRY.counter("webhook_events", "Vendor completion callbacks by result", ["engine", "result"])
+VENDOR_CREDITS = REGISTRY.gauge("vendor_credits", "Last known vendor credit balance", ["engine"])
+COALESCED_REQUESTS = REGISTRY.counter(
+    "coalesced_requests", "Duplicate requests attached to an identical in-flight call", ["flight"]
+)
+CACHE_REQUESTS = REGISTRY.counter("cache_requests", "Cache lookups by result", ["cache", "result"])
+DOWNLOADED_BYTES = REGISTRY.counter("downloaded_bytes", "Bytes downloaded by the download manager", ["source"])
+SCRATCH_WORKSPACES = REGISTRY.gauge("scratch_workspaces", "Job scratch workspaces currently open", ["medium"])
+SCRATCH_BYTES = REGISTRY.counter("scratch_bytes", "Bytes written to job scratch workspaces", ["medium"])
+SCRATCH_SWEPT = REGISTRY.counter("scratch_orphans_swept", "Orphaned scratch workspaces removed at startup", ["reason"])
+ARTIFACT_BYTES = REGISTRY.gauge("artifact_bytes", "Bytes held by the artifact store after the last sweep", ["backend"])
+ARTIFACT_EVICTIONS = REGISTRY.counter("artifact_evictions", "Artifact jobs/objects removed by retention", ["reason"])
+RENDER_SECONDS = REGISTRY.histogram("render_seconds", "Local render wall time", ["renderer"])
+RENDER_FPS = REGISTRY.histogram("render_fps", "Local render throughput (frames per second)", ["renderer"], buckets=FPS_BUCKETS)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def record_render(renderer: str, frames: int, elapsed_s: float) -> None:
+    RENDER_SECONDS.observe(elapsed_s, renderer=renderer)
+    if elapsed_s > 0 and frames > 0:
+        RENDER_FPS.observe(frames / elapsed_s, renderer=renderer)
+
+
+@contextmanager
+def track_render(renderer: str, frames: int):
+    """``with track_render("slideshow", frames):`` 렌더 시간/fps 기록. 실패한 렌더도 시간은 남긴다 (fps 제외)."""
+    t0 = time.perf_counter()
+    ok = False
+    try:
+        yield
+        ok = True
+    finally:
+        record_render(renderer, frames if ok else 0, time.perf_counter() - t0)
+
+
+class VendorPhaseClock:
+    """폴링 상태로 대기(queue)/실행(run) 구간을 나눠 기록한다.
+
+    ``update(status)`` 를 폴링마다 호출하고, 끝나면 ``finish()`` 를 호출한다.
+    """
+
+    QUEUED = {"pending", "queued", "throttled", "submitted", "waiting"}
+
+    def __init__(self, engine: str) -> None:
+        self.engine = engine
+        self._t0 = time.perf_counter()
+        self._run_started: Optional[float] = None
+        self._finished = False
+
+    def update(self, status: str) -> None:
+        if self._run_started is None and str(status).lower() not in self.QUEUED:
+            self._run_started = time.perf_counter()
+
+    def finish(self) -> None:
+        if self._finished:
+            return
+        self._finished = True
+        now = time.perf_counter()
+        run_start = self._run_started or now
+        VENDOR_PHASE_SECONDS.observe(run_start - self._t0, engine=self.engine, phase="queue")
+        VENDOR_PHASE_SECONDS.observe(now - run_start, engine=self.engine, phase="run")
+
+
+@contextmanager
+def track_vendor_job(engine: str):
+    """벤더 작업 하나의 in-flight 게이지와 성공/실패 카운트."""
+    INFLIGHT_JOBS.inc(engine=engine)
+    try:
+        yield
+    except BaseException:
+        VENDOR_JOBS.inc(engine=engine, status="failed")
+        raise
+    else:
+        VENDOR_JOBS.inc(engine=engine, status="succeeded")
+    finally:
+        INFLIGHT_JOBS.dec(engine=engine)
+
+
+def _observe_span(name: str, duration_s: float, status: str) -> None:
+    SPAN_SECONDS.observe(duration_s, span=name, status=status)
+
+
+get_tracer().add_listener(_observe_span)
+
+
+# ---------- 스냅샷 (주간 리포트용) ----------
+_snapshot_thread: Optional[threading.Thread] = None
+_snapshot_lock = threading.Lock()
+_write_lock = threading.Lock()
+
+
+def snapshot_files(path: str = METRICS_FILE, backups: int = METRICS_BACKUPS) -> List[str]:
+    """스냅샷 파일들 (돌려 둔 것 포함, 오래된 것부터, 있는 것만)."""
+    names = [f"{path}.{i}" for i in range(backups, 0, -1)] + [path]
+    return [p for p in names if os.path.exists(p)]
+
+
+def _rotate(path: str, backups: int) -> None:
+    """``path`` → ``path.1`` → … → ``path.{backups}`` (가장 오래된 것은 버린다)."""
+    if backups <= 0:
+        os.remove(path)
+        return
+    for i in range(backups - 1, 0, -1):
+        if os.path.exists(f"{path}.{i}"):
+            os.replace(f"{path}.{i}", f"{path}.{i + 1}")
+    os.replace(path, f"{path}.1")
+
+
+def write_snapshot(
+    path: str = METRICS_FILE,
+    registry: MetricsRegistry = REGISTRY,
+    max_bytes: int = METRICS_MAX_BYTES,
+    backups: int = METRICS_BACKUPS,
+) -> None:
+    record = {"ts": round(time.time(), 3), "pid": os.getpid(), "metrics": registry.snapshot()}
+    line = json.dumps(record, ensure_ascii=False) + "\n"
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with _write_lock:
+        if max_bytes > 0 and os.path.exists(path) and os.path.getsize(path) + len(line.encode()) > max_bytes:
+            _rotate(path, backups)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+
+def start_snapshot_writer(interval_s: float = METRICS_SNAPSHOT_INTERVAL, path: str = METRICS_FILE) -> None:
+    """누적 스냅샷을 주기적으로(+종료 시) 기록한다. 프로세스당 한 번만 시작."""
+    global _snapshot_thread
+    with _snapshot_lock:
+        if _snapshot_thread is not None or interval_s <= 0:
+            return
+
+        def _loop() -> None:
+            while True:
+                time.sleep(interval_s)
+                try:
+                    write_snapshot(path)
+                except OSError:
+                    pass
+
+        _snapshot_thread = threading.Thread(target=_loop, name="metrics-snapshot", daemon=True)
+        _snapshot_thread.start()
+        atexit.register(write_snapshot, path)
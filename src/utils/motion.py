@@ -0,0 +1,36 @@
+"""로컬 모션 렌더러 공용 스펙.
+
+``ai_motion`` / ``ai_motion_depth`` / ``ai_motion_grabcut`` 가 각자 두던
+``MotionSpec`` 을 하나로 합쳤다. 렌더러별 기본값 차이는 ``motion_spec`` 프리셋으로 둔다.
+"""
+
+from dataclasses import dataclass, replace
+from typing import Any, Dict
+
+
+@dataclass
+class MotionSpec:
+    width: int = 1080
+    height: int = 1920
+    duration: float = 5.0
+    fps: int = 30
+    zoom_near: float = 1.06  # foreground zoom factor
+    zoom_far: float = 1.01   # background zoom factor
+    blur_bg: int = 12
+
+    @property
+    def frames(self) -> int:
+        return int(self.duration * self.fps)
+
+
+# 렌더러별 기본값 (기존 개별 MotionSpec 의 기본값 유지)
+PRESETS: Dict[str, Dict[str, Any]] = {
+    "ai_motion": {"zoom_far": 1.02, "blur_bg": 20},
+    "ai_motion_depth": {},
+    "ai_motion_grabcut": {},
+}
+
+
+def motion_spec(renderer: str = "", **overrides: Any) -> MotionSpec:
+    """``renderer`` 프리셋에 ``overrides`` 를 덮어쓴 스펙."""
+    return replace(MotionSpec(**PRESETS.get(renderer, {})), **overrides)
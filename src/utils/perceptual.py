@@ -0,0 +1,221 @@
+"""지각 해시(dHash + pHash)로 거의 같은 사진 찾기.
+
+상품 헤더에는 같은 사진의 다른 크롭/크기, 리뷰 재게시가 자주 섞여 있다. 후보를 자르기 전에
+한 장씩 대표만 남기고, 배치에서는 이미 렌더링한 사진인지 본다.
+
+- 해시: 작은 회색조 썸네일에서 64비트 dHash(가로 밝기 차이)와 pHash(32x32 DCT 저주파의 중앙값 비교).
+  JPEG 는 ``draft`` 로 1/8 크기부터 디코딩한다. 썸네일을 쌓아 NumPy 로 한 번에 계산한다
+- 거리: 두 해시를 이은 128비트의 해밍 거리. ``DEDUPE_MAX_DISTANCE`` 이하면 중복. 축소/재압축은 몇 비트,
+  가장자리 3~5% 크롭은 20~30비트 (pHash 가 크롭에 약하다), 서로 다른 사진은 대개 40비트 이상
+- ``collapse``: 입력 순서(우선순위)대로 묶고, 묶음의 자리는 먼저 나온 항목 자리, 남는 항목은 점수가 가장 높은 것
+- ``RenderedIndex``: 렌더링한 입력 사진의 해시를 JSONL(``RENDERED_INDEX_FILE``)에 쌓아 둔다
+"""
+
+import io
+import json
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Union
+
+if TYPE_CHECKING:
+    import numpy as np
+    from PIL import Image
+
+HASH_SIZE = 8  # 8x8 = 64비트
+PHASH_SIZE = 32
+DEDUPE_MAX_DISTANCE = int(os.getenv("DEDUPE_MAX_DISTANCE", "28"))  # 128비트 중
+# 중복을 걷어낸 뒤 자르도록 후보를 이만큼까지 모은다
+DEDUPE_SCAN_LIMIT = int(os.getenv("DEDUPE_SCAN_LIMIT", "24"))
+RENDERED_INDEX_FILE = os.getenv("RENDERED_INDEX_FILE", os.path.join("outputs", "rendered_index.jsonl"))
+
+ImageInput = Union[bytes, "Image.Image", "np.ndarray"]
+
+
+def _dct_matrix(n: int) -> "np.ndarray":
+    import numpy as np
+
+    k = np.arange(n)[:, None]
+    m = np.cos(np.pi * (2 * np.arange(n)[None, :] + 1) * k / (2 * n)) * np.sqrt(2.0 / n)
+    m[0] /= np.sqrt(2.0)
+    return m.astype(np.float32)
+
+
+_TABLES: Dict[str, "np.ndarray"] = {}
+
+
+def _table(name: str) -> "np.ndarray":
+    """``dct`` (pHash DCT 행렬) / ``bits`` (64비트 자리값). 처음 해시할 때 만든다."""
+    if not _TABLES:
+        import numpy as np
+
+        bits = (1 << np.arange(HASH_SIZE * HASH_SIZE, dtype=np.uint64)[::-1]).astype(np.uint64)
+        _TABLES.update({"dct": _dct_matrix(PHASH_SIZE), "bits": bits})  # 한 번에 (다른 스레드가 반쪽을 보지 않게)
+    return _TABLES[name]
+
+
+def gray_thumbnail(image: ImageInput, size: int = PHASH_SIZE) -> "np.ndarray":
+    """``size`` x ``size`` 회색조 (float32). 바이트면 JPEG 축소 디코딩."""
+    import numpy as np
+    from PIL import Image
+
+    if isinstance(image, (bytes, bytearray)):
+        image = Image.open(io.BytesIO(image))
+        image.draft("L", (size * 2, size * 2))
+    elif isinstance(image, np.ndarray):
+        image = Image.fromarray(image)
+    return np.asarray(image.convert("L").resize((size, size), Image.BOX), np.float32)
+
+
+def _pack(bits: "np.ndarray") -> "np.ndarray":
+    """(N, 64) bool → (N,) uint64."""
+    import numpy as np
+
+    return (bits.reshape(len(bits), -1).astype(np.uint64) * _table("bits")).sum(axis=1, dtype=np.uint64)
+
+
+def hash_thumbnails(thumbs: "np.ndarray") -> "np.ndarray":
+    """(N, 32, 32) 썸네일 → (N, 2) uint64 ``[dHash, pHash]``."""
+    import numpy as np
+
+    n = len(thumbs)
+    if n == 0:
+        return np.zeros((0, 2), np.uint64)
+    # dHash: 32x32 를 9x8 (가로 9칸) 으로 평균 내린 뒤 이웃 칸 비교
+    cols = np.linspace(0, PHASH_SIZE, HASH_SIZE + 2).astype(int)
+    rows = np.linspace(0, PHASH_SIZE, HASH_SIZE + 1).astype(int)
+    small = np.add.reduceat(np.add.reduceat(thumbs, rows[:-1], axis=1), cols[:-1], axis=2)
+    small /= np.diff(rows)[None, :, None] * np.diff(cols)[None, None, :]
+    dhash = _pack(small[:, :, 1:] > small[:, :, :-1])
+    # pHash: 2D DCT 의 왼쪽 위 8x8 (DC 제외) 를 중앙값과 비교
+    dct = _table("dct")
+    coeffs = np.einsum("ij,njk,lk->nil", dct, thumbs, dct)[:, :HASH_SIZE, :HASH_SIZE].reshape(n, -1)
+    median = np.median(coeffs[:, 1:], axis=1, keepdims=True)
+    phash = _pack(coeffs > median)
+    return np.stack([dhash, phash], axis=1)
+
+
+def hash_images(images: Sequence[ImageInput]) -> "np.ndarray":
+    """이미지들 → (N, 2) uint64 해시."""
+    import numpy as np
+
+    if not images:
+        return np.zeros((0, 2), np.uint64)
+    return hash_thumbnails(np.stack([gray_thumbnail(im) for im in images]))
+
+
+def distances(a: "np.ndarray", b: "np.ndarray") -> "np.ndarray":
+    """(N, 2) x (M, 2) → (N, M) 해밍 거리 (dHash + pHash)."""
+    import numpy as np
+
+    if len(a) == 0 or len(b) == 0:
+        return np.zeros((len(a), len(b)), np.int64)
+    diff = np.bitwise_count(a[:, None, :] ^ b[None, :, :])
+    return diff.sum(axis=2, dtype=np.int64)
+
+
+def to_hex(row: "np.ndarray") -> str:
+    return f"{int(row[0]):016x}{int(row[1]):016x}"
+
+
+def from_hex(text: str) -> "np.ndarray":
+    import numpy as np
+
+    return np.array([int(text[:16], 16), int(text[16:32], 16)], np.uint64)
+
+
+def leaders(hashes: "np.ndarray", max_distance: int = DEDUPE_MAX_DISTANCE) -> "np.ndarray":
+    """항목마다 묶음 대표(처음 나온 항목) 인덱스. 먼저 나온 대표들 중 가까운 첫 대표에 붙는다."""
+    import numpy as np
+
+    d = distances(hashes, hashes)
+    out = np.arange(len(hashes))
+    heads: List[int] = []
+    for i in range(len(hashes)):
+        near = [h for h in heads if d[i, h] <= max_distance]
+        if near:
+            out[i] = near[0]
+        else:
+            heads.append(i)
+    return out
+
+
+def collapse(
+    items: Sequence[Dict[str, Any]],
+    hashes: "np.ndarray",
+    max_distance: int = DEDUPE_MAX_DISTANCE,
+    score: Optional[Callable[[Dict[str, Any]], float]] = None,
+) -> List[Dict[str, Any]]:
+    """거의 같은 항목을 하나로. 순서는 묶음이 처음 나온 자리, 남는 항목은 ``score`` 가 가장 높은 것
+    (없으면 먼저 나온 것). 남은 항목의 ``duplicates`` 에 빠진 항목들의 ``filename`` (없으면 ``url``)."""
+    lead = leaders(hashes, max_distance)
+    groups: Dict[int, List[int]] = {}
+    for i, head in enumerate(lead):
+        groups.setdefault(int(head), []).append(i)
+    survivors = []
+    for head in sorted(groups):
+        members = groups[head]
+        best = max(members, key=lambda i: (score(items[i]) if score else 0.0, -i))
+        item = dict(items[best])
+        item["phash"] = to_hex(hashes[best])
+        item["duplicates"] = [items[i].get("filename") or items[i].get("url") for i in members if i != best]
+        survivors.append(item)
+    return survivors
+
+
+class RenderedIndex:
+    """렌더링한 입력 사진의 해시 목록 (JSONL, 한 줄 = 한 번 렌더링)."""
+
+    def __init__(self, path: Optional[str] = RENDERED_INDEX_FILE) -> None:
+        import numpy as np
+
+        self.path = path
+        self.entries: List[Dict[str, Any]] = []
+        self._hashes = np.zeros((0, 2), np.uint64)
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        self.entries.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue
+            if self.entries:
+                self._hashes = np.stack([from_hex(e["hash"]) for e in self.entries])
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def find(
+        self, hashes: "np.ndarray", max_distance: int = DEDUPE_MAX_DISTANCE, **match: Any,
+    ) -> List[Optional[Dict[str, Any]]]:
+        """사진마다 가장 가까운 기존 렌더링 (``match`` 의 키/값이 같은 항목만, 없으면 ``None``)."""
+        import numpy as np
+
+        with self._lock:
+            entries, known = list(self.entries), self._hashes
+        d = distances(hashes, known)
+        out: List[Optional[Dict[str, Any]]] = []
+        for row in d:
+            best = None
+            for j in np.argsort(row, kind="stable"):
+                if row[j] > max_distance:
+                    break
+                if all(entries[j].get(k) == v for k, v in match.items()):
+                    best = {**entries[j], "distance": int(row[j])}
+                    break
+            out.append(best)
+        return out
+
+    def add(self, row: "np.ndarray", **meta: Any) -> Dict[str, Any]:
+        import numpy as np
+
+        entry = {"hash": to_hex(row), "ts": time.time(), **meta}
+        with self._lock:
+            self.entries.append(entry)
+            self._hashes = np.concatenate([self._hashes, row[None, :].astype(np.uint64)])
+            if self.path:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return entry
@@ -0,0 +1,114 @@
+"""UI 미리보기 메모: (종류, 원본 다이제스트, 파라미터) 해시 → 만든 이미지 LRU.
+
+Streamlit 은 위젯이 바뀔 때마다 스크립트(또는 프래그먼트)를 다시 돌린다. 원본 해상도 이미지의
+리사이즈/텍스트 미리보기와 그리드 썸네일을 매번 새로 만들지 않도록 같은 입력이면 만든 결과를 돌려준다.
+
+- 원본 이미지는 픽셀 다이제스트(``image_digest``)로 구분한다. 이미지를 내려받을 때 한 번 계산해
+  후보 항목(``item["digest"]``)에 넣어 두면 다시 해시하지 않는다
+- 파생 이미지(리사이즈 결과 등)의 다이제스트는 만든 키 그대로 쓴다 (텍스트 미리보기 → 리사이즈 결과 위)
+- 화면에는 ``DISPLAY_SIZE`` 로 만들어 보낸다. 텍스트 배치는 프레임 높이에 비례하므로 1080x1920 결과를 줄인 것과 같다
+- ``PREVIEW_CACHE_SIZE``: 프로세스 공용 LRU 크기 (세션끼리 나눠 쓴다)
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .metrics import record_cache
+from .simulation import cover_resize
+from .text_overlay import preview_text_overlay
+
+PREVIEW_CACHE_SIZE = int(os.getenv("PREVIEW_CACHE_SIZE", "64"))
+THUMBNAIL_SIZE = (480, 480)
+# 화면 표시용 9:16 미리보기 크기 (열 너비보다 크게 보내 봐야 브라우저가 줄인다). 배치는 높이 비율로 같다
+DISPLAY_SIZE = (540, 960)
+
+
+def image_digest(image) -> str:
+    """픽셀/크기/모드 기준 다이제스트."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{image.mode}:{image.size}".encode())
+    h.update(image.tobytes())
+    return h.hexdigest()
+
+
+def params_key(kind: str, digest: str, **params: Any) -> str:
+    payload = json.dumps(params, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(f"{kind}|{digest}|{payload}".encode()).hexdigest()
+
+
+class PreviewCache:
+    """키 → 만든 결과 LRU. 같은 키를 동시에 만들면 각자 만들고 나중 것이 남는다 (결과가 같다)."""
+
+    def __init__(self, max_entries: int = PREVIEW_CACHE_SIZE) -> None:
+        self.max_entries = max_entries
+        self._items: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_render(self, key: str, render: Callable[[], Any]) -> Tuple[Any, bool]:
+        """``(결과, 적중 여부)``."""
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+        record_cache("preview", value is not None)
+        if value is not None:
+            return value, True
+        value = render()
+        with self._lock:
+            self._items[key] = value
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+        return value, False
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+_cache = PreviewCache()
+
+
+def get_cache() -> PreviewCache:
+    return _cache
+
+
+def _digest(image, digest: Optional[str]) -> str:
+    return digest or image_digest(image)
+
+
+def resized_preview(image, width: int = 1080, height: int = 1920, digest: Optional[str] = None) -> Tuple[Any, str]:
+    """cover 크롭 리사이즈. ``(이미지, 결과 다이제스트)`` — 다이제스트는 이어지는 미리보기 키로 쓴다."""
+    key = params_key("resize", _digest(image, digest), width=width, height=height)
+    value, _ = _cache.get_or_render(key, lambda: cover_resize(image, width, height))
+    return value, key
+
+
+def text_preview(image, settings: Dict[str, Any], digest: Optional[str] = None):
+    """``preview_text_overlay`` (문구가 없으면 원본 그대로)."""
+    if not settings.get("copy"):
+        return image
+    key = params_key("text", _digest(image, digest), **settings)
+    value, _ = _cache.get_or_render(key, lambda: preview_text_overlay(image, settings))
+    return value
+
+
+def thumbnail(image, size: Tuple[int, int] = THUMBNAIL_SIZE, digest: Optional[str] = None):
+    """그리드/원본 표시용 축소본 (브라우저로 보낼 인코딩 크기를 줄인다)."""
+    if image.width <= size[0] and image.height <= size[1]:
+        return image
+    key = params_key("thumb", _digest(image, digest), size=list(size))
+
+    def render():
+        small = image.copy()
+        small.thumbnail(size)
+        return small
+
+    value, _ = _cache.get_or_render(key, render)
+    return value
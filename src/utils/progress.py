@@ -0,0 +1,136 @@
+"""진행 상황 보고 인터페이스.
+
+생성기(Runway/Higgs/Veo 등)는 ``print`` 나 ``st.*`` 를 직접 부르지 않고
+``ProgressReporter`` 로 이벤트를 보낸다.
+
+- ``ProgressReporter``: 로깅만 (CLI/배치 기본값)
+- ``StreamlitProgressReporter``: 로깅 + Streamlit 표시.
+  반복되는 진행 메시지는 한 자리표시자를 덮어써 화면에 쌓이지 않는다.
+
+호출자는 ``use_reporter(...)`` 로 현재 컨텍스트의 리포터를 지정하고,
+생성기는 ``get_reporter()`` 로 꺼내 쓴다.
+"""
+
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+
+logger = logging.getLogger("progress")
+
+LEVELS = {
+    "info": logging.INFO,
+    "success": logging.INFO,
+    "progress": logging.INFO,
+    "detail": logging.DEBUG,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+}
+
+
+@dataclass
+class ProgressEvent:
+    kind: str  # info | success | progress | detail | warning | error
+    message: str
+    source: str = ""
+    data: Dict[str, Any] = field(default_factory=dict)
+
+
+class ProgressReporter:
+    """로그로만 내보내는 기본 리포터."""
+
+    def __init__(self, source: str = "") -> None:
+        self.source = source
+
+    def emit(self, event: ProgressEvent) -> None:
+        extra: Dict[str, Any] = {"event": event.kind, "fields": {"source": event.source, **event.data}}
+        if event.kind == "progress":
+            # 폴링 루프에서 반복되는 메시지는 간격 제한 (logging_config.RateLimitFilter)
+            extra["rate_key"] = f"{event.source}:progress"
+        logger.log(LEVELS.get(event.kind, logging.INFO), "%s", event.message, extra=extra)
+
+    def _emit(self, kind: str, message: str, data: Dict[str, Any]) -> None:
+        self.emit(ProgressEvent(kind, message, self.source, data))
+
+    # ---------- 편의 메서드 ----------
+    def info(self, message: str, **data: Any) -> None:
+        self._emit("info", message, data)
+
+    def success(self, message: str, **data: Any) -> None:
+        self._emit("success", message, data)
+
+    def progress(self, message: str, **data: Any) -> None:
+        """반복 상태 갱신 (예: 폴링 중 상태)."""
+        self._emit("progress", message, data)
+
+    def detail(self, message: str, **data: Any) -> None:
+        """디버그용 상세 (요청 페이로드, 원본 응답 등)."""
+        self._emit("detail", message, data)
+
+    def warning(self, message: str, **data: Any) -> None:
+        self._emit("warning", message, data)
+
+    def error(self, message: str, **data: Any) -> None:
+        self._emit("error", message, data)
+
+    def child(self, source: str) -> "ProgressReporter":
+        """같은 출력 대상에 ``source`` 만 바꾼 리포터."""
+        clone = object.__new__(type(self))
+        clone.__dict__.update(self.__dict__)
+        clone.source = source
+        return clone
+
+
+class StreamlitProgressReporter(ProgressReporter):
+    """로깅 + Streamlit 표시.
+
+    ``placeholder`` (``st.empty()``) 가 있으면 progress 이벤트는 그 자리를 덮어쓴다.
+    ``show_details`` 가 켜져 있으면 detail 이벤트의 data 를 ``st.json`` 으로 보여준다.
+    """
+
+    def __init__(self, source: str = "", placeholder: Any = None, show_details: bool = False) -> None:
+        super().__init__(source)
+        self.placeholder = placeholder
+        self.show_details = show_details
+
+    def emit(self, event: ProgressEvent) -> None:
+        super().emit(event)
+        try:
+            import streamlit as st
+        except ImportError:
+            return
+        try:
+            if event.kind == "progress":
+                (self.placeholder or st).info(event.message)
+            elif event.kind == "detail":
+                if self.show_details:
+                    st.caption(event.message)
+                    if event.data:
+                        st.json(event.data)
+            else:
+                getattr(st, event.kind)(event.message)
+        except Exception:
+            # 스크립트 컨텍스트 밖(스레드 등)에서는 로그만 남긴다
+            pass
+
+
+_current: ContextVar[Optional[ProgressReporter]] = ContextVar("progress_reporter", default=None)
+
+
+def get_reporter(source: str = "") -> ProgressReporter:
+    """현재 컨텍스트의 리포터 (없으면 로그 전용)."""
+    reporter = _current.get()
+    if reporter is None:
+        return ProgressReporter(source)
+    return reporter.child(source) if source else reporter
+
+
+@contextmanager
+def use_reporter(reporter: ProgressReporter):
+    token = _current.set(reporter)
+    try:
+        yield reporter
+    finally:
+        _current.reset(token)
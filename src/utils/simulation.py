@@ -0,0 +1,54 @@
+"""로컬 시뮬레이션 렌더 (크레딧 소진 없음).
+
+선택 이미지를 1080x1920 으로 cover 크롭한 뒤 약한 줌인 모션으로 인코딩한다.
+드라이런 흐름과 ``simulation`` 엔진이 같이 쓴다.
+"""
+
+import os
+import time
+from typing import TYPE_CHECKING
+
+from .faststart import ensure_faststart
+from .metrics import record_render
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+
+def cover_resize(image: "Image.Image", target_width: int = 1080, target_height: int = 1920) -> "Image.Image":
+    """비율을 유지해 목표 크기를 덮도록 확대한 뒤 가운데를 자른다."""
+    from PIL import Image
+
+    W, H = image.size
+    scale = max(target_width / W, target_height / H)
+    new = image.resize((int(W * scale), int(H * scale)), Image.LANCZOS)
+    nw, nh = new.size
+    left, top = (nw - target_width) // 2, (nh - target_height) // 2
+    return new.crop((left, top, left + target_width, top + target_height))
+
+
+def render_simulation(image: "Image.Image", output_path: str, duration: float = 5, fps: int = 30,
+                      width: int = 1080, height: int = 1920) -> str:
+    import cv2
+    import numpy as np
+
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    t0 = time.perf_counter()
+    base = cover_resize(image.convert("RGB"), target_width=width, target_height=height)
+    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+    writer = cv2.VideoWriter(output_path, fourcc, float(fps), (width, height))
+    total_frames = max(1, int(duration * fps))
+    base_np = cv2.cvtColor(np.array(base), cv2.COLOR_RGB2BGR)
+    # 아주 약한 줌인 모션
+    for i in range(total_frames):
+        t = i / max(1, total_frames - 1)
+        scale = 1.0 + 0.04 * t
+        sw, sh = int(width * scale), int(height * scale)
+        frame = cv2.resize(base_np, (sw, sh), interpolation=cv2.INTER_LANCZOS4)
+        x1 = (sw - width) // 2
+        y1 = (sh - height) // 2
+        writer.write(frame[y1:y1 + height, x1:x1 + width])
+    writer.release()
+    record_render("simulation", total_frames, time.perf_counter() - t0)
+    ensure_faststart(output_path)
+    return output_path
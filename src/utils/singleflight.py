@@ -0,0 +1,144 @@
+"""단일 비행(single-flight): 같은 키의 동시 호출을 진행 중인 호출 하나에 붙인다.
+
+먼저 들어온 호출(리더)만 실제로 실행하고, 그 사이 같은 키로 들어온 호출(팔로워)은
+리더가 끝날 때까지 기다렸다가 같은 결과(또는 같은 예외)를 받는다.
+끝난 호출은 바로 잊는다 — 결과 캐시가 아니라 중복 실행 방지다.
+
+- 붙은 호출 수는 ``coalesced_requests{flight=...}`` 로 센다
+- ``fan_out`` 을 주면 리더가 결과를 풀기 전에 팔로워마다 ``fan_out(결과, join)`` 을 불러
+  팔로워 몫을 만든다 (리더 쪽 파일이 지워지기 전에 팔로워 경로로 복사하는 용도)
+- 키는 ``fingerprint(...)`` 로 만든다 (정렬된 JSON 의 sha256, bytes 는 내용 해시)
+"""
+
+import hashlib
+import json
+import threading
+from typing import Any, Callable, Dict, Generic, List, Optional, Tuple, TypeVar
+
+from .metrics import COALESCED_REQUESTS
+
+
+T = TypeVar("T")
+
+
+def _canonical(value: Any) -> Any:
+    if isinstance(value, (bytes, bytearray)):
+        return {"sha256": hashlib.sha256(value).hexdigest()}
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return repr(value)
+
+
+def fingerprint(*parts: Any, **fields: Any) -> str:
+    """요청을 정규화한 지문 (키 순서/튜플·리스트 차이 무시)."""
+    payload = json.dumps([_canonical(list(parts)), _canonical(fields)], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def file_digest(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """파일 내용 sha256 (같은 이미지가 다른 경로로 들어와도 같은 지문이 되도록)."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class _Share:
+    __slots__ = ("join", "value", "error")
+
+    def __init__(self, join: Any) -> None:
+        self.join = join
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class _Call(Generic[T]):
+    __slots__ = ("done", "value", "error", "followers", "fan_out", "shares", "closed")
+
+    def __init__(self, fan_out: Optional[Callable[[T, Any], T]] = None) -> None:
+        self.done = threading.Event()
+        self.value: Optional[T] = None
+        self.error: Optional[BaseException] = None
+        self.followers = 0
+        self.fan_out = fan_out
+        self.shares: List[_Share] = []
+        self.closed = False  # 리더가 팔로워 몫을 나누는 중 (더는 빠질 수 없음)
+
+
+class SingleFlight(Generic[T]):
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._calls: Dict[str, _Call[T]] = {}
+        self._lock = threading.Lock()
+
+    def do(
+        self,
+        key: str,
+        fn: Callable[[], T],
+        cancel: Optional[threading.Event] = None,
+        join: Any = None,
+        fan_out: Optional[Callable[[T, Any], T]] = None,
+    ) -> Tuple[T, bool]:
+        """``fn()`` 결과와 공유 여부(팔로워였으면 True).
+
+        팔로워는 ``cancel`` 이 켜지면 리더를 건드리지 않고 자기만 빠진다
+        (``InterruptedError``). 리더 쪽 취소는 호출자가 판단한다.
+        리더가 ``fan_out`` 을 줬으면 팔로워는 리더 결과 대신 ``fan_out(결과, join)`` 을 받는다
+        (그 예외도 해당 팔로워에게만 간다).
+        """
+        share: Optional[_Share] = None
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call(fan_out)
+            else:
+                call.followers += 1
+                if call.fan_out is not None:
+                    share = _Share(join)
+                    call.shares.append(share)
+        if not leader:
+            COALESCED_REQUESTS.inc(flight=self.name)
+            while not call.done.is_set():
+                if cancel is not None and cancel.is_set():
+                    with self._lock:
+                        if not call.closed:
+                            if share is not None:
+                                call.shares.remove(share)
+                            raise InterruptedError(f"{self.name}: 대기 중 취소됨")
+                    # 리더가 이미 몫을 나누는 중 — 곧 끝난다
+                call.done.wait(0.1)
+            if call.error is not None:
+                raise call.error
+            if share is not None:
+                if share.error is not None:
+                    raise share.error
+                return share.value, True
+            return call.value, True
+        try:
+            call.value = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+                call.closed = True
+                shares = list(call.shares)
+            if call.error is None:
+                for s in shares:
+                    try:
+                        s.value = call.fan_out(call.value, s.join)
+                    except Exception as e:
+                        s.error = e
+            call.done.set()
+        return call.value, False
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
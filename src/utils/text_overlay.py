@@ -0,0 +1,365 @@
+"""정적 카피 텍스트 오버레이: 한 번 래스터화한 RGBA 레이어를 프레임마다 합성.
+
+예전에는 ASS 파일을 만들어 ``ffmpeg -vf subtitles=`` 로 태웠다. libass 가 같은 문구를 프레임마다
+다시 셰이핑/래스터화하고, 스타일의 ``AppleSDGothicNeo`` 는 리눅스 컨테이너에 없다.
+
+- ``rasterize``: 미리보기와 같은 박스/테두리 규칙으로 문구를 한 번 그려 알파가 곱해진(premultiplied)
+  RGBA 레이어(내용이 있는 영역만)를 만든다. 미리보기(``preview_text_overlay``)와 영상이 같은 레이어를
+  같은 합성식(``TextLayer.composite``)으로 쓰므로 픽셀 단위로 같다
+- 영상 합성 ``TEXT_OVERLAY_MODE``: ``ffmpeg`` (레이어 PNG + ``overlay`` 필터, 오디오 복사),
+  ``blend`` (OpenCV 로 디코딩해 프로세스 안에서 합성, 오디오 없음), ``auto`` (기본, ffmpeg 가 있으면 ffmpeg)
+- 시간 지정(``start``/``end``)이나 애니메이션(``animation="fade"``)이 있는 문구만 자막(ASS)으로 태운다
+
+글자 크기/테두리/여백은 세로 ``REFERENCE_HEIGHT`` (1280, 예전 ASS ``PlayResY``) 기준 값이고
+프레임 높이에 맞춰 늘린다. 폰트는 미리보기/자막 모두 ``src.utils.fonts`` 레지스트리에서 문구에 맞춰 고른다.
+"""
+
+import logging
+import os
+import shutil
+import subprocess
+import time
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+from .faststart import FASTSTART_FLAGS, ensure_faststart
+from .fonts import get_registry
+from .metrics import record_render
+from .workspace import workspace
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+TEXT_OVERLAY_MODE = os.getenv("TEXT_OVERLAY_MODE", "auto")
+MODES = ("auto", "ffmpeg", "blend")
+REFERENCE_HEIGHT = 1280
+
+
+@dataclass(frozen=True)
+class OverlayStyle:
+    font_size: int = 64
+    font_color: str = "white"
+    border_width: int = 3
+    border_color: str = "black"
+    position: str = "top"  # top | middle | bottom
+    bg_opacity: float = 0.4
+    margin: int = 80  # 위/아래 가장자리에서 문구까지
+    padding: int = 20  # 배경 박스 안쪽 여백
+    line_gap: int = 8
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any]) -> "OverlayStyle":
+        """UI 텍스트 설정 → 기준 높이(1280) 스타일. ``auto_scale`` 이면 ``font_scale_pct`` (높이 대비 %)."""
+        auto_scale = bool(settings.get("auto_scale", False))
+        pct = settings.get("font_scale_pct")
+        if auto_scale and isinstance(pct, (int, float)):
+            font_size = max(24, int(REFERENCE_HEIGHT * float(pct) / 100.0))
+        else:
+            font_size = int(settings.get("font_size", 64))
+        border_width = max(2, int(font_size * 0.06)) if auto_scale else int(settings.get("border_width", 3))
+        return cls(
+            font_size=font_size,
+            font_color=settings.get("font_color", "white"),
+            border_width=border_width,
+            border_color=settings.get("border_color", "black"),
+            position=settings.get("position", "top"),
+            bg_opacity=float(settings.get("bg_opacity", 0.4)),
+        )
+
+    def for_height(self, height: int) -> "OverlayStyle":
+        """기준 높이 값 → ``height`` 프레임의 픽셀 값."""
+        k = height / REFERENCE_HEIGHT
+        if k == 1:
+            return self
+        return replace(
+            self,
+            font_size=max(1, round(self.font_size * k)),
+            border_width=round(self.border_width * k),
+            margin=round(self.margin * k),
+            padding=round(self.padding * k),
+            line_gap=round(self.line_gap * k),
+        )
+
+
+@dataclass
+class TextLayer:
+    """프레임 위 ``(x, y)`` 에 놓일 RGBA 레이어. 색은 알파가 곱해진 값 (premultiplied)."""
+
+    x: int
+    y: int
+    rgba: "np.ndarray"  # (h, w, 4) uint8
+
+    def __post_init__(self) -> None:
+        import numpy as np
+
+        self._color = self.rgba[..., :3].astype(np.uint16)
+        self._inv = (255 - self.rgba[..., 3:]).astype(np.uint16)
+
+    @property
+    def empty(self) -> bool:
+        return self.rgba.size == 0
+
+    def bgr(self) -> "TextLayer":
+        """OpenCV(BGR) 프레임용."""
+        return TextLayer(self.x, self.y, self.rgba[..., [2, 1, 0, 3]])
+
+    def composite(self, frame: "np.ndarray") -> "np.ndarray":
+        """``frame`` (H, W, 3 uint8) 에 제자리 합성: ``out = color + frame * (1 - alpha)``."""
+        import numpy as np
+
+        if self.empty:
+            return frame
+        h, w = self.rgba.shape[:2]
+        roi = frame[self.y:self.y + h, self.x:self.x + w]
+        mixed = self._color + (roi.astype(np.uint16) * self._inv + 127) // 255
+        np.minimum(mixed, 255, out=mixed)
+        roi[:] = mixed
+        return frame
+
+    def straight_rgba(self) -> "np.ndarray":
+        """PNG 용 (알파를 곱하지 않은 값)."""
+        import numpy as np
+
+        alpha = self.rgba[..., 3:].astype(np.float32)
+        color = np.where(alpha > 0, self.rgba[..., :3] * 255.0 / np.maximum(alpha, 1), 0)
+        return np.concatenate([np.clip(np.rint(color), 0, 255).astype(np.uint8), self.rgba[..., 3:]], axis=2)
+
+
+def _rgb(color: Any) -> "np.ndarray":
+    import numpy as np
+    from PIL import ImageColor
+
+    if isinstance(color, (tuple, list)):
+        return np.array(color[:3], np.float32)
+    return np.array(ImageColor.getrgb(color)[:3], np.float32)
+
+
+def rasterize(size: Tuple[int, int], text: str, style: OverlayStyle) -> TextLayer:
+    """``size`` (W, H) 프레임용 레이어. 박스/테두리 규칙은 예전 미리보기와 같다."""
+    import numpy as np
+    from PIL import Image, ImageDraw
+
+    W, H = size
+    if not text.strip():
+        return TextLayer(0, 0, np.zeros((0, 0, 4), np.uint8))
+    font = get_registry().font(style.font_size, text)
+    lines = text.split("\n")
+    line_height = style.font_size + style.line_gap
+    total_height = len(lines) * line_height
+    if style.position == "top":
+        y_start = style.margin
+    elif style.position == "middle":
+        y_start = (H - total_height) // 2
+    else:  # bottom
+        y_start = H - total_height - style.margin
+
+    box = Image.new("L", size, 0)
+    border = Image.new("L", size, 0)
+    glyphs = Image.new("L", size, 0)
+    draw_border, draw_text = ImageDraw.Draw(border), ImageDraw.Draw(glyphs)
+    max_width = max(draw_text.textlength(line, font=font) for line in lines)
+    ImageDraw.Draw(box).rectangle(
+        [(W - max_width) // 2 - style.padding, y_start - style.padding,
+         (W + max_width) // 2 + style.padding, y_start + total_height + style.padding],
+        fill=int(255 * style.bg_opacity),
+    )
+    bw = style.border_width
+    for i, line in enumerate(lines):
+        y = y_start + i * line_height
+        x = (W - draw_text.textlength(line, font=font)) // 2
+        if bw:
+            for dx in (-bw, 0, bw):
+                for dy in (-bw, 0, bw):
+                    if dx or dy:
+                        draw_border.text((x + dx, y + dy), line, font=font, fill=255)
+        draw_text.text((x, y), line, font=font, fill=255)
+
+    boxes = [b for b in (box.getbbox(), border.getbbox(), glyphs.getbbox()) if b]
+    if not boxes:
+        return TextLayer(0, 0, np.zeros((0, 0, 4), np.uint8))
+    x0, y0 = min(b[0] for b in boxes), min(b[1] for b in boxes)
+    x1, y1 = max(b[2] for b in boxes), max(b[3] for b in boxes)
+
+    # 박스 → 테두리 → 글자 순으로 "over" (알파가 곱해진 색으로 누적, 내용이 있는 영역만)
+    color = np.zeros((y1 - y0, x1 - x0, 3), np.float32)
+    alpha = np.zeros((y1 - y0, x1 - x0, 1), np.float32)
+    for mask, rgb in ((box, _rgb("black")), (border, _rgb(style.border_color)), (glyphs, _rgb(style.font_color))):
+        m = np.asarray(mask.crop((x0, y0, x1, y1)), np.float32)[..., None] / 255.0
+        color = rgb * m + color * (1 - m)
+        alpha = m + alpha * (1 - m)
+    rgba = np.concatenate([color, alpha * 255.0], axis=2)
+    return TextLayer(x0, y0, np.clip(np.rint(rgba), 0, 255).astype(np.uint8))
+
+
+def render_preview(image, text: str, style: OverlayStyle):
+    """PIL 이미지 위 미리보기 (영상과 같은 레이어/합성식)."""
+    import numpy as np
+    from PIL import Image
+
+    frame = np.array(image.convert("RGB"))
+    rasterize(image.size, text, style).composite(frame)
+    return Image.fromarray(frame)
+
+
+def preview_text_overlay(image, settings: Dict[str, Any]):
+    """UI 텍스트 설정 그대로의 미리보기 — 같은 크기 영상의 ``overlay_text`` 결과와 픽셀 단위로 같다."""
+    copy_text = settings.get("copy", "")
+    if not copy_text:
+        return image
+    return render_preview(image, copy_text, OverlayStyle.from_settings(settings).for_height(image.size[1]))
+
+
+def _probe(path: str) -> Tuple[int, int, float, int]:
+    import cv2
+
+    cap = cv2.VideoCapture(path)
+    try:
+        if not cap.isOpened():
+            raise RuntimeError(f"영상을 열 수 없습니다: {path}")
+        return (
+            int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            cap.get(cv2.CAP_PROP_FPS) or 30.0,
+            int(cap.get(cv2.CAP_PROP_FRAME_COUNT)),
+        )
+    finally:
+        cap.release()
+
+
+def _timed(settings: Dict[str, Any]) -> bool:
+    return any(settings.get(k) not in (None, "") for k in ("start", "end", "animation"))
+
+
+def overlay_text(video_path: str, settings: Dict[str, Any], output_path: str, mode: Optional[str] = None) -> str:
+    """``settings["copy"]`` 를 영상에 입힌다. 문구가 없으면 ``video_path`` 그대로."""
+    copy_text = settings.get("copy", "")
+    if not copy_text:
+        return video_path
+    mode = mode or TEXT_OVERLAY_MODE
+    if mode not in MODES:
+        raise ValueError(f"알 수 없는 오버레이 모드: {mode} (가능: {', '.join(MODES)})")
+    ffmpeg = shutil.which("ffmpeg")
+    style = OverlayStyle.from_settings(settings)
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    if _timed(settings):
+        if not ffmpeg:
+            raise RuntimeError("시간 지정/애니메이션 문구는 ffmpeg(subtitles)가 필요합니다")
+        return burn_subtitles(video_path, copy_text, style, output_path, settings, ffmpeg)
+
+    width, height, fps, frames = _probe(video_path)
+    t0 = time.perf_counter()
+    layer = rasterize((width, height), copy_text, style.for_height(height))
+    if mode == "ffmpeg" or (mode == "auto" and ffmpeg):
+        if not ffmpeg:
+            raise RuntimeError("ffmpeg 가 없습니다 (TEXT_OVERLAY_MODE=blend 로 프로세스 안에서 합성)")
+        _overlay_ffmpeg(video_path, layer, output_path, ffmpeg)
+    else:
+        frames = blend_video(video_path, layer, output_path, fps)
+    record_render("text_overlay", frames, time.perf_counter() - t0)
+    return output_path
+
+
+def _overlay_ffmpeg(video_path: str, layer: TextLayer, output_path: str, ffmpeg: str) -> None:
+    from PIL import Image
+
+    if layer.empty:
+        shutil.copyfile(video_path, output_path)
+        return
+    with workspace("text-overlay") as ws:
+        png = ws.path("overlay.png")
+        Image.fromarray(layer.straight_rgba(), "RGBA").save(png)
+        ws.track(png)
+        # 두 번째 입력(이미지 한 장)은 끝나면 마지막 프레임을 계속 쓴다 (eof_action=repeat)
+        cmd = [
+            ffmpeg, '-y', '-loglevel', 'error',
+            '-i', video_path,
+            '-i', png,
+            '-filter_complex', f"[0:v][1:v]overlay={layer.x}:{layer.y}",
+            '-c:a', 'copy',
+            '-preset', 'fast',
+            *FASTSTART_FLAGS,
+            output_path,
+        ]
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=120)
+    if result.returncode != 0:
+        raise RuntimeError(f"FFmpeg 오류: {result.stderr}")
+
+
+def blend_video(video_path: str, layer: TextLayer, output_path: str, fps: Optional[float] = None) -> int:
+    """OpenCV 로 디코딩 → 합성 → mp4v 인코딩. 오디오 트랙은 옮기지 않는다. 처리한 프레임 수."""
+    import cv2
+
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise RuntimeError(f"영상을 열 수 없습니다: {video_path}")
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    writer = cv2.VideoWriter(output_path, cv2.VideoWriter_fourcc(*'mp4v'), float(fps or cap.get(cv2.CAP_PROP_FPS) or 30.0), (width, height))
+    bgr = layer.bgr()
+    frames = 0
+    try:
+        while True:
+            ok, frame = cap.read()
+            if not ok:
+                break
+            writer.write(bgr.composite(frame))
+            frames += 1
+    finally:
+        cap.release()
+        writer.release()
+    ensure_faststart(output_path)
+    return frames
+
+
+def _ass_time(seconds: float) -> str:
+    cs = int(round(max(0.0, seconds) * 100))
+    return f"{cs // 360000}:{cs // 6000 % 60:02d}:{cs // 100 % 60:02d}.{cs % 100:02d}"
+
+
+def burn_subtitles(
+    video_path: str, text: str, style: OverlayStyle, output_path: str, settings: Dict[str, Any], ffmpeg: str = "ffmpeg",
+) -> str:
+    """시간 지정/애니메이션 문구용 ASS 자막 (libass). 폰트는 미리보기와 같은 레지스트리 페이스."""
+    face = get_registry().find(text)
+    family = face.family if face else "Sans"
+    fonts_dir = face.fonts_dir if face else ""
+    alignment = {"top": 8, "middle": 5}.get(style.position, 2)
+    margin_v = 0 if style.position == "middle" else style.margin
+    start = float(settings.get("start") or 0.0)
+    end = float(settings.get("end") or 0.0) or start + 3600.0
+    effect = r"{\fad(300,300)}" if settings.get("animation") == "fade" else ""
+    back = f"&H{int(255 * (1 - style.bg_opacity)):02X}000000"
+    formatted = text.replace('\n', '\\N')
+    content = f"""[Script Info]
+; Script generated by Marketing Video Generator
+ScriptType: v4.00+
+PlayResX: 720
+PlayResY: {REFERENCE_HEIGHT}
+
+[V4+ Styles]
+Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding
+Style: Default,{family},{style.font_size},&H00FFFFFF,&H000000FF,&H00000000,{back},0,0,0,0,100,100,0,0,1,{style.border_width},0,{alignment},60,60,{margin_v},1
+
+[Events]
+Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
+Dialogue: 0,{_ass_time(start)},{_ass_time(end)},Default,,0,0,0,,{effect}{formatted}"""
+    with workspace("text-subtitles") as ws:
+        ass_file = ws.path("overlay.ass")
+        with open(ass_file, 'w', encoding='utf-8') as f:
+            f.write(content)
+        vf = f"subtitles={ass_file}" + (f":fontsdir={fonts_dir}" if fonts_dir else "")
+        cmd = [
+            ffmpeg, '-y',
+            '-i', video_path,
+            '-vf', vf,
+            '-c:a', 'copy',
+            '-preset', 'fast',
+            *FASTSTART_FLAGS,
+            output_path,
+        ]
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=120)
+    if result.returncode != 0:
+        raise RuntimeError(f"FFmpeg 오류: {result.stderr}")
+    return output_path
@@ -0,0 +1,194 @@
+"""경량 트레이싱.
+
+중첩 스팬(product → stage → vendor call/poll/download/encode)을
+``perf_counter`` 로 측정하고 JSONL 로 내보낸다.
+
+- 인자 repr 대신 스칼라 속성만 저장 (이미지 → 크기, 리스트 → 길이)
+- 루트 스팬에서 샘플링을 결정하고 자식은 따라간다
+- 내보내기는 버퍼링 후 일괄 기록
+"""
+
+import atexit
+import functools
+import inspect
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional
+
+
+TRACE_FILE = os.getenv("TRACE_FILE", os.path.join("logs", "traces.jsonl"))
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "1.0"))
+_MAX_STR = 200
+
+
+def cheap_value(value: Any) -> Any:
+    """repr 없이 싸게 요약한 속성값."""
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, str):
+        return value if len(value) <= _MAX_STR else value[:_MAX_STR] + "..."
+    size = getattr(value, "size", None)
+    if isinstance(size, tuple) and len(size) == 2:  # PIL.Image
+        return f"{type(value).__name__}({size[0]}x{size[1]})"
+    shape = getattr(value, "shape", None)
+    if isinstance(shape, tuple):  # numpy
+        return f"{type(value).__name__}{shape}"
+    if isinstance(value, (list, tuple, dict, set)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+class Span:
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "sampled", "attrs", "status", "_t0", "_wall")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], sampled: bool) -> None:
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16] if sampled else ""
+        self.parent_id = parent_id
+        self.sampled = sampled
+        self.attrs: Dict[str, Any] = {}
+        self.status = "ok"
+        self._t0 = time.perf_counter()
+        self._wall = time.time()
+
+    def set(self, **attrs: Any) -> "Span":
+        if self.sampled:
+            for k, v in attrs.items():
+                self.attrs[k] = cheap_value(v)
+        return self
+
+    def to_record(self, duration_ms: float) -> Dict[str, Any]:
+        return {
+            "ts": round(self._wall, 6),
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "duration_ms": round(duration_ms, 3),
+            "status": self.status,
+            "attrs": self.attrs,
+        }
+
+
+class JsonlExporter:
+    """스팬 레코드를 모아 JSONL 파일에 덧붙인다."""
+
+    def __init__(self, path: str, flush_every: int = 64) -> None:
+        self.path = path
+        self.flush_every = flush_every
+        self._buf: List[str] = []
+        self._lock = threading.Lock()
+
+    def export(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            self._buf.append(line)
+            if len(self._buf) < self.flush_every:
+                return
+            lines, self._buf = self._buf, []
+        self._write(lines)
+
+    def flush(self) -> None:
+        with self._lock:
+            lines, self._buf = self._buf, []
+        self._write(lines)
+
+    def _write(self, lines: List[str]) -> None:
+        if not lines:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+
+_current: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+class Tracer:
+    def __init__(self, exporter: Optional[JsonlExporter] = None, sample_rate: float = TRACE_SAMPLE_RATE) -> None:
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+        self._listeners: List[Callable[[str, float, str], None]] = []
+
+    def add_listener(self, fn: Callable[[str, float, str], None]) -> None:
+        """스팬 종료 시 (이름, 초, 상태) 로 호출된다. 샘플링과 무관."""
+        self._listeners.append(fn)
+
+    @contextmanager
+    def span(self, name: str, **attrs: Any):
+        parent = _current.get()
+        if parent is None:
+            sampled = self.exporter is not None and random.random() < self.sample_rate
+            span = Span(name, uuid.uuid4().hex if sampled else "", None, sampled)
+        else:
+            span = Span(name, parent.trace_id, parent.span_id or None, parent.sampled)
+        span.set(**attrs)
+        token = _current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = "error"
+            span.set(error=type(e).__name__)
+            raise
+        finally:
+            _current.reset(token)
+            duration_s = time.perf_counter() - span._t0
+            for fn in self._listeners:
+                fn(span.name, duration_s, span.status)
+            if span.sampled and self.exporter is not None:
+                self.exporter.export(span.to_record(duration_s * 1000.0))
+
+    def traced(self, name: Optional[str] = None, **static_attrs: Any):
+        """함수 호출을 스팬으로 감싼다. 인자는 기록하지 않는다. ``async def`` 는 await 가 끝날 때까지 잰다."""
+
+        def _decorator(func):
+            span_name = name or func.__name__
+
+            if inspect.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def _async_wrapper(*args, **kwargs):
+                    with self.span(span_name, **static_attrs):
+                        return await func(*args, **kwargs)
+
+                return _async_wrapper
+
+            @functools.wraps(func)
+            def _wrapper(*args, **kwargs):
+                with self.span(span_name, **static_attrs):
+                    return func(*args, **kwargs)
+
+            return _wrapper
+
+        return _decorator
+
+    def flush(self) -> None:
+        if self.exporter is not None:
+            self.exporter.flush()
+
+
+_tracer = Tracer(JsonlExporter(TRACE_FILE) if TRACE_SAMPLE_RATE > 0 else None)
+atexit.register(_tracer.flush)
+
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+
+def span(name: str, **attrs: Any):
+    """``with span("vendor.runway.poll", task_id=...) as s:`` 형태로 사용."""
+    return _tracer.span(name, **attrs)
+
+
+def traced(name: Optional[str] = None, **static_attrs: Any):
+    return _tracer.traced(name, **static_attrs)
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
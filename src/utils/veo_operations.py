@@ -0,0 +1,75 @@
+"""Veo 작업 여러 개/여러 편 다루기 (엔진, ``SmartVideoGenerator``, 실험용 생성기 공용).
+
+엔진 모듈(``src.engines.veo``)을 불러오지 않고 쓸 수 있도록 따로 둔다.
+Gemini API 는 seed 를 받지 않아 seed 는 Vertex 클라이언트일 때만 작업마다 하나씩 올려 보낸다.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional, Sequence, Tuple
+
+from src.engines.base import variant_paths
+from src.utils.download import save_generated_video
+
+# 작업 하나에 요청할 수 있는 영상 수 (모델 이름 앞부분 기준, 없으면 1)
+_MAX_VIDEOS = {"veo-2": 2}
+VEO_MAX_VIDEOS_PER_OPERATION = int(os.getenv("VEO_MAX_VIDEOS_PER_OPERATION", "0"))  # 0 = 모델별 기본값
+VEO_MAX_VARIANTS = int(os.getenv("VEO_MAX_VARIANTS", "8"))
+
+
+def max_videos_per_operation(model: str) -> int:
+    if VEO_MAX_VIDEOS_PER_OPERATION > 0:
+        return VEO_MAX_VIDEOS_PER_OPERATION
+    return next((n for prefix, n in _MAX_VIDEOS.items() if model.startswith(prefix)), 1)
+
+
+def plan_operations(prompts: Sequence[str], n: int, per_operation: int) -> List[Tuple[str, int]]:
+    """변형 n 편 → ``[(프롬프트, 편수)]``. i 번째 변형은 ``prompts[i % len]`` 을 쓴다."""
+    if n > VEO_MAX_VARIANTS:
+        raise ValueError(f"variants 는 최대 {VEO_MAX_VARIANTS} 입니다: {n}")
+    counts: dict = {}
+    for i in range(n):
+        prompt = prompts[i % len(prompts)] if prompts else ""
+        counts[prompt] = counts.get(prompt, 0) + 1
+    plan: List[Tuple[str, int]] = []
+    for prompt, count in counts.items():
+        while count > 0:
+            plan.append((prompt, min(count, per_operation)))
+            count -= per_operation
+    return plan
+
+
+def submit_operations(client, model: str, plan: Sequence[Tuple[str, int]], image=None, seed: Optional[int] = None, **config) -> list:
+    """계획대로 작업을 제출한다 (제출은 금방 끝나서 차례로, 벤더 제출 한도를 한꺼번에 쓰지 않도록)."""
+    from google.genai import types
+
+    operations = []
+    for k, (prompt, count) in enumerate(plan):
+        operations.append(client.models.generate_videos(
+            model=model,
+            prompt=prompt,
+            image=image,
+            config=types.GenerateVideosConfig(
+                number_of_videos=count if count > 1 else None,
+                seed=seed + k if seed is not None and client.vertexai else None,
+                **config,
+            ),
+        ))
+    return operations
+
+
+def refresh_operations(client, operations: Sequence[Any]) -> list:
+    return [op if op.done else client.operations.get(op) for op in operations]
+
+
+def generated_videos(operations: Sequence[Any]) -> list:
+    return [v for op in operations for v in (getattr(getattr(op, "response", None), "generated_videos", None) or [])]
+
+
+def save_variants(client, videos: Sequence[Any], output_path: str) -> List[str]:
+    """생성 결과를 ``variant_paths`` 로 동시에 내려받는다."""
+    paths = variant_paths(output_path, len(videos))
+    if len(videos) == 1:
+        return [save_generated_video(client, videos[0], output_path)]
+    with ThreadPoolExecutor(max_workers=len(videos), thread_name_prefix="veo-download") as pool:
+        return list(pool.map(lambda vp: save_generated_video(client, *vp), zip(videos, paths)))
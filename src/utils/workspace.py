@@ -0,0 +1,212 @@
+"""작업별 스크래치 작업 공간 (tmpfs 우선, 용량 한도, 정리 보장).
+
+중간 프레임/레이어/입력 이미지처럼 결과물이 아닌 파일은 작업마다 격리된 디렉터리에 쓴다.
+기본 위치는 ``/dev/shm`` (RAM tmpfs — 프레임 PNG 수백 장을 디스크에 쓰지 않는다)이고,
+없거나 여유가 모자라면 디스크 임시 디렉터리로 내려간다.
+
+- ``with workspace("job-123") as ws:`` → ``ws.path("frame_00001.png")``
+- 블록을 벗어나면 (예외 포함) 디렉터리째 삭제, 정상 종료 시 남은 것은 ``atexit`` 가 삭제
+- 안쪽에서 다시 ``workspace()`` 를 열면 바깥 작업 공간의 하위 디렉터리가 되고 용량 한도를 공유한다
+  (생성 서비스 작업 → 로컬 렌더러)
+- 파일을 쓴 뒤 ``ws.track(path)`` 로 사용량을 더하고, 한도를 넘으면 ``WorkspaceQuotaExceeded``
+- 프로세스가 죽어 남은 디렉터리는 기동 시 ``sweep_orphans()`` 가 지운다
+  (디렉터리 이름의 소유 PID 가 없거나 ``WORKSPACE_MAX_AGE_S`` 보다 오래된 것)
+
+설정: ``WORKSPACE_ROOT`` (tmpfs 경로, 기본 ``/dev/shm``), ``WORKSPACE_DISK_ROOT`` (기본 시스템 임시 디렉터리),
+``WORKSPACE_QUOTA_MB`` (작업당, 기본 2048), ``WORKSPACE_MIN_FREE_MB`` (tmpfs 에 예상 사용량 + 이만큼
+여유가 없으면 디스크, 기본 256), ``WORKSPACE_MAX_AGE_S`` (기본 86400).
+"""
+
+import atexit
+import contextvars
+import logging
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator, Optional, Set, Tuple
+
+from .metrics import SCRATCH_BYTES, SCRATCH_SWEPT, SCRATCH_WORKSPACES
+
+
+logger = logging.getLogger(__name__)
+
+DIRNAME = "display-ads-scratch"
+TMPFS_ROOT = os.getenv("WORKSPACE_ROOT") or ("/dev/shm" if os.path.isdir("/dev/shm") else "")
+DISK_ROOT = os.getenv("WORKSPACE_DISK_ROOT") or tempfile.gettempdir()
+QUOTA_BYTES = int(float(os.getenv("WORKSPACE_QUOTA_MB", "2048")) * 1024 * 1024)
+MIN_FREE_BYTES = int(float(os.getenv("WORKSPACE_MIN_FREE_MB", "256")) * 1024 * 1024)
+MAX_AGE_S = float(os.getenv("WORKSPACE_MAX_AGE_S", "86400"))
+
+_CURRENT: contextvars.ContextVar[Optional["Workspace"]] = contextvars.ContextVar("workspace", default=None)
+_LIVE: Set[str] = set()
+_LIVE_LOCK = threading.Lock()
+
+
+class WorkspaceQuotaExceeded(RuntimeError):
+    """작업 공간 용량 한도 초과."""
+
+
+@dataclass
+class Workspace:
+    root: str
+    medium: str  # "tmpfs" | "disk"
+    quota_bytes: int
+    parent: Optional["Workspace"] = None
+    used_bytes: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def path(self, name: str) -> str:
+        """작업 공간 안의 파일 경로 (하위 디렉터리는 만들어 둔다)."""
+        path = os.path.join(self.root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return path
+
+    def track(self, *paths: str) -> int:
+        """쓴 파일 크기를 사용량에 더한다. 한도를 넘으면 ``WorkspaceQuotaExceeded``."""
+        size = sum(os.path.getsize(p) for p in paths)
+        self._account(size)
+        SCRATCH_BYTES.inc(size, medium=self.medium)
+        return size
+
+    def _account(self, size: int) -> None:
+        ws: Optional[Workspace] = self
+        while ws is not None:
+            with ws._lock:
+                ws.used_bytes += size
+                over = ws.parent is None and ws.used_bytes > ws.quota_bytes
+            if over:
+                raise WorkspaceQuotaExceeded(
+                    f"작업 공간 용량 초과: {ws.used_bytes / 1024 / 1024:.1f}MB > {ws.quota_bytes / 1024 / 1024:.0f}MB ({ws.root})"
+                )
+            ws = ws.parent
+
+    def usage(self) -> int:
+        """디렉터리의 실제 사용량 (바이트)."""
+        total = 0
+        for dirpath, _, files in os.walk(self.root):
+            for f in files:
+                try:
+                    total += os.path.getsize(os.path.join(dirpath, f))
+                except OSError:
+                    pass
+        return total
+
+
+def _safe(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", name)[:40] or "job"
+
+
+def _roots() -> Tuple[Optional[str], str]:
+    tmpfs = os.path.join(TMPFS_ROOT, DIRNAME) if TMPFS_ROOT else None
+    return tmpfs, os.path.join(DISK_ROOT, DIRNAME)
+
+
+def choose_root(expected_bytes: int = 0, prefer_tmpfs: bool = True) -> Tuple[str, str]:
+    """(기준 디렉터리, 매체). tmpfs 에 예상 사용량 + ``MIN_FREE_BYTES`` 여유가 있으면 tmpfs."""
+    tmpfs, disk = _roots()
+    if prefer_tmpfs and tmpfs:
+        try:
+            os.makedirs(tmpfs, exist_ok=True)
+            if os.access(tmpfs, os.W_OK) and shutil.disk_usage(tmpfs).free - expected_bytes >= MIN_FREE_BYTES:
+                return tmpfs, "tmpfs"
+        except OSError as e:
+            logger.debug("tmpfs 작업 공간 사용 불가 (%s): %s", tmpfs, e)
+    os.makedirs(disk, exist_ok=True)
+    return disk, "disk"
+
+
+def current_workspace() -> Optional[Workspace]:
+    return _CURRENT.get()
+
+
+@contextmanager
+def workspace(
+    name: str = "job", quota_bytes: Optional[int] = None, expected_bytes: int = 0, prefer_tmpfs: bool = True
+) -> Iterator[Workspace]:
+    """격리된 스크래치 디렉터리. 이미 열린 작업 공간이 있으면 그 하위에 만들고 한도를 공유한다."""
+    parent = _CURRENT.get()
+    if parent is not None:
+        ws = Workspace(tempfile.mkdtemp(prefix=f"{_safe(name)}-", dir=parent.root), parent.medium, parent.quota_bytes, parent)
+    else:
+        base, medium = choose_root(expected_bytes, prefer_tmpfs)
+        root = tempfile.mkdtemp(prefix=f"{os.getpid()}-{_safe(name)}-", dir=base)
+        ws = Workspace(root, medium, QUOTA_BYTES if quota_bytes is None else quota_bytes)
+        with _LIVE_LOCK:
+            _LIVE.add(root)
+        SCRATCH_WORKSPACES.inc(medium=medium)
+    token = _CURRENT.set(ws)
+    try:
+        yield ws
+    finally:
+        _CURRENT.reset(token)
+        shutil.rmtree(ws.root, ignore_errors=True)
+        if parent is not None:
+            # 하위 공간이 지워졌으니 바깥 사용량에서 뺀다
+            up = parent
+            while up is not None:
+                with up._lock:
+                    up.used_bytes -= ws.used_bytes
+                up = up.parent
+        else:
+            with _LIVE_LOCK:
+                _LIVE.discard(ws.root)
+            SCRATCH_WORKSPACES.dec(medium=ws.medium)
+
+
+def _pid_alive(pid: int) -> bool:
+    if os.name == "nt":
+        # Windows 의 os.kill(pid, 0) 은 프로세스를 종료시킨다 → 나이로만 판단
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def sweep_orphans(max_age_s: Optional[float] = None) -> int:
+    """죽은 프로세스가 남긴 (또는 ``max_age_s`` 보다 오래된) 작업 공간을 지운다. 지운 개수를 돌려준다."""
+    max_age_s = MAX_AGE_S if max_age_s is None else max_age_s
+    now = time.time()
+    removed = 0
+    for base in _roots():
+        if not base or not os.path.isdir(base):
+            continue
+        for entry in os.listdir(base):
+            path = os.path.join(base, entry)
+            with _LIVE_LOCK:
+                if path in _LIVE:
+                    continue
+            pid = entry.split("-", 1)[0]
+            try:
+                age = now - os.path.getmtime(path)
+            except OSError:
+                continue
+            if pid.isdigit() and not _pid_alive(int(pid)):
+                reason = "dead"
+            elif age > max_age_s:
+                reason = "stale"
+            else:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            SCRATCH_SWEPT.inc(reason=reason)
+            removed += 1
+    if removed:
+        logger.info("🧹 남은 작업 공간 %d개 정리", removed)
+    return removed
+
+
+@atexit.register
+def _cleanup_live() -> None:
+    with _LIVE_LOCK:
+        roots = list(_LIVE)
+        _LIVE.clear()
+    for root in roots:
+        shutil.rmtree(root, ignore_errors=True)
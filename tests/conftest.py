@@ -0,0 +1,61 @@
+"""
+공용 테스트 설정
+
+- 기록 파일(엔진 통계/메트릭 스냅샷/트레이스/앱 로그)은 저장소의 ``logs/`` 가 아니라 세션 임시 폴더로.
+  경로는 모듈 import 때 읽히므로 테스트 모듈보다 먼저 환경 변수를 둔다
+- ``sim``: 벤더 API 시뮬레이터. 설정이 다른 모듈은 ``sim_config`` 를 덮어 쓴다
+- ``test_engines``: ``test_engines(EngineClass, ...)`` 로 테스트 엔진을 등록하고 끝나면 해제한다
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+from contextlib import ExitStack
+
+import pytest
+
+_LOG_DIR = tempfile.mkdtemp(prefix="tests-logs-")
+for _name, _file in (
+    ("ENGINE_STATS_FILE", "engine_stats.jsonl"),
+    ("METRICS_FILE", "metrics.jsonl"),
+    ("TRACE_FILE", "traces.jsonl"),
+):
+    os.environ[_name] = os.path.join(_LOG_DIR, _file)
+os.environ["LOG_DIR"] = _LOG_DIR
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.engines import temp_engine
+from src.sim import SimConfig, serve
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _cleanup_log_dir():
+    yield
+    shutil.rmtree(_LOG_DIR, ignore_errors=True)
+
+
+@pytest.fixture
+def sim_config():
+    return SimConfig(queue_s=0.05, run_s=0.1, jitter=0.0, video_bytes=4096, seed=1)
+
+
+@pytest.fixture
+def sim(sim_config, monkeypatch):
+    """시뮬레이터를 띄우고 어댑터 환경 변수를 그쪽으로 돌린다 (끝나면 Gemini 입력 핸들도 정리)."""
+    from src.utils.clients import get_genai_client
+    from src.utils.gemini_assets import get_assets
+
+    server = serve(sim_config)
+    for key, value in server.env().items():
+        monkeypatch.setenv(key, value)
+    yield server
+    get_assets(get_genai_client("sim")).close()
+    server.stop()
+
+
+@pytest.fixture
+def test_engines():
+    with ExitStack() as stack:
+        yield lambda *classes: [stack.enter_context(temp_engine(cls)) for cls in classes]
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+산출물 저장소 테스트 (내용 주소 게시/중복 저장 없음, 매니페스트와 파생 산출물, 상품 색인,
+동시 게시, 나이/용량 보존과 고정, 게시 중 정리, 로컬 대역으로 GCS 백엔드)
+"""
+
+import datetime
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.utils.artifacts import ORPHAN_GRACE_S, ArtifactStore, GCSBackend, LocalBackend
+
+
+class NotFound(Exception):
+    """``google.api_core.exceptions.NotFound`` 대역."""
+
+
+class FakeBlob:
+    def __init__(self, bucket: "FakeBucket", name: str) -> None:
+        self.bucket, self.name = bucket, name
+        self.path = os.path.join(bucket.root, *name.split("/"))
+
+    @property
+    def size(self):
+        return os.path.getsize(self.path)
+
+    @property
+    def updated(self):
+        return datetime.datetime.fromtimestamp(os.path.getmtime(self.path), tz=datetime.timezone.utc)
+
+    def _write(self, data: bytes) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = f"{self.path}.{threading.get_ident()}.upload"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, self.path)  # GCS 처럼 업로드가 끝나야 보인다
+
+    def upload_from_filename(self, filename):
+        with open(filename, "rb") as f:
+            self._write(f.read())
+
+    def upload_from_string(self, data):
+        self._write(data if isinstance(data, bytes) else data.encode())
+
+    def download_as_bytes(self):
+        if not os.path.isfile(self.path):
+            raise NotFound(self.name)
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def download_to_filename(self, filename):
+        with open(filename, "wb") as f:
+            f.write(self.download_as_bytes())
+
+    def exists(self):
+        return os.path.isfile(self.path)
+
+    def delete(self):
+        if not os.path.isfile(self.path):
+            raise NotFound(self.name)
+        os.unlink(self.path)
+
+
+class FakeBucket:
+    def __init__(self, root: str) -> None:
+        self.root = root
+
+    def blob(self, name: str) -> FakeBlob:
+        return FakeBlob(self, name)
+
+
+class FakeClient:
+    """``storage.Client`` 의 쓰는 부분만 (버킷 = 로컬 디렉터리)."""
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+
+    def bucket(self, name: str) -> FakeBucket:
+        return FakeBucket(os.path.join(self.root, name))
+
+    def list_blobs(self, bucket: FakeBucket, prefix: str = ""):
+        for dirpath, _, names in os.walk(bucket.root):
+            for n in names:
+                if n.endswith(".upload"):
+                    continue
+                name = os.path.relpath(os.path.join(dirpath, n), bucket.root).replace(os.sep, "/")
+                if name.startswith(prefix):
+                    yield bucket.blob(name)
+
+
+@pytest.fixture(params=["local", "gcs"])
+def store(request, tmp_path):
+    if request.param == "local":
+        backend = LocalBackend(str(tmp_path / "artifacts"))
+    else:
+        backend = GCSBackend("ads", prefix="display-ads", client=FakeClient(str(tmp_path / "gcs")), cache_dir=str(tmp_path / "cache"))
+    return ArtifactStore(backend, max_bytes=0, max_age_s=0)
+
+
+def _file(tmp_path, name, data: bytes) -> str:
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_publish_is_content_addressed_with_manifest_and_index(store, tmp_path):
+    a = _file(tmp_path, "a.mp4", b"video-a")
+    same = _file(tmp_path, "same.mp4", b"video-a")
+    m1 = store.publish("job1", "4454757", "veo", {"video": a}, inputs={"image_url": "u"}, params={"prompt": "p"}, timings={"run_s": 1.5})
+    m2 = store.publish("job2", "4454757", "higgs", {"video": same})
+
+    art = m1.artifact("video")
+    assert art.key == f"objects/{art.sha256[:2]}/{art.sha256}.mp4" and art.media_type == "video/mp4"
+    assert m2.artifact("video").key == art.key  # 같은 내용은 한 번만
+    assert len(list(store.backend.list("objects/"))) == 1
+    with open(store.local_path(art), "rb") as f:
+        assert f.read() == b"video-a"
+
+    loaded = store.manifest("job1")
+    assert loaded.inputs == {"image_url": "u"} and loaded.params == {"prompt": "p"} and loaded.timings == {"run_s": 1.5}
+    assert [j["job_id"] for j in store.list_product("4454757")] == ["job2", "job1"]
+    assert store.list_product("other") == []
+    with pytest.raises(KeyError):
+        store.manifest("missing")
+
+    final = _file(tmp_path, "final.mp4", b"video-a+text")
+    store.add_artifact("job1", "final_text", final)
+    derived = store.manifest("job1").artifact("final_text")
+    assert derived.derived_from == "video"
+    assert store.list_product("4454757")[1]["artifacts"] == {"video": art.key, "final_text": derived.key}
+
+
+def test_concurrent_publishes_keep_every_job(store, tmp_path):
+    path = _file(tmp_path, "v.mp4", b"same bytes")
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda i: store.publish(f"j{i}", f"p{i % 2}", "sim", {"video": path}), range(20)))
+    assert sorted(j["job_id"] for j in store.list_product("p0")) == sorted(f"j{i}" for i in range(0, 20, 2))
+    assert len(store.list_product("p1")) == 10
+    keys = [b.key for b in store.backend.list("")]
+    assert len([k for k in keys if k.startswith("objects/")]) == 1
+    assert not any(".part-" in k for k in keys)
+
+
+def test_sweep_evicts_by_age_and_size_but_keeps_pinned(store, tmp_path):
+    now = 1_000_000.0
+    for i in range(4):
+        m = store.publish(f"j{i}", "p", "sim", {"video": _file(tmp_path, f"{i}.mp4", bytes([i]) * 100)})
+        m.created_at = now - (4 - i) * 1000  # j0 이 가장 오래됨
+        store._write_manifest(m)
+    store.pin("j0")
+
+    store.max_age_s = 2500  # j0(고정), j1 만 넘는다
+    result = store.sweep(now=now)
+    assert result.evicted == ["j1"] and result.freed_bytes == 100
+    assert [j["job_id"] for j in store.list_product("p")] == ["j3", "j2", "j0"]
+
+    store.max_age_s = 0
+    store.max_bytes = 150  # 남은 300바이트 → 고정 안 된 가장 오래된 것부터
+    result = store.sweep(now=now)
+    assert result.evicted == ["j2", "j3"] and result.total_bytes == 100
+    assert store.manifest("j0").pinned
+
+    store.pin("j0", pinned=False)
+    store.max_bytes = 50
+    assert store.sweep(now=now).evicted == ["j0"]
+    assert list(store.backend.list("objects/")) == [] and store.list_product("p") == []
+
+
+def test_shared_objects_and_orphans(store, tmp_path):
+    path = _file(tmp_path, "v.mp4", b"x" * 64)
+    store.publish("old", "p", "sim", {"video": path})
+    store.publish("new", "p", "sim", {"video": path})
+    store.delete("old")
+    assert store.sweep().deleted_objects == 0  # 아직 new 가 가리킨다
+    orphan = store.put_object(_file(tmp_path, "o.mp4", b"orphan"))  # 매니페스트 없이 남은 객체
+    assert store.sweep().deleted_objects == 0  # 게시 중일 수 있어 바로 지우지 않는다
+    result = store.sweep(now=time.time() + ORPHAN_GRACE_S + 1)
+    assert result.deleted_objects == 1 and not store.backend.exists(orphan.key)
+    assert store.backend.exists(store.manifest("new").artifact("video").key)
+
+
+def test_sweep_during_publish_keeps_reused_object(store, tmp_path, monkeypatch):
+    path = _file(tmp_path, "v.mp4", b"same video")
+    store.publish("old", "p", "sim", {"video": path})
+    put_object = store.put_object
+
+    def put_then_sweep(*args, **kwargs):
+        artifact = put_object(*args, **kwargs)  # 이미 있는 객체를 재사용
+        store.max_age_s = 1
+        store.sweep(now=time.time() + 10)  # 그 사이 old 와 함께 객체가 지워진다
+        store.max_age_s = 0
+        return artifact
+
+    monkeypatch.setattr(store, "put_object", put_then_sweep)
+    manifest = store.publish("new", "p", "sim", {"video": path})
+    assert [j["job_id"] for j in store.list_product("p")] == ["new"]
+    with open(store.local_path(manifest.artifact("video")), "rb") as f:
+        assert f.read() == b"same video"
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+렌더 엔진 벤치마크 테스트 (기준선 비교의 회귀 판정과 잡음 하한, 시뮬레이션 한 경우 실행)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from scripts.bench_render_engines import compare, run_case, skip_reason, synthetic_photo
+
+
+def _row(engine, wall_s, rss=200.0, scratch=0, status="ok"):
+    return {"engine": engine, "size": "540x960", "duration": 2.0, "status": status,
+            "wall_s": wall_s, "peak_rss_mb": rss, "scratch_peak_bytes": scratch}
+
+
+def test_compare_flags_regressions_over_threshold_and_noise_floor():
+    base = [_row("simulation", 2.0, scratch=10_000_000), _row("grabcut", 0.02), _row("slideshow", 1.0)]
+    new = [_row("simulation", 2.6, rss=210.0, scratch=10_500_000), _row("grabcut", 0.04), _row("slideshow", 0.5),
+           _row("depth", 1.0, status="skipped")]
+    by = {(d["case"], d["metric"]): d for d in compare(base, new, threshold=0.2)}
+    assert by[("simulation@540x960/2s", "wall_s")]["regression"]
+    assert not by[("simulation@540x960/2s", "peak_rss_mb")]["regression"]
+    assert not by[("simulation@540x960/2s", "scratch_peak_bytes")]["regression"]
+    # 2배여도 50ms 미만 차이는 잡음
+    assert not by[("grabcut@540x960/2s", "wall_s")]["regression"]
+    assert by[("slideshow@540x960/2s", "wall_s")]["change"] == -0.5
+    assert not any(case.startswith("depth") for case, _ in by)
+
+
+def test_synthetic_photo_is_deterministic_and_simulation_case_runs(tmp_path):
+    assert synthetic_photo(64, 48, seed=1).tobytes() == synthetic_photo(64, 48, seed=1).tobytes()
+    assert skip_reason("simulation") is None
+    result = run_case("simulation", 180, 320, 0.5, str(tmp_path))
+    assert result["status"] == "ok" and result["frames"] == 15
+    assert result["output_bytes"] > 0 and result["peak_rss_mb"] > 0
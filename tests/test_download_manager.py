@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+DownloadManager 로컬 테스트 (연결 끊김 주입 서버, Veo 인라인 바이트 결과 저장)
+"""
+
+import hashlib
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.utils.download import DownloadManager, IntegrityError, save_generated_video
+
+PAYLOAD = os.urandom(3 * 1024 * 1024 + 123)
+DROP_EVERY = 1024 * 1024
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(PAYLOAD)))
+        self.send_header("Accept-Ranges", "bytes")
+        self.end_headers()
+
+    def do_GET(self):
+        start, end = 0, len(PAYLOAD) - 1
+        rng = self.headers.get("Range")
+        if rng:
+            a, _, b = rng[6:].partition("-")
+            start, end = int(a), int(b) if b else end
+        self.send_response(206 if rng else 200)
+        self.send_header("Content-Length", str(end - start + 1))
+        self.send_header("Accept-Ranges", "bytes")
+        if rng:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(PAYLOAD)}")
+        self.end_headers()
+        stop = min(end + 1, start + DROP_EVERY)
+        self.wfile.write(PAYLOAD[start:stop])
+        if stop <= end:
+            self.close_connection = True
+
+
+@pytest.fixture(scope="module")
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FlakyHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/video.mp4"
+    server.shutdown()
+
+
+def test_resume_after_connection_drop(server_url, tmp_path):
+    out = tmp_path / "out.mp4"
+    res = DownloadManager(backoff_s=0.0).download(server_url, str(out), parallel=False)
+    assert out.read_bytes() == PAYLOAD
+    assert res.resumes >= 3
+    assert res.sha256 == hashlib.sha256(PAYLOAD).hexdigest()
+    assert not (tmp_path / "out.mp4.part").exists()
+
+
+def test_parallel_segments(server_url, tmp_path):
+    out = tmp_path / "out.mp4"
+    res = DownloadManager(backoff_s=0.0, chunk_size=256 * 1024, max_segments=4).download(server_url, str(out), parallel=True)
+    assert res.segments == 4
+    assert out.read_bytes() == PAYLOAD
+
+
+def test_checksum_mismatch_keeps_no_output(server_url, tmp_path):
+    out = tmp_path / "out.mp4"
+    with pytest.raises(IntegrityError):
+        DownloadManager(backoff_s=0.0).download(server_url, str(out), expected_sha256="0" * 64)
+    assert not out.exists()
+    assert not (tmp_path / "out.mp4.part").exists()
+
+
+def test_veo_inline_bytes_are_written_without_files_download(tmp_path):
+    class Files:
+        def download(self, file):
+            raise ValueError("File name is required")  # google-genai 와 같은 동작
+
+    client = SimpleNamespace(files=Files())
+    video = SimpleNamespace(uri=None, name=None, video_bytes=b"\x00\x00\x00\x18ftypmp42inline")
+    out = tmp_path / "sub" / "veo.mp4"
+    assert save_generated_video(client, SimpleNamespace(video=video), str(out)) == str(out)
+    assert out.read_bytes() == video.video_bytes
+    assert not (tmp_path / "sub" / "veo.mp4.part").exists()
+
+    with pytest.raises(RuntimeError):
+        save_generated_video(client, SimpleNamespace(video=SimpleNamespace(uri=None, name=None, video_bytes=None)), str(out))
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+엔진 레지스트리 / 공통 submit-poll-fetch 흐름 / 임시 등록 테스트
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import pytest
+
+from src.engines import (
+    EngineCapabilities,
+    EngineError,
+    EngineRequest,
+    JobHandle,
+    JobStatus,
+    VendorEngine,
+    get_engine,
+    list_engines,
+    select_engines,
+    temp_engine,
+)
+from src.engines import registry
+
+
+class FakeEngine(VendorEngine):
+    name = "fake"
+    capabilities = EngineCapabilities(kind="vendor", ratios=("720:1280",), durations=(5,), cost_per_second=2.0)
+    poll_interval_s = 0.0
+
+    def __init__(self, states=("queued", "running", "succeeded"), reporter=None):
+        super().__init__(reporter)
+        self.states = list(states)
+
+    def submit(self, request):
+        return JobHandle(self.name, "job-1")
+
+    def poll(self, handle):
+        state = self.states.pop(0)
+        return JobStatus(state, result_url="http://x/video.mp4" if state == "succeeded" else None, error="boom")
+
+    def fetch(self, handle, status, output_path):
+        return f"{output_path}<-{status.result_url}"
+
+
+@pytest.fixture
+def fake_engine(test_engines):
+    test_engines(FakeEngine)
+
+
+def test_builtin_engines_registered_without_loading_sdks():
+    names = {e.name for e in list_engines()}
+    assert {"runway", "higgs", "veo", "parallax", "depth", "grabcut", "slideshow", "simulation"} <= names
+    # 목록/선택만으로는 벤더 엔진 모듈이 import 되지 않는다
+    assert "src.engines.runway" not in sys.modules
+    assert "src.engines.veo" not in sys.modules
+
+
+def test_select_engines_filters_by_capabilities():
+    picked = [e.name for e in select_engines(ratio="1080:1920", duration=5, available_only=False)]
+    assert "higgs" in picked and "grabcut" in picked
+    assert "runway" not in picked and "veo" not in picked
+    assert picked == sorted(picked, key=lambda n: registry.get_capabilities(n).expected_latency_s)
+
+
+def test_vendor_run_and_arun(fake_engine):
+    request = EngineRequest(output_path="out.mp4", duration=5)
+    engine = get_engine("fake")
+    assert engine.estimate_cost(request) == 10.0
+    assert engine.run(request) == "out.mp4<-http://x/video.mp4"
+    assert asyncio.run(get_engine("fake").arun(request)) == "out.mp4<-http://x/video.mp4"
+
+
+def test_vendor_failure_raises(fake_engine):
+    with pytest.raises(EngineError, match="boom"):
+        get_engine("fake", states=("running", "failed")).run(EngineRequest(output_path="out.mp4"))
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        get_engine("nope")
+
+
+def test_temp_engine_restores_previous_registration():
+    before = registry.get_capabilities("veo")
+    with temp_engine(FakeEngine, name="veo") as name:
+        assert name == "veo" and get_engine("veo").name == "fake"
+    assert registry.get_capabilities("veo") is before
+    with temp_engine(FakeEngine):
+        assert "fake" in {e.name for e in list_engines()}
+    assert "fake" not in {e.name for e in list_engines()}
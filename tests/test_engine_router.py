@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+라우터 테스트 (통계 기반 마감 선택 / 대기열 지연 시 헤지 / 헤지 창 뒤 실패 헤지 / 진 쪽 취소 / 호출자 취소 /
+변형까지 옮기기 / 통계 파일 정리)
+"""
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.engines import (
+    EngineCapabilities,
+    EngineError,
+    EngineRequest,
+    EngineStats,
+    JobHandle,
+    JobStatus,
+    Outcome,
+    Router,
+    VendorEngine,
+    VendorScheduler,
+    variant_paths,
+)
+
+CAPS = EngineCapabilities(kind="vendor", ratios=("720:1280",), durations=(5,), expected_latency_s=2.0)
+
+
+class TimedEngine(VendorEngine):
+    """queue_s 동안 queued, 이후 run_s 동안 running, 그다음 succeeded (``fail`` 이면 failed)."""
+
+    capabilities = CAPS
+    poll_interval_s = 0.01
+
+    def __init__(self, name, queue_s=0.0, run_s=0.05, fail=False):
+        super().__init__()
+        self.name = name
+        self.queue_s = queue_s
+        self.run_s = run_s
+        self.fail = fail
+        self.submitted = 0
+        self.cancelled = []
+
+    def submit(self, request):
+        self.submitted += 1
+        return JobHandle(self.name, f"{self.name}-1", submitted_at=time.monotonic())
+
+    def poll(self, handle):
+        age = time.monotonic() - handle.submitted_at
+        if age < self.queue_s:
+            return JobStatus("queued")
+        if age < self.queue_s + self.run_s:
+            return JobStatus("running")
+        if self.fail:
+            return JobStatus("failed", error="vendor error")
+        return JobStatus("succeeded", result_url="mem://video")
+
+    def fetch(self, handle, status, output_path):
+        with open(output_path, "wb") as f:
+            f.write(self.name.encode())
+        return output_path
+
+    def cancel(self, handle):
+        self.cancelled.append(handle.job_id)
+        return True
+
+
+def _router(stats):
+    return Router(VendorScheduler(stats=stats), stats=stats, min_samples=3)
+
+
+def _seed(stats, engine, latencies, queue_s=0.1, failures=0):
+    for lat in latencies:
+        stats.record(Outcome(engine, True, lat, queue_s=queue_s))
+    for _ in range(failures):
+        stats.record(Outcome(engine, False, 1.0, error="boom"))
+
+
+def test_choose_engine_predicted_to_meet_deadline():
+    stats = EngineStats(path=None)
+    _seed(stats, "slow", [100, 120, 300])
+    _seed(stats, "fast", [20, 25, 30])
+    engines = {"slow": TimedEngine("slow"), "fast": TimedEngine("fast")}
+    request = EngineRequest(output_path="out.mp4")
+
+    decision = _router(stats).choose(engines, request, deadline_s=60)
+    assert decision.primary == "fast"
+    assert "마감" in decision.reason
+    slow = next(c for c in decision.candidates if c.engine == "slow")
+    assert not slow.eligible and "p90" in slow.note
+    assert decision.hedge == "slow"  # 마감 밖이어도 헤지 후보로는 남긴다
+
+
+def test_failures_outweigh_small_latency_gain():
+    stats = EngineStats(path=None)
+    _seed(stats, "flaky", [10, 10, 10], failures=6)
+    _seed(stats, "steady", [14, 14, 14])
+    engines = {"flaky": TimedEngine("flaky"), "steady": TimedEngine("steady")}
+    decision = _router(stats).choose(engines, EngineRequest(output_path="out.mp4"), hedge=False)
+    assert decision.primary == "steady" and decision.hedge is None
+
+
+def test_hedge_when_primary_stays_queued(tmp_path):
+    stats = EngineStats(path=None)
+    _seed(stats, "primary", [1, 1, 1], queue_s=0.1)
+    _seed(stats, "backup", [2, 2, 2])
+    primary = TimedEngine("primary", queue_s=30)
+    backup = TimedEngine("backup", run_s=0.05)
+    out = tmp_path / "out.mp4"
+
+    result = _router(stats).run({"primary": primary, "backup": backup}, EngineRequest(output_path=str(out)))
+    assert result.engine == "backup"
+    assert out.read_bytes() == b"backup"
+    meta = result.metadata
+    assert meta["hedged"] and meta["route"]["primary"] == "primary"
+    assert "시작하지 않음" in meta["hedge_reason"]
+    assert meta["attempts"]["primary"]["status"] == "cancelled"
+
+    deadline = time.monotonic() + 2
+    while not primary.cancelled and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert primary.cancelled == ["primary-1"]  # 진 쪽 벤더 작업 취소
+    assert not (tmp_path / "out.primary.mp4").exists()
+
+
+def test_no_hedge_when_primary_starts_in_time(tmp_path):
+    stats = EngineStats(path=None)
+    _seed(stats, "primary", [1, 1, 1], queue_s=0.5)
+    _seed(stats, "backup", [2, 2, 2])
+    engines = {"primary": TimedEngine("primary", run_s=0.8), "backup": TimedEngine("backup")}
+
+    result = _router(stats).run(engines, EngineRequest(output_path=str(tmp_path / "out.mp4")))
+    assert result.engine == "primary"
+    assert not result.metadata["hedged"]
+    assert stats.samples("primary") == 4  # 실행 결과가 통계에 반영
+
+
+def test_hedge_on_failure_after_hedge_window(tmp_path):
+    stats = EngineStats(path=None)
+    _seed(stats, "primary", [1, 1, 1], queue_s=0.2)
+    _seed(stats, "backup", [2, 2, 2])
+    # 창(0.2s) 안에 시작했지만 창이 지난 뒤 실패 → 2순위가 실행되어야 한다
+    primary = TimedEngine("primary", run_s=0.5, fail=True)
+    backup = TimedEngine("backup")
+    out = tmp_path / "out.mp4"
+
+    result = _router(stats).run({"primary": primary, "backup": backup}, EngineRequest(output_path=str(out)))
+    assert result.engine == "backup" and backup.submitted == 1
+    assert out.read_bytes() == b"backup"
+    meta = result.metadata
+    assert meta["hedged"] and "primary 실패" in meta["hedge_reason"]
+    assert meta["attempts"]["primary"]["status"] == "failed"
+
+
+def test_caller_cancel_stops_every_attempt(tmp_path):
+    stats = EngineStats(path=None)
+    _seed(stats, "primary", [1, 1, 1], queue_s=0.05)
+    _seed(stats, "backup", [2, 2, 2])
+    primary = TimedEngine("primary", queue_s=30)
+    backup = TimedEngine("backup", queue_s=30)
+    cancel = threading.Event()
+    threading.Timer(0.3, cancel.set).start()  # 헤지가 뜬 뒤에 취소
+
+    t0 = time.monotonic()
+    with pytest.raises(EngineError, match="cancelled"):
+        _router(stats).run({"primary": primary, "backup": backup}, EngineRequest(output_path=str(tmp_path / "out.mp4")), cancel=cancel)
+    assert time.monotonic() - t0 < 2
+    assert primary.cancelled == ["primary-1"] and backup.cancelled == ["backup-1"]
+
+
+class VariantEngine(TimedEngine):
+    """요청한 변형 수만큼 ``{이름}_v{i}`` 파일을 쓴다."""
+
+    def submit(self, request):
+        handle = super().submit(request)
+        handle.raw = int(request.options.get("variants") or 1)
+        return handle
+
+    def fetch(self, handle, status, output_path):
+        for i, path in enumerate(variant_paths(output_path, handle.raw)):
+            with open(path, "wb") as f:
+                f.write(f"{self.name}-{i}".encode())
+        return output_path
+
+
+def test_winner_variants_are_moved(tmp_path):
+    stats = EngineStats(path=None)
+    out = tmp_path / "out.mp4"
+    request = EngineRequest(output_path=str(out), options={"variants": 3})
+    result = _router(stats).run({"v": VariantEngine("v")}, request, hedge=False)
+    assert result.engine == "v"
+    assert [open(p, "rb").read() for p in variant_paths(str(out), 3)] == [b"v-0", b"v-1", b"v-2"]
+    assert sorted(os.listdir(tmp_path)) == ["out.mp4", "out_v1.mp4", "out_v2.mp4"]
+
+
+def test_stats_file_is_compacted_to_window(tmp_path):
+    path = tmp_path / "engine_stats.jsonl"
+    stats = EngineStats(path=str(path), window=5)
+    for i in range(40):
+        stats.record(Outcome("a" if i % 4 else "b", True, float(i)))
+    assert len(path.read_text().splitlines()) <= 20  # 2 x 기록 (엔진별 최근 5건)
+    reloaded = EngineStats(path=str(path), window=5)
+    assert [o.latency_s for o in reloaded.outcomes("a")] == [o.latency_s for o in stats.outcomes("a")]
+    assert [o.latency_s for o in reloaded.outcomes("b")] == [20.0, 24.0, 28.0, 32.0, 36.0]
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+우선순위 / 공정 분배 대기열 테스트 (등급, 사용자별 WFQ, 마감, 예약 슬롯, CPU 슬롯, 서비스 순서)
+"""
+
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.engines import (
+    EngineCancelled,
+    EngineCapabilities,
+    EngineRequest,
+    EngineStats,
+    FairQueue,
+    LocalEngine,
+    QueueTag,
+    VendorScheduler,
+    get_engine,
+)
+from src.engines.fairqueue import FairOrder
+from src.server.generation import GenerationService
+from src.sim.fairness import run_fairness
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+from queue_status import render  # noqa: E402
+
+
+def _drain(order):
+    out = []
+    while len(order):
+        out.append(order.pop())
+    return out
+
+
+def test_priority_classes_and_weighted_fair_share():
+    order = FairOrder(weights={"team-b": 2.0})
+    for i in range(4):
+        order.push(f"a{i}", QueueTag("batch", "team-a"))
+    for i in range(4):
+        order.push(f"b{i}", QueueTag("batch", "team-b"))
+    order.push("bf", QueueTag("backfill", "nightly"))
+    order.push("ui", QueueTag("interactive", "designer"))
+    # interactive 가 먼저, backfill 은 마지막. team-b 는 가중치 2 → 두 배로 자주
+    assert _drain(order) == ["ui", "b0", "a0", "b1", "b2", "a1", "b3", "a2", "a3", "bf"]
+
+
+def test_deadline_urgency_within_class():
+    now = [1000.0]
+    order = FairOrder(weights={}, urgent_s=60, clock=lambda: now[0])
+    order.push("early", QueueTag("batch", "u"))
+    order.push("later", QueueTag("batch", "u"))
+    order.push("due", QueueTag("batch", "v", deadline_at=1030.0))
+    order.push("far", QueueTag("batch", "w", deadline_at=5000.0))
+    order.push("ui", QueueTag("interactive", "x"))
+    # 마감 임박(30s)은 같은 등급 안에서 앞서지만 interactive 를 넘지는 않는다
+    assert _drain(order) == ["ui", "due", "early", "far", "later"]
+
+
+def test_interactive_reserve_and_cancel():
+    queue = FairQueue("test", capacity=2, interactive_reserve=1)
+    batch = QueueTag("batch", "bot")
+    # UI 사용이 없으면 배치가 슬롯을 전부 쓴다
+    t1 = queue.acquire(batch)
+    t2 = queue.acquire(batch)
+    queue.release(t1)
+    queue.release(t2)
+
+    ui_ticket = queue.acquire(QueueTag("interactive", "designer"))  # 예약 창이 열린다
+    queue.release(ui_ticket)
+    t1 = queue.acquire(batch)
+    cancel = threading.Event()
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        waiting = pool.submit(queue.acquire, batch, 1, 1.0, cancel)
+        time.sleep(0.1)
+        assert not waiting.done()  # 남은 한 슬롯은 interactive 몫
+        snap = queue.snapshot()
+        assert snap["in_use"] == 1 and snap["interactive_reserve"] == 1 and len(snap["waiting"]) == 1
+        ui_ticket = queue.acquire(QueueTag("interactive", "designer"))  # 바로 들어간다
+        cancel.set()
+        with pytest.raises(EngineCancelled):
+            waiting.result()
+    assert queue.waiting == 0
+    queue.release(ui_ticket)
+    queue.release(t1)
+
+
+class HeavyEngine(LocalEngine):
+    name = "heavy"
+    capabilities = EngineCapabilities(kind="local", ratios=(), durations=(), cpu_slots=2)
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def render(self, request):
+        cls = type(self)
+        with cls.lock:
+            cls.running += 1
+            cls.peak = max(cls.peak, cls.running)
+        time.sleep(0.1)
+        with cls.lock:
+            cls.running -= 1
+        with open(request.output_path, "wb") as f:
+            f.write(b"x")
+        return request.output_path
+
+
+@pytest.fixture
+def heavy(test_engines):
+    test_engines(HeavyEngine)
+    HeavyEngine.peak = 0
+
+
+def test_local_renders_take_cpu_slots(heavy, tmp_path):
+    scheduler = VendorScheduler(stats=EngineStats(path=None))
+    scheduler.cpu = FairQueue("cpu", capacity=3, interactive_reserve=0)
+
+    def one(i):
+        request = EngineRequest(output_path=str(tmp_path / f"{i}.mp4"), seed=i, tag=QueueTag("batch", "bot"))
+        return scheduler.run(get_engine("heavy"), request)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(one, range(4)))
+    assert HeavyEngine.peak == 1  # 2슬롯짜리 렌더는 3슬롯 CPU 에 하나씩
+    assert scheduler.queues()["cpu"]["in_use"] == 0
+
+
+def test_service_runs_interactive_before_queued_batch(heavy, tmp_path):
+    service = GenerationService(workers=1, out_dir=str(tmp_path))
+    try:
+        def spec(i, priority, user="bot"):
+            return {"engine": "heavy", "priority": priority, "user": user, "settings": {"image_path": "in.jpg", "seed": i}}
+
+        jobs = [service.submit(spec(i, "batch")) for i in range(4)]
+        ui = service.submit(spec(99, "interactive", "designer"))
+        queued = service.queue()
+        assert queued["waiting"][0]["id"] == ui.id
+        while not all(j.done for j in jobs + [ui]):
+            time.sleep(0.02)
+        finished = sorted(jobs + [ui], key=lambda j: j.finished_at)
+        # 이미 돌던 첫 배치 다음이 interactive
+        assert finished[1].id == ui.id
+        with pytest.raises(ValueError):
+            service.submit(spec(1, "urgent"))
+    finally:
+        service.shutdown()
+
+
+def test_benchmark_interactive_p95_under_batch_load():
+    kwargs = dict(capacity=3, batch_jobs=60, interactive_jobs=6, service_s=0.03)
+    fifo = run_fairness("fifo", **kwargs)
+    fair = run_fairness("fair", **kwargs)
+    assert fair.interactive_p95_s < fifo.interactive_p95_s / 3
+    assert fair.interactive_p95_s < 0.03 * 3
+
+
+def test_queue_status_render():
+    queue = FairQueue("runway", capacity=2, interactive_reserve=0)
+    ticket = queue.acquire(QueueTag("batch", "bot", label="4454757"))
+    text = render({"runway": queue.snapshot()})
+    assert "■ runway: 사용 1/2" in text and "batch" in text and "4454757" in text
+    queue.release(ticket)
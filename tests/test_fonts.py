@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+폰트 레지스트리 테스트 (패밀리/한글 범위 색인, 문구에 맞는 페이스 고르기, (페이스, 크기) LRU)
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.utils.fonts import FontRegistry, text_scripts
+
+
+def _build_font(path, family, chars, weight=400):
+    """``chars`` 만 가진 작은 TrueType 폰트 (글자마다 네모 하나)."""
+    from fontTools.fontBuilder import FontBuilder
+    from fontTools.pens.ttGlyphPen import TTGlyphPen
+
+    names = [".notdef"] + [f"uni{ord(c):04X}" for c in chars]
+    pen = TTGlyphPen(None)
+    pen.moveTo((50, 0)); pen.lineTo((50, 700)); pen.lineTo((550, 700)); pen.lineTo((550, 0)); pen.closePath()
+    box = pen.glyph()
+    fb = FontBuilder(1000, isTTF=True)
+    fb.setupGlyphOrder(names)
+    fb.setupCharacterMap({ord(c): n for c, n in zip(chars, names[1:])})
+    fb.setupGlyf({n: box for n in names})
+    fb.setupHorizontalMetrics({n: (600, 50) for n in names})
+    fb.setupHorizontalHeader(ascent=800, descent=-200)
+    fb.setupNameTable({"familyName": family, "styleName": "Bold" if weight >= 600 else "Regular"})
+    fb.setupOS2(usWeightClass=weight)
+    fb.setupPost()
+    fb.save(str(path))
+    return str(path)
+
+
+LATIN = "AaBbé"
+HANGUL = "가힣ㄱ서울"
+
+
+@pytest.fixture
+def font_dir(tmp_path):
+    sub = tmp_path / "nested"
+    sub.mkdir()
+    _build_font(tmp_path / "latin.ttf", "Plain Sans", LATIN, 700)
+    _build_font(sub / "kr.ttf", "Test Gothic", LATIN + HANGUL, 400)
+    _build_font(sub / "kr-bold.ttf", "Test Gothic", LATIN + HANGUL, 700)
+    (tmp_path / "broken.ttf").write_bytes(b"not a font")
+    return tmp_path
+
+
+def test_scripts_of_text():
+    assert text_scripts("서울 Night 123") == {"hangul", "latin"}
+    assert text_scripts("") == frozenset()
+
+
+def test_indexes_families_and_hangul_coverage(font_dir):
+    registry = FontRegistry([str(font_dir)], preferred="")
+    assert registry.families == ["Plain Sans", "Test Gothic"]  # 깨진 파일은 건너뛴다
+    assert [f.weight for f in registry.by_family["test gothic"]] == [700, 400]
+    assert all("hangul" in f.scripts for f in registry.by_family["test gothic"])
+    assert registry.by_family["plain sans"][0].scripts == {"latin"}
+
+
+def test_find_prefers_covering_bold_hangul_face(font_dir):
+    registry = FontRegistry([str(font_dir)], preferred="")
+    assert registry.find("서울 야경").path.endswith("kr-bold.ttf")
+    assert registry.find("Night", bold=False).path.endswith("kr.ttf")  # 라틴 문구도 한글 폰트
+    assert registry.find("Night", family="Plain Sans").family == "Plain Sans"
+
+    preferred = FontRegistry([str(font_dir)], preferred=str(font_dir / "latin.ttf"))
+    assert preferred.find("Night").family == "Plain Sans"
+    assert preferred.find("서울").family == "Test Gothic"  # 한글이 없는 폰트는 지정해도 건너뛴다
+
+    empty = FontRegistry([str(font_dir / "missing")], preferred="")
+    assert empty.find("서울") is None
+    assert empty.font(20, "서울") is not None  # PIL 기본 폰트
+
+
+def test_font_objects_are_cached_per_face_and_size(font_dir):
+    registry = FontRegistry([str(font_dir)], preferred="", cache_size=2)
+    a = registry.font(40, "서울")
+    assert registry.font(40, "서울") is a
+    assert a.getname() == ("Test Gothic", "Bold")
+    assert a.getbbox("가")[2] > 0
+    registry.font(41, "서울")
+    registry.font(42, "서울")
+    assert registry.cached() == 2
+    assert registry.font(40, "서울") is not a  # LRU 에서 밀려났다
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Gemini 입력 이미지 핸들 테스트 (이미지당 한 번 업로드, 동시 요청 합치기, 만료 전 재업로드,
+백그라운드 지연 삭제, 마케팅 영상 전후 벤치마크)
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.sim import SimConfig
+from src.sim.assets import run_assets
+from src.utils.clients import get_genai_client
+from src.utils.gemini_assets import GeminiAssets
+
+
+@pytest.fixture
+def sim_config():
+    return SimConfig(queue_s=0.05, run_s=0.1, jitter=0.0, video_bytes=4096, image_s=0.05, seed=1)
+
+
+@pytest.fixture
+def assets(sim):
+    manager = GeminiAssets(get_genai_client("sim"), linger_s=0.2)
+    yield manager
+    manager.close()
+
+
+def test_one_download_and_upload_per_image(sim, assets):
+    url = f"{sim.base_url}/images/a.jpg"
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        held = list(pool.map(lambda _: assets.acquire(url), range(4)))
+    assert len({id(a) for a in held}) == 1 and held[0].refs == 4
+    uris = {a.part().file_data.file_uri for a in held}  # 분석 입력 (Files URI)
+    assert len(uris) == 1
+    assert held[0].image().image_bytes == held[0].data  # 생성 입력 (받아 둔 바이트)
+    for a in held:
+        assets.release(a)
+    # 같은 내용이면 다른 경로(바이트)로 들어와도 같은 핸들
+    with assets.use(held[0].data) as same:
+        assert same is held[0]
+    assert sim.simulator.requests["GET image"] == 1
+    assert sim.simulator.requests["POST gemini.upload"] == 1
+    assert assets.stats["uploads"] == 1 and assets.stats["reused"] == 3
+
+
+def test_waits_for_processing(sim, assets):
+    sim.simulator.config.file_processing_s = 0.3
+    with assets.use(f"{sim.base_url}/images/b.jpg") as asset:
+        t0 = time.monotonic()
+        assert asset.remote().state.name == "ACTIVE"
+        assert 0.2 <= time.monotonic() - t0 < 1.5  # 고정 2초가 아니라 짧은 간격부터
+
+
+def test_lazy_delete_and_reupload_near_expiry(sim, assets):
+    url = f"{sim.base_url}/images/c.jpg"
+    with assets.use(url) as asset:
+        first = asset.remote().name
+        asset.expires_at = time.time() + assets.expiry_margin_s - 1  # 만료 임박
+        assert asset.remote().name != first
+    assert sim.simulator.requests["POST gemini.upload"] == 2
+    # 놓은 직후에는 남아 있다가, linger 뒤 백그라운드에서 지워진다
+    assert sim.simulator.requests["DELETE gemini.file"] == 0
+    with assets.use(url) as again:
+        assert again is asset  # linger 안에 다시 쓰면 그대로
+    deadline = time.monotonic() + 3
+    while sim.simulator.requests["DELETE gemini.file"] < 1 and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert sim.simulator.requests["DELETE gemini.file"] == 1
+    assert assets.stats["deleted"] == 1 and not assets._assets
+
+
+def test_benchmark_uploads_per_marketing_video(sim, tmp_path):
+    before = run_assets(sim, "before", videos=4, images=2, out_dir=str(tmp_path), poll_interval_s=0.05)
+    after = run_assets(sim, "after", videos=4, images=2, out_dir=str(tmp_path), poll_interval_s=0.05)
+    assert before.succeeded == after.succeeded == 4
+    assert (before.uploads, before.downloads, before.deletes) == (8, 8, 8)
+    assert (after.uploads, after.downloads, after.deletes) == (2, 2, 2)
+    assert after.per_video_mean_s < before.per_video_mean_s
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+헤드리스 생성 서비스 테스트 (POST /jobs, 상태 조회, SSE 진행, 결과 다운로드, 취소, 합쳐진 작업의 결과,
+원격 호출 제한과 토큰, 실행 중인 auto 작업 취소, 끝난 작업 정리)
+"""
+
+import os
+import shutil
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.testclient import TestClient
+
+from src.engines import EngineCapabilities, JobHandle, JobStatus, LocalEngine, VendorEngine
+from src.server.client import GenerationClient
+from src.server.generation import GenerationService
+from src.server.jobs_api import job_routes
+from src.utils.metrics import COALESCED_REQUESTS
+
+VIDEO = b"\x00\x00\x00\x18ftypmp42" + b"\x00" * 128
+
+
+class SleepyEngine(LocalEngine):
+    name = "sleepy"
+    capabilities = EngineCapabilities(kind="local", ratios=(), durations=())
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+    delay_s = 0.05
+
+    def render(self, request):
+        cls = type(self)
+        with cls.lock:
+            cls.running += 1
+            cls.peak = max(cls.peak, cls.running)
+        try:
+            self.reporter.progress("🎞️ 렌더링 중", frame=1)
+            time.sleep(cls.delay_s)
+            with open(request.output_path, "wb") as f:
+                f.write(VIDEO)
+            return request.output_path
+        finally:
+            with cls.lock:
+                cls.running -= 1
+
+
+class StuckVendorEngine(VendorEngine):
+    """제출은 받지만 계속 queued 인 벤더. 취소된 작업 id 를 모은다."""
+
+    name = "stuck"
+    capabilities = EngineCapabilities(kind="vendor", ratios=(), durations=(), expected_latency_s=60.0)
+    poll_interval_s = 0.01
+    cancelled = []
+
+    def submit(self, request):
+        return JobHandle(self.name, f"stuck-{request.seed}")
+
+    def poll(self, handle):
+        return JobStatus("queued")
+
+    def fetch(self, handle, status, output_path):
+        raise AssertionError("stuck 은 끝나지 않는다")
+
+    def cancel(self, handle):
+        type(self).cancelled.append(handle.job_id)
+        return True
+
+
+@pytest.fixture
+def service(tmp_path, test_engines):
+    test_engines(SleepyEngine)
+    SleepyEngine.peak = 0
+    svc = GenerationService(workers=4, out_dir=str(tmp_path))
+    server = uvicorn.Server(uvicorn.Config(Starlette(routes=job_routes(svc)), host="127.0.0.1", port=0, log_level="warning"))
+    server.install_signal_handlers = lambda: None
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    svc.client = GenerationClient(f"http://127.0.0.1:{port}")
+    yield svc
+    server.should_exit = True
+    svc.shutdown()
+
+
+def test_job_lifecycle_with_sse_and_artifact(service):
+    client = service.client
+    job = client.submit("sleepy", {"image_path": "in.jpg", "prompt": "p"}, product_id="4454757")
+    assert job["state"] in ("queued", "running")
+    assert job["links"]["events"] == f"/jobs/{job['id']}/events"
+
+    events = []
+    final = client.wait(job["id"], events.append)
+    assert final["state"] == "succeeded"
+    kinds = [(e["kind"], e.get("state")) for e in events]
+    assert kinds[0] == ("state", "queued") and ("state", "running") in kinds
+    assert any(e["kind"] == "progress" and "렌더링" in e["message"] for e in events)
+    # 결과는 산출물 저장소의 내용 주소 경로 + 상품 색인
+    sha = final["metadata"]["artifacts"]["video"]
+    assert final["output_path"] == os.path.join(service.out_dir, "artifacts", "objects", sha[:2], f"{sha}.mp4")
+    listed = requests.get(f"{client.base_url}/products/4454757/artifacts", timeout=5).json()["jobs"]
+    assert [j["job_id"] for j in listed] == [job["id"]]
+
+    art = requests.get(client.artifact_url(job["id"], download=True), timeout=5)
+    assert art.content == VIDEO and "attachment" in art.headers["content-disposition"]
+    part = requests.get(client.artifact_url(job["id"]), headers={"Range": "bytes=0-7"}, timeout=5)
+    assert part.status_code == 206 and part.content == VIDEO[:8]
+
+
+def test_fifty_concurrent_submissions(service):
+    client = service.client
+    with ThreadPoolExecutor(max_workers=50) as pool:
+        jobs = list(pool.map(lambda i: client.submit("sleepy", {"image_path": "in.jpg", "seed": i}, product_id=f"p{i % 5}"), range(50)))
+    assert len({j["id"] for j in jobs}) == 50
+
+    deadline = time.monotonic() + 20
+    while time.monotonic() < deadline:
+        counts = requests.get(f"{client.base_url}/jobs?limit=100", timeout=5).json()["counts"]
+        if counts.get("succeeded") == 50:
+            break
+        time.sleep(0.05)
+    assert counts == {"succeeded": 50}
+    assert SleepyEngine.peak <= service.workers  # 워커 풀 크기만큼만 동시에
+
+
+def test_cancel_and_validation(service):
+    client = service.client
+    SleepyEngine.delay_s = 0.5
+    try:
+        blockers = [client.submit("sleepy", {"image_path": "in.jpg", "seed": i}) for i in range(service.workers)]
+        queued = client.submit("sleepy", {"image_path": "in.jpg", "seed": -1})
+        assert client.cancel(queued["id"])["state"] == "cancelled"
+        assert client.wait(blockers[0]["id"])["state"] == "succeeded"
+        assert client.get(queued["id"])["state"] == "cancelled"
+    finally:
+        SleepyEngine.delay_s = 0.05
+
+    with pytest.raises(RuntimeError, match="400"):
+        client.submit("nope", {"image_path": "in.jpg"})
+    with pytest.raises(RuntimeError, match="400"):
+        client.submit("sleepy", {})
+    assert requests.get(f"{client.base_url}/jobs/missing", timeout=5).status_code == 404
+
+    # 잘못된 쿼리/헤더는 500 이 아니라 400, limit 은 잘라 쓴다
+    for query in ("limit=abc", "limit=-1"):
+        assert requests.get(f"{client.base_url}/jobs?{query}", timeout=5).status_code == 400
+    assert len(requests.get(f"{client.base_url}/jobs?limit=0", timeout=5).json()["jobs"]) == 1
+    events_url = f"{client.base_url}/jobs/{queued['id']}/events"
+    assert requests.get(f"{events_url}?cursor=x", timeout=5).status_code == 400
+    assert requests.get(events_url, headers={"Last-Event-ID": "1.5"}, timeout=5).status_code == 400
+
+
+def test_cancel_running_auto_job_stops_vendor(service, test_engines):
+    test_engines(StuckVendorEngine)
+    StuckVendorEngine.cancelled = []
+    client = service.client
+    job = client.submit("auto", {"image_path": "in.jpg", "seed": 7, "candidates": ["stuck"], "hedge": False})
+    deadline = time.monotonic() + 5
+    while client.get(job["id"])["state"] != "running" and time.monotonic() < deadline:
+        time.sleep(0.02)
+    time.sleep(0.1)  # 벤더 제출까지
+    assert client.cancel(job["id"])["id"] == job["id"]
+    assert client.wait(job["id"])["state"] == "cancelled"
+    assert StuckVendorEngine.cancelled == ["stuck-7"]
+
+
+def test_finished_jobs_are_evicted_but_artifacts_stay(service):
+    client = service.client
+    service.history = 2
+    ids = []
+    for seed in range(4):
+        job = client.submit("sleepy", {"image_path": "in.jpg", "seed": seed}, product_id="p1")
+        assert client.wait(job["id"])["state"] == "succeeded"
+        ids.append(job["id"])
+    assert [j.id for j in service.list()] == ids[:1:-1]
+    assert requests.get(f"{client.base_url}/jobs/{ids[0]}", timeout=5).status_code == 404
+    # 결과는 매니페스트로 계속 받는다
+    resp = requests.get(f"{client.base_url}/jobs/{ids[0]}/artifact?download=1", timeout=5)
+    assert resp.status_code == 200 and resp.content == VIDEO
+    assert f"p1_sleepy_{ids[0]}.mp4" in resp.headers["content-disposition"]
+    assert {j["job_id"] for j in client.session.get(f"{client.base_url}/products/p1/artifacts").json()["jobs"]} == set(ids)
+
+    service.job_ttl_s = 0
+    client.submit("sleepy", {"image_path": "in.jpg", "seed": 9})
+    deadline = time.monotonic() + 5
+    while service.list() and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert service.list() == []
+
+
+def test_coalesced_jobs_both_keep_their_output(service, monkeypatch):
+    SleepyEngine.delay_s = 0.3
+    copyfile = shutil.copyfile
+
+    def slow_copy(src, dst, **kwargs):
+        time.sleep(0.2)  # 리더 작업 공간이 먼저 지워질 틈
+        return copyfile(src, dst, **kwargs)
+
+    monkeypatch.setattr(shutil, "copyfile", slow_copy)
+    try:
+        before = COALESCED_REQUESTS.value(flight="engine")
+        # 상품이 달라 작업은 둘이지만 엔진 요청(이미지 내용/프롬프트)은 같다 → 한 번만 렌더
+        jobs = [
+            service.submit({"product_id": pid, "engine": "sleepy", "settings": {"image_base64": "aW1n", "prompt": "p"}})
+            for pid in ("a", "b")
+        ]
+        deadline = time.monotonic() + 5
+        while not all(j.done for j in jobs) and time.monotonic() < deadline:
+            time.sleep(0.02)
+    finally:
+        SleepyEngine.delay_s = 0.05
+    assert [j.state for j in jobs] == ["succeeded", "succeeded"], [j.error for j in jobs]
+    assert COALESCED_REQUESTS.value(flight="engine") - before == 1
+    for job in jobs:
+        assert os.path.isfile(job.output_path)
+        with open(job.output_path, "rb") as f:
+            assert f.read() == VIDEO
+
+
+def test_remote_callers_need_token_and_cannot_reference_local_files(service):
+    # TestClient 의 클라이언트 주소는 루프백이 아니다
+    anonymous = TestClient(Starlette(routes=job_routes(service, token="")))
+    assert anonymous.post("/jobs", json={"engine": "sleepy", "settings": {"image_base64": "aW1n"}}).status_code == 401
+    assert anonymous.get("/jobs").status_code == 401
+
+    remote = TestClient(Starlette(routes=job_routes(service, token="s3cret")), headers={"Authorization": "Bearer s3cret"})
+    denied = [
+        {"engine": "sleepy", "settings": {"image_path": "/etc/passwd"}},
+        {"engine": "sleepy", "settings": {"image_url": "file:///etc/passwd"}},
+        {"engine": "slideshow", "settings": {"image_url": "https://img/1.jpg", "options": {"images": ["https://img/2.jpg", "/etc/passwd"]}}},
+        {"engine": "auto", "settings": {"image_url": "https://img/1.jpg", "engine_options": {"slideshow": {"images": [{"url": "/etc/hosts"}]}}}},
+        {"engine": "auto", "settings": {"image_url": "https://img/1.jpg", "engine_options": {"runway": {"force_live": True}}}},
+    ]
+    for spec in denied:
+        resp = remote.post("/jobs", json=spec)
+        assert resp.status_code == 403, spec
+    assert "options.images" in remote.post("/jobs", json=denied[2]).json()["error"]
+    assert remote.post("/jobs", json={"engine": "sleepy", "settings": {"image_base64": "aW1n"}}).status_code == 202
+
+
+def test_token_guards_every_route_but_artifact(service):
+    api = TestClient(Starlette(routes=job_routes(service, token="s3cret")))
+    assert api.get("/jobs").status_code == 401
+    assert api.get("/queues", headers={"Authorization": "Bearer nope"}).status_code == 401
+    auth = {"Authorization": "Bearer s3cret"}
+    job = api.post("/jobs", json={"engine": "sleepy", "settings": {"image_base64": "aW1n", "seed": 5}}, headers=auth).json()
+    while api.get(f"/jobs/{job['id']}", headers=auth).json()["state"] not in ("succeeded", "failed"):
+        time.sleep(0.02)
+    assert api.get(f"/jobs/{job['id']}/artifact").status_code == 200
+    assert GenerationClient("http://svc", token="s3cret").session.headers["Authorization"] == "Bearer s3cret"
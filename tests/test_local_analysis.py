@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+로컬 사진 분석기 테스트 (합성 라벨 세트 일치율/지연, 네트워크 없는 전략 선택, refine 모드, 라벨 세트 왕복)
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.core.local_analysis import LocalPhotoAnalyzer, SceneFeatures, classify
+from src.core.photo_analysis import PhotoAnalysisCache, choose_strategy
+from src.core.smart_video_generator import SmartVideoGenerator
+from src.generators.gemini.image_video import GeminiImageVideoGenerator
+from src.sim.analysis import label_remote, load_labels, run_agreement, synthetic_samples
+
+
+def test_agreement_and_latency_on_synthetic_set():
+    report = run_agreement(synthetic_samples(2), LocalPhotoAnalyzer())
+    assert report.samples == 8
+    assert report.strategy == 1.0 and report.scene_type == 1.0, report.mismatches
+    assert report.p50_ms < 200  # 수십 ms (느린 CI 여유)
+
+
+def test_people_cues_pick_people_strategies():
+    base = dict(face_area=0.0, persons=0, green=0.3, sky=0.4, warm_center=0.0, edges=0.02, lines=0.1,
+                brightness=0.6, sharpness=0.7, colorfulness=0.5)
+    portrait = classify(SceneFeatures(faces=1, **dict(base, face_area=0.08)))
+    assert choose_strategy(portrait) == "people_portrait" and portrait.scene_type == "activity"
+    group = classify(SceneFeatures(faces=2, **dict(base, persons=4)))
+    assert group.people_count == 4 and group.composition == "group"
+    assert choose_strategy(classify(SceneFeatures(faces=0, **base))) == "landscape_wide"
+
+
+def test_local_mode_makes_no_vendor_calls(sim):
+    generator = SmartVideoGenerator(api_key="sim", analysis_cache=PhotoAnalysisCache(path=None))
+    assert generator.analyzer == "local"
+    analyses = generator.analyze_photos([f"{sim.base_url}/images/local-{i}.jpg" for i in range(4)])
+    assert len(analyses) == 4 and all(a.confidence != 0.5 for a in analyses)
+    assert sim.simulator.requests["POST gemini.generate"] == 0
+    assert sim.simulator.requests["POST gemini.upload"] == 0
+
+
+def test_refine_sends_only_low_confidence(sim, tmp_path):
+    samples = synthetic_samples(1)
+    paths = []
+    for name, data, _ in samples:
+        path = tmp_path / f"{name}.jpg"
+        path.write_bytes(data)
+        paths.append(str(path))
+    analyzer = LocalPhotoAnalyzer()
+    low = [p for p, (_, data, _) in zip(paths, samples) if analyzer.analyze(data).confidence < 0.6]
+    assert 0 < len(low) < len(paths)  # 실내(단서 없음)만 낮다
+    generator = SmartVideoGenerator(api_key="sim", analysis_cache=PhotoAnalysisCache(path=None), analyzer="refine")
+    generator.analyze_photos(paths)
+    assert sim.simulator.requests["POST gemini.generate"] == 1
+    assert sim.simulator.requests["POST gemini.upload"] == len(low)
+    with pytest.raises(ValueError):
+        SmartVideoGenerator(api_key="sim", analyzer="vision")
+
+
+def test_remote_labels_round_trip(sim, tmp_path):
+    images = [f"{sim.base_url}/images/label-{i}.jpg" for i in range(3)]
+    generator = SmartVideoGenerator(api_key="sim", analysis_cache=PhotoAnalysisCache(path=None), analyzer="remote")
+    path = str(tmp_path / "labels.jsonl")
+    assert label_remote(images, path, generator) == 3
+    rows = [json.loads(line) for line in open(path, encoding="utf-8")]
+    assert [r["image"] for r in rows] == images
+    report = run_agreement(load_labels(path))
+    assert report.samples == 3 and 0.0 <= report.strategy <= 1.0
+
+
+def test_image_video_generator_uses_local_analysis(tmp_path):
+    food = next(data for name, data, _ in synthetic_samples(1) if name.startswith("food"))
+    path = tmp_path / "dish.jpg"
+    path.write_bytes(food)
+    generator = GeminiImageVideoGenerator(api_key="offline")
+    assert generator.analyze_image_content(str(path)) == "food_scene"  # URL 이 아니라 내용으로
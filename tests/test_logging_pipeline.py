@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+로깅 파이프라인 테스트 (JSON 레코드, 진행 메시지 간격 제한)
+"""
+
+import json
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.utils.logging_config import JsonFormatter, RateLimitFilter
+
+
+def _record(msg, **extra):
+    record = logging.makeLogRecord({"name": "progress", "levelno": logging.INFO, "levelname": "INFO", "msg": msg})
+    for k, v in extra.items():
+        setattr(record, k, v)
+    return record
+
+
+def test_rate_limit_suppresses_repeats_and_counts():
+    f = RateLimitFilter(interval=60)
+    assert f.filter(_record("poll 0", rate_key="runway:progress"))
+    assert not any(f.filter(_record(f"poll {i}", rate_key="runway:progress")) for i in range(1, 10))
+    # 다른 키, rate_key 없는 레코드, 경고는 통과
+    assert f.filter(_record("poll", rate_key="higgs:progress"))
+    assert f.filter(_record("plain"))
+    warn = _record("slow", rate_key="runway:progress")
+    warn.levelno = logging.WARNING
+    assert f.filter(warn)
+
+    f.interval = 0
+    passed = _record("poll 10", rate_key="runway:progress")
+    assert f.filter(passed)
+    assert passed.suppressed == 9
+
+
+def test_json_formatter_includes_fields():
+    line = JsonFormatter().format(_record("done", event="info", fields={"source": "runway", "task_id": "t1"}))
+    data = json.loads(line)
+    assert data["msg"] == "done"
+    assert data["event"] == "info"
+    assert data["task_id"] == "t1"
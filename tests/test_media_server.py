@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+미디어 사이드카 테스트 (전체 GET, Range 206 과 Content-Range, 범위 밖 416, 다운로드 이름,
+outputs 밖으로 나가는 경로 거부, media_url)
+"""
+
+import os
+import sys
+
+import pytest
+from starlette.applications import Starlette
+from starlette.testclient import TestClient
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.server.media import media_routes, resolve_media_path
+from src.server.runner import media_url
+
+VIDEO = bytes(range(256)) * 40  # 10240 바이트
+
+
+@pytest.fixture
+def media(tmp_path):
+    root = tmp_path / "outputs"
+    (root / "4454757").mkdir(parents=True)
+    (root / "4454757" / "veo_1.mp4").write_bytes(VIDEO)
+    (tmp_path / "secret.txt").write_text("secret")
+    return root, TestClient(Starlette(routes=media_routes(str(root))))
+
+
+def test_full_get_and_download_name(media):
+    _, client = media
+    resp = client.get("/media/4454757/veo_1.mp4")
+    assert resp.status_code == 200 and resp.content == VIDEO
+    assert resp.headers["content-type"] == "video/mp4"
+    assert resp.headers["accept-ranges"] == "bytes"
+    assert "content-disposition" not in resp.headers  # 인라인 재생
+
+    resp = client.get("/media/4454757/veo_1.mp4?download=1")
+    assert resp.headers["content-disposition"] == 'attachment; filename="veo_1.mp4"'
+    assert client.get("/media/4454757/missing.mp4").status_code == 404
+
+
+def test_range_requests(media):
+    _, client = media
+    resp = client.get("/media/4454757/veo_1.mp4", headers={"Range": "bytes=100-1099"})
+    assert resp.status_code == 206
+    assert resp.headers["content-range"] == f"bytes 100-1099/{len(VIDEO)}"
+    assert resp.content == VIDEO[100:1100]
+
+    resp = client.get("/media/4454757/veo_1.mp4", headers={"Range": "bytes=10000-"})
+    assert resp.status_code == 206 and resp.content == VIDEO[10000:]
+    assert resp.headers["content-range"] == f"bytes 10000-{len(VIDEO) - 1}/{len(VIDEO)}"
+
+    resp = client.get("/media/4454757/veo_1.mp4", headers={"Range": f"bytes={len(VIDEO)}-{len(VIDEO) + 10}"})
+    assert resp.status_code == 416
+    assert resp.headers["content-range"].endswith(f"*/{len(VIDEO)}")
+
+
+def test_paths_outside_root_are_rejected(media, tmp_path):
+    root, client = media
+    for path in ("/media/%2e%2e/secret.txt", "/media/4454757/%2e%2e/%2e%2e/secret.txt", f"/media/{tmp_path}/secret.txt"):
+        resp = client.get(path)
+        assert resp.status_code == 403, path
+        assert b"secret" not in resp.content
+
+    for rel in ("../secret.txt", str(tmp_path / "secret.txt"), "4454757/../../secret.txt"):
+        with pytest.raises(PermissionError):
+            resolve_media_path(rel, str(root))
+    assert resolve_media_path("4454757/../4454757/veo_1.mp4", str(root)) == os.path.realpath(root / "4454757" / "veo_1.mp4")
+
+    # outputs 안의 심볼릭 링크로 밖을 가리켜도 막는다
+    os.symlink(tmp_path / "secret.txt", root / "link.txt")
+    assert client.get("/media/link.txt").status_code == 403
+
+
+def test_media_url_is_relative_to_root(media, monkeypatch):
+    root, _ = media
+    monkeypatch.setenv("SIDECAR_PUBLIC_URL", "https://ads.example.com/sidecar/")
+    path = str(root / "4454757" / "veo_1.mp4")
+    assert media_url(path, media_root=str(root)) == "https://ads.example.com/sidecar/media/4454757/veo_1.mp4"
+    assert media_url(path, download=True, media_root=str(root)).endswith("veo_1.mp4?download=1")
+    (root / "4454757" / "한글 이름.mp4").write_bytes(b"x")
+    assert media_url(str(root / "4454757" / "한글 이름.mp4"), media_root=str(root)).endswith(
+        "/media/4454757/%ED%95%9C%EA%B8%80%20%EC%9D%B4%EB%A6%84.mp4"
+    )
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+메트릭 레지스트리 / 주간 리포트 집계 / 렌더 시간 기록 / 스냅샷 파일 회전 테스트
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from scripts.metrics_report import hist_quantile, load_snapshots, window_deltas
+from src.utils.metrics import RENDER_FPS, RENDER_SECONDS, MetricsRegistry, snapshot_files, track_render, write_snapshot
+
+
+def test_prometheus_text_format():
+    reg = MetricsRegistry()
+    jobs = reg.counter("jobs", "Jobs", ["engine"])
+    lat = reg.histogram("latency_seconds", "Latency", ["engine"], buckets=(0.1, 1.0))
+    jobs.inc(engine="runway")
+    jobs.inc(2, engine="runway")
+    lat.observe(0.05, engine="runway")
+    lat.observe(0.5, engine="runway")
+
+    text = reg.render()
+    assert "# TYPE display_ads_jobs counter" in text
+    assert 'display_ads_jobs_total{engine="runway"} 3' in text
+    assert 'display_ads_latency_seconds_bucket{engine="runway",le="0.1"} 1' in text
+    assert 'display_ads_latency_seconds_bucket{engine="runway",le="+Inf"} 2' in text
+    assert 'display_ads_latency_seconds_count{engine="runway"} 2' in text
+
+
+def test_window_deltas_per_process():
+    reg = MetricsRegistry()
+    jobs = reg.counter("vendor_jobs", "Jobs", ["engine", "status"])
+    jobs.inc(5, engine="veo", status="succeeded")
+    before = {"ts": 100.0, "pid": 1, "metrics": reg.snapshot()}
+    jobs.inc(3, engine="veo", status="succeeded")
+    after = {"ts": 200.0, "pid": 1, "metrics": reg.snapshot()}
+    other = {"ts": 150.0, "pid": 2, "metrics": reg.snapshot()}  # 기간 중 시작한 다른 프로세스
+
+    merged = window_deltas([before, after, other], start_ts=120.0, end_ts=300.0)
+    assert merged["display_ads_vendor_jobs"]["values"]["veo|succeeded"] == 3 + 8
+
+
+def test_hist_quantile_interpolates():
+    assert hist_quantile(0.5, [1.0, 2.0], [0, 10, 0]) == 1.5
+    assert hist_quantile(0.5, [1.0], [0, 0]) is None
+
+
+def test_track_render_times_failed_renders_without_fps():
+    before = RENDER_SECONDS.count(renderer="test_fail"), RENDER_FPS.count(renderer="test_fail")
+    with track_render("test_fail", 30):
+        pass
+    with pytest.raises(RuntimeError):
+        with track_render("test_fail", 30):
+            raise RuntimeError("ffmpeg 실패")
+    assert RENDER_SECONDS.count(renderer="test_fail") - before[0] == 2  # 실패도 시간은 남긴다
+    assert RENDER_FPS.count(renderer="test_fail") - before[1] == 1
+
+
+def test_snapshot_file_rotates(tmp_path):
+    reg = MetricsRegistry()
+    reg.counter("jobs_total", "jobs").inc()
+    path = str(tmp_path / "metrics.jsonl")
+    for _ in range(12):
+        write_snapshot(path, reg, max_bytes=300, backups=2)
+    files = snapshot_files(path, backups=2)
+    assert files == [f"{path}.2", f"{path}.1", path]
+    assert all(os.path.getsize(p) <= 300 for p in files)
+    snaps = [s for p in files for s in load_snapshots(p)]
+    assert [s["ts"] for s in snaps] == sorted(s["ts"] for s in snaps)
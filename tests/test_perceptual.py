@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+지각 해시 중복 제거 테스트 (크롭/크기/재압축은 같은 사진, 다른 사진은 멀리, 묶음 순서와 대표 선택,
+렌더링 인덱스, 배치에서 같은 사진 건너뛰기)
+"""
+
+import asyncio
+import io
+import os
+import sys
+
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from scripts import run_batch
+from src.engines import EngineCapabilities, LocalEngine
+from src.utils.perceptual import (
+    DEDUPE_MAX_DISTANCE,
+    RenderedIndex,
+    collapse,
+    distances,
+    from_hex,
+    hash_images,
+    leaders,
+    to_hex,
+)
+
+
+def _photo(seed, width=1200, height=800):
+    """저주파 색 덩어리 + 질감 (실제 사진처럼 구조가 있는 이미지)."""
+    rng = np.random.default_rng(seed)
+    base = cv2.resize(rng.integers(0, 256, (6, 9, 3)).astype(np.uint8), (width, height), interpolation=cv2.INTER_CUBIC)
+    texture = cv2.GaussianBlur(rng.normal(0, 25, (height, width, 3)).astype(np.float32), (0, 0), 3)
+    return Image.fromarray(np.clip(base + texture, 0, 255).astype(np.uint8))
+
+
+def _jpeg(image, quality=90):
+    buf = io.BytesIO()
+    image.save(buf, "JPEG", quality=quality)
+    return buf.getvalue()
+
+
+def _crop(image, frac):
+    w, h = image.size
+    return image.crop((int(w * frac), int(h * frac), int(w * (1 - frac)), int(h * (1 - frac))))
+
+
+def test_variants_are_near_and_different_photos_far():
+    photo = _photo(0)
+    variants = [photo.resize((600, 400)), _crop(photo, 0.04), Image.open(io.BytesIO(_jpeg(photo, 35)))]
+    hashes = hash_images([_jpeg(photo)] + [_jpeg(v) for v in variants])
+    assert distances(hashes[:1], hashes[1:]).max() <= DEDUPE_MAX_DISTANCE
+
+    others = hash_images([_jpeg(_photo(seed)) for seed in range(1, 13)])
+    d = distances(others, others)
+    assert d[np.triu_indices(len(others), 1)].min() > DEDUPE_MAX_DISTANCE
+    assert distances(hashes[:1], others).min() > DEDUPE_MAX_DISTANCE
+
+
+def test_hashes_accept_images_and_round_trip_hex():
+    photo = _photo(3)
+    from_bytes, from_image, from_array = hash_images([_jpeg(photo, 95), photo, np.asarray(photo)])
+    assert distances(from_bytes[None], np.stack([from_image, from_array])).max() <= 4
+    assert (from_hex(to_hex(from_image)) == from_image).all()
+    assert hash_images([]).shape == (0, 2)
+
+
+def test_collapse_keeps_first_position_and_best_scored_member():
+    a, b, c = _photo(10), _photo(11), _photo(12)
+    images = [a.resize((400, 266)), b, a, c, _crop(b, 0.03)]
+    items = [{"filename": f"{i}.jpg", "score": float(img.width * img.height)} for i, img in enumerate(images)]
+    hashes = hash_images(images)
+    assert leaders(hashes).tolist() == [0, 1, 0, 3, 1]
+
+    survivors = collapse(items, hashes, score=lambda it: it["score"])
+    # 묶음 자리는 처음 나온 순서 (a, b, c), 남는 항목은 큰 사진
+    assert [s["filename"] for s in survivors] == ["2.jpg", "1.jpg", "3.jpg"]
+    assert survivors[0]["duplicates"] == ["0.jpg"]
+    assert survivors[1]["duplicates"] == ["4.jpg"]
+    assert survivors[2]["duplicates"] == []
+    # 점수가 없으면 먼저 나온 항목
+    assert [s["filename"] for s in collapse(items, hashes)] == ["0.jpg", "1.jpg", "3.jpg"]
+
+
+def test_rendered_index_persists_and_filters_by_key(tmp_path):
+    path = str(tmp_path / "rendered.jsonl")
+    photo = _photo(20)
+    hashes = hash_images([photo, _photo(21)])
+    index = RenderedIndex(path)
+    index.add(hashes[0], engine="veo", prompt="", output="a.mp4")
+
+    reloaded = RenderedIndex(path)
+    assert len(reloaded) == 1
+    again = hash_images([_crop(photo, 0.03)])
+    found = reloaded.find(again, engine="veo", prompt="")[0]
+    assert found["output"] == "a.mp4" and found["distance"] <= DEDUPE_MAX_DISTANCE
+    assert reloaded.find(again, engine="higgs", prompt="") == [None]
+    assert reloaded.find(hashes[1:], engine="veo", prompt="") == [None]
+
+
+class StampEngine(LocalEngine):
+    name = "stamp"
+    capabilities = EngineCapabilities(kind="local", ratios=(), durations=())
+    rendered = []
+
+    def render(self, request):
+        type(self).rendered.append(request.image_path)
+        with open(request.output_path, "wb") as f:
+            f.write(b"x")
+        return request.output_path
+
+
+@pytest.fixture
+def stamp(test_engines):
+    test_engines(StampEngine)
+    StampEngine.rendered = []
+
+
+def test_batch_skips_photos_already_rendered(stamp, tmp_path, capsys):
+    paths = []
+    for name, image in [("a", _photo(30)), ("a_small", _photo(30).resize((600, 400))), ("b", _photo(31))]:
+        paths.append(str(tmp_path / f"{name}.jpg"))
+        image.save(paths[-1], quality=90)
+    jobs = [{"engine": "stamp", "image": p} for p in paths] + [{"engine": "stamp", "image": paths[0], "prompt": "zoom"}]
+    index = RenderedIndex(str(tmp_path / "rendered.jsonl"))
+
+    results = asyncio.run(run_batch.run_jobs(jobs, 2, str(tmp_path), index))
+    assert [r["status"] for r in results] == ["succeeded", "skipped", "succeeded", "succeeded"]
+    assert results[1]["duplicate_of"] == {"index": 0}
+    assert len(StampEngine.rendered) == 3 and len(index) == 3
+
+    # 다음 배치: 이미 렌더링한 사진은 이전 결과를 가리킨다
+    again = asyncio.run(run_batch.run_jobs(jobs[1:2], 1, str(tmp_path), RenderedIndex(index.path)))
+    assert again[0]["status"] == "skipped"
+    assert again[0]["duplicate_of"]["output"] == results[0]["output"]
+    capsys.readouterr()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+사진 분석 테스트 (구조화 응답 파싱, 배치 요청 한 번으로 후보 순위, 이미지 해시 + 프롬프트 버전 캐시)
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.core import photo_analysis
+from src.core.photo_analysis import PhotoAnalysis, PhotoAnalysisCache, parse_batch
+from src.core.smart_video_generator import SmartVideoGenerator
+
+
+def _item(**kw):
+    item = {
+        "has_people": False, "people_count": 0, "scene_type": "Landscape", "composition": "wide",
+        "dominant_elements": ["Nature"], "suggested_motion": "pan", "confidence": 1.7, "marketing_score": 0.4,
+    }
+    item.update(kw)
+    return item
+
+
+def test_parse_batch_orders_by_index_and_skips_broken():
+    text = json.dumps({"photos": [_item(index=2, people_count=3), _item(index=0), {"index": 1, "scene_type": "food"}]})
+    first, broken, third = parse_batch(text, 3)
+    assert broken is None
+    assert first.scene_type == "landscape" and first.dominant_elements == ["nature"] and first.confidence == 1.0
+    assert third.people_count == 3 and third.has_people  # 인원이 있으면 has_people 도 참
+    with pytest.raises(ValueError):
+        PhotoAnalysis.from_json({"has_people": True})
+
+
+def test_rank_candidates_in_one_call_and_cache(sim, tmp_path, monkeypatch):
+    path = str(tmp_path / "analysis.jsonl")
+    generator = SmartVideoGenerator(api_key="sim", analysis_cache=PhotoAnalysisCache(path=path), analyzer="remote")
+    urls = [f"{sim.base_url}/images/cand-{i}.jpg" for i in range(8)]
+    ranked = generator.rank_photos(urls + urls[:1])  # 같은 이미지가 또 있어도 한 항목
+    scores = [a.marketing_score for _, a in ranked]
+    assert scores == sorted(scores, reverse=True) and len(ranked) == 9
+    assert sim.simulator.requests["POST gemini.generate"] == 1
+    assert all(a.confidence > 0.5 for _, a in ranked)  # 기본값이 아니라 실제 응답
+
+    # 다시 순위를 매기면 (재시작 후에도) 분석 요청 없이 캐시에서
+    again = SmartVideoGenerator(api_key="sim", analysis_cache=PhotoAnalysisCache(path=path), analyzer="remote")
+    assert dict(again.rank_photos(urls)) == dict(ranked)
+    assert sim.simulator.requests["POST gemini.generate"] == 1
+
+    # 프롬프트 버전이 바뀌면 예전 결과는 쓰지 않는다
+    monkeypatch.setattr(photo_analysis, "PROMPT_VERSION", "next")
+    generator.analyze_photo(urls[0])
+    assert sim.simulator.requests["POST gemini.generate"] == 2
+
+
+def test_batch_size_and_fallback(sim, monkeypatch):
+    monkeypatch.setattr("src.core.smart_video_generator.PHOTO_ANALYSIS_BATCH", 3)
+    generator = SmartVideoGenerator(api_key="sim", analysis_cache=PhotoAnalysisCache(path=None), analyzer="remote")
+    urls = [f"{sim.base_url}/images/batch-{i}.jpg" for i in range(7)]
+    analyses = generator.analyze_photos(urls + ["http://127.0.0.1:9/missing.jpg"])
+    assert sim.simulator.requests["POST gemini.generate"] == 3  # 3 + 3 + 1
+    assert analyses[-1].confidence == 0.5  # 받지 못한 이미지는 기본 분석
+    assert len(generator.analysis_cache._entries) == 7
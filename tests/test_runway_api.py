@@ -17,7 +17,7 @@ headers = {
 }
 
 # 기본 API 연결 테스트
-base_url = "https://api.dev.runwayml.com"
+base_url = os.getenv("RUNWAY_BASE_URL", "https://api.dev.runwayml.com")  # 로컬 시뮬레이터: python -m src.sim
 
 print("🚀 Runway API 연결 테스트...")
 print(f"📡 Base URL: {base_url}")
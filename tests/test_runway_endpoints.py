@@ -3,6 +3,7 @@
 Runway API 엔드포인트 탐색
 """
 
+import os
 import requests
 import json
 
@@ -14,7 +15,7 @@ headers = {
     'X-Runway-Version': '2024-11-06'
 }
 
-base_url = "https://api.dev.runwayml.com"
+base_url = os.getenv("RUNWAY_BASE_URL", "https://api.dev.runwayml.com")  # 로컬 시뮬레이터: python -m src.sim
 
 # 가능한 엔드포인트들 테스트
 endpoints_to_test = [
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+단일 비행(single-flight) 테스트: 같은 요청이 동시에 들어오면 한 번만 실행되고
+모두 같은 결과를 받는지 (로컬 렌더 / 벤더 제출 / 생성 서비스 / 카탈로그 조회)
+"""
+
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from PIL import Image
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.engines import EngineCancelled, EngineCapabilities, EngineError, EngineRequest, EngineStats, LocalEngine, VendorScheduler
+from src.engines import get_engine
+from src.server.generation import GenerationService
+from src.sim import SimConfig
+from src.utils import catalog
+from src.utils.metrics import COALESCED_REQUESTS
+from src.utils.singleflight import SingleFlight, fingerprint
+
+
+@pytest.fixture
+def sim_config():
+    return SimConfig(queue_s=0.1, run_s=0.2, jitter=0.0, video_bytes=2048, seed=3)
+
+
+def _coalesced(flight):
+    return COALESCED_REQUESTS.value(flight=flight)
+
+
+class CountingEngine(LocalEngine):
+    name = "counting"
+    capabilities = EngineCapabilities(kind="local", ratios=(), durations=())
+    renders = 0
+    delay_s = 0.3
+
+    def render(self, request):
+        type(self).renders += 1
+        time.sleep(type(self).delay_s)
+        with open(request.output_path, "wb") as f:
+            f.write(f"render-{request.seed}".encode())
+        return request.output_path
+
+
+@pytest.fixture
+def counting(test_engines):
+    test_engines(CountingEngine)
+    CountingEngine.renders = 0
+
+
+def test_fingerprint_is_canonical():
+    assert fingerprint("a", x={"b": 1, "a": [1, 2]}) == fingerprint("a", x={"a": (1, 2), "b": 1})
+    assert fingerprint(b"img") == fingerprint(b"img") != fingerprint(b"img2")
+    assert fingerprint("a", seed=1) != fingerprint("a", seed=2)
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight("test")
+    calls = []
+    gate = threading.Event()
+
+    def work():
+        calls.append(1)
+        gate.wait(2)
+        return "value"
+
+    before = _coalesced("test")
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(flight.do, "k", work) for _ in range(8)]
+        time.sleep(0.2)
+        gate.set()
+        results = [f.result() for f in futures]
+    assert len(calls) == 1
+    assert [v for v, _ in results] == ["value"] * 8
+    assert sum(shared for _, shared in results) == 7
+    assert _coalesced("test") - before == 7
+    assert flight.in_flight() == 0
+
+    # 끝난 뒤의 호출은 다시 실행된다 (결과 캐시가 아님)
+    assert flight.do("k", work) == ("value", False) and len(calls) == 2
+
+    # 예외도 팔로워에게 그대로 전달
+    def boom():
+        time.sleep(0.2)
+        raise ValueError("boom")
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(flight.do, "e", boom) for _ in range(3)]
+        for f in futures:
+            with pytest.raises(ValueError, match="boom"):
+                f.result()
+
+
+def test_local_renders_coalesce_across_output_paths(counting, tmp_path):
+    scheduler = VendorScheduler(stats=EngineStats(path=None))
+    # 같은 이미지 내용이 다른 경로로 들어와도 같은 요청
+    for i in range(4):
+        (tmp_path / f"in_{i}.jpg").write_bytes(b"same image")
+
+    def one(i):
+        request = EngineRequest(output_path=str(tmp_path / f"out_{i}.mp4"), image_path=str(tmp_path / f"in_{i}.jpg"), seed=7)
+        return scheduler.run(get_engine("counting"), request)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        paths = list(pool.map(one, range(4)))
+    assert CountingEngine.renders == 1
+    assert paths == [str(tmp_path / f"out_{i}.mp4") for i in range(4)]
+    assert {open(p, "rb").read() for p in paths} == {b"render-7"}
+
+    # 시드가 다르면 별개 요청
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        list(pool.map(lambda s: scheduler.run(get_engine("counting"), EngineRequest(
+            output_path=str(tmp_path / f"seed_{s}.mp4"), image_path=str(tmp_path / "in_0.jpg"), seed=s)), [1, 2]))
+    assert CountingEngine.renders == 3
+
+
+def test_followers_get_their_copy_before_leader_cleans_up(counting, tmp_path):
+    scheduler = VendorScheduler(stats=EngineStats(path=None))
+    (tmp_path / "in.jpg").write_bytes(b"img")
+
+    def one(name):
+        request = EngineRequest(output_path=str(tmp_path / name / "out.mp4"), image_path=str(tmp_path / "in.jpg"))
+        os.makedirs(tmp_path / name, exist_ok=True)
+        path = scheduler.run(get_engine("counting"), request)
+        if name == "leader":
+            os.remove(path)  # 생성 서비스가 작업 공간을 지우는 것과 같다
+        return path
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        leader = pool.submit(one, "leader")
+        time.sleep(0.05)
+        followers = [pool.submit(one, f"f{i}") for i in range(2)]
+        leader.result()
+        paths = [f.result() for f in followers]
+    assert CountingEngine.renders == 1
+    assert paths == [str(tmp_path / f"f{i}" / "out.mp4") for i in range(2)]
+    assert all(open(p, "rb").read() == b"render-None" for p in paths)
+
+
+def test_followers_fail_when_leader_output_is_missing(counting, monkeypatch, tmp_path):
+    scheduler = VendorScheduler(stats=EngineStats(path=None))
+    (tmp_path / "in.jpg").write_bytes(b"img")
+
+    def no_file(self, request):
+        time.sleep(0.3)
+        return request.output_path
+
+    monkeypatch.setattr(CountingEngine, "render", no_file)
+
+    def one(name):
+        request = EngineRequest(output_path=str(tmp_path / name), image_path=str(tmp_path / "in.jpg"))
+        return scheduler.run(get_engine("counting"), request)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(one, "leader.mp4")
+        time.sleep(0.05)
+        follower = pool.submit(one, "follower.mp4")
+        assert leader.result() == str(tmp_path / "leader.mp4")
+        with pytest.raises(EngineError, match="공유할 결과 파일이 없습니다"):
+            follower.result()
+
+
+def test_cancelled_follower_leaves_leader_running(counting, tmp_path):
+    scheduler = VendorScheduler(stats=EngineStats(path=None))
+    (tmp_path / "in.jpg").write_bytes(b"img")
+    cancel = threading.Event()
+
+    def one(name, cancel_event=None):
+        request = EngineRequest(output_path=str(tmp_path / name), image_path=str(tmp_path / "in.jpg"))
+        return scheduler.run(get_engine("counting"), request, cancel=cancel_event)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(one, "leader.mp4")
+        time.sleep(0.05)
+        follower = pool.submit(one, "follower.mp4", cancel)
+        cancel.set()
+        with pytest.raises(EngineCancelled):
+            follower.result()
+        assert leader.result() == str(tmp_path / "leader.mp4")
+    assert CountingEngine.renders == 1 and not (tmp_path / "follower.mp4").exists()
+
+
+def test_vendor_submissions_coalesce(sim, monkeypatch, tmp_path):
+    monkeypatch.setenv("RUNWAY_LIVE", "1")
+    Image.new("RGB", (72, 128), (200, 120, 40)).save(tmp_path / "in.jpg")
+    scheduler = VendorScheduler(stats=EngineStats(path=None))
+    before = _coalesced("engine")
+
+    def one(i):
+        engine = get_engine("runway", api_key="sim", force_live=True)
+        engine.poll_interval_s = 0.05
+        request = EngineRequest(
+            output_path=str(tmp_path / f"runway_{i}.mp4"), image_path=str(tmp_path / "in.jpg"), prompt="p", seed=1
+        )
+        return scheduler.run(engine, request)
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        paths = list(pool.map(one, range(5)))
+    assert sim.simulator.requests["POST runway.submit"] == 1
+    assert len({open(p, "rb").read() for p in paths}) == 1
+    assert _coalesced("engine") - before == 4
+
+
+def test_service_attaches_duplicate_submissions(counting, tmp_path):
+    CountingEngine.delay_s = 0.5
+    service = GenerationService(workers=2, out_dir=str(tmp_path))
+    try:
+        spec = {"product_id": "4454757", "engine": "counting", "settings": {"image_base64": "aW1n", "prompt": "p"}}
+        before = _coalesced("job")
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            jobs = list(pool.map(lambda _: service.submit(dict(spec)), range(3)))
+        assert len({j.id for j in jobs}) == 1
+        job = jobs[0]
+        assert job.attached == 3 and _coalesced("job") - before == 2
+
+        # 붙은 제출이 남아 있으면 취소는 연결만 줄인다
+        service.cancel(job.id)
+        assert job.attached == 2 and not job.done
+        while not job.done:
+            time.sleep(0.02)
+        assert job.state == "succeeded" and CountingEngine.renders == 1
+        assert any(e["kind"] == "attach" for e in job.events)
+
+        # 끝난 작업에는 붙지 않는다
+        assert service.submit(dict(spec)).id != job.id
+    finally:
+        CountingEngine.delay_s = 0.3
+        service.shutdown()
+
+
+def test_catalog_fetch_coalesces(monkeypatch):
+    calls = []
+
+    class Resp:
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return {"data": {"images": [{"url": "https://img/1.jpg"}]}}
+
+    def fake_get(url, timeout):
+        calls.append(url)
+        time.sleep(0.2)
+        return Resp()
+
+    monkeypatch.setattr(catalog.requests, "get", fake_get)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda _: catalog.get_json("https://api/products/1/header"), range(4)))
+    assert len(calls) == 1
+    assert all(r == results[0] for r in results)
+    results[1]["data"]["images"].clear()  # 팔로워는 복사본
+    assert results[0]["data"]["images"]
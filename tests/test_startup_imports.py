@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+"""
+기동 경로 테스트 (``import app`` 이 무거운 모듈을 올리지 않는다 — ``scripts/bench_startup.py`` 와 같은 목록)
+"""
+
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from scripts.bench_startup import HEAVY_MODULES
+
+
+def test_app_import_keeps_heavy_modules_unloaded():
+    code = "import sys, app; print(' '.join(sorted(sys.modules)))"
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, timeout=120)
+    assert out.returncode == 0, out.stderr
+    loaded = set(out.stdout.split())
+    assert [m for m in HEAVY_MODULES + ("requests",) if m in loaded] == []
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+정적 텍스트 오버레이 테스트 (미리보기 = 영상 프레임, 예전 미리보기와 같은 배치, 프로세스 안 합성)
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.utils import text_overlay
+from src.utils.fonts import load_font
+from src.utils.text_overlay import OverlayStyle, overlay_text, preview_text_overlay, rasterize, render_preview
+
+SETTINGS = {"copy": "서울 야경 투어\n지금 예약", "position": "bottom", "font_size": 56, "bg_opacity": 0.5}
+
+
+def _frame(width=360, height=640, seed=0):
+    return np.random.default_rng(seed).integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+
+def _legacy_preview(image, text, style):
+    """예전 ``create_text_overlay_preview`` (RGBA 레이어를 그려 ``alpha_composite``)."""
+    img = image.convert("RGBA")
+    overlay = Image.new("RGBA", img.size, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(overlay)
+    font = load_font(style.font_size, text)
+    lines = text.split("\n")
+    line_height = style.font_size + style.line_gap
+    total = len(lines) * line_height
+    y_start = {"top": style.margin, "middle": (img.height - total) // 2}.get(style.position, img.height - total - style.margin)
+    max_width = max(draw.textlength(line, font=font) for line in lines)
+    draw.rectangle(
+        [(img.width - max_width) // 2 - style.padding, y_start - style.padding,
+         (img.width + max_width) // 2 + style.padding, y_start + total + style.padding],
+        fill=(0, 0, 0, int(255 * style.bg_opacity)),
+    )
+    img = Image.alpha_composite(img, overlay)
+    draw = ImageDraw.Draw(img)
+    bw = style.border_width
+    for i, line in enumerate(lines):
+        y = y_start + i * line_height
+        x = (img.width - draw.textlength(line, font=font)) // 2
+        for dx in (-bw, 0, bw):
+            for dy in (-bw, 0, bw):
+                if dx or dy:
+                    draw.text((x + dx, y + dy), line, font=font, fill=style.border_color)
+        draw.text((x, y), line, font=font, fill=style.font_color)
+    return img.convert("RGB")
+
+
+@pytest.mark.parametrize("position", ["top", "middle", "bottom"])
+def test_matches_legacy_preview_layout(position):
+    image = Image.fromarray(_frame(seed=1))
+    style = OverlayStyle(font_size=40, position=position, margin=40)
+    new = np.asarray(render_preview(image, "서울 야경\nNight tour", style), np.int16)
+    old = np.asarray(_legacy_preview(image, "서울 야경\nNight tour", style), np.int16)
+    assert np.abs(new - old).max() <= 2  # 반올림 차이만
+
+
+def test_layer_is_cropped_and_scaled():
+    style = OverlayStyle.from_settings(SETTINGS)
+    assert style.for_height(1280) is style
+    half = style.for_height(640)
+    assert (half.font_size, half.margin, half.padding) == (28, 40, 10)
+    layer = rasterize((360, 640), SETTINGS["copy"], half)
+    h, w = layer.rgba.shape[:2]
+    assert 0 < w < 360 and 0 < h < 640 and layer.y + h <= 640 - 40 + 10 + 1  # 박스 아래 끝 (사각형은 끝 좌표 포함)
+    assert rasterize((360, 640), "", half).empty
+
+
+def test_blend_video_matches_preview(tmp_path):
+    cv2 = pytest.importorskip("cv2")
+    frame = _frame()
+    src = str(tmp_path / "in.avi")
+    # 무손실 코덱으로 써야 프레임을 그대로 비교할 수 있다
+    writer = cv2.VideoWriter(src, cv2.VideoWriter_fourcc(*'MJPG'), 24.0, (360, 640))
+    for _ in range(12):
+        writer.write(frame)
+    writer.release()
+    cap = cv2.VideoCapture(src)
+    decoded = [cap.read()[1] for _ in range(12)]
+    cap.release()
+
+    layer = rasterize((360, 640), SETTINGS["copy"], OverlayStyle.from_settings(SETTINGS).for_height(640))
+    out = str(tmp_path / "out.avi")
+    assert text_overlay.blend_video(src, layer, out) == 12
+    preview = preview_text_overlay(Image.fromarray(decoded[0][..., ::-1]), SETTINGS)
+    expected = layer.bgr().composite(decoded[0].copy())
+    assert np.array_equal(np.asarray(preview)[..., ::-1], expected)
+
+
+def test_overlay_text_blend_mode(tmp_path, monkeypatch):
+    cv2 = pytest.importorskip("cv2")
+    src = str(tmp_path / "in.mp4")
+    writer = cv2.VideoWriter(src, cv2.VideoWriter_fourcc(*'mp4v'), 24.0, (360, 640))
+    for i in range(24):
+        writer.write(_frame(seed=i))
+    writer.release()
+
+    assert overlay_text(src, {"copy": ""}, str(tmp_path / "none.mp4")) == src
+    out = overlay_text(src, SETTINGS, str(tmp_path / "o" / "out.mp4"), mode="blend")
+    cap = cv2.VideoCapture(out)
+    assert int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) == 24
+    assert (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))) == (360, 640)
+    cap.release()
+    with pytest.raises(ValueError):
+        overlay_text(src, SETTINGS, out, mode="libass")
+
+    monkeypatch.setattr(text_overlay.shutil, "which", lambda _: None)
+    with pytest.raises(RuntimeError):
+        overlay_text(src, {**SETTINGS, "animation": "fade"}, out)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+트레이싱 테스트 (스팬 중첩과 부모 id, 예외 상태, JSONL 내보내기, 동기/비동기 traced, 샘플링)
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+import numpy as np
+import pytest
+from PIL import Image
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.utils.tracing import JsonlExporter, Tracer, cheap_value, current_span
+
+
+def _records(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.fixture
+def tracer(tmp_path):
+    return Tracer(JsonlExporter(str(tmp_path / "traces.jsonl"), flush_every=1000), sample_rate=1.0)
+
+
+def test_nested_spans_share_trace_and_link_parents(tracer):
+    with tracer.span("product", product_id="4454757") as root:
+        with tracer.span("stage") as stage:
+            assert current_span() is stage
+            with tracer.span("vendor.poll", image=Image.new("RGB", (72, 128)), frames=np.zeros((3, 4))) as leaf:
+                pass
+        assert current_span() is root
+    assert current_span() is None
+
+    assert root.parent_id is None and stage.parent_id == root.span_id and leaf.parent_id == stage.span_id
+    assert root.trace_id == stage.trace_id == leaf.trace_id != ""
+    assert leaf.attrs == {"image": "Image(72x128)", "frames": "ndarray(3, 4)"}
+
+
+def test_exception_marks_span_and_propagates(tracer):
+    seen = []
+    tracer.add_listener(lambda name, seconds, status: seen.append((name, status)))
+    with pytest.raises(ValueError):
+        with tracer.span("outer"):
+            with tracer.span("inner"):
+                raise ValueError("boom")
+    assert seen == [("inner", "error"), ("outer", "error")]
+
+
+def test_jsonl_export_buffers_until_flush(tracer):
+    path = tracer.exporter.path
+    with tracer.span("a", note="x" * 500):
+        with tracer.span("b"):
+            pass
+    assert not os.path.exists(path)  # flush_every 전에는 버퍼에만
+    tracer.flush()
+    b, a = _records(path)  # 끝난 순서 (자식 먼저)
+    assert (a["name"], b["name"]) == ("a", "b")
+    assert b["parent_id"] == a["span_id"] and b["trace_id"] == a["trace_id"]
+    assert a["status"] == "ok" and a["duration_ms"] >= b["duration_ms"] >= 0
+    assert a["attrs"]["note"].endswith("...") and len(a["attrs"]["note"]) == 203
+
+    small = JsonlExporter(path, flush_every=2)
+    small.export({"n": 1})
+    small.export({"n": 2})  # 가득 차면 바로 쓴다
+    assert [r.get("n") for r in _records(path)][-2:] == [1, 2]
+
+
+def test_traced_wraps_sync_and_async_functions(tracer):
+    @tracer.traced("sync.work", kind="test")
+    def work(x):
+        return current_span().name, x * 2
+
+    @tracer.traced()
+    async def fetch(x):
+        await asyncio.sleep(0.01)
+        return current_span().name, x + 1
+
+    assert work(2) == ("sync.work", 4) and work.__name__ == "work"
+    assert asyncio.run(fetch(1)) == ("fetch", 2)
+    tracer.flush()
+    records = {r["name"]: r for r in _records(tracer.exporter.path)}
+    assert records["sync.work"]["attrs"] == {"kind": "test"}
+    assert records["fetch"]["duration_ms"] >= 10  # await 가 끝날 때까지 잰다
+
+
+def test_unsampled_traces_notify_listeners_but_export_nothing(tmp_path):
+    tracer = Tracer(JsonlExporter(str(tmp_path / "t.jsonl")), sample_rate=0.0)
+    seen = []
+    tracer.add_listener(lambda name, seconds, status: seen.append(name))
+    with tracer.span("root") as root:
+        with tracer.span("child", x=1) as child:
+            pass
+    tracer.flush()
+    assert seen == ["child", "root"]
+    assert not root.sampled and not child.sampled and child.attrs == {}
+    assert not os.path.exists(tmp_path / "t.jsonl")
+    assert cheap_value([1, 2, 3]) == "list[3]" and cheap_value(None) is None
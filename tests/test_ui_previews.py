@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+UI 미리보기 메모/프래그먼트 테스트 (파라미터 해시 적중, LRU, 앱 스크립트 한 번 실행 + 프래그먼트만 다시 실행)
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+from PIL import Image
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.core.video_prompt import DEFAULT_STYLE, build_custom_prompt
+from src.utils import previews
+from src.utils.previews import PreviewCache, image_digest, params_key, resized_preview, text_preview, thumbnail
+from src.utils.text_overlay import preview_text_overlay
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def _photo(width=900, height=600, seed=0):
+    return Image.fromarray(np.random.default_rng(seed).integers(0, 256, (height, width, 3), dtype=np.uint8))
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(previews, "_cache", PreviewCache(max_entries=8))
+
+
+def test_keys_follow_pixels_and_params():
+    a, b = _photo(seed=1), _photo(seed=2)
+    assert image_digest(a) == image_digest(a.copy()) != image_digest(b)
+    assert params_key("text", "d", copy="x", font_size=64) == params_key("text", "d", font_size=64, copy="x")
+    assert params_key("text", "d", copy="x", font_size=64) != params_key("text", "d", copy="x", font_size=66)
+
+
+def test_previews_are_memoized_by_parameters():
+    photo = _photo()
+    digest = image_digest(photo)
+    resized, key = resized_preview(photo, 270, 480, digest=digest)
+    assert resized.size == (270, 480)
+    assert resized_preview(photo, 270, 480, digest=digest) == (resized, key)
+    assert resized_preview(photo, 540, 960, digest=digest)[0] is not resized
+
+    settings = {"copy": "서울 야경\nNight tour", "position": "bottom", "font_size": 64}
+    shown = text_preview(resized, settings, digest=key)
+    assert text_preview(resized, dict(settings), digest=key) is shown
+    assert np.array_equal(np.asarray(shown), np.asarray(preview_text_overlay(resized, settings)))
+    assert text_preview(resized, {**settings, "font_size": 70}, digest=key) is not shown
+    assert text_preview(resized, {"copy": ""}, digest=key) is resized
+
+    thumb = thumbnail(photo, (300, 300), digest=digest)
+    assert max(thumb.size) == 300 and thumbnail(photo, (300, 300), digest=digest) is thumb
+    assert thumbnail(thumb, (300, 300)) is thumb  # 이미 작으면 그대로
+
+
+def test_cache_evicts_least_recently_used():
+    cache = PreviewCache(max_entries=2)
+    cache.get_or_render("a", lambda: 1)
+    cache.get_or_render("b", lambda: 2)
+    assert cache.get_or_render("a", lambda: 0) == (1, True)
+    cache.get_or_render("c", lambda: 3)
+    assert len(cache) == 2
+    assert cache.get_or_render("b", lambda: 4) == (4, False)
+
+
+def test_prompt_builder_matches_ui_defaults():
+    prompt = build_custom_prompt({})
+    assert prompt == build_custom_prompt(DEFAULT_STYLE)
+    assert "Add a slow push-in camera movement slowly from eye level" in prompt
+    static = build_custom_prompt({"camera_movement": "static", "environmental_motion": [], "depth_of_field": True})
+    assert "push-in" not in static and "slow-moving clouds" not in static and "bokeh" in static
+
+
+def test_app_runs_and_fragment_reruns_alone(monkeypatch):
+    testing = pytest.importorskip("streamlit.testing.v1")
+    from src.server import runner
+    from src.utils import catalog
+
+    calls = []
+
+    def fake_get_json(url, timeout=None):
+        calls.append(url)
+        return {"data": {"title": "상하이 디즈니랜드", "ctaButton": {"price": {"salePrice": "89,000원"}}}}
+
+    monkeypatch.setattr(catalog, "get_json", fake_get_json)
+    monkeypatch.setattr(runner, "start_background_server", lambda *a, **k: None)
+    monkeypatch.setenv("TEXT_SETTINGS_UI", "1")
+    monkeypatch.chdir(ROOT)
+
+    photos = [_photo(seed=i) for i in range(3)]
+    items = [{
+        "filename": f"p{i}.jpg", "url": f"https://example.invalid/p{i}.jpg", "type": "NON_REVIEW", "image": p,
+        "width": p.width, "height": p.height, "is_portrait": False, "is_landscape": True, "digest": image_digest(p),
+    } for i, p in enumerate(photos)]
+    at = testing.AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=60)
+    at.session_state["product_id"] = "4454757"
+    at.session_state["product_id_current"] = "4454757"
+    at.session_state["analyzed_images"] = items
+    at.session_state["selected_image"] = items[0]
+    at.run()
+    assert not at.exception
+    assert at.session_state["text_settings"]["copy"] == "상하이 디즈니랜드\n지금 예약 · 89,000원"
+    assert at.session_state["video_settings"]["camera_speed"] == "slow"
+
+    # 위젯을 바꿔 다시 실행해도 카피는 다시 조회하지 않는다
+    next(w for w in at.slider if w.label == "글자 크기").set_value(80).run()
+    assert at.session_state["text_settings"]["font_size"] == 80
+    at.button(key="select_1").click().run()
+    assert not at.exception and at.session_state["selected_image"]["url"].endswith("p1.jpg")
+    assert len(calls) == 1
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+벤더 스케줄러 테스트 (요청 한도/동시 실행 한도가 있는 로컬 Runway 대역 서버)
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from PIL import Image
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.engines import EngineRequest, EngineStats, InsufficientCredits, VendorLimits, VendorScheduler, get_engine
+from src.engines.scheduler import TokenBucket
+from src.utils.metrics import RATE_LIMITED
+
+VIDEO = b"\x00\x00\x00\x18ftypmp42" + b"\x00" * 512
+
+
+class StandIn:
+    """Runway API 흉내: 초당 제출 수 / 동시 작업 수를 넘으면 429 + Retry-After."""
+
+    def __init__(self, submits_per_s=3, max_running=2, task_s=0.3, credits=1000.0, force_429=0):
+        self.submits_per_s = submits_per_s
+        self.max_running = max_running
+        self.task_s = task_s
+        self.credits = credits
+        self.force_429 = force_429
+        self.lock = threading.Lock()
+        self.submit_times = []
+        self.tasks = {}
+        self.rejected = 0
+        self.org_calls = 0
+        self.peak_running = 0
+
+    def running(self, now):
+        return sum(1 for t in self.tasks.values() if now - t < self.task_s)
+
+
+def make_handler(state: StandIn):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _json(self, code, body, headers=None):
+            data = json.dumps(body).encode()
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_HEAD(self):
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(VIDEO)))
+            self.end_headers()
+
+        def do_GET(self):
+            if self.path == "/v1/organization":
+                with state.lock:
+                    state.org_calls += 1
+                return self._json(200, {"creditBalance": state.credits})
+            if self.path.startswith("/v1/tasks/"):
+                started = state.tasks[self.path.rsplit("/", 1)[1]]
+                done = time.monotonic() - started >= state.task_s
+                url = f"http://127.0.0.1:{self.server.server_address[1]}/files/out.mp4"
+                return self._json(200, {"status": "SUCCEEDED", "output": [url]} if done else {"status": "RUNNING"})
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(VIDEO)))
+            self.end_headers()
+            self.wfile.write(VIDEO)
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            now = time.monotonic()
+            with state.lock:
+                recent = [t for t in state.submit_times if now - t < 1.0]
+                limited = state.force_429 > 0 or len(recent) >= state.submits_per_s or state.running(now) >= state.max_running
+                if limited:
+                    state.force_429 = max(0, state.force_429 - 1)
+                    state.rejected += 1
+                else:
+                    state.submit_times = recent + [now]
+                    task_id = f"task-{len(state.tasks)}"
+                    state.tasks[task_id] = now
+                    state.peak_running = max(state.peak_running, state.running(now))
+            if limited:
+                return self._json(429, {"error": "rate limited"}, {"Retry-After": "1"})
+            self._json(200, {"id": task_id})
+
+    return Handler
+
+
+@pytest.fixture
+def stand_in(monkeypatch, tmp_path):
+    state = StandIn()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(state))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setenv("RUNWAY_BASE_URL", f"http://127.0.0.1:{server.server_address[1]}")
+    monkeypatch.setenv("RUNWAY_API_KEY", "test")
+    monkeypatch.setenv("RUNWAY_LIVE", "1")
+    Image.new("RGB", (64, 96), (10, 20, 30)).save(tmp_path / "in.jpg")
+    yield state
+    server.shutdown()
+
+
+def _engine():
+    engine = get_engine("runway", model="gen3a_turbo")
+    engine.poll_interval_s = 0.05
+    return engine
+
+
+def _request(tmp_path, i):
+    return EngineRequest(output_path=str(tmp_path / f"out_{i}.mp4"), image_path=str(tmp_path / "in.jpg"), duration=5, seed=i)
+
+
+def test_token_bucket_refill_and_pause():
+    now = [0.0]
+    bucket = TokenBucket(rate_per_s=2.0, burst=2, clock=lambda: now[0])
+    assert bucket.reserve() == 0 and bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.5)
+    now[0] = 0.5
+    assert bucket.reserve() == 0
+    bucket.pause(3.0)
+    assert bucket.reserve() == pytest.approx(3.0)
+    now[0] = 3.5
+    assert bucket.reserve() == 0  # 재개 직후 재시도 1건
+    assert bucket.reserve() == pytest.approx(0.5)
+
+
+def test_limits_keep_burst_under_vendor_caps(stand_in, tmp_path):
+    # 대역 서버 한도(초당 3건, 동시 2건)보다 보수적으로
+    scheduler = VendorScheduler({"runway": VendorLimits(rate_per_min=90, burst=1, max_in_flight=2)}, stats=EngineStats(path=None))
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        paths = list(pool.map(lambda i: scheduler.run(_engine(), _request(tmp_path, i)), range(6)))
+    assert all(open(p, "rb").read() == VIDEO for p in paths)
+    assert stand_in.rejected == 0
+    assert stand_in.peak_running <= 2
+    assert stand_in.org_calls == 1  # 크레딧 잔액은 캐시
+
+
+def test_retry_after_on_429(stand_in, tmp_path):
+    stand_in.force_429 = 1
+    before = RATE_LIMITED.value(engine="runway", call="submit")
+    scheduler = VendorScheduler({"runway": VendorLimits(backoff_base_s=0.1)}, stats=EngineStats(path=None))
+    t0 = time.monotonic()
+    assert scheduler.run(_engine(), _request(tmp_path, 0))
+    assert stand_in.rejected == 1
+    assert time.monotonic() - t0 >= 1.0  # Retry-After 존중
+    assert RATE_LIMITED.value(engine="runway", call="submit") == before + 1
+
+
+def test_insufficient_credits(stand_in, tmp_path):
+    stand_in.credits = 60  # gen3a_turbo 5초 = 25 크레딧 → 2건만 가능
+    scheduler = VendorScheduler(stats=EngineStats(path=None))
+    scheduler.run(_engine(), _request(tmp_path, 0))
+    scheduler.run(_engine(), _request(tmp_path, 1))
+    with pytest.raises(InsufficientCredits):
+        scheduler.run(_engine(), _request(tmp_path, 2))
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Veo 변형(A/B) 생성 테스트 (작업 묶기 계획, 작업당 여러 편, 작업 여러 개 동시 대기, 작업 하나의 변형 등록)
+"""
+
+import os
+import sys
+import time
+
+import pytest
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.core.photo_analysis import PhotoAnalysisCache
+from src.core.smart_video_generator import SmartVideoGenerator
+from src.engines import EngineRequest, get_engine, variant_paths
+from src.engines.registry import load_engine_class
+from src.server.client import GenerationClient
+from src.server.generation import GenerationService
+from src.sim import SimConfig
+from src.sim.variants import run_variants
+from src.utils import veo_operations
+from src.utils.veo_operations import plan_operations
+
+
+@pytest.fixture
+def sim_config():
+    return SimConfig(queue_s=0.05, run_s=0.2, jitter=0.0, video_bytes=4096, seed=1)
+
+
+@pytest.fixture
+def sim(sim, monkeypatch):
+    monkeypatch.setattr(load_engine_class("veo"), "poll_interval_s", 0.05)  # 엔진 모듈은 테스트 안에서만 불러온다
+    return sim
+
+
+def test_plan_groups_same_prompt_up_to_limit():
+    assert plan_operations(["a"], 5, 2) == [("a", 2), ("a", 2), ("a", 1)]
+    assert plan_operations(["a", "b"], 3, 4) == [("a", 2), ("b", 1)]
+    assert variant_paths("out/x.mp4", 3) == ["out/x.mp4", "out/x_v1.mp4", "out/x_v2.mp4"]
+    with pytest.raises(ValueError):
+        plan_operations(["a"], veo_operations.VEO_MAX_VARIANTS + 1, 1)
+
+
+def test_engine_variants_in_one_operation(sim, tmp_path, monkeypatch):
+    monkeypatch.setattr(veo_operations, "VEO_MAX_VIDEOS_PER_OPERATION", 4)
+    engine = get_engine("veo", api_key="sim")
+    request = EngineRequest(output_path=str(tmp_path / "ad.mp4"), prompt="p", options={"variants": 3})
+    assert engine.estimate_cost(request) == 3 * engine.capabilities.estimate_cost(5)
+    assert engine.run(request) == request.output_path
+    assert all(os.path.getsize(p) == 4096 for p in variant_paths(request.output_path, 3))
+    assert sim.simulator.requests["POST veo.submit"] == 1
+    assert sim.simulator.requests["GET file"] == 3
+
+
+def test_engine_variants_across_operations(sim, tmp_path):
+    # Veo 3 는 작업당 1편 — 프롬프트마다 작업을 내고 같이 기다린다
+    engine = get_engine("veo", api_key="sim")
+    request = EngineRequest(
+        output_path=str(tmp_path / "ad.mp4"), prompt="p", options={"variants": 2, "variant_prompts": ["a", "b"]},
+    )
+    engine.run(request)
+    assert sim.simulator.requests["POST veo.submit"] == 2
+    assert all(os.path.isfile(p) for p in variant_paths(request.output_path, 2))
+
+
+def test_service_registers_variants_of_one_job(sim, tmp_path):
+    import threading
+
+    import uvicorn
+    from starlette.applications import Starlette
+
+    from src.server.jobs_api import job_routes
+
+    svc = GenerationService(workers=1, out_dir=str(tmp_path))
+    server = uvicorn.Server(uvicorn.Config(Starlette(routes=job_routes(svc)), host="127.0.0.1", port=0, log_level="warning"))
+    server.install_signal_handlers = lambda: None
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    client = GenerationClient(f"http://127.0.0.1:{server.servers[0].sockets[0].getsockname()[1]}")
+    try:
+        job = client.submit("veo", {
+            "image_url": f"{sim.base_url}/images/p.jpg", "prompt": "p",
+            "options": {"variants": 2}, "engine_options": {"api_key": "sim"},
+        }, product_id="ab")
+        final = client.wait(job["id"])
+        assert final["state"] == "succeeded", final
+        variants = final["metadata"]["variants"]
+        assert variants[0] == final["output_path"] and len(variants) == 2
+        assert requests.get(client.artifact_url(job["id"], variant=1), timeout=5).content == open(variants[1], "rb").read()
+        assert requests.get(client.artifact_url(job["id"], variant=2), timeout=5).status_code == 404
+    finally:
+        server.should_exit = True
+        svc.shutdown()
+
+
+def test_smart_generator_variants_use_strategy_table(sim, tmp_path):
+    generator = SmartVideoGenerator(api_key="sim", analysis_cache=PhotoAnalysisCache(path=None))
+    generator.poll_interval_s = 0.05
+    paths = generator.generate_marketing_variants(f"{sim.base_url}/images/v.jpg", str(tmp_path / "m.mp4"), 3)
+    assert paths == variant_paths(str(tmp_path / "m.mp4"), 3) and all(os.path.isfile(p) for p in paths)
+    assert sim.simulator.requests["POST veo.submit"] == 3  # 전략이 달라 프롬프트마다 작업 하나
+
+
+def test_variant_mode_beats_sequential_wall_time(sim, tmp_path):
+    sequential = run_variants(sim, "sequential", 3, out_dir=str(tmp_path / "s"), poll_interval_s=0.05)
+    concurrent = run_variants(sim, "concurrent", 3, out_dir=str(tmp_path / "c"), poll_interval_s=0.05)
+    multi = run_variants(sim, "multi", 3, out_dir=str(tmp_path / "m"), poll_interval_s=0.05)
+    assert sequential.produced == concurrent.produced == multi.produced == 3
+    assert (sequential.operations, concurrent.operations, multi.operations) == (3, 3, 1)
+    assert concurrent.per_variant_s < sequential.per_variant_s
+    assert multi.per_variant_s < sequential.per_variant_s
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+웹훅 수신 테스트: 로컬 Higgs 대역 서버가 완료 콜백을 보내면 엔진이 바로 깨어나는지,
+폴링 대비 완료 감지 지연과 상태 조회 요청 수를 비교한다.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.testclient import TestClient
+
+from src.engines import EngineRequest, get_engine
+from src.engines.jobs import JobStore
+from src.server import runner
+from src.server.webhooks import sign, webhook_routes
+from src.utils.metrics import WEBHOOK_EVENTS
+
+VIDEO = b"\x00\x00\x00\x18ftypmp42" + b"\x00" * 256
+SECRET = "s3cret"
+
+
+class HiggsStandIn:
+    """job set 을 task_s 뒤 완료하고, 등록된 webhook 으로 job set 을 POST 한다."""
+
+    def __init__(self, task_s=0.3):
+        self.task_s = task_s
+        self.base = ""
+        self.jobs = {}
+        self.status_calls = 0
+        self.completed_at = {}
+
+    def job_set(self, job_id):
+        done = time.monotonic() - self.jobs[job_id]["t0"] >= self.task_s
+        job = {"status": "completed", "results": {"raw": {"url": f"{self.base}/files/{job_id}.mp4"}}} if done else {"status": "processing"}
+        return {"id": job_id, "jobs": [job]}
+
+    def finish_later(self, job_id, webhook):
+        time.sleep(self.task_s)
+        self.completed_at[job_id] = time.monotonic()
+        if webhook:
+            body = json.dumps(self.job_set(job_id)).encode()
+            requests.post(webhook["url"], data=body, headers={"X-Webhook-Secret": webhook["secret"]}, timeout=5)
+
+
+def make_handler(state: HiggsStandIn):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _json(self, code, body):
+            data = json.dumps(body).encode()
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self):
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            job_id = f"js-{len(state.jobs)}"
+            state.jobs[job_id] = {"t0": time.monotonic()}
+            threading.Thread(target=state.finish_later, args=(job_id, payload.get("webhook")), daemon=True).start()
+            self._json(200, {"id": job_id})
+
+        def do_HEAD(self):
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(VIDEO)))
+            self.end_headers()
+
+        def do_GET(self):
+            if self.path.startswith("/v1/job-sets/"):
+                state.status_calls += 1
+                return self._json(200, state.job_set(self.path.rsplit("/", 1)[1]))
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(VIDEO)))
+            self.end_headers()
+            self.wfile.write(VIDEO)
+
+    return Handler
+
+
+@pytest.fixture
+def higgs(monkeypatch):
+    state = HiggsStandIn()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(state))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    state.base = f"http://127.0.0.1:{server.server_address[1]}"
+    monkeypatch.setenv("HIGGS_BASE_URL", state.base)
+    yield state
+    server.shutdown()
+
+
+@pytest.fixture
+def receiver(monkeypatch):
+    """웹훅 라우트만 올린 수신 서버 (사이드카 대신 임의 포트)."""
+    monkeypatch.setenv("WEBHOOK_SECRET", SECRET)
+    monkeypatch.setattr("src.engines.jobs._secret", None)
+    monkeypatch.setattr(runner, "start_background_server", lambda *a, **kw: None)
+    server = uvicorn.Server(uvicorn.Config(Starlette(routes=webhook_routes()), host="127.0.0.1", port=0, log_level="warning"))
+    server.install_signal_handlers = lambda: None
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    monkeypatch.setenv("WEBHOOK_PUBLIC_URL", f"http://127.0.0.1:{port}")
+    yield
+    server.should_exit = True
+
+
+def _run_higgs(tmp_path, name):
+    engine = get_engine("higgs", api_key="k", api_secret="s")
+    engine.poll_interval_s = 0.5
+    engine.webhook_fallback_interval_s = 30.0
+    request = EngineRequest(output_path=str(tmp_path / f"{name}.mp4"), image_url="http://img/in.jpg")
+    handle = engine.submit(request)
+    status = engine.wait(handle)
+    detected = time.monotonic()
+    engine.fetch(handle, status, request.output_path)
+    return handle, detected
+
+
+def test_callback_vs_polling(higgs, receiver, tmp_path, monkeypatch):
+    hook, hook_detected = _run_higgs(tmp_path, "hook")
+    hook_calls = higgs.status_calls
+    assert hook.webhook
+    assert (tmp_path / "hook.mp4").read_bytes() == VIDEO
+
+    monkeypatch.delenv("WEBHOOK_PUBLIC_URL")
+    poll, poll_detected = _run_higgs(tmp_path, "poll")
+    poll_calls = higgs.status_calls - hook_calls
+    assert not poll.webhook
+
+    hook_latency = hook_detected - higgs.completed_at[hook.job_id]
+    poll_latency = poll_detected - higgs.completed_at[poll.job_id]
+    assert hook_calls == 0 and poll_calls >= 2
+    assert hook_latency < 0.1 < poll_latency  # 0.3s 작업, 0.5s 주기 → 다음 폴링까지 ~0.2s
+
+
+def test_receiver_rejects_bad_signature():
+    store = JobStore()
+    client = TestClient(Starlette(routes=webhook_routes(store, secret=lambda: SECRET)))
+    body = json.dumps({"id": "task-1", "status": "SUCCEEDED"}).encode()
+
+    assert client.post("/webhooks/runway", content=body, headers={"X-Webhook-Signature": "sha256=00"}).status_code == 401
+    assert client.post("/webhooks/runway", content=body).status_code == 401
+    assert store.take("runway", "task-1", timeout_s=0) is None
+
+    ok = client.post("/webhooks/runway", content=body, headers={"X-Webhook-Signature": sign(SECRET, body)})
+    assert ok.status_code == 200
+    assert store.take("runway", "task-1", timeout_s=0)["status"] == "SUCCEEDED"
+
+    # 등록되지 않은 엔진 경로는 메트릭 라벨을 만들지 않는다
+    series = len(WEBHOOK_EVENTS.snapshot())
+    assert client.post("/webhooks/made-up-1", content=body).status_code == 404
+    assert client.post("/webhooks/grabcut", content=body).status_code == 404  # 로컬 엔진은 콜백이 없다
+    assert len(WEBHOOK_EVENTS.snapshot()) == series
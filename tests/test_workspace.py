@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+스크래치 작업 공간 테스트 (격리, 중첩/용량 한도, 예외 시 정리, tmpfs 폴백, 남은 작업 공간 정리, 서비스 작업)
+"""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.engines import EngineCapabilities, LocalEngine
+from src.server.generation import GenerationService
+from src.utils import workspace as wsmod
+from src.utils.workspace import WorkspaceQuotaExceeded, current_workspace, sweep_orphans, workspace
+
+
+@pytest.fixture
+def roots(tmp_path, monkeypatch):
+    monkeypatch.setattr(wsmod, "TMPFS_ROOT", str(tmp_path / "shm"))
+    monkeypatch.setattr(wsmod, "DISK_ROOT", str(tmp_path / "disk"))
+    monkeypatch.setattr(wsmod, "MIN_FREE_BYTES", 0)
+    return tmp_path
+
+
+def _write(path, size):
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+
+
+def test_isolated_and_removed_even_on_error(roots):
+    seen = []
+
+    def job(i):
+        with workspace(f"job-{i}") as ws:
+            _write(ws.path("frame.png"), 10)
+            seen.append(ws.root)
+            time.sleep(0.05)
+
+    threads = [threading.Thread(target=job, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(set(seen)) == 4  # 같은 파일명을 써도 서로 덮어쓰지 않는다
+    assert all(os.path.basename(r).startswith(f"{os.getpid()}-job-") for r in seen)
+    assert not any(os.path.exists(r) for r in seen)
+
+    with pytest.raises(ValueError):
+        with workspace("crash") as ws:
+            _write(ws.path("sub/frame.png"), 10)
+            root = ws.root
+            raise ValueError("렌더 실패")
+    assert not os.path.exists(root)
+    assert current_workspace() is None
+
+
+def test_nested_workspace_shares_quota(roots):
+    with workspace("job", quota_bytes=100) as job:
+        assert job.medium == "tmpfs"
+        with workspace("render") as render:
+            assert os.path.dirname(render.root) == job.root
+            _write(render.path("a.png"), 60)
+            render.track(render.path("a.png"))
+            assert job.used_bytes == 60
+            _write(render.path("b.png"), 60)
+            with pytest.raises(WorkspaceQuotaExceeded):
+                render.track(render.path("b.png"))
+        # 하위 공간이 지워지면 사용량도 돌려받는다
+        assert not os.path.exists(render.root) and job.used_bytes == 0
+        _write(job.path("input.jpg"), 90)
+        job.track(job.path("input.jpg"))
+
+
+def test_falls_back_to_disk(roots, monkeypatch):
+    monkeypatch.setattr(wsmod, "MIN_FREE_BYTES", 1 << 60)
+    with workspace("big") as ws:
+        assert ws.medium == "disk" and ws.root.startswith(str(roots / "disk"))
+    monkeypatch.setattr(wsmod, "TMPFS_ROOT", "")
+    monkeypatch.setattr(wsmod, "MIN_FREE_BYTES", 0)
+    with workspace("no-shm") as ws:
+        assert ws.medium == "disk"
+
+
+def test_sweep_orphans(roots):
+    # 끝난 프로세스의 PID 로 남은 디렉터리를 흉내 낸다
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+    tmpfs, disk = wsmod._roots()
+    orphan = os.path.join(tmpfs, f"{dead.pid}-job-abc")
+    old = os.path.join(disk, f"{os.getpid()}-old-xyz")
+    for d in (orphan, old):
+        os.makedirs(d)
+        _write(os.path.join(d, "frame.png"), 10)
+    os.utime(old, (time.time() - 7200, time.time() - 7200))
+    with workspace("live") as live:
+        assert sweep_orphans(max_age_s=3600) == 2
+        assert os.path.isdir(live.root)  # 열려 있는 작업 공간은 건드리지 않는다
+    assert not os.path.exists(orphan) and not os.path.exists(old)
+
+
+class ScratchEngine(LocalEngine):
+    name = "scratch"
+    capabilities = EngineCapabilities(kind="local", ratios=(), durations=())
+    roots = []
+
+    def render(self, request):
+        with workspace("frames") as ws:
+            type(self).roots.append((request.image_path, ws.root))
+            _write(ws.path("frame_00000.png"), 10)
+        with open(request.output_path, "wb") as f:
+            f.write(b"x")
+        return request.output_path
+
+
+def test_service_job_scratch_is_removed(roots, tmp_path, test_engines):
+    test_engines(ScratchEngine)
+    service = GenerationService(workers=1, out_dir=str(tmp_path / "out"))
+    try:
+        job = service.submit({"engine": "scratch", "product_id": "p1", "settings": {"image_base64": "aGVsbG8=", "seed": 1}})
+        while not job.done:
+            time.sleep(0.02)
+        assert job.state == "succeeded", job.error
+        image_path, render_root = ScratchEngine.roots[-1]
+        # 입력 이미지와 렌더러 중간 파일이 같은 작업 공간 아래에 있었고, 작업 후 남지 않는다
+        assert os.path.dirname(render_root) == os.path.dirname(image_path)
+        assert not os.path.exists(os.path.dirname(image_path))
+        # 결과만 산출물 저장소에 남는다
+        objects = [os.path.join(d, f) for d, _, fs in os.walk(tmp_path / "out" / "artifacts" / "objects") for f in fs]
+        assert objects == [job.output_path]
+    finally:
+        service.shutdown()